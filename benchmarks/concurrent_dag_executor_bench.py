@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+
+import random
+import time
+
+import pyperf
+
+from sqlmesh.utils.concurrency import ConcurrentDAGExecutor
+from sqlmesh.utils.dag import DAG
+
+NODES_NUM = 50_000
+TASKS_NUM = 8
+
+
+def build_dag(nodes_num: int, seed: int = 42) -> DAG[int]:
+    """Builds a synthetic DAG where each node depends on up to 3 recent nodes."""
+    rng = random.Random(seed)
+    graph = {}
+    for node in range(nodes_num):
+        window = range(max(0, node - 100), node)
+        graph[node] = set(rng.sample(window, min(len(window), rng.randint(0, 3))))
+    return DAG(graph)
+
+
+def run_executor(dag: DAG[int]) -> None:
+    errors, skipped = ConcurrentDAGExecutor(
+        dag, lambda _: None, TASKS_NUM, raise_on_error=True
+    ).run()
+    assert not errors and not skipped
+
+
+def assert_near_linear() -> None:
+    """Dispatching 10x more nodes should take roughly 10x longer, not 100x."""
+    timings = []
+    for nodes_num in (NODES_NUM // 10, NODES_NUM):
+        dag = build_dag(nodes_num)
+        t0 = time.perf_counter()
+        run_executor(dag)
+        timings.append(time.perf_counter() - t0)
+
+    ratio = timings[1] / timings[0]
+    assert ratio < 30, f"Dispatch overhead grows super-linearly: 10x nodes took {ratio:.1f}x longer"
+
+
+def main():
+    runner = pyperf.Runner()
+    runner.parse_args()
+    if not runner.args.worker:
+        assert_near_linear()
+
+    dag = build_dag(NODES_NUM)
+    runner.bench_func("concurrent_dag_executor_50k", run_executor, dag)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python
+
+import random
+
+import pyperf
+
+from sqlmesh.utils.dag import DAG
+
+NODES_NUM = 8_000
+
+
+def build_graph(nodes_num: int, seed: int = 42) -> dict:
+    """Builds a synthetic model graph where each node depends on up to 5 earlier nodes."""
+    rng = random.Random(seed)
+    return {
+        f"model_{node}": {
+            f"model_{dep}" for dep in rng.sample(range(node), min(node, rng.randint(0, 5)))
+        }
+        for node in range(nodes_num)
+    }
+
+
+def bench_build_and_sort(graph: dict) -> None:
+    DAG(graph).sorted
+
+
+def bench_downstream(dag: DAG) -> None:
+    for node in list(dag.graph)[:500]:
+        dag.downstream(node)
+
+
+def bench_upstream_with_appends(graph: dict) -> None:
+    dag: DAG = DAG()
+    for node, deps in graph.items():
+        dag.add(node, deps)
+        dag.upstream(node)
+
+
+def main():
+    runner = pyperf.Runner()
+    graph = build_graph(NODES_NUM)
+
+    dag = DAG(graph)
+    dag.sorted
+
+    runner.bench_func("dag_build_and_sort", bench_build_and_sort, graph)
+    runner.bench_func("dag_downstream", bench_downstream, dag)
+    runner.bench_func("dag_upstream_with_appends", bench_upstream_with_appends, graph)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+
+import gzip
+import pickle
+import typing as t
+
+import pyperf
+
+from sqlmesh.core.context import Context
+from sqlmesh.core.model import Model, SqlModel
+from sqlmesh.core.model.cache import OptimizedQueryCacheEntry
+from sqlmesh.utils import serialization
+
+MODELS_NUM = 5_000
+
+
+def build_entries(
+    models_num: int,
+) -> t.Tuple[t.List[t.List[Model]], t.List[OptimizedQueryCacheEntry]]:
+    """Scales the models of the sushi example up to the given number of cache entries."""
+    context = Context(paths="examples/sushi")
+    sushi_models = [model for model in context.models.values() if isinstance(model, SqlModel)]
+
+    model_entries = []
+    query_entries = []
+    for idx in range(models_num):
+        model = sushi_models[idx % len(sushi_models)]
+        model = model.copy(update={"name": f"{model.name}_{idx}"})
+        model.full_depends_on
+        model_entries.append([model])
+        query_entries.append(
+            OptimizedQueryCacheEntry(
+                optimized_rendered_query=model.render_query(),
+                renderer_violations=model.violated_rules_for_query,
+            )
+        )
+    return model_entries, query_entries
+
+
+def legacy_dumps(value: t.Any) -> bytes:
+    """The previous cache format."""
+    return gzip.compress(pickle.dumps(value), compresslevel=1)
+
+
+def legacy_loads(payload: bytes) -> t.Any:
+    return pickle.loads(gzip.decompress(payload))
+
+
+def bench_dumps(entries: t.List[t.Any], dumps: t.Callable[[t.Any], bytes]) -> None:
+    for entry in entries:
+        dumps(entry)
+
+
+def bench_loads(payloads: t.List[bytes], loads: t.Callable[[bytes], t.Any]) -> None:
+    for payload in payloads:
+        loads(payload)
+
+
+def main():
+    runner = pyperf.Runner()
+    model_entries, query_entries = build_entries(MODELS_NUM)
+
+    for kind, entries in (("model", model_entries), ("optimized_query", query_entries)):
+        for format, dumps, loads in (
+            ("legacy", legacy_dumps, legacy_loads),
+            ("compact", serialization.dumps, serialization.loads),
+        ):
+            payloads = [dumps(entry) for entry in entries]
+            runner.bench_func(f"{kind}_dumps_{format}", bench_dumps, entries, dumps)
+            runner.bench_func(f"{kind}_loads_{format}", bench_loads, payloads, loads)
+
+
+if __name__ == "__main__":
+    main()
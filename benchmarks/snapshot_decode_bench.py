@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+
+import json
+
+import pyperf
+from sqlglot import parse_one
+
+from sqlmesh.core.model import IncrementalByTimeRangeKind, SqlModel
+from sqlmesh.core.snapshot import Snapshot, SnapshotChangeCategory
+from sqlmesh.core.state_sync.db.snapshot import _snapshot_to_json, parse_snapshot
+
+SNAPSHOTS_NUM = 10_000
+
+
+def build_rows(snapshots_num: int) -> list:
+    """Builds serialized snapshots the same way the state sync stores them."""
+    rows = []
+    for idx in range(snapshots_num):
+        model = SqlModel(
+            name=f"db.model_{idx}",
+            kind=IncrementalByTimeRangeKind(time_column="ds"),
+            cron="@hourly" if idx % 2 else "@daily",
+            query=parse_one(
+                f"SELECT id, name, amount, ds FROM db.upstream_{idx % 100} "
+                "WHERE ds BETWEEN @start_ds AND @end_ds"
+            ),
+        )
+        snapshot = Snapshot.from_node(model, nodes={})
+        snapshot.categorize_as(SnapshotChangeCategory.BREAKING)
+        rows.append(_snapshot_to_json(snapshot))
+    return rows
+
+
+def bench_parse_snapshot_trusted(rows: list) -> None:
+    for row in rows:
+        parse_snapshot(row, 0, None, False, None, trusted=True)
+
+
+def bench_parse_snapshot(rows: list) -> None:
+    for row in rows:
+        parse_snapshot(row, 0, None, False, None)
+
+
+def bench_parse_snapshot_dict(rows: list) -> None:
+    """The previous approach which decodes the JSON into a dictionary before validating it."""
+    for row in rows:
+        Snapshot(
+            **{
+                **json.loads(row),
+                "updated_ts": 0,
+                "unpaused_ts": None,
+                "unrestorable": False,
+                "next_auto_restatement_ts": None,
+            }
+        )
+
+
+def main():
+    runner = pyperf.Runner()
+    rows = build_rows(SNAPSHOTS_NUM)
+
+    runner.bench_func("parse_snapshot_trusted", bench_parse_snapshot_trusted, rows)
+    runner.bench_func("parse_snapshot", bench_parse_snapshot, rows)
+    runner.bench_func("parse_snapshot_dict", bench_parse_snapshot_dict, rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+
+import random
+
+import pyperf
+
+from sqlmesh.core.snapshot import SnapshotIntervals
+from sqlmesh.core.state_sync.db.interval import snapshot_intervals_from_rows
+
+SNAPSHOTS_NUM = 1_000
+ROWS_NUM = 100_000
+DAY_MS = 24 * 60 * 60 * 1000
+
+
+def build_rows(snapshots_num: int, rows_num: int, seed: int = 42) -> list:
+    """Builds uncompacted interval records ordered the same way the state sync query orders them.
+
+    Each snapshot gets a run of daily intervals in random order with occasional removals and
+    pending restatements mixed in.
+    """
+    rng = random.Random(seed)
+    rows_per_snapshot = rows_num // snapshots_num
+    rows = []
+    for snapshot_idx in range(snapshots_num):
+        name = f'"db"."model_{snapshot_idx}"'
+        version = f"version_{snapshot_idx}"
+        days = list(range(rows_per_snapshot))
+        rng.shuffle(days)
+        for row_idx, day in enumerate(days):
+            start, end = day * DAY_MS, (day + 1) * DAY_MS
+            is_removed = rng.random() < 0.01
+            is_pending_restatement = not is_removed and rng.random() < 0.01
+            rows.append(
+                (
+                    f"{snapshot_idx}_{row_idx}",
+                    name,
+                    f"identifier_{snapshot_idx}",
+                    version,
+                    f"dev_version_{snapshot_idx}",
+                    start,
+                    end,
+                    False,
+                    is_removed,
+                    is_pending_restatement,
+                )
+            )
+    return rows
+
+
+def bench_snapshot_intervals_from_rows(rows: list) -> None:
+    snapshot_intervals_from_rows(rows)
+
+
+def bench_snapshot_intervals_per_row_merge(rows: list) -> None:
+    """The previous approach which re-merges all intervals of a snapshot for every added row."""
+    intervals = {}
+    for _, name, identifier, version, dev_version, start, end, _, is_removed, _ in rows:
+        key = (name, version)
+        if key not in intervals:
+            intervals[key] = SnapshotIntervals(
+                name=name, identifier=identifier, version=version, dev_version=dev_version
+            )
+        if is_removed:
+            intervals[key].remove_interval(start, end)
+        else:
+            intervals[key].add_interval(start, end)
+
+
+def main():
+    runner = pyperf.Runner()
+    rows = build_rows(SNAPSHOTS_NUM, ROWS_NUM)
+
+    runner.bench_func("snapshot_intervals_from_rows", bench_snapshot_intervals_from_rows, rows)
+    runner.bench_func(
+        "snapshot_intervals_per_row_merge", bench_snapshot_intervals_per_row_merge, rows
+    )
+
+
+if __name__ == "__main__":
+    main()
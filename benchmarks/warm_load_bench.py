@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+
+import shutil
+import tempfile
+import typing as t
+from pathlib import Path
+from unittest import mock
+
+import pyperf
+
+from sqlmesh.core.config import Config, DuckDBConnectionConfig, GatewayConfig, ModelDefaultsConfig
+from sqlmesh.core.context import Context
+from sqlmesh.core.model.cache import OptimizedQueryCache
+
+MODELS_NUM = 1_000
+LAYER_WIDTH = 50
+
+CONFIG = Config(
+    gateways={"main": GatewayConfig(connection=DuckDBConnectionConfig())},
+    model_defaults=ModelDefaultsConfig(dialect="duckdb"),
+)
+
+
+def build_project(path: Path, models_num: int) -> None:
+    """Writes a project with layers of models, each joining two models of the previous layer."""
+    models_path = path / "models"
+    models_path.mkdir()
+
+    for idx in range(models_num):
+        if idx < LAYER_WIDTH:
+            query = "SELECT 1 AS id, 'a' AS name, 1.0 AS amount"
+        else:
+            left = idx - LAYER_WIDTH
+            right = max(left - idx % 3, 0)
+            query = (
+                "SELECT a.id, a.name, SUM(a.amount + b.amount) AS amount "
+                f"FROM db.m{left} AS a JOIN db.m{right} AS b ON a.id = b.id "
+                "WHERE a.name <> 'x' GROUP BY a.id, a.name"
+            )
+        (models_path / f"m{idx}.sql").write_text(f"MODEL (name db.m{idx}, kind FULL);\n{query}")
+
+
+def bench_warm_load(path: Path) -> None:
+    """Loads the project from a warm cache and computes the hashes that snapshots are created from."""
+    context = Context(paths=path, config=CONFIG)
+    for model in context.models.values():
+        model.data_hash
+        model.metadata_hash
+
+
+def bench_warm_load_workers(path: Path) -> None:
+    """The previous behavior, where all models were sent to workers regardless of the cache."""
+    with mock.patch.object(OptimizedQueryCache, "exists_many", return_value=set()):
+        bench_warm_load(path)
+
+
+def main():
+    runner = pyperf.Runner()
+    path = Path(tempfile.mkdtemp())
+
+    try:
+        build_project(path, MODELS_NUM)
+        # Populate the caches
+        Context(paths=path, config=CONFIG)
+
+        benches: t.List[t.Tuple[str, t.Callable[[Path], None]]] = [
+            ("warm_load", bench_warm_load),
+            ("warm_load_workers", bench_warm_load_workers),
+        ]
+        for name, func in benches:
+            runner.bench_func(name, func, path)
+    finally:
+        shutil.rmtree(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -1161,6 +1161,11 @@ def state() -> None:
     is_flag=True,
     help="Do not prompt for confirmation before exporting existing state",
 )
+@click.option(
+    "--chunked",
+    is_flag=True,
+    help="Write a compressed, indexed state file that can be imported in parallel and per environment",
+)
 @click.pass_obj
 @error_handler
 @cli_analytics
@@ -1170,6 +1175,7 @@ def state_export(
     environment: t.Optional[t.Tuple[str]],
     local: bool,
     no_confirm: bool,
+    chunked: bool,
 ) -> None:
     """Export the state database to a file"""
     confirm = not no_confirm
@@ -1183,6 +1189,7 @@ def state_export(
         environment_names=environment_names,
         local_only=local,
         confirm=confirm,
+        chunked=chunked,
     )
 
 
@@ -1204,10 +1211,27 @@ def state_export(
     is_flag=True,
     help="Do not prompt for confirmation before updating existing state",
 )
+@click.option(
+    "--environment",
+    multiple=True,
+    help="Name of environment to import along with its snapshots. Only supported for chunked state files",
+)
 @click.pass_obj
 @error_handler
 @cli_analytics
-def state_import(obj: Context, input_file: Path, replace: bool, no_confirm: bool) -> None:
+def state_import(
+    obj: Context,
+    input_file: Path,
+    replace: bool,
+    no_confirm: bool,
+    environment: t.Optional[t.Tuple[str]],
+) -> None:
     """Import a state export file back into the state database"""
     confirm = not no_confirm
-    obj.import_state(input_file=input_file, clear=replace, confirm=confirm)
+    environment_names = list(environment) if environment else None
+    obj.import_state(
+        input_file=input_file,
+        clear=replace,
+        confirm=confirm,
+        environment_names=environment_names,
+    )
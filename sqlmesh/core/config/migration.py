@@ -9,6 +9,9 @@ class MigrationConfig(BaseConfig):
     Args:
         promoted_snapshots_only: If True, only snapshots that are part of at least one environment will be migrated.
             Otherwise, all snapshots will be migrated.
+        streaming: If True, snapshots will be migrated in topologically ordered chunks with bounded memory, and
+            an interrupted migration will be resumed by the next one.
     """
 
     promoted_snapshots_only: bool = True
+    streaming: bool = False
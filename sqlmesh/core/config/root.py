@@ -44,7 +44,7 @@ from sqlmesh.core.notification_target import NotificationTarget
 from sqlmesh.core.user import User
 from sqlmesh.utils.date import to_timestamp, now
 from sqlmesh.utils.errors import ConfigError
-from sqlmesh.utils.pydantic import model_validator
+from sqlmesh.utils.pydantic import field_validator, model_validator
 
 
 def validate_no_past_ttl(v: str) -> str:
@@ -120,6 +120,7 @@ class Config(BaseConfig):
         disable_anonymized_analytics: Whether to disable the anonymized analytics collection.
         before_all: SQL statements or macros to be executed at the start of the `sqlmesh plan` and `sqlmesh run` commands.
         after_all: SQL statements or macros to be executed at the end of the `sqlmesh plan` and `sqlmesh run` commands.
+        concurrency_groups: A mapping from concurrency group names to the maximum number of models in that group that can be evaluated concurrently.
     """
 
     gateways: GatewayDict = {"": GatewayConfig()}
@@ -165,6 +166,7 @@ class Config(BaseConfig):
     after_all: t.Optional[t.List[str]] = None
     linter: LinterConfig = LinterConfig()
     janitor: JanitorConfig = JanitorConfig()
+    concurrency_groups: t.Dict[str, int] = {}
 
     _FIELD_UPDATE_STRATEGY: t.ClassVar[t.Dict[str, UpdateStrategy]] = {
         "gateways": UpdateStrategy.NESTED_UPDATE,
@@ -183,6 +185,7 @@ class Config(BaseConfig):
         "before_all": UpdateStrategy.EXTEND,
         "after_all": UpdateStrategy.EXTEND,
         "linter": UpdateStrategy.NESTED_UPDATE,
+        "concurrency_groups": UpdateStrategy.KEY_UPDATE,
     }
 
     _connection_config_validator = connection_config_validator
@@ -221,6 +224,16 @@ class Config(BaseConfig):
 
         return data
 
+    @field_validator("concurrency_groups", mode="after")
+    @classmethod
+    def _validate_concurrency_groups(cls, v: t.Dict[str, int]) -> t.Dict[str, int]:
+        for group, limit in v.items():
+            if limit <= 0:
+                raise ConfigError(
+                    f"The concurrency limit for group '{group}' must be a positive integer, got {limit}"
+                )
+        return v
+
     @model_validator(mode="after")
     def _normalize_fields_after(self) -> Self:
         dialect = self.model_defaults.dialect
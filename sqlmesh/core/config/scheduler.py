@@ -6,6 +6,7 @@ import typing as t
 from pydantic import Field, ValidationError
 
 from sqlglot.helper import subclasses
+from sqlmesh.core import constants as c
 from sqlmesh.core.config.base import BaseConfig
 from sqlmesh.core.console import get_console
 from sqlmesh.core.plan import (
@@ -13,7 +14,12 @@ from sqlmesh.core.plan import (
     PlanEvaluator,
 )
 from sqlmesh.core.config import DuckDBConnectionConfig
-from sqlmesh.core.state_sync import EngineAdapterStateSync, StateSync
+from sqlmesh.core.state_sync import (
+    CachingStateSync,
+    EngineAdapterStateSync,
+    ReadReplicaStateSync,
+    StateSync,
+)
 from sqlmesh.utils.errors import ConfigError
 from sqlmesh.utils.hashing import md5
 from sqlmesh.utils.pydantic import field_validator, validation_error_message
@@ -46,6 +52,17 @@ class SchedulerConfig(abc.ABC):
             The StateSync instance.
         """
 
+    def create_caching_state_sync(self, state_sync: StateSync) -> CachingStateSync:
+        """Wraps a State Sync with an in-memory cache of snapshots.
+
+        Args:
+            state_sync: The State Sync to wrap.
+
+        Returns:
+            The CachingStateSync instance.
+        """
+        return CachingStateSync(state_sync)  # type: ignore
+
     @abc.abstractmethod
     def get_default_catalog_per_gateway(self, context: GenericContext) -> t.Dict[str, str]:
         """Returns the default catalog for each gateway.
@@ -65,6 +82,11 @@ class SchedulerConfig(abc.ABC):
 
 class _EngineAdapterStateSyncSchedulerConfig(SchedulerConfig):
     def create_state_sync(self, context: GenericContext) -> StateSync:
+        return self._create_engine_adapter_state_sync(context)
+
+    def _create_engine_adapter_state_sync(
+        self, context: GenericContext, cache_intervals: bool = False, compress_blobs: bool = False
+    ) -> EngineAdapterStateSync:
         state_connection = (
             context.config.get_state_connection(context.gateway) or context.connection_config
         )
@@ -104,8 +126,21 @@ class _EngineAdapterStateSyncSchedulerConfig(SchedulerConfig):
                 )
 
         schema = context.config.get_state_schema(context.gateway)
+        interval_cache_path = (
+            context.path
+            / c.CACHE
+            / "state_intervals"
+            / md5([self.state_sync_fingerprint(context), schema or ""])
+            if cache_intervals
+            else None
+        )
         return EngineAdapterStateSync(
-            engine_adapter, schema=schema, context_path=context.path, console=context.console
+            engine_adapter,
+            schema=schema,
+            context_path=context.path,
+            console=context.console,
+            interval_cache_path=interval_cache_path,
+            compress_blobs=compress_blobs,
         )
 
     def state_sync_fingerprint(self, context: GenericContext) -> str:
@@ -126,6 +161,52 @@ class BuiltInSchedulerConfig(_EngineAdapterStateSyncSchedulerConfig, BaseConfig)
     """The Built-In Scheduler configuration."""
 
     type_: t.Literal["builtin"] = Field(alias="type", default="builtin")
+    state_replica: bool = False
+    state_replica_max_staleness: int = 60
+    state_cache_max_entries: t.Optional[int] = 20_000
+    state_cache_max_size_bytes: t.Optional[int] = None
+    state_cache_intervals: bool = False
+    state_compress_blobs: bool = False
+
+    def create_state_sync(self, context: GenericContext) -> StateSync:
+        state_sync = self._create_engine_adapter_state_sync(
+            context,
+            cache_intervals=self.state_cache_intervals,
+            compress_blobs=self.state_compress_blobs,
+        )
+        if not self.state_replica:
+            return state_sync
+
+        state_connection = (
+            context.config.get_state_connection(context.gateway) or context.connection_config
+        )
+        replica_path = (
+            context.path
+            / c.CACHE
+            / "state_replica"
+            / f"{md5([self.state_sync_fingerprint(context), state_sync.schema or ''])}.duckdb"
+        )
+        replica_path.parent.mkdir(parents=True, exist_ok=True)
+        replica_adapter = DuckDBConnectionConfig(
+            database=str(replica_path), concurrent_tasks=state_connection.concurrent_tasks
+        ).create_engine_adapter()
+        return ReadReplicaStateSync(  # type: ignore
+            state_sync,
+            EngineAdapterStateSync(
+                replica_adapter,
+                schema=state_sync.schema,
+                context_path=context.path,
+                console=context.console,
+            ),
+            max_staleness=self.state_replica_max_staleness,
+        )
+
+    def create_caching_state_sync(self, state_sync: StateSync) -> CachingStateSync:
+        return CachingStateSync(  # type: ignore
+            state_sync,
+            max_entries=self.state_cache_max_entries,
+            max_size_bytes=self.state_cache_max_size_bytes,
+        )
 
     def create_plan_evaluator(self, context: GenericContext) -> PlanEvaluator:
         return BuiltInPlanEvaluator(
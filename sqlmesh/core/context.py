@@ -102,6 +102,7 @@ from sqlmesh.core.snapshot import (
     missing_intervals,
     to_table_mapping,
 )
+from sqlmesh.core.snapshot.cache import EvaluationDurationCache
 from sqlmesh.core.snapshot.definition import get_next_model_interval_start
 from sqlmesh.core.state_sync import (
     CachingStateSync,
@@ -541,6 +542,17 @@ class GenericContext(BaseContext, t.Generic[C]):
         Returns:
             The built-in scheduler instance.
         """
+        # Each evaluation records its intervals through the state sync, so evaluations on different
+        # gateways can only overlap if the state connection can be used by multiple threads.
+        max_workers_per_gateway = (
+            {
+                gateway.lower(): self.config.get_connection(gateway).concurrent_tasks
+                for gateway in self.engine_adapters
+                if gateway != self.selected_gateway
+            }
+            if self._state_connection_config.concurrent_tasks > 1
+            else None
+        )
         return Scheduler(
             snapshots,
             self.snapshot_evaluator,
@@ -549,6 +561,9 @@ class GenericContext(BaseContext, t.Generic[C]):
             max_workers=self.concurrent_tasks,
             console=self.console,
             notification_target_manager=self.notification_target_manager,
+            evaluation_duration_cache=self._evaluation_duration_cache,
+            max_workers_per_gateway=max_workers_per_gateway,
+            concurrency_group_limits=self.config.concurrency_groups,
         )
 
     @property
@@ -559,7 +574,7 @@ class GenericContext(BaseContext, t.Generic[C]):
             if self._state_sync.get_versions(validate=False).schema_version == 0:
                 self._state_sync.migrate(default_catalog=self.default_catalog)
             self._state_sync.get_versions()
-            self._state_sync = CachingStateSync(self._state_sync)  # type: ignore
+            self._state_sync = self._scheduler.create_caching_state_sync(self._state_sync)
         return self._state_sync
 
     @property
@@ -610,12 +625,17 @@ class GenericContext(BaseContext, t.Generic[C]):
             prod = self.state_reader.get_environment(c.PROD)
 
             if prod:
-                for snapshot in self.state_reader.get_snapshots(prod.snapshots).values():
-                    if snapshot.node.project in self._projects:
-                        uncached.add(snapshot.name)
+                # Only snapshots of remote projects need to be fully fetched and parsed.
+                remote_snapshot_ids = []
+                for header in self.state_reader.get_snapshot_headers(prod.snapshots).values():
+                    if header.project in self._projects:
+                        uncached.add(header.name)
                     else:
-                        store = self._standalone_audits if snapshot.is_audit else self._models
-                        store[snapshot.name] = snapshot.node  # type: ignore
+                        remote_snapshot_ids.append(header.snapshot_id)
+
+                for snapshot in self.state_reader.get_snapshots(remote_snapshot_ids).values():
+                    store = self._standalone_audits if snapshot.is_audit else self._models
+                    store[snapshot.name] = snapshot.node  # type: ignore
 
         for model in self._models.values():
             self.dag.add(model.fqn, model.depends_on)
@@ -722,7 +742,7 @@ class GenericContext(BaseContext, t.Generic[C]):
         def _block_until_finalized() -> str:
             for _ in range(env_check_attempts_num):
                 assert environment is not None  # mypy
-                environment_state = self.state_sync.get_environment(environment)
+                environment_state = self.state_sync.get_environment_summary(environment)
                 if not environment_state:
                     raise SQLMeshError(f"Environment '{environment}' was not found.")
                 if environment_state.finalized_ts:
@@ -748,7 +768,7 @@ class GenericContext(BaseContext, t.Generic[C]):
 
             def _has_environment_changed() -> bool:
                 assert environment is not None  # mypy
-                current_environment_state = self.state_sync.get_environment(environment)
+                current_environment_state = self.state_sync.get_environment_summary(environment)
                 return (
                     not current_environment_state
                     or current_environment_state.plan_id != plan_id_at_start
@@ -2216,6 +2236,7 @@ class GenericContext(BaseContext, t.Generic[C]):
             self._new_state_sync().migrate(
                 default_catalog=self.default_catalog,
                 promoted_snapshots_only=self.config.migration.promoted_snapshots_only,
+                streaming=self.config.migration.streaming,
             )
         except Exception as e:
             self.notification_target_manager.notify(
@@ -2417,6 +2438,8 @@ class GenericContext(BaseContext, t.Generic[C]):
     def clear_caches(self) -> None:
         for path in self.configs:
             rmtree(path / c.CACHE)
+        # Drop the durations loaded in memory, so that they are re-read from the now empty cache
+        self.__dict__.pop("_evaluation_duration_cache", None)
         if isinstance(self.state_sync, CachingStateSync):
             self.state_sync.clear_cache()
 
@@ -2426,6 +2449,7 @@ class GenericContext(BaseContext, t.Generic[C]):
         environment_names: t.Optional[t.List[str]] = None,
         local_only: bool = False,
         confirm: bool = True,
+        chunked: bool = False,
     ) -> None:
         from sqlmesh.core.state_sync.export_import import export_state
 
@@ -2450,13 +2474,20 @@ class GenericContext(BaseContext, t.Generic[C]):
                     local_snapshots=local_snapshots,
                     environment_names=environment_names,
                     console=self.console,
+                    chunked=chunked,
                 )
                 self.console.stop_state_export(success=True, output_file=output_file)
             except:
                 self.console.stop_state_export(success=False, output_file=output_file)
                 raise
 
-    def import_state(self, input_file: Path, clear: bool = False, confirm: bool = True) -> None:
+    def import_state(
+        self,
+        input_file: Path,
+        clear: bool = False,
+        confirm: bool = True,
+        environment_names: t.Optional[t.List[str]] = None,
+    ) -> None:
         from sqlmesh.core.state_sync.export_import import import_state
 
         if self.console.start_state_import(
@@ -2472,6 +2503,7 @@ class GenericContext(BaseContext, t.Generic[C]):
                     input_file=input_file,
                     clear=clear,
                     console=self.console,
+                    environment_names=environment_names,
                 )
                 self.console.stop_state_import(success=True, input_file=input_file)
             except:
@@ -2531,10 +2563,20 @@ class GenericContext(BaseContext, t.Generic[C]):
         for gateway_name in self.config.gateways:
             if gateway_name != self.selected_gateway:
                 connection = self.config.get_connection(gateway_name)
-                adapter = connection.create_engine_adapter(concurrent_tasks=self.concurrent_tasks)
+                # Per-gateway slots are only used by the scheduler if the state connection is multithreaded
+                concurrent_tasks = (
+                    max(self.concurrent_tasks, connection.concurrent_tasks)
+                    if self._state_connection_config.concurrent_tasks > 1
+                    else self.concurrent_tasks
+                )
+                adapter = connection.create_engine_adapter(concurrent_tasks=concurrent_tasks)
                 adapters[gateway_name] = adapter
         return adapters
 
+    @cached_property
+    def _evaluation_duration_cache(self) -> EvaluationDurationCache:
+        return EvaluationDurationCache(self.path / c.CACHE)
+
     @cached_property
     def default_catalog_per_gateway(self) -> t.Dict[str, str]:
         """Returns the default catalogs for each engine adapter."""
@@ -2642,7 +2684,7 @@ class GenericContext(BaseContext, t.Generic[C]):
 
     def _destroy(self) -> None:
         # Invalidate all environments, including prod
-        for environment in self.state_reader.get_environments():
+        for environment in self.state_reader.get_environments_summary():
             self.state_sync.invalidate_environment(name=environment.name, protect_prod=False)
             self.console.log_success(f"Environment '{environment.name}' invalidated.")
 
@@ -103,6 +103,7 @@ class EngineAdapter:
     SUPPORTS_MANAGED_MODELS = False
     SCHEMA_DIFFER = SchemaDiffer()
     SUPPORTS_TUPLE_IN = True
+    SUPPORTS_CORRELATED_SUBQUERIES = True
     HAS_VIEW_BINDING = False
     SUPPORTS_REPLACE_TABLE = True
     DEFAULT_CATALOG_TYPE = DIALECT
@@ -1254,6 +1255,34 @@ class EngineAdapter:
         )
         self._insert_append_source_queries(table_name, source_queries, columns_to_types)
 
+    def insert_append_rows(
+        self,
+        table_name: TableName,
+        rows: t.Iterable[t.Tuple[t.Any, ...]],
+        columns_to_types: t.Dict[str, exp.DataType],
+    ) -> None:
+        """Appends rows of Python values to an existing table.
+
+        The default implementation inserts the rows as literal values. Engines that provide a bulk loading
+        interface override this method to bypass the generation of SQL for the rows.
+
+        Args:
+            table_name: The name of the target table.
+            rows: The rows to insert. Values are ordered the same way as the columns in columns_to_types.
+            columns_to_types: A mapping between the column name and its data type.
+        """
+        import pandas as pd
+
+        rows = list(rows)
+        if not rows:
+            return
+
+        self.insert_append(
+            table_name,
+            pd.DataFrame(rows, columns=list(columns_to_types)),
+            columns_to_types=columns_to_types,
+        )
+
     def _insert_append_source_queries(
         self,
         table_name: TableName,
@@ -34,6 +34,7 @@ class ClickhouseEngineAdapter(EngineAdapterWithIndexSupport, LogicalMergeMixin):
     SUPPORTS_TRANSACTIONS = False
     SUPPORTS_VIEW_SCHEMA = False
     SUPPORTS_REPLACE_TABLE = False
+    SUPPORTS_CORRELATED_SUBQUERIES = False
     COMMENT_CREATION_VIEW = CommentCreationView.COMMENT_COMMAND_ONLY
 
     SCHEMA_DIFFER = SchemaDiffer()
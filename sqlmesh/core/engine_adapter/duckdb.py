@@ -65,6 +65,32 @@ class DuckDBEngineAdapter(LogicalMergeMixin, GetCurrentCatalogFromFunctionMixin,
             )
         ]
 
+    def insert_append_rows(
+        self,
+        table_name: TableName,
+        rows: t.Iterable[t.Tuple[t.Any, ...]],
+        columns_to_types: t.Dict[str, exp.DataType],
+    ) -> None:
+        """Appends rows to an existing table by registering them with the connection as a relation."""
+        import pandas as pd
+
+        rows = list(rows)
+        if not rows:
+            return
+
+        relation_name = self._get_temp_table(table_name, table_only=True, quoted=False).name
+        self.cursor.register(relation_name, pd.DataFrame(rows, columns=list(columns_to_types)))
+        try:
+            self.execute(
+                exp.insert(
+                    exp.select(*self._casted_columns(columns_to_types)).from_(relation_name),
+                    table_name,
+                    columns=list(columns_to_types),
+                )
+            )
+        finally:
+            self.cursor.unregister(relation_name)
+
     def _get_data_objects(
         self, schema_name: SchemaName, object_names: t.Optional[t.Set[str]] = None
     ) -> t.List[DataObject]:
@@ -58,6 +58,28 @@ class MySQLEngineAdapter(
         """Returns the catalog name of the current connection."""
         return None
 
+    def insert_append_rows(
+        self,
+        table_name: TableName,
+        rows: t.Iterable[t.Tuple[t.Any, ...]],
+        columns_to_types: t.Dict[str, exp.DataType],
+    ) -> None:
+        """Appends rows to an existing table using `executemany`, which batches them into multi-row inserts."""
+        rows = list(rows)
+        if not rows:
+            return
+
+        table = exp.to_table(table_name).sql(dialect=self.dialect, identify=True)
+        columns = ", ".join(
+            exp.to_identifier(column).sql(dialect=self.dialect, identify=True)
+            for column in columns_to_types
+        )
+        placeholders = ", ".join(["%s"] * len(columns_to_types))
+        sql = f"INSERT INTO {table} ({columns}) VALUES ({placeholders})"
+        with self.transaction():
+            self._log_sql(sql)
+            self.cursor.executemany(sql, rows)
+
     def create_index(
         self,
         table_name: TableName,
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import io
 import logging
 import typing as t
 from functools import partial
@@ -65,6 +66,45 @@ class PostgresEngineAdapter(
         drop_cascade=True,
     )
 
+    def insert_append_rows(
+        self,
+        table_name: TableName,
+        rows: t.Iterable[t.Tuple[t.Any, ...]],
+        columns_to_types: t.Dict[str, exp.DataType],
+    ) -> None:
+        """Appends rows to an existing table using `COPY ... FROM STDIN`.
+
+        psycopg2 and pg8000 expose COPY through different cursor APIs. Other drivers fall back to
+        inserting the rows as values.
+        """
+        cursor = self.cursor
+        copy_expert = getattr(cursor, "copy_expert", None)
+        is_pg8000 = cursor.__class__.__module__.startswith("pg8000")
+        if copy_expert is None and not is_pg8000:
+            super().insert_append_rows(table_name, rows, columns_to_types)
+            return
+
+        buffer = io.StringIO()
+        for row in rows:
+            buffer.write("\t".join(_to_copy_text(value) for value in row))
+            buffer.write("\n")
+        if not buffer.tell():
+            return
+        buffer.seek(0)
+
+        table = exp.to_table(table_name).sql(dialect=self.dialect, identify=True)
+        columns = ", ".join(
+            exp.to_identifier(column).sql(dialect=self.dialect, identify=True)
+            for column in columns_to_types
+        )
+        sql = f"COPY {table} ({columns}) FROM STDIN"
+        with self.transaction():
+            self._log_sql(sql)
+            if copy_expert is not None:
+                copy_expert(sql, buffer)
+            else:
+                cursor.execute(sql, stream=buffer)
+
     def _fetch_native_df(
         self, query: t.Union[exp.Expression, str], quote_identifiers: bool = False
     ) -> DF:
@@ -124,3 +164,15 @@ class PostgresEngineAdapter(
             when_matched=when_matched,
             merge_filter=merge_filter,
         )
+
+
+_COPY_TEXT_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def _to_copy_text(value: t.Any) -> str:
+    """Renders a value in the text format of `COPY`."""
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    return str(value).translate(_COPY_TEXT_ESCAPES)
@@ -6,6 +6,7 @@ import typing as t
 
 from sqlglot import exp
 
+from sqlmesh.core.engine_adapter.base import EngineAdapter
 from sqlmesh.core.engine_adapter.postgres import PostgresEngineAdapter
 from sqlmesh.core.engine_adapter.shared import (
     set_catalog,
@@ -34,3 +35,12 @@ class RisingwaveEngineAdapter(PostgresEngineAdapter):
 
     def _truncate_table(self, table_name: TableName) -> None:
         return self.execute(exp.Delete(this=exp.to_table(table_name)))
+
+    def insert_append_rows(
+        self,
+        table_name: TableName,
+        rows: t.Iterable[t.Tuple[t.Any, ...]],
+        columns_to_types: t.Dict[str, exp.DataType],
+    ) -> None:
+        # RisingWave doesn't support `COPY ... FROM STDIN`
+        EngineAdapter.insert_append_rows(self, table_name, rows, columns_to_types)
@@ -1,14 +1,19 @@
 from __future__ import annotations
 
 import abc
+import ast
 import glob
+import hashlib
 import itertools
 import linecache
 import os
+import pickle
 import re
 import typing as t
-from collections import Counter, defaultdict
+import zlib
+from collections import Counter
 from dataclasses import dataclass
+from functools import cached_property
 from pathlib import Path
 from pydantic import ValidationError
 import concurrent.futures
@@ -37,7 +42,9 @@ from sqlmesh.core.model.common import make_python_env
 from sqlmesh.core.signal import signal
 from sqlmesh.core.test import ModelTestMetadata, filter_tests_by_patterns
 from sqlmesh.utils import UniqueKeyDict, sys_path
+from sqlmesh.utils.cache import FileCache
 from sqlmesh.utils.errors import ConfigError
+from sqlmesh.utils.hashing import md5
 from sqlmesh.utils.jinja import JinjaMacroRegistry, MacroExtractor
 from sqlmesh.utils.metaprogramming import import_python_file
 from sqlmesh.utils.pydantic import validation_error_message
@@ -203,17 +210,10 @@ class Loader(abc.ABC):
             self._load_materializations()
             signals = self._load_signals()
 
-            config_mtimes: t.Dict[Path, t.List[float]] = defaultdict(list)
-
-            for config_file in self.config_path.glob("config.*"):
-                self._track_file(config_file)
-                config_mtimes[self.config_path].append(self._path_mtimes[config_file])
-
-            for config_file in c.SQLMESH_PATH.glob("config.*"):
+            for config_file in itertools.chain(
+                self.config_path.glob("config.*"), c.SQLMESH_PATH.glob("config.*")
+            ):
                 self._track_file(config_file)
-                config_mtimes[c.SQLMESH_PATH].append(self._path_mtimes[config_file])
-
-            self._config_mtimes = {path: max(mtimes) for path, mtimes in config_mtimes.items()}
 
             macros, jinja_macros = self._load_scripts()
             audits: UniqueKeyDict[str, ModelAudit] = UniqueKeyDict("audits")
@@ -477,8 +477,6 @@ class SqlMeshLoader(Loader):
         jinja_macros = JinjaMacroRegistry()
         extractor = MacroExtractor()
 
-        macros_max_mtime: t.Optional[float] = None
-
         for path in self._glob_paths(
             self.config_path / c.MACROS,
             ignore_patterns=self.config.ignore_patterns,
@@ -486,12 +484,6 @@ class SqlMeshLoader(Loader):
         ):
             if import_python_file(path, self.config_path):
                 self._track_file(path)
-                macro_file_mtime = self._path_mtimes[path]
-                macros_max_mtime = (
-                    max(macros_max_mtime, macro_file_mtime)
-                    if macros_max_mtime
-                    else macro_file_mtime
-                )
 
         for path in self._glob_paths(
             self.config_path / c.MACROS,
@@ -499,17 +491,11 @@ class SqlMeshLoader(Loader):
             extension=".sql",
         ):
             self._track_file(path)
-            macro_file_mtime = self._path_mtimes[path]
-            macros_max_mtime = (
-                max(macros_max_mtime, macro_file_mtime) if macros_max_mtime else macro_file_mtime
-            )
             with open(path, "r", encoding="utf-8") as file:
                 jinja_macros.add_macros(
                     extractor.extract(file.read(), dialect=self.config.model_defaults.dialect)
                 )
 
-        self._macros_max_mtime = macros_max_mtime
-
         macros = macro.get_registry()
         macro.set_registry(standard_macros)
 
@@ -527,7 +513,14 @@ class SqlMeshLoader(Loader):
         Loads all of the models within the model directory with their associated
         audits into a Dict and creates the dag
         """
-        cache = SqlMeshLoader._Cache(self, self.config_path)
+        cache = SqlMeshLoader._Cache(
+            self,
+            self.config_path,
+            macros=macros,
+            jinja_macros=jinja_macros,
+            audits=audits,
+            signals=signals,
+        )
 
         sql_models = self._load_sql_models(macros, jinja_macros, audits, signals, cache, gateway)
         external_models = self._load_external_models(audits, cache, gateway)
@@ -694,8 +687,6 @@ class SqlMeshLoader(Loader):
     def _load_signals(self) -> UniqueKeyDict[str, signal]:
         """Loads signals for the built-in scheduler."""
 
-        signals_max_mtime: t.Optional[float] = None
-
         for path in self._glob_paths(
             self.config_path / c.SIGNALS,
             ignore_patterns=self.config.ignore_patterns,
@@ -703,16 +694,8 @@ class SqlMeshLoader(Loader):
         ):
             if os.path.getsize(path):
                 self._track_file(path)
-                signal_file_mtime = self._path_mtimes[path]
-                signals_max_mtime = (
-                    max(signals_max_mtime, signal_file_mtime)
-                    if signals_max_mtime
-                    else signal_file_mtime
-                )
                 import_python_file(path, self.config_path)
 
-        self._signals_max_mtime = signals_max_mtime
-
         return signal.get_registry()
 
     def _load_audits(
@@ -720,7 +703,6 @@ class SqlMeshLoader(Loader):
     ) -> UniqueKeyDict[str, Audit]:
         """Loads all the model audits."""
         audits_by_name: UniqueKeyDict[str, Audit] = UniqueKeyDict("audits")
-        audits_max_mtime: t.Optional[float] = None
         variables = get_variables()
 
         for path in self._glob_paths(
@@ -730,12 +712,6 @@ class SqlMeshLoader(Loader):
         ):
             self._track_file(path)
             with open(path, "r", encoding="utf-8") as file:
-                audits_file_mtime = self._path_mtimes[path]
-                audits_max_mtime = (
-                    max(audits_max_mtime, audits_file_mtime)
-                    if audits_max_mtime
-                    else audits_file_mtime
-                )
                 expressions = parse(file.read(), default_dialect=self.config.model_defaults.dialect)
                 audits = load_multiple_audits(
                     expressions=expressions,
@@ -751,8 +727,6 @@ class SqlMeshLoader(Loader):
                 for audit in audits:
                     audits_by_name[audit.name] = audit
 
-        self._audits_max_mtime = audits_max_mtime
-
         return audits_by_name
 
     def _load_metrics(self) -> UniqueKeyDict[str, MetricMeta]:
@@ -877,19 +851,49 @@ class SqlMeshLoader(Loader):
         return test_meta_list
 
     class _Cache(CacheBase):
-        def __init__(self, loader: SqlMeshLoader, config_path: Path):
+        """Caches the models of each file.
+
+        An entry is keyed by the content hash of its file. It's only valid while the macros, jinja
+        macros, audits, signals and variables that the cached models reference remain unchanged.
+        The content hashes of these dependencies are stored in a separate small entry, so that
+        they can be checked without loading the models themselves.
+        """
+
+        def __init__(
+            self,
+            loader: SqlMeshLoader,
+            config_path: Path,
+            macros: t.Optional[MacroRegistry] = None,
+            jinja_macros: t.Optional[JinjaMacroRegistry] = None,
+            audits: t.Optional[t.Dict[str, ModelAudit]] = None,
+            signals: t.Optional[t.Dict[str, signal]] = None,
+        ):
             self._loader = loader
             self.config_path = config_path
             self._model_cache = ModelCache(self.config_path / c.CACHE)
+            self._dependency_cache: FileCache[t.Dict[str, str]] = FileCache(
+                self.config_path / c.CACHE, prefix="model_dependencies"
+            )
+            self._jinja_macros = jinja_macros or JinjaMacroRegistry()
+            self._audits = audits or {}
+            self._variables = get_variables()
+            self._file_hashes: t.Dict[Path, str] = {}
+            # Adding or removing a definition can change how references are resolved, e.g. when a
+            # user macro shadows a built-in one, so the names of all definitions are part of the key.
+            self._definitions_hash = md5(
+                sorted(f"macro:{name}" for name in macros or {})
+                + sorted(f"jinja:{name}" for name in self._jinja_macros.root_macros)
+                + sorted(f"audit:{name}" for name in self._audits)
+                + sorted(f"signal:{name}" for name in signals or {})
+            )
 
         def get_or_load_models(
             self, target_path: Path, loader: t.Callable[[], t.List[Model]]
         ) -> t.List[Model]:
-            models = self._model_cache.get_or_load(
-                self._cache_entry_name(target_path),
-                self._model_cache_entry_id(target_path),
-                loader=loader,
-            )
+            models = self.get(target_path)
+            if not models:
+                models = loader()
+                self.put(models, target_path)
 
             for model in models:
                 model._path = target_path
@@ -897,16 +901,31 @@ class SqlMeshLoader(Loader):
             return models
 
         def put(self, models: t.List[Model], path: Path) -> bool:
-            return self._model_cache.put(
-                models,
-                self._cache_entry_name(path),
-                self._model_cache_entry_id(path),
-            )
+            if not models:
+                return False
+
+            dependencies = self._model_dependencies(models)
+            entry_name = self._cache_entry_name(path)
+            entry_id = self._model_cache_entry_id(path)
+            if not self._model_cache.put(
+                models, entry_name, self._with_dependencies_hash(entry_id, dependencies)
+            ):
+                return False
+
+            # Dependencies are stored last so that they never point to a missing entry
+            self._dependency_cache.put(entry_name, entry_id, value=dependencies)
+            return True
 
         def get(self, path: Path) -> t.List[Model]:
+            entry_name = self._cache_entry_name(path)
+            entry_id = self._model_cache_entry_id(path)
+
+            dependencies = self._dependency_cache.get(entry_name, entry_id)
+            if dependencies is None or self._current_dependencies(dependencies) != dependencies:
+                return []
+
             models = self._model_cache.get(
-                self._cache_entry_name(path),
-                self._model_cache_entry_id(path),
+                entry_name, self._with_dependencies_hash(entry_id, dependencies)
             )
 
             for model in models:
@@ -920,18 +939,11 @@ class SqlMeshLoader(Loader):
             )
 
         def _model_cache_entry_id(self, model_path: Path) -> str:
-            mtimes = [
-                self._loader._path_mtimes[model_path],
-                self._loader._macros_max_mtime,
-                self._loader._signals_max_mtime,
-                self._loader._audits_max_mtime,
-                self._loader._config_mtimes.get(self.config_path),
-                self._loader._config_mtimes.get(c.SQLMESH_PATH),
-            ]
             return "__".join(
                 [
-                    str(max(m for m in mtimes if m is not None)),
-                    self._loader.config.fingerprint,
+                    self._file_hash(model_path),
+                    self._definitions_hash,
+                    self._config_fingerprint,
                     # default catalog can change outside sqlmesh (e.g., DB user's
                     # default catalog), and it is retained in cached model's fully
                     # qualified name
@@ -942,3 +954,86 @@ class SqlMeshLoader(Loader):
                     self._loader.context.gateway or self._loader.config.default_gateway_name,
                 ]
             )
+
+        @cached_property
+        def _config_fingerprint(self) -> str:
+            # Variables are tracked per model, so changing one doesn't invalidate every entry
+            config = self._loader.config.dict(
+                exclude={
+                    "loader": True,
+                    "notification_targets": True,
+                    "variables": True,
+                    "gateways": {"__all__": {"variables"}},
+                }
+            )
+            return str(zlib.crc32(pickle.dumps(config)))
+
+        def _with_dependencies_hash(self, entry_id: str, dependencies: t.Dict[str, str]) -> str:
+            return "__".join([entry_id, md5(f"{k}={v}" for k, v in sorted(dependencies.items()))])
+
+        def _model_dependencies(self, models: t.List[Model]) -> t.Dict[str, str]:
+            """Returns the content hashes of all definitions referenced by the given models."""
+            dependencies: t.Dict[str, str] = {}
+            for model in models:
+                jinja_registries = [model.jinja_macros]
+                for audit_name, audit in model.audit_definitions.items():
+                    jinja_registries.append(audit.jinja_macros)
+                    if audit_name in self._audits:
+                        dependencies[f"audit:{audit_name}"] = ""
+
+                for name in itertools.chain.from_iterable(
+                    registry.root_macros for registry in jinja_registries
+                ):
+                    dependencies[f"jinja:{name}"] = ""
+
+                for executable in model.python_env.values():
+                    if executable.path is not None:
+                        dependencies[f"file:{executable.path}"] = ""
+
+                used_variables = _used_variables(model)
+                for variable in self._variables if used_variables is None else used_variables:
+                    dependencies[f"var:{variable}"] = ""
+
+            return self._current_dependencies(dependencies)
+
+        def _current_dependencies(self, dependencies: t.Dict[str, str]) -> t.Dict[str, str]:
+            """Returns the current content hashes of the given dependencies."""
+            current = {}
+            for dependency in dependencies:
+                kind, _, name = dependency.partition(":")
+                if kind == "file":
+                    current[dependency] = self._file_hash(self.config_path / name)
+                elif kind == "jinja":
+                    macro_info = self._jinja_macros.root_macros.get(name)
+                    current[dependency] = md5([macro_info.definition if macro_info else None])
+                elif kind == "audit":
+                    audit = self._audits.get(name)
+                    current[dependency] = (
+                        self._file_hash(audit._path) if audit and audit._path else ""
+                    )
+                elif kind == "var":
+                    current[dependency] = md5([repr(self._variables.get(name))])
+            return current
+
+        def _file_hash(self, path: Path) -> str:
+            if path not in self._file_hashes:
+                try:
+                    content = path.read_bytes()
+                except OSError:
+                    content = b""
+                self._file_hashes[path] = hashlib.md5(content).hexdigest()
+            return self._file_hashes[path]
+
+
+def _used_variables(model: Model) -> t.Optional[t.Set[str]]:
+    """Returns the names of the variables that are captured in the model's python environment.
+
+    Returns None if the names can't be determined.
+    """
+    executable = model.python_env.get(c.SQLMESH_VARS)
+    if executable is None:
+        return set()
+    try:
+        return set(ast.literal_eval(executable.payload))
+    except (ValueError, SyntaxError):
+        return None
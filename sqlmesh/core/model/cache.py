@@ -57,19 +57,13 @@ class ModelCache:
 
         models = loader()
         if isinstance(models, list) and isinstance(seq_get(models, 0), (SqlModel, ExternalModel)):
-            # make sure we preload full_depends_on
-            for model in models:
-                model.full_depends_on
-
+            _preload(models)
             self._file_cache.put(name, entry_id, value=models)
         return models
 
     def put(self, models: t.List[Model], name: str, entry_id: str = "") -> bool:
         if models and isinstance(seq_get(models, 0), (SqlModel, ExternalModel)):
-            # make sure we preload full_depends_on
-            for model in models:
-                model.full_depends_on
-
+            _preload(models)
             self._file_cache.put(name, entry_id, value=models)
             return True
 
@@ -128,6 +122,14 @@ class OptimizedQueryCache:
         self._put(name, model)
         return False
 
+    def exists_many(self, names: t.Iterable[str]) -> t.Set[str]:
+        """Returns the subset of the given entry names that exist in the cache.
+
+        Args:
+            names: The cache entry names of models.
+        """
+        return {name for name, _ in self._file_cache.exists_many((name, "") for name in names)}
+
     def put(self, model: Model) -> t.Optional[str]:
         if not isinstance(model, SqlModel):
             return None
@@ -152,7 +154,7 @@ class OptimizedQueryCache:
     @staticmethod
     def _entry_name(model: SqlModel) -> str:
         hash_data = _mapping_schema_hash_data(model.mapping_schema)
-        hash_data.append(gen(model.query, comments=True))
+        hash_data.append(model._query_gen_with_comments)
         hash_data.append(str([gen(d) for d in model.macro_definitions]))
         hash_data.append(str([(k, v) for k, v in model.sorted_python_env]))
         hash_data.extend(model.jinja_macros.data_hash_values)
@@ -200,10 +202,7 @@ def load_optimized_query_and_mapping(
 ) -> t.Tuple[str, t.Optional[str], str, str, t.Dict]:
     assert _optimized_query_cache
 
-    schema = MappingSchema(normalize=False)
-    for parent, columns_to_types in mapping.items():
-        schema.add_table(parent, columns_to_types, dialect=model.dialect)
-    model.update_schema(schema)
+    update_model_schema(model, mapping)
 
     if isinstance(model, SqlModel):
         entry_name = _optimized_query_cache._entry_name(model)
@@ -220,6 +219,19 @@ def load_optimized_query_and_mapping(
     )
 
 
+def update_model_schema(model: Model, mapping: t.Dict) -> None:
+    """Updates the model's mapping schema with the columns of its parents.
+
+    Args:
+        model: The target model.
+        mapping: The mapping from parent names to their columns.
+    """
+    schema = MappingSchema(normalize=False)
+    for parent, columns_to_types in mapping.items():
+        schema.add_table(parent, columns_to_types, dialect=model.dialect)
+    model.update_schema(schema)
+
+
 def _mapping_schema_hash_data(schema: t.Dict[str, t.Any]) -> t.List[str]:
     keys = sorted(schema) if all(isinstance(v, dict) for v in schema.values()) else schema
 
@@ -232,3 +244,14 @@ def _mapping_schema_hash_data(schema: t.Dict[str, t.Any]) -> t.List[str]:
             data.append(str(schema[k]))
 
     return data
+
+
+def _preload(models: t.List[Model]) -> None:
+    for model in models:
+        # make sure we preload full_depends_on
+        model.full_depends_on
+        if isinstance(model, SqlModel):
+            # Cached models are restored without decoding their query, as long as the canonical query strings
+            # used by their hashes and cache keys are stored with them
+            model._query_gen
+            model._query_gen_with_comments
@@ -43,13 +43,13 @@ from sqlmesh.core.model.kind import (
 from sqlmesh.core.model.seed import CsvSeedReader, Seed, create_seed
 from sqlmesh.core.renderer import ExpressionRenderer, QueryRenderer
 from sqlmesh.core.signal import SignalRegistry
-from sqlmesh.utils import columns_to_types_all_known, str_to_bool, UniqueKeyDict
+from sqlmesh.utils import columns_to_types_all_known, serialization, str_to_bool, UniqueKeyDict
 from sqlmesh.utils.cron import CroniterCache
 from sqlmesh.utils.date import TimeLike, make_inclusive, to_datetime, to_time_column
 from sqlmesh.utils.errors import ConfigError, SQLMeshError, raise_config_error, PythonModelEvalError
 from sqlmesh.utils.hashing import hash_data
 from sqlmesh.utils.jinja import JinjaMacroRegistry, extract_macro_references_and_variables
-from sqlmesh.utils.pydantic import PydanticModel, PRIVATE_FIELDS
+from sqlmesh.utils.pydantic import PydanticModel, PRIVATE_FIELDS, model_serializer
 from sqlmesh.utils.metaprogramming import (
     Executable,
     SqlValue,
@@ -74,6 +74,9 @@ logger = logging.getLogger(__name__)
 
 PROPERTIES = {"physical_properties", "session_properties", "virtual_properties"}
 
+# The key under which a model restored from a pickle keeps its encoded query until the query is accessed
+_ENCODED_QUERY = "_encoded_query"
+
 RUNTIME_RENDERED_MODEL_FIELDS = {
     "audits",
     "signals",
@@ -1165,6 +1168,9 @@ class _Model(ModelMeta, frozen=True):
         for statement in self.on_virtual_update:
             additional_metadata.append(gen(statement))
 
+        if self.concurrency_group:
+            additional_metadata.append(f"concurrency_group:{self.concurrency_group}")
+
         return additional_metadata
 
     def _is_metadata_statement(self, statement: exp.Expression) -> bool:
@@ -1273,15 +1279,60 @@ class SqlModel(_Model):
         # query renderer is very expensive to serialize
         state["__dict__"].pop("_query_renderer", None)
         state["__dict__"].pop("column_descriptions", None)
+        # The restored model only decodes its query when the query is accessed. The canonical query strings are
+        # only stored if they have already been computed, in which case hashes and cache keys can be computed
+        # without decoding the query.
+        query = state["__dict__"].get("query")
+        if query is not None:
+            try:
+                state["__dict__"][_ENCODED_QUERY] = serialization.dump_expression(query)
+                del state["__dict__"]["query"]
+            except RecursionError:
+                pass
         private = state[PRIVATE_FIELDS]
         private["_columns_to_types"] = None
         return state
 
+    if not t.TYPE_CHECKING:
+
+        def __getattr__(self, item: str) -> t.Any:
+            if item == "query":
+                encoded_query = self.__dict__.get(_ENCODED_QUERY)
+                if encoded_query is not None:
+                    query = self.__dict__.setdefault(
+                        "query", serialization.load_expression(*encoded_query)
+                    )
+                    self.__dict__.pop(_ENCODED_QUERY, None)
+                    return query
+                if "query" in self.__dict__:
+                    # The query was decoded concurrently
+                    return self.__dict__["query"]
+            return super().__getattr__(item)
+
+    def __eq__(self, other: t.Any) -> bool:
+        if isinstance(other, SqlModel):
+            self._ensure_query()
+            other._ensure_query()
+        return super().__eq__(other)
+
+    def __hash__(self) -> int:
+        self._ensure_query()
+        return super().__hash__()
+
+    @model_serializer(mode="wrap")
+    def _ensure_query_serializer(self, handler: t.Callable[[t.Any], t.Any]) -> t.Any:
+        self._ensure_query()
+        return handler(self)
+
     def copy(self, **kwargs: t.Any) -> Self:
         model = super().copy(**kwargs)
         model.__dict__.pop("_query_renderer", None)
         model.__dict__.pop("column_descriptions", None)
         model._columns_to_types = None
+        if "query" in kwargs.get("update", {}):
+            model.__dict__.pop(_ENCODED_QUERY, None)
+            model.__dict__.pop("_query_gen", None)
+            model.__dict__.pop("_query_gen_with_comments", None)
         if kwargs.get("update", {}).keys() & {"depends_on_", "query"}:
             model._full_depends_on = None
         return model
@@ -1492,7 +1543,8 @@ class SqlModel(_Model):
     def _query_renderer(self) -> QueryRenderer:
         no_quote_identifiers = self.kind.is_view and self.dialect in ("trino", "spark")
         return QueryRenderer(
-            self.query,
+            # Don't decode the query of a restored model unless the renderer has no cached result
+            self.query if "query" in self.__dict__ else lambda: self.query,
             self.dialect,
             self.macro_definitions,
             schema=self.mapping_schema,
@@ -1517,7 +1569,18 @@ class SqlModel(_Model):
 
     @property
     def _additional_metadata(self) -> t.List[str]:
-        return [*super()._additional_metadata, gen(self.query)]
+        return [*super()._additional_metadata, self._query_gen]
+
+    @cached_property
+    def _query_gen(self) -> str:
+        return gen(self.query)
+
+    @cached_property
+    def _query_gen_with_comments(self) -> str:
+        return gen(self.query, comments=True)
+
+    def _ensure_query(self) -> None:
+        self.query
 
     @property
     def violated_rules_for_query(self) -> t.Dict[type[Rule], t.Any]:
@@ -78,6 +78,7 @@ class ModelMeta(_Node):
     enabled: bool = True
     physical_version: t.Optional[str] = None
     gateway: t.Optional[str] = None
+    concurrency_group: t.Optional[str] = None
     optimize_query: t.Optional[bool] = None
     ignored_rules_: t.Optional[t.Set[str]] = Field(
         default=None, exclude=True, alias="ignored_rules"
@@ -180,6 +181,12 @@ class ModelMeta(_Node):
         gateway = str_or_exp_to_str(v)
         return gateway and gateway.lower()
 
+    @field_validator("concurrency_group", mode="before")
+    def _concurrency_group_validator(cls, v: t.Any) -> t.Optional[str]:
+        if v is None:
+            return None
+        return str_or_exp_to_str(v)
+
     @field_validator("partitioned_by_", "clustered_by", mode="before")
     def _partition_and_cluster_validator(
         cls, v: t.Any, info: ValidationInfo
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import typing as t
+from collections import defaultdict, deque
 from concurrent.futures import as_completed
 from pathlib import Path
 
@@ -11,8 +12,10 @@ from sqlmesh.core import constants as c
 from sqlmesh.core.model.cache import (
     load_optimized_query_and_mapping,
     optimized_query_cache_pool,
+    update_model_schema,
     OptimizedQueryCache,
 )
+from sqlmesh.core.model.definition import SqlModel
 
 if t.TYPE_CHECKING:
     from sqlmesh.core.model.definition import Model
@@ -53,36 +56,67 @@ def _update_model_schemas(
     optimized_query_cache: OptimizedQueryCache,
 ) -> None:
     futures = set()
-    graph = {
-        model: {dep for dep in deps if dep in models}
-        for model, deps in dag._dag.items()
-        if model in models
-    }
-
-    def process_models(completed_model: t.Optional[Model] = None) -> None:
-        for name in list(graph):
-            deps = graph[name]
-
-            if completed_model:
-                deps.discard(completed_model.fqn)
-
-            if not deps:
-                del graph[name]
-                model = models[name]
-                futures.add(
-                    executor.submit(
-                        load_optimized_query_and_mapping,
-                        model,
-                        mapping={
-                            parent: models[parent].columns_to_types
-                            for parent in model.depends_on
-                            if parent in models
-                        },
+    children: t.Dict[str, t.List[str]] = defaultdict(list)
+    indegree: t.Dict[str, int] = {}
+    for name, deps in dag._dag.items():
+        if name not in models:
+            continue
+        indegree[name] = 0
+        for dep in deps:
+            if dep in models:
+                children[dep].append(name)
+                indegree[name] += 1
+
+    ready = deque(name for name, degree in indegree.items() if not degree)
+
+    def complete_model(model: Model) -> None:
+        _update_schema_with_model(schema, model)
+        for child in children.get(model.fqn, []):
+            indegree[child] -= 1
+            if not indegree[child]:
+                ready.append(child)
+
+    def process_models() -> None:
+        while ready:
+            batch = [models[ready.popleft()] for _ in range(len(ready))]
+            mappings = {
+                model.fqn: {
+                    parent: models[parent].columns_to_types
+                    for parent in model.depends_on
+                    if parent in models
+                }
+                for model in batch
+            }
+
+            # Models whose optimized query is already cached are updated in place, so that they don't have
+            # to be sent to a worker
+            entry_names = {}
+            for model in batch:
+                if isinstance(model, SqlModel):
+                    update_model_schema(model, mappings[model.fqn])
+                    entry_names[model.fqn] = optimized_query_cache._entry_name(model)
+            cached_entry_names = optimized_query_cache.exists_many(entry_names.values())
+
+            for model in batch:
+                entry_name = entry_names.get(model.fqn)
+                if entry_name in cached_entry_names and optimized_query_cache.with_optimized_query(
+                    model, entry_name
+                ):
+                    complete_model(model)
+                else:
+                    futures.add(
+                        executor.submit(
+                            load_optimized_query_and_mapping,
+                            model,
+                            mapping=mappings[model.fqn],
+                        )
                     )
-                )
 
     with optimized_query_cache_pool(optimized_query_cache) as executor:
-        process_models()
+        try:
+            process_models()
+        except Exception as ex:
+            raise SchemaError(f"Failed to update model schemas\n\n{ex}")
 
         while futures:
             for future in as_completed(futures):
@@ -95,7 +129,7 @@ def _update_model_schemas(
                     if model.mapping_schema != mapping_schema:
                         model.set_mapping_schema(mapping_schema)
                     optimized_query_cache.with_optimized_query(model, entry_name)
-                    _update_schema_with_model(schema, model)
-                    process_models(completed_model=model)
+                    complete_model(model)
+                    process_models()
                 except Exception as ex:
                     raise SchemaError(f"Failed to update model schemas\n\n{ex}")
@@ -9,7 +9,7 @@ from pathlib import Path
 from pydantic import Field
 from sqlglot import exp
 
-from sqlmesh.utils.cron import CroniterCache
+from sqlmesh.utils.cron import CroniterCache, cron_floor, cron_next, cron_prev
 from sqlmesh.utils.date import TimeLike, to_datetime, validate_date_range
 from sqlmesh.utils.errors import ConfigError
 from sqlmesh.utils.pydantic import (
@@ -111,7 +111,7 @@ class IntervalUnit(str, Enum):
         Returns:
             The timestamp for the next run.
         """
-        return self.croniter(value).get_next(estimate=estimate)
+        return cron_next(self.cron_expr, to_datetime(value), estimate=estimate)
 
     def cron_prev(self, value: TimeLike, estimate: bool = False) -> datetime:
         """
@@ -124,7 +124,7 @@ class IntervalUnit(str, Enum):
         Returns:
             The timestamp for the previous run.
         """
-        return self.croniter(value).get_prev(estimate=estimate)
+        return cron_prev(self.cron_expr, to_datetime(value), estimate=estimate)
 
     def cron_floor(self, value: TimeLike, estimate: bool = False) -> datetime:
         """
@@ -137,9 +137,7 @@ class IntervalUnit(str, Enum):
         Returns:
             The timestamp floor.
         """
-        croniter = self.croniter(value)
-        croniter.get_next(estimate=estimate)
-        return croniter.get_prev(estimate=True)
+        return cron_floor(self.cron_expr, to_datetime(value), estimate=estimate)
 
     @property
     def seconds(self) -> int:
@@ -357,7 +355,9 @@ class _Node(PydanticModel):
         Returns:
             The timestamp for the next run.
         """
-        return self.croniter(value).get_next(estimate=estimate)
+        return cron_next(
+            self.cron, to_datetime(value, tz=self.cron_tz), tz=self.cron_tz, estimate=estimate
+        )
 
     def cron_prev(self, value: TimeLike, estimate: bool = False) -> datetime:
         """
@@ -370,7 +370,9 @@ class _Node(PydanticModel):
         Returns:
             The timestamp for the previous run.
         """
-        return self.croniter(value).get_prev(estimate=estimate)
+        return cron_prev(
+            self.cron, to_datetime(value, tz=self.cron_tz), tz=self.cron_tz, estimate=estimate
+        )
 
     def cron_floor(self, value: TimeLike, estimate: bool = False) -> datetime:
         """
@@ -383,7 +385,9 @@ class _Node(PydanticModel):
         Returns:
             The timestamp floor.
         """
-        return self.croniter(self.cron_next(value, estimate=estimate)).get_prev(estimate=True)
+        return cron_floor(
+            self.cron, to_datetime(value, tz=self.cron_tz), tz=self.cron_tz, estimate=estimate
+        )
 
     def text_diff(self, other: Node, rendered: bool = False) -> str:
         """Produce a text diff against another node.
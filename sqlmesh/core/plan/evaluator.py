@@ -493,7 +493,8 @@ class BuiltInPlanEvaluator(PlanEvaluator):
 
         snapshots_to_restate: t.Dict[SnapshotId, t.Tuple[SnapshotTableInfo, Interval]] = {}
 
-        for env in self.state_sync.get_environments():
+        # Only environments that contain one of the restated snapshots can be affected
+        for env in self.state_sync.get_environments(snapshot_names=prod_restatements):
             keyed_snapshots = {s.name: s.table_info for s in env.snapshots}
 
             # We dont just restate matching snapshots, we also have to restate anything downstream of them
@@ -40,7 +40,7 @@ logger = logging.getLogger(__name__)
 class BaseExpressionRenderer:
     def __init__(
         self,
-        expression: exp.Expression,
+        expression: t.Union[exp.Expression, t.Callable[[], exp.Expression]],
         dialect: DialectType,
         macro_definitions: t.List[d.MacroDef],
         path: Path = Path(),
@@ -54,7 +54,12 @@ class BaseExpressionRenderer:
         normalize_identifiers: bool = True,
         optimize_query: t.Optional[bool] = True,
     ):
-        self._expression = expression
+        if isinstance(expression, exp.Expression):
+            self.__expression: t.Optional[exp.Expression] = expression
+            self.__expression_factory: t.Optional[t.Callable[[], exp.Expression]] = None
+        else:
+            self.__expression = None
+            self.__expression_factory = expression
         self._dialect = dialect
         self._macro_definitions = macro_definitions
         self._path = path
@@ -69,6 +74,15 @@ class BaseExpressionRenderer:
         self._model_fqn = model_fqn
         self._optimize_query_flag = optimize_query is not False
 
+    @property
+    def _expression(self) -> exp.Expression:
+        """The expression to render. If a factory was provided, it's only invoked on a cache miss."""
+        if self.__expression is None:
+            assert self.__expression_factory is not None
+            self.__expression = self.__expression_factory()
+            self.__expression_factory = None
+        return self.__expression
+
     def update_schema(self, schema: t.Dict[str, t.Any]) -> None:
         self.schema = d.normalize_mapping_schema(schema, dialect=self._dialect)
 
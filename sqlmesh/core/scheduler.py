@@ -24,6 +24,7 @@ from sqlmesh.core.snapshot import (
     snapshots_to_dag,
     Intervals,
 )
+from sqlmesh.core.snapshot.cache import EvaluationDurationCache
 from sqlmesh.core.snapshot.definition import (
     Interval,
     expand_range,
@@ -31,7 +32,12 @@ from sqlmesh.core.snapshot.definition import (
 )
 from sqlmesh.core.state_sync import StateSync
 from sqlmesh.utils import CompletionStatus
-from sqlmesh.utils.concurrency import concurrent_apply_to_dag, NodeExecutionFailedError
+from sqlmesh.utils import intervals as vectorized_intervals
+from sqlmesh.utils.concurrency import (
+    concurrent_apply_to_dag,
+    critical_path_priorities,
+    NodeExecutionFailedError,
+)
 from sqlmesh.utils.dag import DAG
 from sqlmesh.utils.date import (
     TimeLike,
@@ -61,8 +67,16 @@ class Scheduler:
         snapshots: A collection of snapshots.
         snapshot_evaluator: The snapshot evaluator to execute queries.
         state_sync: The state sync to pull saved snapshots.
-        max_workers: The maximum number of parallel queries to run.
+        max_workers: The maximum number of parallel queries to run. When `max_workers_per_gateway` is provided,
+            this only limits the queries against the default gateway.
         console: The rich instance used for printing scheduling information.
+        evaluation_duration_cache: If provided, historical evaluation durations are used to prioritize
+            scheduling units that lie on the longest (critical) path of the DAG, and newly observed
+            durations are recorded into it.
+        max_workers_per_gateway: The maximum number of parallel queries to run per non-default gateway. Idle
+            capacity of one gateway is never blocked by a saturated gateway.
+        concurrency_group_limits: The maximum number of parallel evaluations for models that belong to the given
+            concurrency group.
     """
 
     def __init__(
@@ -74,6 +88,9 @@ class Scheduler:
         max_workers: int = 1,
         console: t.Optional[Console] = None,
         notification_target_manager: t.Optional[NotificationTargetManager] = None,
+        evaluation_duration_cache: t.Optional[EvaluationDurationCache] = None,
+        max_workers_per_gateway: t.Optional[t.Dict[str, int]] = None,
+        concurrency_group_limits: t.Optional[t.Dict[str, int]] = None,
     ):
         self.state_sync = state_sync
         self.snapshots = {s.snapshot_id: s for s in snapshots}
@@ -86,6 +103,9 @@ class Scheduler:
         self.notification_target_manager = (
             notification_target_manager or NotificationTargetManager()
         )
+        self.evaluation_duration_cache = evaluation_duration_cache
+        self.max_workers_per_gateway = max_workers_per_gateway or {}
+        self.concurrency_group_limits = concurrency_group_limits or {}
 
     def merged_missing_intervals(
         self,
@@ -427,6 +447,10 @@ class Scheduler:
                     )
 
                 evaluation_duration_ms = now_timestamp() - execution_start_ts
+                if self.evaluation_duration_cache and not audit_only:
+                    self.evaluation_duration_cache.record(
+                        snapshot, to_timestamp(start), to_timestamp(end), evaluation_duration_ms
+                    )
             finally:
                 num_audits = len(audit_results)
                 num_audits_failed = sum(1 for result in audit_results if result.count)
@@ -439,13 +463,19 @@ class Scheduler:
                     num_audits_failed,
                 )
 
+        node_resources, resource_limits, tasks_num = self._node_resources(dag)
+        node_priorities = self._node_priorities(dag, tasks_num)
+
         try:
             with self.snapshot_evaluator.concurrent_context():
                 return concurrent_apply_to_dag(
                     dag,
                     evaluate_node,
-                    self.max_workers,
+                    tasks_num,
                     raise_on_error=False,
+                    node_priorities=node_priorities,
+                    node_resources=node_resources,
+                    resource_limits=resource_limits,
                 )
         finally:
             if run_environment_statements:
@@ -461,8 +491,103 @@ class Scheduler:
                     execution_time=execution_time,
                 )
 
+            if self.evaluation_duration_cache:
+                self.evaluation_duration_cache.save()
+
             self.state_sync.recycle()
 
+    def _node_resources(
+        self, dag: DAG[SchedulingUnit]
+    ) -> t.Tuple[
+        t.Optional[t.Dict[SchedulingUnit, t.Collection[t.Hashable]]],
+        t.Optional[t.Dict[t.Hashable, int]],
+        int,
+    ]:
+        """Assigns each scheduling unit to its gateway and concurrency group slots.
+
+        Args:
+            dag: The DAG of scheduling units.
+
+        Returns:
+            A tuple of resources used by each scheduling unit, the limits for each resource and the total
+            number of concurrent tasks.
+        """
+        if not self.max_workers_per_gateway and not self.concurrency_group_limits:
+            return None, None, self.max_workers
+
+        node_resources: t.Dict[SchedulingUnit, t.Collection[t.Hashable]] = {}
+        resource_limits: t.Dict[t.Hashable, int] = {}
+        tasks_num = self.max_workers if not self.max_workers_per_gateway else 0
+
+        for node in dag:
+            snapshot_name, (_, batch_idx) = node
+            if batch_idx == -1:
+                continue
+            snapshot = self.snapshots_by_name[snapshot_name]
+            resources: t.List[t.Hashable] = []
+
+            if self.max_workers_per_gateway:
+                # Snapshots of all gateways without a dedicated limit share the default gateway's slots
+                gateway = snapshot.model_gateway
+                gateway_limit = self.max_workers
+                if gateway and gateway in self.max_workers_per_gateway:
+                    gateway_limit = self.max_workers_per_gateway[gateway]
+                else:
+                    gateway = None
+
+                gateway_key = ("gateway", gateway)
+                if gateway_key not in resource_limits:
+                    resource_limits[gateway_key] = gateway_limit
+                    tasks_num += gateway_limit
+                resources.append(gateway_key)
+
+            concurrency_group = snapshot.model.concurrency_group if snapshot.is_model else None
+            if concurrency_group and concurrency_group in self.concurrency_group_limits:
+                group_key = ("concurrency_group", concurrency_group)
+                resource_limits[group_key] = self.concurrency_group_limits[concurrency_group]
+                resources.append(group_key)
+
+            node_resources[node] = resources
+
+        return node_resources, resource_limits, max(tasks_num, 1)
+
+    def _node_priorities(
+        self, dag: DAG[SchedulingUnit], tasks_num: int
+    ) -> t.Optional[t.Dict[SchedulingUnit, float]]:
+        """Weights each scheduling unit by the expected duration of the longest path starting at it.
+
+        Args:
+            dag: The DAG of scheduling units.
+            tasks_num: The number of concurrent tasks used to evaluate the DAG.
+
+        Returns:
+            The priority of each scheduling unit or None if there is no duration history available.
+        """
+        if not self.evaluation_duration_cache or tasks_num <= 1:
+            return None
+
+        estimates: t.Dict[SchedulingUnit, t.Optional[float]] = {}
+        for node in dag:
+            snapshot_name, ((start, end), batch_idx) = node
+            if batch_idx == -1:
+                estimates[node] = 0.0
+                continue
+            estimates[node] = self.evaluation_duration_cache.estimate(
+                self.snapshots_by_name[snapshot_name], start, end
+            )
+
+        known_estimates = [e for e in estimates.values() if e]
+        if not known_estimates:
+            return None
+
+        # Units without any history are assumed to take an average amount of time.
+        default_estimate = sum(known_estimates) / len(known_estimates)
+        weights = {
+            node: default_estimate if estimate is None else estimate
+            for node, estimate in estimates.items()
+        }
+        return critical_path_priorities(dag, weights.__getitem__)
+
     def _dag(self, batches: SnapshotToIntervals) -> DAG[SchedulingUnit]:
         """Builds a DAG of snapshot intervals to be evaluated.
 
@@ -864,4 +989,4 @@ def _expand_range_as_interval(
     start_ts: int, end_ts: int, interval_unit: IntervalUnit
 ) -> t.List[Interval]:
     values = expand_range(start_ts, end_ts, interval_unit)
-    return [(values[i], values[i + 1]) for i in range(len(values) - 1)]
+    return vectorized_intervals.from_arrays(values[:-1], values[1:])
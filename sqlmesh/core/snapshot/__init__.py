@@ -7,10 +7,12 @@ from sqlmesh.core.snapshot.definition import (
     SnapshotChangeCategory as SnapshotChangeCategory,
     SnapshotDataVersion as SnapshotDataVersion,
     SnapshotFingerprint as SnapshotFingerprint,
+    SnapshotHeader as SnapshotHeader,
     SnapshotId as SnapshotId,
     SnapshotIdLike as SnapshotIdLike,
     SnapshotInfoLike as SnapshotInfoLike,
     SnapshotIntervals as SnapshotIntervals,
+    SnapshotIntervalsBuilder as SnapshotIntervalsBuilder,
     SnapshotNameVersion as SnapshotNameVersion,
     SnapshotNameVersionLike as SnapshotNameVersionLike,
     SnapshotTableCleanupTask as SnapshotTableCleanupTask,
@@ -4,6 +4,7 @@ import logging
 import typing as t
 
 from pathlib import Path
+from threading import Lock
 from sqlmesh.core.model.cache import (
     OptimizedQueryCache,
     optimized_query_cache_pool,
@@ -41,9 +42,11 @@ class SnapshotCache:
         snapshots = {}
         cache_hits: t.Set[SnapshotId] = set()
 
-        for s_id in snapshot_ids:
-            snapshot = self._snapshot_cache.get(self._entry_name(s_id))
+        entry_names = {self._entry_name(s_id): s_id for s_id in snapshot_ids}
+        cached_snapshots = self._snapshot_cache.get_many((name, "") for name in entry_names)
+        for (name, _), snapshot in cached_snapshots.items():
             if snapshot:
+                s_id = entry_names[name]
                 snapshot.intervals = []
                 snapshot.dev_intervals = []
                 snapshots[s_id] = snapshot
@@ -61,7 +64,7 @@ class SnapshotCache:
                 (
                     (snapshot.model, s_id)
                     for s_id, snapshot in snapshots.items()
-                    if snapshot.is_model
+                    if snapshot.is_node_parsed and snapshot.is_model
                 ),
             ):
                 if entry_name:
@@ -69,7 +72,17 @@ class SnapshotCache:
                         snapshots[key].model, entry_name
                     )
 
+        cached_entries = self._snapshot_cache.exists_many(
+            (self._entry_name(s_id), "") for s_id in snapshots
+        )
+        entries_to_cache = {}
+
         for snapshot in snapshots.values():
+            if not snapshot.is_node_parsed:
+                # Snapshots read from the state are prepared and cached once their nodes are accessed.
+                snapshot._on_node_parsed = self._on_node_parsed
+                continue
+
             self._update_node_hash_cache(snapshot)
 
             if snapshot.is_model and c.MAX_FORK_WORKERS == 1:
@@ -80,7 +93,15 @@ class SnapshotCache:
                         "Failed to cache optimized query for snapshot %s", snapshot.snapshot_id
                     )
 
-            self.put(snapshot)
+            cache_key = (self._entry_name(snapshot.snapshot_id), "")
+            if cache_key not in cached_entries and self._prepare_for_caching(snapshot):
+                entries_to_cache[cache_key] = snapshot
+
+        if entries_to_cache:
+            try:
+                self._snapshot_cache.put_many(entries_to_cache)
+            except Exception:
+                logger.exception("Failed to cache %s snapshots", len(entries_to_cache))
 
         return snapshots, cache_hits
 
@@ -90,10 +111,10 @@ class SnapshotCache:
         if self._snapshot_cache.exists(entry_name):
             return
 
+        if not self._prepare_for_caching(snapshot):
+            return
+
         try:
-            if snapshot.is_model:
-                # make sure we preload full_depends_on
-                snapshot.model.full_depends_on
             self._snapshot_cache.put(entry_name, value=snapshot)
         except Exception:
             logger.exception("Failed to cache snapshot %s", snapshot.snapshot_id)
@@ -101,6 +122,30 @@ class SnapshotCache:
     def clear(self) -> None:
         self._snapshot_cache.clear()
 
+    def _on_node_parsed(self, snapshot: Snapshot) -> None:
+        self._update_node_hash_cache(snapshot)
+
+        if snapshot.is_model:
+            try:
+                self._optimized_query_cache.with_optimized_query(snapshot.model)
+            except Exception:
+                logger.exception(
+                    "Failed to cache optimized query for snapshot %s", snapshot.snapshot_id
+                )
+
+        self.put(snapshot)
+
+    @staticmethod
+    def _prepare_for_caching(snapshot: Snapshot) -> bool:
+        try:
+            if snapshot.is_model:
+                # make sure we preload full_depends_on
+                snapshot.model.full_depends_on
+        except Exception:
+            logger.exception("Failed to cache snapshot %s", snapshot.snapshot_id)
+            return False
+        return True
+
     @staticmethod
     def _entry_name(snapshot_id: SnapshotId) -> str:
         return f"{snapshot_id.name}_{snapshot_id.identifier}"
@@ -109,3 +154,83 @@ class SnapshotCache:
     def _update_node_hash_cache(snapshot: Snapshot) -> None:
         snapshot.node._data_hash = snapshot.fingerprint.data_hash
         snapshot.node._metadata_hash = snapshot.fingerprint.metadata_hash
+
+
+class EvaluationDurationCache:
+    """File-based cache of historical evaluation durations used to prioritize the evaluation of snapshots.
+
+    Durations are tracked per model name rather than per snapshot so that the history survives model changes.
+    They are normalized to a single interval, which makes them comparable between runs with different batch sizes.
+
+    Args:
+        path: The path to the cache folder.
+    """
+
+    _ENTRY_NAME = "durations"
+    # The weight of the latest observation in the exponential moving average.
+    _SMOOTHING_FACTOR = 0.5
+
+    def __init__(self, path: Path):
+        self._file_cache: FileCache[t.Dict[str, float]] = FileCache(
+            path, prefix="evaluation_duration"
+        )
+        self._durations: t.Dict[str, float] = self._file_cache.get(self._ENTRY_NAME) or {}
+        self._lock = Lock()
+        self._dirty = False
+
+    def estimate(self, snapshot: Snapshot, start: int, end: int) -> t.Optional[float]:
+        """Returns the expected evaluation duration in milliseconds for the given snapshot and interval.
+
+        Args:
+            snapshot: The target snapshot.
+            start: The start of the interval.
+            end: The end of the interval.
+
+        Returns:
+            The expected duration or None if there is no history for this snapshot.
+        """
+        duration_per_interval = self._durations.get(snapshot.name)
+        if duration_per_interval is None:
+            return None
+        return duration_per_interval * self._intervals_num(snapshot, start, end)
+
+    def record(self, snapshot: Snapshot, start: int, end: int, duration_ms: int) -> None:
+        """Records an observed evaluation duration.
+
+        Args:
+            snapshot: The evaluated snapshot.
+            start: The start of the evaluated interval.
+            end: The end of the evaluated interval.
+            duration_ms: The evaluation duration in milliseconds.
+        """
+        duration_per_interval = duration_ms / self._intervals_num(snapshot, start, end)
+        with self._lock:
+            previous = self._durations.get(snapshot.name)
+            if previous is not None:
+                duration_per_interval = (
+                    self._SMOOTHING_FACTOR * duration_per_interval
+                    + (1 - self._SMOOTHING_FACTOR) * previous
+                )
+            self._durations[snapshot.name] = duration_per_interval
+            self._dirty = True
+
+    def save(self) -> None:
+        """Persists the recorded durations if there were any changes."""
+        with self._lock:
+            if not self._dirty:
+                return
+            try:
+                self._file_cache.put(self._ENTRY_NAME, value=dict(self._durations))
+                self._dirty = False
+            except Exception:
+                logger.exception("Failed to cache evaluation durations")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._durations.clear()
+            self._dirty = False
+        self._file_cache.clear()
+
+    @staticmethod
+    def _intervals_num(snapshot: Snapshot, start: int, end: int) -> int:
+        return max(1, (end - start) // snapshot.node.interval_unit.milliseconds)
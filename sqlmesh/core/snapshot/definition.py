@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import bisect
 import sys
 import typing as t
 from collections import defaultdict
@@ -9,7 +10,7 @@ import logging
 from functools import cached_property, lru_cache
 from pathlib import Path
 
-from pydantic import Field
+from pydantic import Field, TypeAdapter
 from sqlglot import exp
 from sqlglot.optimizer.normalize_identifiers import normalize_identifiers
 
@@ -19,7 +20,9 @@ from sqlmesh.core.macros import call_macro
 from sqlmesh.core.model import Model, ModelKindMixin, ModelKindName, ViewKind, CustomKind
 from sqlmesh.core.model.definition import _Model
 from sqlmesh.core.node import IntervalUnit, NodeType
+from sqlmesh.utils import intervals as vectorized_intervals
 from sqlmesh.utils import sanitize_name
+from sqlmesh.utils.cron import cron_ticks
 from sqlmesh.utils.dag import DAG
 from sqlmesh.utils.date import (
     TimeLike,
@@ -46,9 +49,17 @@ from sqlmesh.utils.metaprogramming import (
     Executable,
 )
 from sqlmesh.utils.hashing import hash_data
-from sqlmesh.utils.pydantic import PydanticModel, field_validator
+from sqlmesh.utils.pydantic import (
+    PRIVATE_FIELDS,
+    TRUSTED_CONTEXT_KEY,
+    PydanticModel,
+    ValidationInfo,
+    field_validator,
+    is_trusted,
+)
 
 if t.TYPE_CHECKING:
+    import numpy as np
     from sqlglot.dialects.dialect import DialectType
     from sqlmesh.core.environment import EnvironmentNamingInfo
     from sqlmesh.core.context import ExecutionContext
@@ -58,6 +69,8 @@ Intervals = t.List[Interval]
 
 Node = t.Annotated[t.Union[Model, StandaloneAudit], Field(discriminator="source_type")]
 
+_NODE_ADAPTER: TypeAdapter[Node] = TypeAdapter(Node)
+
 
 logger = logging.getLogger(__name__)
 
@@ -221,6 +234,74 @@ class SnapshotIntervals(PydanticModel):
         setattr(self, interval_attr, target_intervals)
 
 
+class SnapshotIntervalsBuilder:
+    """Accumulates interval additions and removals for a `SnapshotIntervals` instance and applies them in bulk.
+
+    Calling `SnapshotIntervals.add_interval` repeatedly re-merges the whole list of intervals on every call.
+    The builder instead buffers operations in the order they were recorded and resolves each run of consecutive
+    additions with a single merge, which results in exactly the same intervals.
+
+    Args:
+        snapshot_intervals: The target snapshot intervals.
+    """
+
+    def __init__(self, snapshot_intervals: SnapshotIntervals):
+        self.snapshot_intervals = snapshot_intervals
+        # Buffered (is_removal, start, end) operations per interval attribute.
+        self._operations: t.Dict[str, t.List[t.Tuple[bool, int, int]]] = defaultdict(list)
+
+    def add_interval(self, start: int, end: int) -> None:
+        self._operations["intervals"].append((False, start, end))
+
+    def add_dev_interval(self, start: int, end: int) -> None:
+        self._operations["dev_intervals"].append((False, start, end))
+
+    def add_pending_restatement_interval(self, start: int, end: int) -> None:
+        self._operations["pending_restatement_intervals"].append((False, start, end))
+
+    def remove_interval(self, start: int, end: int) -> None:
+        self._operations["intervals"].append((True, start, end))
+
+    def remove_dev_interval(self, start: int, end: int) -> None:
+        self._operations["dev_intervals"].append((True, start, end))
+
+    def remove_pending_restatement_interval(self, start: int, end: int) -> None:
+        self._operations["pending_restatement_intervals"].append((True, start, end))
+
+    def build(self) -> SnapshotIntervals:
+        """Applies all buffered operations and returns the target snapshot intervals."""
+        for interval_attr, operations in self._operations.items():
+            target_intervals: Intervals = getattr(self.snapshot_intervals, interval_attr)
+            target_starts: t.Optional[t.List[int]] = None
+            added: Intervals = []
+
+            for is_removal, start, end in operations:
+                if not is_removal:
+                    added.append((start, end))
+                    continue
+                if added:
+                    target_intervals = merge_intervals([*target_intervals, *added])
+                    target_starts = None
+                    added = []
+
+                # Intervals are sorted and don't overlap, so only the last one that starts before the
+                # removed range ends can intersect with it. Removing a range that doesn't intersect
+                # with any interval is a no-op.
+                if target_starts is None:
+                    target_starts = [interval_start for interval_start, _ in target_intervals]
+                idx = bisect.bisect_left(target_starts, end)
+                if idx and target_intervals[idx - 1][1] > start:
+                    target_intervals = remove_interval(target_intervals, start, end)
+                    target_starts = None
+
+            if added:
+                target_intervals = merge_intervals([*target_intervals, *added])
+            setattr(self.snapshot_intervals, interval_attr, target_intervals)
+
+        self._operations.clear()
+        return self.snapshot_intervals
+
+
 class SnapshotDataVersion(PydanticModel, frozen=True):
     fingerprint: SnapshotFingerprint
     version: str
@@ -545,6 +626,103 @@ class SnapshotTableInfo(PydanticModel, SnapshotInfoMixin, frozen=True):
         return SnapshotNameVersion(name=self.name, version=self.version)
 
 
+class SnapshotHeader(PydanticModel):
+    """The attributes of a snapshot that can be read from the state without fetching and parsing its node.
+
+    Args:
+        name: The snapshot name.
+        identifier: The snapshot identifier.
+        version: The snapshot version, if it has been categorized.
+        dev_version: The snapshot dev version.
+        change_category: The snapshot change category.
+        parents: The parent snapshot IDs.
+        kind_name: The kind name of the snapshot's model, if it's a model snapshot.
+        project: The project the snapshot's node belongs to.
+        interval_unit: The interval unit of the snapshot's node.
+        disable_restatement: Whether restatement is disabled for the snapshot's node.
+        effective_from: The timestamp from which the snapshot should be considered effective.
+        ttl_ms: The time-to-live of the snapshot in milliseconds.
+        updated_ts: Epoch millis timestamp when the snapshot was last updated.
+        unpaused_ts: The timestamp which indicates when the snapshot was unpaused.
+        unrestorable: Whether or not the snapshot can be used to revert its model to a previous version.
+        table_info: The table info of the snapshot, if it has been categorized.
+    """
+
+    name: str
+    identifier: str
+    version: t.Optional[str] = None
+    dev_version: str
+    change_category: t.Optional[SnapshotChangeCategory] = None
+    parents: t.Tuple[SnapshotId, ...] = ()
+    kind_name: t.Optional[ModelKindName] = None
+    project: str = ""
+    interval_unit: IntervalUnit
+    disable_restatement: bool = False
+    effective_from: t.Optional[TimeLike] = None
+    ttl_ms: int = 0
+    updated_ts: int = 0
+    unpaused_ts: t.Optional[int] = None
+    unrestorable: bool = False
+    table_info: t.Optional[SnapshotTableInfo] = None
+
+    @property
+    def snapshot_id(self) -> SnapshotId:
+        return SnapshotId(name=self.name, identifier=self.identifier)
+
+    @property
+    def name_version(self) -> SnapshotNameVersion:
+        return SnapshotNameVersion(name=self.name, version=self.version)
+
+    @property
+    def is_forward_only(self) -> bool:
+        return self.change_category == SnapshotChangeCategory.FORWARD_ONLY
+
+    @property
+    def expiration_ts(self) -> int:
+        return self.updated_ts + self.ttl_ms
+
+    @property
+    def normalized_effective_from_ts(self) -> t.Optional[int]:
+        return (
+            to_timestamp(self.interval_unit.cron_floor(self.effective_from))
+            if self.effective_from
+            else None
+        )
+
+    def set_unpaused_ts(self, unpaused_dt: t.Optional[TimeLike]) -> None:
+        """Sets the timestamp for when this snapshot was unpaused.
+
+        Args:
+            unpaused_dt: The datetime object of when this snapshot was unpaused.
+        """
+        self.unpaused_ts = (
+            to_timestamp(self.interval_unit.cron_floor(unpaused_dt)) if unpaused_dt else None
+        )
+
+    @classmethod
+    def from_snapshot(cls, snapshot: Snapshot) -> SnapshotHeader:
+        return cls(
+            name=snapshot.name,
+            identifier=snapshot.identifier,
+            version=snapshot.version,
+            dev_version=snapshot.dev_version,
+            change_category=snapshot.change_category,
+            parents=snapshot.parents,
+            kind_name=snapshot.model_kind_name,
+            project=snapshot.node.project,
+            interval_unit=snapshot.node.interval_unit,
+            disable_restatement=snapshot.disable_restatement,
+            effective_from=snapshot.effective_from,
+            ttl_ms=snapshot.ttl_ms,
+            updated_ts=snapshot.updated_ts,
+            unpaused_ts=snapshot.unpaused_ts,
+            unrestorable=snapshot.unrestorable,
+            table_info=snapshot.table_info
+            if snapshot.change_category and snapshot.version
+            else None,
+        )
+
+
 class Snapshot(PydanticModel, SnapshotInfoMixin):
     """A snapshot represents a node at a certain point in time.
 
@@ -561,7 +739,8 @@ class Snapshot(PydanticModel, SnapshotInfoMixin):
     Args:
         name: The snapshot name which is the same as the node name and should be unique per node.
         fingerprint: A unique hash of the node definition so that nodes can be reused across environments.
-        node: Node object that the snapshot encapsulates.
+        node: Node object that the snapshot encapsulates. Nodes of trusted snapshots read back from the state
+            are kept in their serialized form and parsed on first access.
         parents: The list of parent snapshots (upstream dependencies).
         intervals: List of [start, end) intervals showing which time ranges a snapshot has data for.
         dev_intervals: List of [start, end) intervals showing development intervals (forward-only).
@@ -586,13 +765,14 @@ class Snapshot(PydanticModel, SnapshotInfoMixin):
     name: str
     fingerprint: SnapshotFingerprint
     physical_schema_: t.Optional[str] = Field(default=None, alias="physical_schema")
-    node: Node
+    node_: t.Any = Field(alias="node")
     parents: t.Tuple[SnapshotId, ...]
     intervals: Intervals = []
     dev_intervals: Intervals = []
     pending_restatement_intervals: Intervals = []
     created_ts: int
-    updated_ts: int
+    # Stored in a separate column of the state and set after the rest of the snapshot has been parsed.
+    updated_ts: int = 0
     ttl: str
     previous_versions: t.Tuple[SnapshotDataVersion, ...] = ()
     version: t.Optional[str] = None
@@ -607,9 +787,14 @@ class Snapshot(PydanticModel, SnapshotInfoMixin):
     next_auto_restatement_ts: t.Optional[int] = None
     dev_table_suffix: str = "dev"
 
+    # Invoked once the serialized node has been parsed on first access.
+    _on_node_parsed: t.Optional[t.Callable[[Snapshot], None]] = None
+
     @field_validator("ttl")
     @classmethod
-    def _time_delta_must_be_positive(cls, v: str) -> str:
+    def _time_delta_must_be_positive(cls, v: str, info: ValidationInfo) -> str:
+        if is_trusted(info):
+            return v
         current_time = now()
         if to_datetime(v, current_time) < current_time:
             raise ValueError(
@@ -617,6 +802,33 @@ class Snapshot(PydanticModel, SnapshotInfoMixin):
             )
         return v
 
+    @field_validator("node_", mode="before")
+    @classmethod
+    def _validate_node(cls, v: t.Any, info: ValidationInfo) -> t.Any:
+        if isinstance(v, dict) and is_trusted(info):
+            return v
+        return _NODE_ADAPTER.validate_python(v, context=info.context)
+
+    @property
+    def node(self) -> Node:
+        if isinstance(self.node_, dict):
+            self.node_ = _NODE_ADAPTER.validate_python(
+                self.node_, context={TRUSTED_CONTEXT_KEY: True}
+            )
+            on_node_parsed, self._on_node_parsed = self._on_node_parsed, None
+            if on_node_parsed:
+                on_node_parsed(self)
+        return self.node_
+
+    @node.setter
+    def node(self, node: Node) -> None:
+        self.node_ = node
+
+    @property
+    def is_node_parsed(self) -> bool:
+        """Whether the node has been parsed from its serialized form."""
+        return not isinstance(self.node_, dict)
+
     @staticmethod
     def hydrate_with_intervals_by_version(
         snapshots: t.Iterable[Snapshot],
@@ -1254,6 +1466,8 @@ class Snapshot(PydanticModel, SnapshotInfoMixin):
 
     @property
     def node_type(self) -> NodeType:
+        if not self.is_node_parsed:
+            return NodeType.AUDIT if self.node_.get("source_type") == "audit" else NodeType.MODEL
         if self.node.is_model:
             return NodeType.MODEL
         if self.node.is_audit:
@@ -1345,6 +1559,7 @@ class Snapshot(PydanticModel, SnapshotInfoMixin):
         # Don't store intervals.
         state["__dict__"]["intervals"] = []
         state["__dict__"]["dev_intervals"] = []
+        state[PRIVATE_FIELDS] = {**state[PRIVATE_FIELDS], "_on_node_parsed": None}
         return state
 
 
@@ -1630,21 +1845,37 @@ def fingerprint_from_node(
             for table in node.depends_on
             if table in nodes
         ]
+        cache[node.fqn] = fingerprint_from_parents(node, parents)
 
-        parent_data_hash = hash_data(sorted(p.to_version() for p in parents))
+    return cache[node.fqn]
 
-        parent_metadata_hash = hash_data(
-            sorted(h for p in parents for h in (p.metadata_hash, p.parent_metadata_hash))
-        )
 
-        cache[node.fqn] = SnapshotFingerprint(
-            data_hash=node.data_hash,
-            metadata_hash=node.metadata_hash,
-            parent_data_hash=parent_data_hash,
-            parent_metadata_hash=parent_metadata_hash,
-        )
+def fingerprint_from_parents(
+    node: Node, parents: t.Iterable[SnapshotFingerprint]
+) -> SnapshotFingerprint:
+    """Generates a fingerprint of the node given the fingerprints of its direct parents.
 
-    return cache[node.fqn]
+    Args:
+        node: Node to fingerprint.
+        parents: The fingerprints of the node's direct parents.
+
+    Returns:
+        The fingerprint.
+    """
+    parents = list(parents)
+
+    parent_data_hash = hash_data(sorted(p.to_version() for p in parents))
+
+    parent_metadata_hash = hash_data(
+        sorted(h for p in parents for h in (p.metadata_hash, p.parent_metadata_hash))
+    )
+
+    return SnapshotFingerprint(
+        data_hash=node.data_hash,
+        metadata_hash=node.metadata_hash,
+        parent_data_hash=parent_data_hash,
+        parent_metadata_hash=parent_metadata_hash,
+    )
 
 
 def _parents_from_node(
@@ -1671,21 +1902,7 @@ def merge_intervals(intervals: t.Collection[Interval]) -> Intervals:
     Returns:
         A new list of sorted and merged intervals.
     """
-    if not intervals:
-        return []
-    intervals = sorted(intervals)
-
-    merged = [intervals[0]]
-
-    for interval in intervals[1:]:
-        current = merged[-1]
-
-        if interval[0] <= current[1]:
-            merged[-1] = (current[0], max(current[1], interval[1]))
-        else:
-            merged.append(interval)
-
-    return merged
+    return vectorized_intervals.merge_intervals(intervals)
 
 
 def _format_date_time(time_like: TimeLike, unit: t.Optional[IntervalUnit]) -> str:
@@ -1716,22 +1933,7 @@ def remove_interval(intervals: Intervals, remove_start: int, remove_end: int) ->
     Returns:
         A new list of intervals.
     """
-    modified: Intervals = []
-
-    for start, end in intervals:
-        if remove_start > start and remove_end < end:
-            modified.extend(
-                (
-                    (start, remove_start),
-                    (remove_end, end),
-                )
-            )
-        elif remove_start > start:
-            modified.append((start, min(remove_start, end)))
-        elif remove_end < end:
-            modified.append((max(remove_end, start), end))
-
-    return modified
+    return vectorized_intervals.remove_interval(intervals, remove_start, remove_end)
 
 
 def to_table_mapping(
@@ -1843,21 +2045,12 @@ def missing_intervals(
     return missing
 
 
-@lru_cache(maxsize=None)
-def expand_range(start_ts: int, end_ts: int, interval_unit: IntervalUnit) -> t.List[int]:
-    croniter = interval_unit.croniter(start_ts)
-    timestamps = [start_ts]
-
-    while True:
-        ts = to_timestamp(croniter.get_next(estimate=True))
-
-        if ts > end_ts:
-            if timestamps and timestamps[-1] != end_ts:
-                timestamps.append(end_ts)
-            break
+def expand_range(start_ts: int, end_ts: int, interval_unit: IntervalUnit) -> np.ndarray:
+    """Returns the boundaries of intervals of the given unit between the start and the end.
 
-        timestamps.append(ts)
-    return timestamps
+    The result is a read-only array shared through the process-wide cron calendar.
+    """
+    return cron_ticks(interval_unit.cron_expr, start_ts, end_ts)
 
 
 @lru_cache(maxsize=None)
@@ -1886,40 +2079,25 @@ def compute_missing_intervals(
         return []
 
     timestamps = expand_range(start_ts, end_ts, interval_unit)
-    missing = set()
-
-    for current_ts, next_ts in zip(timestamps, timestamps[1:]):
-        for low, high in intervals:
-            if current_ts < low:
-                missing.add((current_ts, next_ts))
-                break
-            elif current_ts >= low and next_ts <= high:
-                break
-        else:
-            missing.add((current_ts, next_ts))
+    missing = vectorized_intervals.uncovered_mask(timestamps, intervals)
 
-    if missing:
+    if missing.any():
         if lookback:
             if model_end_ts:
-                croniter = interval_unit.croniter(end_ts)
-                end_ts = to_timestamp(croniter.get_prev(estimate=True))
+                end_ts = to_timestamp(interval_unit.cron_prev(end_ts, estimate=True))
 
                 while model_end_ts < end_ts:
-                    end_ts = to_timestamp(croniter.get_prev(estimate=True))
+                    end_ts = to_timestamp(interval_unit.cron_prev(end_ts, estimate=True))
                     lookback -= 1
 
                 lookback = max(lookback, 0)
 
-            for i, (current_ts, next_ts) in enumerate(zip(timestamps, timestamps[1:])):
-                parent = timestamps[i + lookback : i + lookback + 2]
-
-                if len(parent) < 2 or tuple(parent) in missing:
-                    missing.add((current_ts, next_ts))
+            missing = vectorized_intervals.apply_lookback(missing, lookback)
 
         if model_end_ts:
-            missing = {interval for interval in missing if interval[0] < model_end_ts}
+            missing &= timestamps[:-1] < model_end_ts
 
-    return sorted(missing)
+    return vectorized_intervals.from_arrays(timestamps[:-1][missing], timestamps[1:][missing])
 
 
 @lru_cache(maxsize=None)
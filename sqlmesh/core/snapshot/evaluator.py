@@ -464,16 +464,15 @@ class SnapshotEvaluator:
             target_snapshots: Snapshots to cleanup.
             on_complete: A callback to call on each successfully deleted database object.
         """
-        snapshots_to_dev_table_only = {
-            t.snapshot.snapshot_id: t.dev_table_only for t in target_snapshots
-        }
+        # The target snapshots may be a lazy iterator, so they are only consumed once
+        snapshots_to_cleanup = {t.snapshot.snapshot_id: t for t in target_snapshots}
 
         with self.concurrent_context():
             concurrent_apply_to_snapshots(
-                [t.snapshot for t in target_snapshots],
+                [t.snapshot for t in snapshots_to_cleanup.values()],
                 lambda s: self._cleanup_snapshot(
                     s,
-                    snapshots_to_dev_table_only[s.snapshot_id],
+                    snapshots_to_cleanup[s.snapshot_id].dev_table_only,
                     self.get_adapter(s.model_gateway),
                     on_complete,
                 ),
@@ -12,6 +12,11 @@ implies, it only allows for read-only operations on snapshots and environment st
 
 The provided `sqlmesh.core.state_sync.EngineAdapterStateSync` leverages an existing engine
 adapter to read and write state to the underlying data store.
+
+# ReadReplicaStateSync
+
+`sqlmesh.core.state_sync.ReadReplicaStateSync` serves reads from a local DuckDB replica of the
+state which is synced incrementally with the primary state sync, while writes go through to the primary.
 """
 
 from sqlmesh.core.state_sync.base import (
@@ -22,3 +27,4 @@ from sqlmesh.core.state_sync.base import (
 from sqlmesh.core.state_sync.cache import CachingStateSync as CachingStateSync
 from sqlmesh.core.state_sync.common import cleanup_expired_views as cleanup_expired_views
 from sqlmesh.core.state_sync.db import EngineAdapterStateSync as EngineAdapterStateSync
+from sqlmesh.core.state_sync.db.replica import ReadReplicaStateSync as ReadReplicaStateSync
@@ -17,6 +17,7 @@ from sqlmesh.core.environment import (
 )
 from sqlmesh.core.snapshot import (
     Snapshot,
+    SnapshotHeader,
     SnapshotId,
     SnapshotIdLike,
     SnapshotInfoLike,
@@ -97,6 +98,21 @@ class StateReader(abc.ABC):
             A dictionary of snapshot ids to snapshots for ones that could be found.
         """
 
+    @abc.abstractmethod
+    def get_snapshot_headers(
+        self, snapshot_ids: t.Iterable[SnapshotIdLike]
+    ) -> t.Dict[SnapshotId, SnapshotHeader]:
+        """Bulk fetch snapshot headers given the corresponding snapshot ids.
+
+        Unlike `get_snapshots`, this doesn't fetch and parse snapshot nodes nor their intervals.
+
+        Args:
+            snapshot_ids: Iterable of snapshot ids to get.
+
+        Returns:
+            A dictionary of snapshot ids to snapshot headers for ones that could be found.
+        """
+
     @abc.abstractmethod
     def snapshots_exist(self, snapshot_ids: t.Iterable[SnapshotIdLike]) -> t.Set[SnapshotId]:
         """Checks if multiple snapshots exist in the state sync.
@@ -132,9 +148,26 @@ class StateReader(abc.ABC):
         """
 
     @abc.abstractmethod
-    def get_environments(self) -> t.List[Environment]:
+    def get_environment_summary(self, environment: str) -> t.Optional[EnvironmentSummary]:
+        """Fetches the summary of the environment if it exists without fetching its snapshots.
+
+        Args:
+            environment: The environment
+
+        Returns:
+            The environment summary.
+        """
+
+    @abc.abstractmethod
+    def get_environments(
+        self, snapshot_names: t.Optional[t.Iterable[str]] = None
+    ) -> t.List[Environment]:
         """Fetches all environments.
 
+        Args:
+            snapshot_names: If provided, only environments that contain a snapshot with one of these names
+                are fetched.
+
         Returns:
             A list of all environments.
         """
@@ -282,14 +315,15 @@ class StateReader(abc.ABC):
     @abc.abstractmethod
     def get_expired_snapshots(
         self, current_ts: int, ignore_ttl: bool = False
-    ) -> t.List[SnapshotTableCleanupTask]:
-        """Aggregates the id's of the expired snapshots and creates a list of table cleanup tasks.
+    ) -> t.Iterator[SnapshotTableCleanupTask]:
+        """Aggregates the id's of the expired snapshots and creates table cleanup tasks.
 
         Expired snapshots are snapshots that have exceeded their time-to-live
-        and are no longer in use within an environment.
+        and are no longer in use within an environment. Cleanup tasks are fetched
+        from the state lazily as the returned iterator is consumed.
 
         Returns:
-           The list of table cleanup tasks.
+           An iterator over table cleanup tasks.
         """
 
     @abc.abstractmethod
@@ -456,6 +490,7 @@ class StateSync(StateReader, abc.ABC):
         default_catalog: t.Optional[str],
         skip_backup: bool = False,
         promoted_snapshots_only: bool = True,
+        streaming: bool = False,
     ) -> None:
         """Migrate the state sync to the latest SQLMesh / SQLGlot version."""
 
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import threading
 import typing as t
+from collections import OrderedDict, defaultdict
 
 from sqlmesh.core.model import SeedModel
 from sqlmesh.core.snapshot import (
@@ -15,35 +17,164 @@ from sqlmesh.core.state_sync.base import DelegatingStateSync, StateSync
 from sqlmesh.utils.date import TimeLike, now_timestamp
 
 
+class CacheStats(t.NamedTuple):
+    """Statistics of a snapshot cache."""
+
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    size_bytes: int
+
+
+class _CacheEntry(t.NamedTuple):
+    # A snapshot or False if the snapshot does not exist in the state sync.
+    value: t.Union[Snapshot, t.Literal[False]]
+    expire_at: int
+    size: int
+
+
+class SnapshotLRUCache:
+    """A least recently used cache of snapshots with a per-entry expiration.
+
+    The cache is bounded by the number of entries and, optionally, by the estimated size of the cached
+    snapshots. The least recently used entries are evicted first once either budget is exceeded.
+
+    Args:
+        max_entries: The maximum number of entries. Unbounded if None.
+        max_size_bytes: The maximum estimated size of all cached snapshots in bytes. Sizes are estimated by
+            the length of the serialized snapshots and only if this is set, since it requires serializing each
+            snapshot when it's cached.
+    """
+
+    def __init__(self, max_entries: t.Optional[int] = None, max_size_bytes: t.Optional[int] = None):
+        self.max_entries = max_entries
+        self.max_size_bytes = max_size_bytes
+
+        self._entries: OrderedDict[SnapshotId, _CacheEntry] = OrderedDict()
+        self._ids_by_name: t.Dict[str, t.Set[SnapshotId]] = defaultdict(set)
+        self._size_bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    def get(
+        self, snapshot_id: SnapshotId, now: int, record_stats: bool = True
+    ) -> t.Optional[Snapshot | t.Literal[False]]:
+        """Returns the cached snapshot, False if it's cached as missing or None if it's not cached."""
+        with self._lock:
+            entry = self._entries.get(snapshot_id)
+            if entry is not None and entry.expire_at < now:
+                self._remove(snapshot_id)
+                entry = None
+
+            if entry is None:
+                if record_stats:
+                    self._misses += 1
+                return None
+
+            self._entries.move_to_end(snapshot_id)
+            if record_stats:
+                self._hits += 1
+            return entry.value
+
+    def put(
+        self,
+        snapshot_id: SnapshotId,
+        value: t.Union[Snapshot, t.Literal[False]],
+        expire_at: int,
+    ) -> None:
+        size = _estimate_size(value) if value and self.max_size_bytes is not None else 0
+        with self._lock:
+            self._remove(snapshot_id)
+            self._entries[snapshot_id] = _CacheEntry(value, expire_at, size)
+            self._ids_by_name[snapshot_id.name].add(snapshot_id)
+            self._size_bytes += size
+
+            while self._entries and (
+                (self.max_entries is not None and len(self._entries) > self.max_entries)
+                or (self.max_size_bytes is not None and self._size_bytes > self.max_size_bytes)
+            ):
+                self._remove(next(iter(self._entries)))
+                self._evictions += 1
+
+    def pop(self, snapshot_id: SnapshotId) -> None:
+        with self._lock:
+            self._remove(snapshot_id)
+
+    def pop_name(self, name: str) -> None:
+        """Removes all snapshots with the given name."""
+        with self._lock:
+            for snapshot_id in list(self._ids_by_name.get(name, ())):
+                self._remove(snapshot_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._ids_by_name.clear()
+            self._size_bytes = 0
+
+    @property
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                entries=len(self._entries),
+                size_bytes=self._size_bytes,
+            )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, snapshot_id: SnapshotId) -> bool:
+        return snapshot_id in self._entries
+
+    def _remove(self, snapshot_id: SnapshotId) -> None:
+        entry = self._entries.pop(snapshot_id, None)
+        if entry is None:
+            return
+        self._size_bytes -= entry.size
+        ids = self._ids_by_name[snapshot_id.name]
+        ids.discard(snapshot_id)
+        if not ids:
+            del self._ids_by_name[snapshot_id.name]
+
+
 class CachingStateSync(DelegatingStateSync):
     """In memory cache for snapshots that implements the state sync api.
 
     Args:
         state_sync: The base state sync.
         ttl: The number of seconds a snapshot should be cached.
+        max_entries: The maximum number of cached snapshots.
+        max_size_bytes: The maximum estimated size of cached snapshots in bytes.
     """
 
-    def __init__(self, state_sync: StateSync, ttl: int = 120):
+    def __init__(
+        self,
+        state_sync: StateSync,
+        ttl: int = 120,
+        max_entries: t.Optional[int] = 20_000,
+        max_size_bytes: t.Optional[int] = None,
+    ):
         super().__init__(state_sync)
-        # The cache can contain a snapshot or False or None.
-        # False means that the snapshot does not exist in the state sync but has been requested before
-        # None means that the snapshot has not been requested.
-        self.snapshot_cache: t.Dict[
-            SnapshotId, t.Tuple[t.Optional[Snapshot | t.Literal[False]], int]
-        ] = {}
-
+        self.snapshot_cache = SnapshotLRUCache(
+            max_entries=max_entries, max_size_bytes=max_size_bytes
+        )
         self.ttl = ttl
 
+    @property
+    def cache_stats(self) -> CacheStats:
+        """Hit, miss and eviction counts of the snapshot cache along with its current size."""
+        return self.snapshot_cache.stats
+
     def _from_cache(
-        self, snapshot_id: SnapshotId, now: int
+        self, snapshot_id: SnapshotId, now: int, record_stats: bool = True
     ) -> t.Optional[Snapshot | t.Literal[False]]:
-        snapshot: t.Optional[Snapshot | t.Literal[False]] = None
-        snapshot_expiration = self.snapshot_cache.get(snapshot_id)
-
-        if snapshot_expiration and snapshot_expiration[1] >= now:
-            snapshot = snapshot_expiration[0]
-
-        return snapshot
+        return self.snapshot_cache.get(snapshot_id, now, record_stats=record_stats)
 
     def get_snapshots(
         self, snapshot_ids: t.Iterable[SnapshotIdLike]
@@ -58,7 +189,7 @@ class CachingStateSync(DelegatingStateSync):
             snapshot = self._from_cache(snapshot_id, now)
 
             if snapshot is None:
-                self.snapshot_cache[snapshot_id] = (False, expire_at)
+                self.snapshot_cache.put(snapshot_id, False, expire_at)
                 missing.add(snapshot_id)
             elif snapshot:
                 existing[snapshot_id] = snapshot
@@ -67,10 +198,10 @@ class CachingStateSync(DelegatingStateSync):
             existing.update(self.state_sync.get_snapshots(missing))
 
         for snapshot_id, snapshot in existing.items():
-            cached = self._from_cache(snapshot_id, now)
-            if cached and (not isinstance(cached.node, SeedModel) or cached.node.is_hydrated):
+            cached = self._from_cache(snapshot_id, now, record_stats=False)
+            if cached and not _is_dehydrated_seed(cached):
                 continue
-            self.snapshot_cache[snapshot_id] = (snapshot, expire_at)
+            self.snapshot_cache.put(snapshot_id, snapshot, expire_at)
 
         return existing
 
@@ -96,7 +227,7 @@ class CachingStateSync(DelegatingStateSync):
         snapshots = tuple(snapshots)
 
         for snapshot in snapshots:
-            self.snapshot_cache.pop(snapshot.snapshot_id, None)
+            self.snapshot_cache.pop(snapshot.snapshot_id)
 
         self.state_sync.push_snapshots(snapshots)
 
@@ -104,7 +235,7 @@ class CachingStateSync(DelegatingStateSync):
         snapshot_ids = tuple(snapshot_ids)
 
         for s in snapshot_ids:
-            self.snapshot_cache.pop(s.snapshot_id, None)
+            self.snapshot_cache.pop(s.snapshot_id)
         self.state_sync.delete_snapshots(snapshot_ids)
 
     def delete_expired_snapshots(
@@ -119,14 +250,10 @@ class CachingStateSync(DelegatingStateSync):
     def add_snapshots_intervals(self, snapshots_intervals: t.Sequence[SnapshotIntervals]) -> None:
         for snapshot_intervals in snapshots_intervals:
             if snapshot_intervals.snapshot_id:
-                self.snapshot_cache.pop(snapshot_intervals.snapshot_id, None)
+                self.snapshot_cache.pop(snapshot_intervals.snapshot_id)
             else:
                 # Evict all snapshots that share the same name
-                self.snapshot_cache = {
-                    snapshot_id: value
-                    for snapshot_id, value in self.snapshot_cache.items()
-                    if snapshot_id.name != snapshot_intervals.name
-                }
+                self.snapshot_cache.pop_name(snapshot_intervals.name)
         self.state_sync.add_snapshots_intervals(snapshots_intervals)
 
     def remove_intervals(
@@ -135,7 +262,7 @@ class CachingStateSync(DelegatingStateSync):
         remove_shared_versions: bool = False,
     ) -> None:
         for s, _ in snapshot_intervals:
-            self.snapshot_cache.pop(s.snapshot_id, None)
+            self.snapshot_cache.pop(s.snapshot_id)
         self.state_sync.remove_intervals(snapshot_intervals, remove_shared_versions)
 
     def unpause_snapshots(
@@ -146,3 +273,20 @@ class CachingStateSync(DelegatingStateSync):
 
     def clear_cache(self) -> None:
         self.snapshot_cache.clear()
+
+
+def _is_dehydrated_seed(snapshot: Snapshot) -> bool:
+    if not snapshot.is_node_parsed:
+        # Don't parse the node just to check whether the seed content has been loaded
+        node = snapshot.node_
+        return node.get("source_type") == "seed" and not node.get("is_hydrated", True)
+    return isinstance(snapshot.node, SeedModel) and not snapshot.node.is_hydrated
+
+
+def _estimate_size(snapshot: Snapshot) -> int:
+    """Estimates the memory footprint of a snapshot by the length of its serialized form.
+
+    Traversing the object graph undercounts snapshots, since SQLGlot expressions and pydantic models keep
+    their attributes in slots rather than in `__dict__`.
+    """
+    return len(snapshot.json())
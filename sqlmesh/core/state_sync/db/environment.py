@@ -10,8 +10,10 @@ from sqlmesh.core.engine_adapter import EngineAdapter
 from sqlmesh.core.state_sync.db.utils import (
     fetchall,
     fetchone,
+    create_batches,
 )
 from sqlmesh.core.environment import Environment, EnvironmentStatements, EnvironmentSummary
+from sqlmesh.core.snapshot import SnapshotId, SnapshotNameVersion
 from sqlmesh.utils.migration import index_text_type, blob_text_type
 from sqlmesh.utils.date import now_timestamp, time_like_to_str
 from sqlmesh.utils.errors import SQLMeshError
@@ -24,6 +26,8 @@ logger = logging.getLogger(__name__)
 
 
 class EnvironmentState:
+    ENVIRONMENT_BATCH_SIZE = 1000
+
     def __init__(
         self,
         engine_adapter: EngineAdapter,
@@ -32,6 +36,7 @@ class EnvironmentState:
         self.engine_adapter = engine_adapter
         self.environments_table = exp.table_("_environments", db=schema)
         self.environment_statements_table = exp.table_("_environment_statements", db=schema)
+        self.environment_snapshots_table = exp.table_("_environment_snapshots", db=schema)
 
         index_type = index_text_type(engine_adapter.dialect)
         blob_type = blob_text_type(engine_adapter.dialect)
@@ -52,6 +57,7 @@ class EnvironmentState:
             "normalize_name": exp.DataType.build("boolean"),
             "gateway_managed": exp.DataType.build("boolean"),
             "requirements": exp.DataType.build(blob_type),
+            "updated_ts": exp.DataType.build("bigint"),
         }
 
         self._environment_statements_columns_to_types = {
@@ -60,6 +66,13 @@ class EnvironmentState:
             "environment_statements": exp.DataType.build(blob_type),
         }
 
+        self._environment_snapshots_columns_to_types = {
+            "environment_name": exp.DataType.build(index_type),
+            "name": exp.DataType.build(index_type),
+            "identifier": exp.DataType.build(index_type),
+            "version": exp.DataType.build(index_type),
+        }
+
     def update_environment(self, environment: Environment) -> None:
         """Updates the environment.
 
@@ -80,6 +93,20 @@ class EnvironmentState:
             columns_to_types=self._environment_columns_to_types,
         )
 
+        self.engine_adapter.delete_from(
+            self.environment_snapshots_table,
+            where=exp.column("environment_name").eq(exp.Literal.string(environment.name)),
+        )
+        if environment.snapshots:
+            self.engine_adapter.insert_append_rows(
+                self.environment_snapshots_table,
+                (
+                    (environment.name, snapshot.name, snapshot.identifier, snapshot.version)
+                    for snapshot in environment.snapshots
+                ),
+                columns_to_types=self._environment_snapshots_columns_to_types,
+            )
+
     def update_environment_statements(
         self,
         environment_name: str,
@@ -123,9 +150,10 @@ class EnvironmentState:
 
         filter_expr = exp.column("name").eq(name)
 
+        current_ts = now_timestamp()
         self.engine_adapter.update_table(
             self.environments_table,
-            {"expiration_ts": now_timestamp()},
+            {"expiration_ts": current_ts, "updated_ts": current_ts},
             where=filter_expr,
         )
 
@@ -161,7 +189,7 @@ class EnvironmentState:
         environment.finalized_ts = now_timestamp()
         self.engine_adapter.update_table(
             self.environments_table,
-            {"finalized_ts": environment.finalized_ts},
+            {"finalized_ts": environment.finalized_ts, "updated_ts": environment.finalized_ts},
             where=environment_filter,
         )
 
@@ -194,34 +222,128 @@ class EnvironmentState:
         current_ts = current_ts or now_timestamp()
         expired_environments = self.get_expired_environments(current_ts=current_ts)
 
+        # Delete the expired environments' corresponding environment statements and membership first,
+        # since they're matched against the expired environment rows
+        expired_names_query = (
+            exp.select("name")
+            .from_(self.environments_table)
+            .where(self._create_expiration_filter_expr(current_ts))
+        )
+        for table in (self.environment_statements_table, self.environment_snapshots_table):
+            self.engine_adapter.delete_from(
+                table,
+                where=exp.column("environment_name").isin(query=expired_names_query.copy()),
+            )
+
         self.engine_adapter.delete_from(
             self.environments_table,
             where=self._create_expiration_filter_expr(current_ts),
         )
 
-        # Delete the expired environments' corresponding environment statements
-        if expired_environments_exprs := [
-            exp.EQ(this=exp.column("environment_name"), expression=exp.Literal.string(env.name))
-            for env in expired_environments
-        ]:
-            self.engine_adapter.delete_from(
-                self.environment_statements_table,
-                where=exp.or_(*expired_environments_exprs),
-            )
-
         return expired_environments
 
-    def get_environments(self) -> t.List[Environment]:
+    def get_environments(
+        self, snapshot_names: t.Optional[t.Iterable[str]] = None
+    ) -> t.List[Environment]:
         """Fetches all environments.
 
+        Args:
+            snapshot_names: If provided, only environments that contain a snapshot with one of these names
+                are fetched.
+
         Returns:
             A list of all environments.
         """
+        if snapshot_names is None:
+            return [
+                self._environment_from_row(row)
+                for row in fetchall(self.engine_adapter, self._environments_query())
+            ]
+
+        environments: t.Dict[str, Environment] = {}
+        for batch in create_batches(
+            sorted(set(snapshot_names)), batch_size=self.ENVIRONMENT_BATCH_SIZE
+        ):
+            member_environments_query = (
+                exp.select("environment_name")
+                .from_(self.environment_snapshots_table)
+                .where(exp.column("name").isin(*batch))
+            )
+            for row in fetchall(
+                self.engine_adapter,
+                self._environments_query(
+                    where=exp.column("name").isin(query=member_environments_query),
+                ),
+            ):
+                environment = self._environment_from_row(row)
+                environments[environment.name] = environment
+        return list(environments.values())
+
+    def get_environment_snapshot_ids(self) -> t.Set[SnapshotId]:
+        """Fetches the IDs of snapshots that are a part of at least one environment.
+
+        Returns:
+            The set of snapshot IDs.
+        """
+        return {
+            SnapshotId(name=name, identifier=identifier)
+            for name, identifier in fetchall(
+                self.engine_adapter,
+                exp.select("name", "identifier").distinct().from_(self.environment_snapshots_table),
+            )
+        }
+
+    def get_environment_snapshot_name_versions(
+        self, environment: str, names: t.Optional[t.Collection[str]] = None
+    ) -> t.List[SnapshotNameVersion]:
+        """Fetches the names and versions of snapshots in the environment without fetching the environment.
+
+        Args:
+            environment: The environment name.
+            names: If provided, only snapshots with these names are returned.
+
+        Returns:
+            The names and versions of the environment's snapshots.
+        """
+        environment_filter = exp.column("environment_name").eq(exp.Literal.string(environment))
+        name_filters: t.Iterable[t.Optional[exp.Expression]] = (
+            [None]
+            if names is None
+            else (
+                exp.column("name").isin(*batch)
+                for batch in create_batches(sorted(names), batch_size=self.ENVIRONMENT_BATCH_SIZE)
+            )
+        )
         return [
-            self._environment_from_row(row)
-            for row in fetchall(self.engine_adapter, self._environments_query())
+            SnapshotNameVersion(name=name, version=version)
+            for name_filter in name_filters
+            for name, version in fetchall(
+                self.engine_adapter,
+                exp.select("name", "version")
+                .from_(self.environment_snapshots_table)
+                .where(environment_filter)
+                .where(name_filter),
+            )
         ]
 
+    def get_environment_summary(self, environment: str) -> t.Optional[EnvironmentSummary]:
+        """Fetches the summary of the environment if it exists without fetching its snapshots.
+
+        Args:
+            environment: The environment name.
+
+        Returns:
+            The environment summary.
+        """
+        row = fetchone(
+            self.engine_adapter,
+            self._environments_query(
+                where=exp.column("name").eq(exp.Literal.string(environment)),
+                required_fields=list(EnvironmentSummary.all_fields()),
+            ),
+        )
+        return self._environment_summmary_from_row(row) if row else None
+
     def get_environments_summary(self) -> t.List[EnvironmentSummary]:
         """Fetches summaries for all environments.
 
@@ -360,6 +482,7 @@ def _environment_to_df(environment: Environment) -> pd.DataFrame:
                 "normalize_name": environment.normalize_name,
                 "gateway_managed": environment.gateway_managed,
                 "requirements": json.dumps(environment.requirements),
+                "updated_ts": now_timestamp(),
             }
         ]
     )
@@ -29,11 +29,13 @@ from sqlmesh.core.engine_adapter import EngineAdapter
 from sqlmesh.core.environment import Environment, EnvironmentStatements, EnvironmentSummary
 from sqlmesh.core.snapshot import (
     Snapshot,
+    SnapshotHeader,
     SnapshotId,
     SnapshotIdLike,
     SnapshotInfoLike,
     SnapshotIntervals,
     SnapshotNameVersion,
+    SnapshotNameVersionLike,
     SnapshotTableCleanupTask,
     SnapshotTableInfo,
     start_date,
@@ -84,6 +86,9 @@ class EngineAdapterStateSync(StateSync):
         schema: The schema to store state metadata in. If None or empty string then no schema is defined
         console: The console to log information to.
         context_path: The context path, used for caching snapshot models.
+        interval_cache_path: The path to the cache of resolved snapshot intervals. If provided, intervals are
+            refreshed incrementally by only fetching interval records that haven't been seen yet.
+        compress_blobs: Whether to compress newly stored snapshot blobs with zstd.
     """
 
     def __init__(
@@ -92,14 +97,25 @@ class EngineAdapterStateSync(StateSync):
         schema: t.Optional[str],
         console: t.Optional[Console] = None,
         context_path: Path = Path(),
+        interval_cache_path: t.Optional[Path] = None,
+        compress_blobs: bool = False,
     ):
         self.plan_dags_table = exp.table_("_plan_dags", db=schema)
-        self.interval_state = IntervalState(engine_adapter, schema=schema)
+        self.interval_state = IntervalState(
+            engine_adapter,
+            schema=schema,
+            cache_intervals=interval_cache_path is not None,
+            cache_path=interval_cache_path,
+        )
         self.environment_state = EnvironmentState(engine_adapter, schema=schema)
+        self.version_state = VersionState(engine_adapter, schema=schema)
         self.snapshot_state = SnapshotState(
-            engine_adapter, schema=schema, context_path=context_path
+            engine_adapter,
+            schema=schema,
+            context_path=context_path,
+            version_state=self.version_state,
+            compress_blobs=compress_blobs,
         )
-        self.version_state = VersionState(engine_adapter, schema=schema)
         self.migrator = StateMigrator(
             engine_adapter,
             version_state=self.version_state,
@@ -269,9 +285,11 @@ class EngineAdapterStateSync(StateSync):
 
     def get_expired_snapshots(
         self, current_ts: int, ignore_ttl: bool = False
-    ) -> t.List[SnapshotTableCleanupTask]:
+    ) -> t.Iterator[SnapshotTableCleanupTask]:
         return self.snapshot_state.get_expired_snapshots(
-            self.environment_state.get_environments(), current_ts=current_ts, ignore_ttl=ignore_ttl
+            self.environment_state.environment_snapshots_table,
+            current_ts=current_ts,
+            ignore_ttl=ignore_ttl,
         )
 
     def get_expired_environments(self, current_ts: int) -> t.List[Environment]:
@@ -282,9 +300,12 @@ class EngineAdapterStateSync(StateSync):
         self, ignore_ttl: bool = False, current_ts: t.Optional[int] = None
     ) -> t.List[SnapshotTableCleanupTask]:
         current_ts = current_ts or now_timestamp()
-        expired_snapshot_ids, cleanup_targets = self.snapshot_state._get_expired_snapshots(
-            self.environment_state.get_environments(), ignore_ttl=ignore_ttl, current_ts=current_ts
+        expired_snapshot_ids, cleanup_targets_iter = self.snapshot_state._get_expired_snapshots(
+            self.environment_state.environment_snapshots_table,
+            ignore_ttl=ignore_ttl,
+            current_ts=current_ts,
         )
+        cleanup_targets = list(cleanup_targets_iter)
 
         self.snapshot_state.delete_snapshots(expired_snapshot_ids)
         self.interval_state.cleanup_intervals(cleanup_targets, expired_snapshot_ids)
@@ -312,8 +333,11 @@ class EngineAdapterStateSync(StateSync):
         for table in (
             self.snapshot_state.snapshots_table,
             self.snapshot_state.auto_restatements_table,
+            self.snapshot_state.blobs_table,
+            self.snapshot_state.blob_refs_table,
             self.environment_state.environments_table,
             self.environment_state.environment_statements_table,
+            self.environment_state.environment_snapshots_table,
             self.interval_state.intervals_table,
             self.plan_dags_table,
             self.version_state.versions_table,
@@ -341,13 +365,22 @@ class EngineAdapterStateSync(StateSync):
     def get_environment_statements(self, environment: str) -> t.List[EnvironmentStatements]:
         return self.environment_state.get_environment_statements(environment)
 
-    def get_environments(self) -> t.List[Environment]:
+    def get_environment_summary(self, environment: str) -> t.Optional[EnvironmentSummary]:
+        return self.environment_state.get_environment_summary(environment)
+
+    def get_environments(
+        self, snapshot_names: t.Optional[t.Iterable[str]] = None
+    ) -> t.List[Environment]:
         """Fetches all environments.
 
+        Args:
+            snapshot_names: If provided, only environments that contain a snapshot with one of these names
+                are fetched.
+
         Returns:
             A list of all environments.
         """
-        return self.environment_state.get_environments()
+        return self.environment_state.get_environments(snapshot_names=snapshot_names)
 
     def get_environments_summary(self) -> t.List[EnvironmentSummary]:
         """Fetches all environment names along with expiry datetime.
@@ -374,6 +407,12 @@ class EngineAdapterStateSync(StateSync):
         Snapshot.hydrate_with_intervals_by_version(snapshots.values(), intervals)
         return snapshots
 
+    def get_snapshot_headers(
+        self,
+        snapshot_ids: t.Iterable[SnapshotIdLike],
+    ) -> t.Dict[SnapshotId, SnapshotHeader]:
+        return self.snapshot_state.get_snapshot_headers(snapshot_ids)
+
     @transactional()
     def add_interval(
         self,
@@ -426,15 +465,19 @@ class EngineAdapterStateSync(StateSync):
         models: t.Optional[t.Set[str]] = None,
         ensure_finalized_snapshots: bool = False,
     ) -> t.Dict[str, int]:
-        env = self.get_environment(environment)
-        if not env:
-            return {}
-
-        snapshots = (
-            env.snapshots if not ensure_finalized_snapshots else env.finalized_or_current_snapshots
-        )
-        if models is not None:
-            snapshots = [s for s in snapshots if s.name in models]
+        snapshots: t.Sequence[SnapshotNameVersionLike]
+        if ensure_finalized_snapshots:
+            env = self.get_environment(environment)
+            if not env:
+                return {}
+            snapshots = env.finalized_or_current_snapshots
+            if models is not None:
+                snapshots = [s for s in snapshots if s.name in models]
+        else:
+            # Current snapshots are read from the environment membership without fetching the environment
+            snapshots = self.environment_state.get_environment_snapshot_name_versions(
+                environment, names=models
+            )
 
         if not snapshots:
             return {}
@@ -447,20 +490,23 @@ class EngineAdapterStateSync(StateSync):
     def close(self) -> None:
         self.engine_adapter.close()
 
-    @transactional()
     def migrate(
         self,
         default_catalog: t.Optional[str],
         skip_backup: bool = False,
         promoted_snapshots_only: bool = True,
+        streaming: bool = False,
     ) -> None:
         """Migrate the state sync to the latest SQLMesh / SQLGlot version."""
-        self.migrator.migrate(
-            self,
-            default_catalog,
-            skip_backup=skip_backup,
-            promoted_snapshots_only=promoted_snapshots_only,
-        )
+        # A streaming migration commits its progress chunk by chunk, so it can't run in a single transaction
+        with self.engine_adapter.transaction(condition=not streaming):
+            self.migrator.migrate(
+                self,
+                default_catalog,
+                skip_backup=skip_backup,
+                promoted_snapshots_only=promoted_snapshots_only,
+                streaming=streaming,
+            )
 
     @transactional()
     def rollback(self) -> None:
@@ -1,7 +1,12 @@
 from __future__ import annotations
 
+import itertools
 import typing as t
 import logging
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from threading import Lock
 
 from sqlglot import exp
 
@@ -11,9 +16,11 @@ from sqlmesh.core.state_sync.db.utils import (
     snapshot_id_filter,
     create_batches,
     fetchall,
+    fetchone,
 )
 from sqlmesh.core.snapshot import (
     SnapshotIntervals,
+    SnapshotIntervalsBuilder,
     SnapshotIdLike,
     SnapshotNameVersionLike,
     SnapshotTableCleanupTask,
@@ -22,29 +29,71 @@ from sqlmesh.core.snapshot import (
     Snapshot,
 )
 from sqlmesh.core.snapshot.definition import Interval
+from sqlmesh.utils.cache import FileCache
+from sqlmesh.utils.hashing import md5
 from sqlmesh.utils.migration import index_text_type
 from sqlmesh.utils import random_id
 from sqlmesh.utils.date import now_timestamp
 
-if t.TYPE_CHECKING:
-    import pandas as pd
-
-
 logger = logging.getLogger(__name__)
 
+# Interval records are resolved per (name, version, dev_version, identifier).
+MergeKey = t.Tuple[str, str, t.Optional[str], t.Optional[str]]
+# The number of records, the number of records with non-null identifiers and dev versions, and the
+# latest creation timestamp of records of a snapshot version.
+IntervalStats = t.Tuple[int, int, int, int]
+
+
+@dataclass
+class _IntervalCacheEntry:
+    """Resolved intervals of a single snapshot name and version.
+
+    Args:
+        stats: The stats of interval records of this version that have been applied.
+        cursor: Only records created after this timestamp haven't been applied yet.
+        builders: The builders into which interval records of this version have been resolved.
+    """
+
+    stats: IntervalStats
+    cursor: int
+    builders: t.Dict[MergeKey, SnapshotIntervalsBuilder] = field(default_factory=dict)
+
+    @property
+    def snapshot_intervals(self) -> t.List[SnapshotIntervals]:
+        return [
+            b.snapshot_intervals.copy(deep=True)
+            for b in self.builders.values()
+            if not b.snapshot_intervals.is_empty()
+        ]
+
 
 class IntervalState:
     INTERVAL_BATCH_SIZE = 1000
     SNAPSHOT_BATCH_SIZE = 1000
+    # Dialects for which intervals are compacted by the engine itself rather than in Python.
+    SERVER_SIDE_COMPACTION_DIALECTS = {"duckdb", "postgres"}
 
     def __init__(
         self,
         engine_adapter: EngineAdapter,
         schema: t.Optional[str] = None,
         table_name: t.Optional[str] = None,
+        cache_intervals: bool = False,
+        cache_path: t.Optional[Path] = None,
     ):
         self.engine_adapter = engine_adapter
         self.intervals_table = exp.table_(table_name or "_intervals", db=schema)
+        # Resolved intervals per snapshot name and version, which are refreshed incrementally. If a cache path
+        # is provided, entries are persisted as well, so that subsequent processes only fetch new records.
+        self._interval_cache: t.Optional[t.Dict[t.Tuple[str, str], _IntervalCacheEntry]] = (
+            {} if cache_intervals else None
+        )
+        self._persisted_interval_cache: t.Optional[FileCache[_IntervalCacheEntry]] = (
+            FileCache(cache_path, prefix="intervals")
+            if cache_intervals and cache_path is not None
+            else None
+        )
+        self._interval_cache_lock = Lock()
 
         index_type = index_text_type(engine_adapter.dialect)
         self._interval_columns_to_types = {
@@ -112,18 +161,26 @@ class IntervalState:
             logger.info("Removing interval for snapshots: %s", snapshot_ids)
 
         for is_dev in (True, False):
-            self.engine_adapter.insert_append(
+            self.engine_adapter.insert_append_rows(
                 self.intervals_table,
-                _intervals_to_df(intervals_to_remove, is_dev=is_dev, is_removed=True),
+                _intervals_to_rows(intervals_to_remove, is_dev=is_dev, is_removed=True),
                 columns_to_types=self._interval_columns_to_types,
             )
 
     def get_snapshot_intervals(
         self, snapshots: t.Collection[SnapshotNameVersionLike]
     ) -> t.List[SnapshotIntervals]:
+        if self._interval_cache is not None:
+            with self._interval_cache_lock:
+                return self._get_cached_snapshot_intervals(snapshots)
         return self._get_snapshot_intervals(snapshots)[1]
 
     def compact_intervals(self) -> None:
+        if self.engine_adapter.dialect in self.SERVER_SIDE_COMPACTION_DIALECTS:
+            # Only handles intervals that were never removed or pending restatement. The remaining ones
+            # are compacted in Python below, since removals must be applied in the order they were recorded.
+            self._compact_intervals_server_side()
+
         interval_ids, snapshot_intervals = self._get_snapshot_intervals(uncompacted_only=True)
 
         logger.info(
@@ -140,11 +197,173 @@ class IntervalState:
                     self.intervals_table, exp.column("id").isin(*interval_id_batch)
                 )
 
+    def _compact_intervals_server_side(self) -> None:
+        """Merges overlapping and adjacent intervals with a single INSERT ... SELECT followed by a DELETE.
+
+        Intervals of each snapshot are merged using the gaps-and-islands approach: an interval starts a
+        new island if it starts after all preceding intervals have ended. Only versions that have uncompacted
+        records and no removed or pending restatement records are compacted this way.
+
+        The ids of the merged records are captured in a temporary table first, so that both statements
+        operate on the same records even if other records are committed concurrently in between.
+        """
+        row = fetchone(
+            self.engine_adapter,
+            exp.select(exp.func("MAX", exp.column("created_ts"))).from_(self.intervals_table),
+        )
+        cutoff_ts = row[0] if row else None
+        if cutoff_ts is None:
+            return
+
+        # Compacted records get a unique prefix so that they can be told apart from the ones they replace.
+        id_prefix = f"{random_id()}-"
+        compacted_filter = exp.and_(
+            exp.column("created_ts", table="i") <= cutoff_ts,
+            exp.column("id", table="i").like(f"{id_prefix}%").not_(),
+            exp.Exists(
+                this=self._same_version_records("u").where(
+                    exp.and_(
+                        exp.column("is_compacted", table="u").not_(),
+                        exp.column("created_ts", table="u") <= cutoff_ts,
+                    ),
+                    copy=False,
+                )
+            ),
+            exp.Exists(
+                this=self._same_version_records("r").where(
+                    exp.and_(
+                        exp.or_(
+                            exp.column("is_removed", table="r"),
+                            exp.column("is_pending_restatement", table="r"),
+                        ),
+                        exp.column("created_ts", table="r") <= cutoff_ts,
+                    ),
+                    copy=False,
+                )
+            ).not_(),
+        )
+
+        compacted_ids = (
+            exp.select(exp.column("id", table="i"))
+            .from_(exp.to_table(self.intervals_table).as_("i"))
+            .where(compacted_filter)
+        )
+        ids_table_name = self.intervals_table.copy()
+        ids_table_name.set("this", exp.to_identifier(f"{self.intervals_table.name}_compacted_ids"))
+
+        # The temp table is created, used and dropped within a single transaction
+        with self.engine_adapter.temp_table(
+            compacted_ids,
+            name=ids_table_name,
+            columns_to_types={"id": self._interval_columns_to_types["id"]},
+        ) as ids_table:
+            merged_ids = exp.select("id").from_(ids_table)
+            self.engine_adapter.insert_append(
+                self.intervals_table,
+                self._merged_intervals_query(merged_ids, id_prefix),
+                columns_to_types=self._interval_columns_to_types,
+            )
+            self.engine_adapter.delete_from(
+                self.intervals_table, exp.column("id").isin(query=merged_ids.copy())
+            )
+
+    def _merged_intervals_query(self, merged_ids: exp.Select, id_prefix: str) -> exp.Select:
+        """Returns a query that merges the records with the given ids into compacted records.
+
+        Args:
+            merged_ids: The query that returns the ids of records to merge.
+            id_prefix: The prefix of the ids of compacted records.
+        """
+        partition_by = [
+            exp.column(col) for col in ("name", "version", "dev_version", "identifier", "is_dev")
+        ]
+        order_by = exp.Order(expressions=[exp.column("start_ts"), exp.column("end_ts")])
+
+        # The furthest end of all intervals that precede the current one.
+        preceding_end = exp.Window(
+            this=exp.func("MAX", exp.column("end_ts")),
+            partition_by=partition_by,
+            order=order_by,
+            spec=exp.WindowSpec(
+                kind="ROWS",
+                start="UNBOUNDED",
+                start_side="PRECEDING",
+                end=exp.Literal.number(1),
+                end_side="PRECEDING",
+            ),
+        )
+        flagged = (
+            exp.select(
+                "id",
+                "created_ts",
+                "name",
+                "identifier",
+                "version",
+                "dev_version",
+                "start_ts",
+                "end_ts",
+                "is_dev",
+                exp.case()
+                .when(exp.column("start_ts") <= preceding_end, exp.Literal.number(0))
+                .else_(exp.Literal.number(1))
+                .as_("is_island_start"),
+            )
+            .from_(exp.to_table(self.intervals_table).as_("i"))
+            .where(exp.column("id", table="i").isin(query=merged_ids))
+        )
+        islands = exp.select(
+            "*",
+            exp.Window(
+                this=exp.func("SUM", exp.column("is_island_start")),
+                partition_by=partition_by,
+                order=order_by,
+                spec=exp.WindowSpec(
+                    kind="ROWS", start="UNBOUNDED", start_side="PRECEDING", end="CURRENT ROW"
+                ),
+            ).as_("island_id"),
+        ).from_(flagged.subquery("flagged"))
+        return (
+            exp.select(
+                exp.DPipe(
+                    this=exp.Literal.string(id_prefix),
+                    expression=exp.cast(
+                        exp.Window(this=exp.func("ROW_NUMBER")), exp.DataType.build("text")
+                    ),
+                ).as_("id"),
+                # Keep the original order relative to records that are added later.
+                exp.func("MAX", exp.column("created_ts")).as_("created_ts"),
+                "name",
+                "identifier",
+                "version",
+                "dev_version",
+                exp.func("MIN", exp.column("start_ts")).as_("start_ts"),
+                exp.func("MAX", exp.column("end_ts")).as_("end_ts"),
+                "is_dev",
+                exp.false().as_("is_removed"),
+                exp.true().as_("is_compacted"),
+                exp.false().as_("is_pending_restatement"),
+            )
+            .from_(islands.subquery("islands"))
+            .group_by(*partition_by, exp.column("island_id"))
+        )
+
+    def _same_version_records(self, alias: str) -> exp.Select:
+        return (
+            exp.select("1")
+            .from_(exp.to_table(self.intervals_table).as_(alias))
+            .where(
+                exp.and_(
+                    exp.column("name", table=alias).eq(exp.column("name", table="i")),
+                    exp.column("version", table=alias).eq(exp.column("version", table="i")),
+                )
+            )
+        )
+
     def refresh_snapshot_intervals(self, snapshots: t.Collection[Snapshot]) -> t.List[Snapshot]:
         if not snapshots:
             return []
 
-        _, intervals = self._get_snapshot_intervals([s for s in snapshots if s.version])
+        intervals = self.get_snapshot_intervals([s for s in snapshots if s.version])
         for s in snapshots:
             s.intervals = []
             s.dev_intervals = []
@@ -207,20 +426,18 @@ class IntervalState:
         snapshots: t.Iterable[t.Union[Snapshot, SnapshotIntervals]],
         is_compacted: bool = False,
     ) -> None:
-        import pandas as pd
-
         new_intervals = []
         for snapshot in snapshots:
             logger.info("Pushing intervals for snapshot %s", snapshot.snapshot_id)
             for start_ts, end_ts in snapshot.intervals:
                 new_intervals.append(
-                    _interval_to_df(
+                    _interval_to_row(
                         snapshot, start_ts, end_ts, is_dev=False, is_compacted=is_compacted
                     )
                 )
             for start_ts, end_ts in snapshot.dev_intervals:
                 new_intervals.append(
-                    _interval_to_df(
+                    _interval_to_row(
                         snapshot, start_ts, end_ts, is_dev=True, is_compacted=is_compacted
                     )
                 )
@@ -229,7 +446,7 @@ class IntervalState:
         for snapshot in snapshots:
             for start_ts, end_ts in snapshot.pending_restatement_intervals:
                 new_intervals.append(
-                    _interval_to_df(
+                    _interval_to_row(
                         snapshot,
                         start_ts,
                         end_ts,
@@ -240,9 +457,9 @@ class IntervalState:
                 )
 
         if new_intervals:
-            self.engine_adapter.insert_append(
+            self.engine_adapter.insert_append_rows(
                 self.intervals_table,
-                pd.DataFrame(new_intervals),
+                new_intervals,
                 columns_to_types=self._interval_columns_to_types,
             )
 
@@ -256,75 +473,20 @@ class IntervalState:
 
         query = self._get_snapshot_intervals_query(uncompacted_only)
 
-        interval_ids: t.Set[str] = set()
-        intervals: t.Dict[
-            t.Tuple[str, str, t.Optional[str], t.Optional[str]], SnapshotIntervals
-        ] = {}
-
-        for where in (
-            snapshot_name_version_filter(
-                self.engine_adapter,
-                snapshots,
-                alias="intervals",
-                batch_size=self.SNAPSHOT_BATCH_SIZE,
+        rows = itertools.chain.from_iterable(
+            fetchall(self.engine_adapter, query.where(where))
+            for where in (
+                snapshot_name_version_filter(
+                    self.engine_adapter,
+                    snapshots,
+                    alias="intervals",
+                    batch_size=self.SNAPSHOT_BATCH_SIZE,
+                )
+                if snapshots
+                else [None]
             )
-            if snapshots
-            else [None]
-        ):
-            rows = fetchall(self.engine_adapter, query.where(where))
-            for (
-                interval_id,
-                name,
-                identifier,
-                version,
-                dev_version,
-                start,
-                end,
-                is_dev,
-                is_removed,
-                is_pending_restatement,
-            ) in rows:
-                interval_ids.add(interval_id)
-                merge_key = (name, version, dev_version, identifier)
-                # Pending restatement intervals are merged by name and version
-                pending_restatement_interval_merge_key = (name, version, None, None)
-
-                if merge_key not in intervals:
-                    intervals[merge_key] = SnapshotIntervals(
-                        name=name,
-                        identifier=identifier,
-                        version=version,
-                        dev_version=dev_version,
-                    )
-
-                if pending_restatement_interval_merge_key not in intervals:
-                    intervals[pending_restatement_interval_merge_key] = SnapshotIntervals(
-                        name=name,
-                        identifier=None,
-                        version=version,
-                        dev_version=None,
-                    )
-
-                if is_removed:
-                    if is_dev:
-                        intervals[merge_key].remove_dev_interval(start, end)
-                    else:
-                        intervals[merge_key].remove_interval(start, end)
-                elif is_pending_restatement:
-                    intervals[
-                        pending_restatement_interval_merge_key
-                    ].add_pending_restatement_interval(start, end)
-                else:
-                    if is_dev:
-                        intervals[merge_key].add_dev_interval(start, end)
-                    else:
-                        intervals[merge_key].add_interval(start, end)
-                        # Remove all pending restatement intervals recorded before the current interval has been added
-                        intervals[
-                            pending_restatement_interval_merge_key
-                        ].remove_pending_restatement_interval(start, end)
-
-        return interval_ids, [i for i in intervals.values() if not i.is_empty()]
+        )
+        return snapshot_intervals_from_rows(rows)
 
     def _get_snapshot_intervals_query(self, uncompacted_only: bool) -> exp.Select:
         query = (
@@ -368,6 +530,157 @@ class IntervalState:
             )
         return query
 
+    def _get_cached_snapshot_intervals(
+        self, snapshots: t.Collection[SnapshotNameVersionLike]
+    ) -> t.List[SnapshotIntervals]:
+        """Returns intervals of the given snapshots, only fetching records that haven't been seen yet.
+
+        Cached entries are validated against the stats of interval records of each version. If the
+        stats are unchanged, no records are fetched. Otherwise, only records created after the entry's
+        cursor are fetched and applied on top of it. If the stats of the entry with the new records
+        applied don't match the stats in the state, records have been deleted, updated or created with
+        an earlier timestamp since the entry was cached (eg. due to compaction or cleanup), in which
+        case all records of the version are fetched again.
+        """
+        cache = t.cast(t.Dict[t.Tuple[str, str], _IntervalCacheEntry], self._interval_cache)
+        if not snapshots:
+            return []
+
+        stats = self._get_interval_stats(snapshots)
+
+        keys = {(s.name, s.version) for s in snapshots if s.version}
+        if self._persisted_interval_cache is not None:
+            entry_names = {_interval_cache_entry_name(key): key for key in keys if key not in cache}
+            for (entry_name, _), persisted_entry in self._persisted_interval_cache.get_many(
+                (entry_name, "") for entry_name in entry_names
+            ).items():
+                cache[entry_names[entry_name]] = persisted_entry
+
+        entries: t.Dict[t.Tuple[str, str], _IntervalCacheEntry] = {}
+        stale: t.Dict[t.Tuple[str, str], t.Optional[_IntervalCacheEntry]] = {}
+        for key in keys:
+            entry = cache.get(key)
+            if key not in stats:
+                cache.pop(key, None)
+            elif entry and entry.stats == stats[key]:
+                entries[key] = entry
+            else:
+                stale[key] = entry
+
+        if stale:
+            # Records created after the stats have been fetched are picked up by the next refresh.
+            cursor = max(s[3] for s in stats.values())
+            synced, mismatched = self._sync_cache_entries(stale, stats, cursor)
+            entries.update(synced)
+            if mismatched:
+                resynced, _ = self._sync_cache_entries(dict.fromkeys(mismatched), stats, cursor)
+                entries.update(resynced)
+
+        return [i for entry in entries.values() for i in entry.snapshot_intervals]
+
+    def _sync_cache_entries(
+        self,
+        stale: t.Dict[t.Tuple[str, str], t.Optional[_IntervalCacheEntry]],
+        stats: t.Dict[t.Tuple[str, str], IntervalStats],
+        cursor: int,
+    ) -> t.Tuple[t.Dict[t.Tuple[str, str], _IntervalCacheEntry], t.Set[t.Tuple[str, str]]]:
+        """Applies records created up to the cursor which haven't been applied to the given entries yet.
+
+        Args:
+            stale: Entries to sync by snapshot name and version. Entries which are None are built from scratch.
+            stats: The current stats of interval records by snapshot name and version.
+            cursor: The creation timestamp up to which records are applied.
+
+        Returns:
+            A tuple of synced entries and keys of the existing entries which no longer match the state and
+            have to be built from scratch.
+        """
+        cache = t.cast(t.Dict[t.Tuple[str, str], _IntervalCacheEntry], self._interval_cache)
+
+        keys_by_cursor: t.Dict[t.Optional[int], t.List[SnapshotNameVersion]] = defaultdict(list)
+        for (name, version), entry in stale.items():
+            keys_by_cursor[entry.cursor if entry else None].append(
+                SnapshotNameVersion(name=name, version=version)
+            )
+
+        rows_by_key: t.Dict[t.Tuple[str, str], t.List[t.Tuple[t.Any, ...]]] = defaultdict(list)
+        created_ts = exp.column("created_ts", table="intervals")
+        for since, keys in keys_by_cursor.items():
+            for where in snapshot_name_version_filter(
+                self.engine_adapter, keys, alias="intervals", batch_size=self.SNAPSHOT_BATCH_SIZE
+            ):
+                query = self._get_snapshot_intervals_query(uncompacted_only=False).where(
+                    exp.and_(where, created_ts <= cursor), copy=False
+                )
+                if since is not None:
+                    query = query.where(created_ts > since, copy=False)
+                for row in fetchall(self.engine_adapter, query):
+                    rows_by_key[(row[1], row[3])].append(row)
+
+        synced = {}
+        mismatched = set()
+        persisted: t.Dict[str, _IntervalCacheEntry] = {}
+        for key, entry in stale.items():
+            rows = rows_by_key.get(key, [])
+            applied_stats = entry.stats if entry else (0, 0, 0, 0)
+            is_consistent = (
+                applied_stats[0] + len(rows),
+                applied_stats[1] + sum(1 for row in rows if row[2] is not None),
+                applied_stats[2] + sum(1 for row in rows if row[4] is not None),
+            ) == stats[key][:3]
+            if entry and not is_consistent:
+                mismatched.add(key)
+                continue
+
+            new_entry = _IntervalCacheEntry(
+                stats=stats[key], cursor=cursor, builders=entry.builders if entry else {}
+            )
+            _apply_interval_rows(new_entry.builders, rows)
+            for builder in new_entry.builders.values():
+                builder.build()
+
+            synced[key] = new_entry
+            if is_consistent:
+                cache[key] = new_entry
+                persisted[_interval_cache_entry_name(key)] = new_entry
+            else:
+                # Records have been changed while being fetched, so the entry is rebuilt next time.
+                cache.pop(key, None)
+
+        if self._persisted_interval_cache is not None and persisted:
+            self._persisted_interval_cache.put_many(
+                {(entry_name, ""): entry for entry_name, entry in persisted.items()}
+            )
+
+        return synced, mismatched
+
+    def _get_interval_stats(
+        self, snapshots: t.Collection[SnapshotNameVersionLike]
+    ) -> t.Dict[t.Tuple[str, str], IntervalStats]:
+        name_col = exp.column("name", table="intervals")
+        version_col = exp.column("version", table="intervals")
+
+        stats = {}
+        for where in snapshot_name_version_filter(
+            self.engine_adapter, snapshots, alias="intervals", batch_size=self.SNAPSHOT_BATCH_SIZE
+        ):
+            query = (
+                exp.select(
+                    name_col,
+                    version_col,
+                    exp.func("COUNT", exp.Star()),
+                    exp.func("COUNT", exp.column("identifier", table="intervals")),
+                    exp.func("COUNT", exp.column("dev_version", table="intervals")),
+                    exp.func("MAX", exp.column("created_ts", table="intervals")),
+                )
+                .from_(exp.to_table(self.intervals_table).as_("intervals"))
+                .where(where, copy=False)
+                .group_by(name_col, version_col, copy=False)
+            )
+            for name, version, *version_stats in fetchall(self.engine_adapter, query):
+                stats[(name, version)] = t.cast(IntervalStats, tuple(version_stats))
+        return stats
+
     def _update_intervals_for_deleted_snapshots(
         self, snapshot_ids: t.Collection[SnapshotIdLike]
     ) -> None:
@@ -429,27 +742,23 @@ class IntervalState:
             self.engine_adapter.delete_from(self.intervals_table, where)
 
 
-def _intervals_to_df(
+def _intervals_to_rows(
     snapshot_intervals: t.Sequence[t.Tuple[t.Union[SnapshotInfoLike, SnapshotIntervals], Interval]],
     is_dev: bool,
     is_removed: bool,
-) -> pd.DataFrame:
-    import pandas as pd
-
-    return pd.DataFrame(
-        [
-            _interval_to_df(
-                s,
-                *interval,
-                is_dev=is_dev,
-                is_removed=is_removed,
-            )
-            for s, interval in snapshot_intervals
-        ]
-    )
+) -> t.List[t.Tuple[t.Any, ...]]:
+    return [
+        _interval_to_row(
+            s,
+            *interval,
+            is_dev=is_dev,
+            is_removed=is_removed,
+        )
+        for s, interval in snapshot_intervals
+    ]
 
 
-def _interval_to_df(
+def _interval_to_row(
     snapshot: t.Union[SnapshotInfoLike, SnapshotIntervals],
     start_ts: int,
     end_ts: int,
@@ -457,18 +766,111 @@ def _interval_to_df(
     is_removed: bool = False,
     is_compacted: bool = False,
     is_pending_restatement: bool = False,
-) -> t.Dict[str, t.Any]:
-    return {
-        "id": random_id(),
-        "created_ts": now_timestamp(),
-        "name": snapshot.name,
-        "identifier": snapshot.identifier if not is_pending_restatement else None,
-        "version": snapshot.version,
-        "dev_version": snapshot.dev_version if not is_pending_restatement else None,
-        "start_ts": start_ts,
-        "end_ts": end_ts,
-        "is_dev": is_dev,
-        "is_removed": is_removed,
-        "is_compacted": is_compacted,
-        "is_pending_restatement": is_pending_restatement,
-    }
+) -> t.Tuple[t.Any, ...]:
+    """Returns a row of the intervals table in the order of `IntervalState._interval_columns_to_types`."""
+    return (
+        random_id(),
+        now_timestamp(),
+        snapshot.name,
+        snapshot.identifier if not is_pending_restatement else None,
+        snapshot.version,
+        snapshot.dev_version if not is_pending_restatement else None,
+        start_ts,
+        end_ts,
+        is_dev,
+        is_removed,
+        is_compacted,
+        is_pending_restatement,
+    )
+
+
+def snapshot_intervals_from_rows(
+    rows: t.Iterable[t.Tuple[t.Any, ...]],
+) -> t.Tuple[t.Set[str], t.List[SnapshotIntervals]]:
+    """Resolves interval records into snapshot intervals.
+
+    Args:
+        rows: Interval records ordered by name, version and creation time, as returned by
+            `IntervalState._get_snapshot_intervals_query`.
+
+    Returns:
+        A tuple of IDs of processed interval records and the resulting non-empty snapshot intervals.
+    """
+    builders: t.Dict[MergeKey, SnapshotIntervalsBuilder] = {}
+    interval_ids = _apply_interval_rows(builders, rows)
+    intervals = (builder.build() for builder in builders.values())
+    return interval_ids, [i for i in intervals if not i.is_empty()]
+
+
+def _interval_cache_entry_name(key: t.Tuple[str, str]) -> str:
+    name, version = key
+    return md5([name, version])
+
+
+def _apply_interval_rows(
+    builders: t.Dict[MergeKey, SnapshotIntervalsBuilder], rows: t.Iterable[t.Tuple[t.Any, ...]]
+) -> t.Set[str]:
+    """Records interval operations of the given interval records in builders keyed by merge key.
+
+    Returns:
+        The IDs of processed interval records.
+    """
+    interval_ids: t.Set[str] = set()
+
+    for (
+        interval_id,
+        name,
+        identifier,
+        version,
+        dev_version,
+        start,
+        end,
+        is_dev,
+        is_removed,
+        is_pending_restatement,
+    ) in rows:
+        interval_ids.add(interval_id)
+        merge_key = (name, version, dev_version, identifier)
+        # Pending restatement intervals are merged by name and version
+        pending_restatement_interval_merge_key = (name, version, None, None)
+
+        if merge_key not in builders:
+            builders[merge_key] = SnapshotIntervalsBuilder(
+                SnapshotIntervals(
+                    name=name,
+                    identifier=identifier,
+                    version=version,
+                    dev_version=dev_version,
+                )
+            )
+
+        if pending_restatement_interval_merge_key not in builders:
+            builders[pending_restatement_interval_merge_key] = SnapshotIntervalsBuilder(
+                SnapshotIntervals(
+                    name=name,
+                    identifier=None,
+                    version=version,
+                    dev_version=None,
+                )
+            )
+
+        if is_removed:
+            if is_dev:
+                builders[merge_key].remove_dev_interval(start, end)
+            else:
+                builders[merge_key].remove_interval(start, end)
+        elif is_pending_restatement:
+            builders[pending_restatement_interval_merge_key].add_pending_restatement_interval(
+                start, end
+            )
+        else:
+            if is_dev:
+                builders[merge_key].add_dev_interval(start, end)
+            else:
+                builders[merge_key].add_interval(start, end)
+                # Remove all pending restatement intervals recorded before the current interval has been added
+                builders[
+                    pending_restatement_interval_merge_key
+                ].remove_pending_restatement_interval(start, end)
+
+    return interval_ids
@@ -24,9 +24,12 @@ from sqlmesh.core.snapshot import (
 )
 from sqlmesh.core.snapshot.definition import (
     _parents_from_node,
+    fingerprint_from_parents,
 )
 from sqlmesh.core.state_sync.base import (
     MIGRATIONS,
+    SCHEMA_VERSION,
+    Versions,
 )
 from sqlmesh.core.state_sync.base import StateSync
 from sqlmesh.core.state_sync.db.environment import EnvironmentState
@@ -35,6 +38,7 @@ from sqlmesh.core.state_sync.db.snapshot import SnapshotState
 from sqlmesh.core.state_sync.db.version import VersionState
 from sqlmesh.core.state_sync.db.utils import (
     SQLMESH_VERSION,
+    create_batches,
     snapshot_id_filter,
     fetchall,
 )
@@ -42,6 +46,8 @@ from sqlmesh.utils import major_minor
 from sqlmesh.utils.dag import DAG
 from sqlmesh.utils.date import now_timestamp
 from sqlmesh.utils.errors import SQLMeshError
+from sqlmesh.utils.migration import blob_text_type, index_text_type
+from sqlmesh.utils.process import create_process_pool_executor
 
 logger = logging.getLogger(__name__)
 
@@ -49,10 +55,16 @@ logger = logging.getLogger(__name__)
 if t.TYPE_CHECKING:
     from sqlmesh.core._typing import TableName
 
+    from sqlmesh.core.state_sync.db.snapshot import SerializedSnapshot
+
+    # The serialized snapshot and the attributes that are stored in separate columns
+    RawSnapshotRow = t.Tuple[SerializedSnapshot, t.Dict[str, t.Any]]
+
 
 class StateMigrator:
     SNAPSHOT_BATCH_SIZE = 1000
     SNAPSHOT_MIGRATION_BATCH_SIZE = 500
+    SNAPSHOT_MIGRATION_POOL_CHUNK_SIZE = 20
 
     def __init__(
         self,
@@ -71,6 +83,18 @@ class StateMigrator:
         self.environment_state = environment_state
         self.interval_state = interval_state
         self.plan_dags_table = plan_dags_table
+        self.migration_checkpoints_table = exp.table_(
+            "_migration_checkpoints", db=self.snapshot_state.snapshots_table.db or None
+        )
+
+        index_type = index_text_type(engine_adapter.dialect)
+        blob_type = blob_text_type(engine_adapter.dialect)
+        self._migration_checkpoint_columns_to_types = {
+            "name": exp.DataType.build(index_type),
+            "identifier": exp.DataType.build(index_type),
+            "fingerprint": exp.DataType.build(blob_type),
+            "table_info": exp.DataType.build(blob_type),
+        }
 
         self._state_tables = [
             self.snapshot_state.snapshots_table,
@@ -82,6 +106,9 @@ class StateMigrator:
             self.plan_dags_table,
             self.snapshot_state.auto_restatements_table,
             self.environment_state.environment_statements_table,
+            self.environment_state.environment_snapshots_table,
+            self.snapshot_state.blobs_table,
+            self.snapshot_state.blob_refs_table,
         ]
 
     def migrate(
@@ -90,22 +117,55 @@ class StateMigrator:
         default_catalog: t.Optional[str],
         skip_backup: bool = False,
         promoted_snapshots_only: bool = True,
+        streaming: bool = False,
     ) -> None:
-        """Migrate the state sync to the latest SQLMesh / SQLGlot version."""
+        """Migrate the state sync to the latest SQLMesh / SQLGlot version.
+
+        Args:
+            state_sync: The state sync to migrate.
+            default_catalog: The default catalog.
+            skip_backup: Whether to skip backing up the state tables before migrating them.
+            promoted_snapshots_only: Whether to only migrate snapshots that are part of at least one environment.
+            streaming: Whether to migrate snapshot rows in topologically ordered chunks instead of loading all of
+                them at once. Migration scripts are applied and committed first, then progress is checkpointed
+                after each chunk. A migration that was interrupted after its scripts had been committed is not
+                rolled back and is resumed by the next migration.
+        """
         versions = self.version_state.get_versions()
         migration_start_ts = time.perf_counter()
+        is_resumable = False
 
         try:
-            migrate_rows = self._apply_migrations(state_sync, default_catalog, skip_backup)
+            has_checkpoints = self.engine_adapter.table_exists(self.migration_checkpoints_table)
+            if has_checkpoints and versions.schema_version == SCHEMA_VERSION:
+                # Migration scripts have already been applied by the interrupted migration
+                logger.info("Resuming the interrupted migration of snapshot rows")
+                migrate_rows = True
+            else:
+                if has_checkpoints:
+                    # The interrupted migration was started by a different SQLMesh version
+                    self.engine_adapter.drop_table(self.migration_checkpoints_table)
+                # The scripts of a streaming migration are committed together with the checkpoints table, so that
+                # they are never applied twice
+                with self.engine_adapter.transaction(condition=streaming):
+                    migrate_rows = self._apply_migrations(state_sync, default_catalog, skip_backup)
+                    if streaming and migrate_rows:
+                        self._create_migration_checkpoints_table(versions)
+            is_resumable = streaming and migrate_rows
 
             if not migrate_rows and major_minor(SQLMESH_VERSION) == versions.minor_sqlmesh_version:
                 return
 
             if migrate_rows:
-                self._migrate_rows(promoted_snapshots_only)
+                self.snapshot_state.backfill_headers()
+                if streaming:
+                    self._migrate_rows_in_chunks(promoted_snapshots_only)
+                else:
+                    self._migrate_rows(promoted_snapshots_only)
                 # Cleanup plan DAGs since we currently don't migrate snapshot records that are in there.
                 self.engine_adapter.delete_from(self.plan_dags_table, "TRUE")
             self.version_state.update_versions()
+            self.engine_adapter.drop_table(self.migration_checkpoints_table)
 
             analytics.collector.on_migration_end(
                 from_sqlmesh_version=versions.sqlmesh_version,
@@ -113,7 +173,11 @@ class StateMigrator:
                 migration_time_sec=time.perf_counter() - migration_start_ts,
             )
         except Exception as e:
-            if skip_backup:
+            if is_resumable:
+                logger.error(
+                    "Migration scripts have been applied, so no rollback was attempted. The migration of snapshot rows is resumed by the next migration."
+                )
+            elif skip_backup:
                 logger.error("Backup was skipped so no rollback was attempted.")
             else:
                 self.rollback()
@@ -133,6 +197,8 @@ class StateMigrator:
     def rollback(self) -> None:
         """Rollback to the previous migration."""
         logger.info("Starting migration rollback.")
+        # Progress of an interrupted streaming migration doesn't apply to the restored state
+        self.engine_adapter.drop_table(self.migration_checkpoints_table)
         versions = self.version_state.get_versions()
         if versions.schema_version == 0:
             # Clean up state tables
@@ -193,11 +259,9 @@ class StateMigrator:
         return migrate_snapshots_and_environments
 
     def _migrate_rows(self, promoted_snapshots_only: bool) -> None:
-        logger.info("Fetching environments")
-        environments = self.environment_state.get_environments()
         # Only migrate snapshots that are part of at least one environment.
         snapshots_to_migrate = (
-            {s.snapshot_id for e in environments for s in e.snapshots}
+            self.environment_state.get_environment_snapshot_ids()
             if promoted_snapshots_only
             else None
         )
@@ -205,35 +269,16 @@ class StateMigrator:
         if not snapshot_mapping:
             logger.info("No changes to snapshots detected")
             return
-        self._migrate_environment_rows(environments, snapshot_mapping)
+        logger.info("Fetching environments")
+        self._migrate_environment_rows(self.environment_state.get_environments(), snapshot_mapping)
 
     def _migrate_snapshot_rows(
         self, snapshots: t.Optional[t.Set[SnapshotId]]
     ) -> t.Dict[SnapshotId, SnapshotTableInfo]:
         logger.info("Migrating snapshot rows...")
         raw_snapshots = {
-            SnapshotId(name=name, identifier=identifier): {
-                **json.loads(raw_snapshot),
-                "updated_ts": updated_ts,
-                "unpaused_ts": unpaused_ts,
-                "unrestorable": unrestorable,
-            }
-            for where in (
-                snapshot_id_filter(
-                    self.engine_adapter, snapshots, batch_size=self.SNAPSHOT_BATCH_SIZE
-                )
-                if snapshots is not None
-                else [None]
-            )
-            for name, identifier, raw_snapshot, updated_ts, unpaused_ts, unrestorable in fetchall(
-                self.engine_adapter,
-                exp.select(
-                    "name", "identifier", "snapshot", "updated_ts", "unpaused_ts", "unrestorable"
-                )
-                .from_(self.snapshot_state.snapshots_table)
-                .where(where)
-                .lock(),
-            )
+            snapshot_id: _raw_snapshot(raw_snapshot_row)
+            for snapshot_id, raw_snapshot_row in self._get_raw_snapshots(snapshots).items()
         }
         if not raw_snapshots:
             return {}
@@ -363,6 +408,359 @@ class StateMigrator:
         self.console.stop_snapshot_migration_progress()
         return all_snapshot_mapping
 
+    def _create_migration_checkpoints_table(self, versions: Versions) -> None:
+        """Creates the checkpoints table and records that the migration scripts have been applied.
+
+        Only the schema version is updated, so that the scripts aren't applied again while the SQLMesh and SQLGlot
+        versions are only updated once the snapshot rows have been migrated.
+        """
+        self.engine_adapter.create_state_table(
+            self.migration_checkpoints_table.sql(dialect=self.engine_adapter.dialect),
+            self._migration_checkpoint_columns_to_types,
+            primary_key=("name", "identifier"),
+        )
+        self.version_state.update_versions(
+            schema_version=SCHEMA_VERSION,
+            sqlglot_version=versions.sqlglot_version,
+            sqlmesh_version=versions.sqlmesh_version,
+        )
+
+    def _migrate_rows_in_chunks(self, promoted_snapshots_only: bool) -> None:
+        # Only migrate snapshots that are part of at least one environment.
+        snapshots_to_migrate = (
+            self.environment_state.get_environment_snapshot_ids()
+            if promoted_snapshots_only
+            else None
+        )
+        self._migrate_snapshot_rows_in_chunks(snapshots_to_migrate)
+
+        if not fetchall(
+            self.engine_adapter,
+            exp.select("name")
+            .from_(self.migration_checkpoints_table)
+            .where(exp.column("table_info").is_(exp.null()).not_())
+            .limit(1),
+        ):
+            logger.info("No changes to snapshots detected")
+            return
+
+        logger.info("Fetching environments")
+        environments = self.environment_state.get_environments()
+        snapshot_mapping = {
+            snapshot_id: SnapshotTableInfo.parse_raw(table_info)
+            for snapshot_id, _, table_info in self._get_migration_checkpoints(
+                {s.snapshot_id for environment in environments for s in environment.snapshots}
+            )
+            if table_info is not None
+        }
+        self._migrate_environment_rows(environments, snapshot_mapping)
+
+    def _migrate_snapshot_rows_in_chunks(self, snapshots: t.Optional[t.Set[SnapshotId]]) -> None:
+        """Migrates snapshot rows level by level in topological order.
+
+        Snapshots within the same level don't depend on each other, so each chunk of a level is parsed and
+        fingerprinted in a process pool given the new fingerprints of its parents. Only the new fingerprints
+        of snapshots with unprocessed children are kept in memory. Migrated snapshots are pushed in bulk and
+        recorded in the checkpoints table in the same transaction, so that an interrupted migration
+        skips the chunks that have already been migrated.
+        """
+        logger.info("Migrating snapshot rows in chunks...")
+        dag = self._get_snapshot_dag(snapshots)
+        if not dag.graph:
+            return
+
+        migrated_snapshot_ids = {
+            SnapshotId(name=name, identifier=identifier)
+            for name, identifier in fetchall(
+                self.engine_adapter,
+                exp.select("name", "identifier").from_(self.migration_checkpoints_table),
+            )
+        }
+
+        remaining_children: t.Dict[SnapshotId, int] = {}
+        for snapshot_id, parent_ids in dag.graph.items():
+            if snapshot_id not in migrated_snapshot_ids:
+                for parent_id in parent_ids:
+                    remaining_children[parent_id] = remaining_children.get(parent_id, 0) + 1
+
+        self.console.start_snapshot_migration_progress(len(dag.graph))
+        self.console.update_snapshot_migration_progress(
+            len(migrated_snapshot_ids & dag.graph.keys())
+        )
+
+        fingerprints: t.Dict[SnapshotId, t.Optional[SnapshotFingerprint]] = {}
+
+        with create_process_pool_executor(max_workers=c.MAX_FORK_WORKERS) as pool:
+            for level in _topological_levels(dag):
+                level = [s_id for s_id in level if s_id not in migrated_snapshot_ids]
+                for chunk in create_batches(level, batch_size=self.SNAPSHOT_MIGRATION_BATCH_SIZE):
+                    missing_parent_ids = {
+                        parent_id for s_id in chunk for parent_id in dag.graph[s_id]
+                    } - fingerprints.keys()
+                    if missing_parent_ids:
+                        # Parents that were migrated before the migration was interrupted
+                        fingerprints.update(
+                            (
+                                snapshot_id,
+                                SnapshotFingerprint.parse_raw(fingerprint) if fingerprint else None,
+                            )
+                            for snapshot_id, fingerprint, _ in self._get_migration_checkpoints(
+                                missing_parent_ids
+                            )
+                        )
+
+                    # Rows of a chunk are only locked until its migrated snapshots have been pushed
+                    with self.engine_adapter.transaction():
+                        unresolved_parent_ids = {
+                            parent_id
+                            for s_id in chunk
+                            for parent_id in dag.graph[s_id]
+                            if fingerprints.get(parent_id) is None
+                        }
+                        if unresolved_parent_ids:
+                            fingerprints.update(
+                                self._fingerprints_from_nodes(unresolved_parent_ids, dag)
+                            )
+
+                        raw_snapshots = self._get_raw_snapshots(chunk)
+                        chunk = [s_id for s_id in chunk if s_id in raw_snapshots]
+                        results = pool.map(
+                            _migrate_snapshot,
+                            [
+                                (
+                                    raw_snapshots[s_id],
+                                    {
+                                        parent_id.name: fingerprints.get(parent_id)
+                                        for parent_id in dag.graph[s_id]
+                                    },
+                                )
+                                for s_id in chunk
+                            ],
+                            chunksize=self.SNAPSHOT_MIGRATION_POOL_CHUNK_SIZE,
+                        )
+                        self._push_migrated_snapshots(chunk, list(results), dag, fingerprints)
+
+                    for snapshot_id in chunk:
+                        for parent_id in dag.graph[snapshot_id]:
+                            remaining_children[parent_id] -= 1
+                            if not remaining_children[parent_id]:
+                                fingerprints.pop(parent_id, None)
+                        if not remaining_children.get(snapshot_id):
+                            fingerprints.pop(snapshot_id, None)
+
+                    self.console.update_snapshot_migration_progress(len(chunk))
+
+        self.console.stop_snapshot_migration_progress()
+
+    def _push_migrated_snapshots(
+        self,
+        snapshot_ids: t.List[SnapshotId],
+        results: t.List[t.Tuple[t.Optional[SnapshotFingerprint], t.Optional[Snapshot]]],
+        dag: DAG[SnapshotId],
+        fingerprints: t.Dict[SnapshotId, t.Optional[SnapshotFingerprint]],
+    ) -> None:
+        new_snapshots: t.Dict[SnapshotId, Snapshot] = {}
+        snapshot_id_mapping: t.Dict[SnapshotId, SnapshotId] = {}
+        for snapshot_id, (fingerprint, new_snapshot) in zip(snapshot_ids, results):
+            fingerprints[snapshot_id] = fingerprint
+            if new_snapshot is None:
+                continue
+
+            new_snapshot_id = new_snapshot.snapshot_id
+            if (
+                new_snapshot_id not in new_snapshots
+                or new_snapshot.updated_ts > new_snapshots[new_snapshot_id].updated_ts
+            ):
+                new_snapshots[new_snapshot_id] = new_snapshot
+            snapshot_id_mapping[snapshot_id] = new_snapshot_id
+            logger.debug("%s mapped to %s", snapshot_id, new_snapshot_id)
+
+        # Snapshots that are being migrated themselves map to their existing records
+        for new_snapshot_id, raw_snapshot_row in self._get_raw_snapshots(
+            [s_id for s_id in new_snapshots if s_id in dag]
+        ).items():
+            logger.debug("Migrated snapshot %s already exists", new_snapshot_id)
+            new_snapshots[new_snapshot_id] = Snapshot.parse_obj(_raw_snapshot(raw_snapshot_row))
+
+        existing_new_snapshots = self.snapshot_state.snapshots_exist(new_snapshots)
+        new_snapshots_to_push = [
+            s for s in new_snapshots.values() if s.snapshot_id not in existing_new_snapshots
+        ]
+
+        import pandas as pd
+
+        checkpoints = pd.DataFrame(
+            [
+                {
+                    "name": snapshot_id.name,
+                    "identifier": snapshot_id.identifier,
+                    "fingerprint": fingerprint.json() if fingerprint else None,
+                    "table_info": (
+                        new_snapshots[snapshot_id_mapping[snapshot_id]].table_info.json()
+                        if snapshot_id in snapshot_id_mapping
+                        else None
+                    ),
+                }
+                for snapshot_id, (fingerprint, _) in zip(snapshot_ids, results)
+            ]
+        )
+
+        if new_snapshots_to_push:
+            logger.info("Pushing %s migrated snapshots", len(new_snapshots_to_push))
+            self._push_snapshots(new_snapshots_to_push)
+        self.engine_adapter.insert_append(
+            self.migration_checkpoints_table,
+            checkpoints,
+            columns_to_types=self._migration_checkpoint_columns_to_types,
+        )
+
+    def _fingerprints_from_nodes(
+        self, snapshot_ids: t.Collection[SnapshotId], dag: DAG[SnapshotId]
+    ) -> t.Dict[SnapshotId, SnapshotFingerprint]:
+        """Computes the fingerprints of snapshots from their stored nodes and the nodes of their ancestors.
+
+        This is the fallback for parents whose fingerprints couldn't be computed from the fingerprints of
+        their own parents, so that their descendants don't keep stale fingerprints.
+        """
+        nodes: t.Dict[SnapshotId, Node] = {}
+        seen: t.Set[SnapshotId] = set()
+        to_fetch = set(snapshot_ids)
+        while to_fetch:
+            seen.update(to_fetch)
+            for snapshot_id, raw_snapshot_row in self._get_raw_snapshots(to_fetch).items():
+                nodes[snapshot_id] = Snapshot.parse_obj(_raw_snapshot(raw_snapshot_row)).node
+            to_fetch = {p_id for s_id in to_fetch for p_id in dag.graph.get(s_id, ())} - seen
+
+        fingerprints = {}
+        for snapshot_id in snapshot_ids:
+            if snapshot_id not in nodes:
+                raise SQLMeshError(
+                    f"Could not compute the fingerprint of {snapshot_id}: the snapshot was not found."
+                )
+
+            ancestor_nodes: t.Dict[str, Node] = {}
+            queue = {snapshot_id}
+            visited: t.Set[SnapshotId] = set()
+            while queue:
+                next_snapshot_id = queue.pop()
+                if next_snapshot_id in visited or next_snapshot_id not in nodes:
+                    continue
+                visited.add(next_snapshot_id)
+                ancestor_nodes[next_snapshot_id.name] = nodes[next_snapshot_id]
+                queue.update(dag.graph.get(next_snapshot_id, ()))
+
+            try:
+                fingerprints[snapshot_id] = fingerprint_from_node(
+                    nodes[snapshot_id], nodes=ancestor_nodes
+                )
+            except Exception as ex:
+                raise SQLMeshError(
+                    f"Could not compute the fingerprint of {snapshot_id}: {ex}"
+                ) from ex
+
+        return fingerprints
+
+    def _get_snapshot_dag(self, snapshots: t.Optional[t.Set[SnapshotId]]) -> DAG[SnapshotId]:
+        """Builds the DAG of snapshots to migrate from the parent IDs in their headers."""
+        parents: t.Dict[SnapshotId, t.List[t.Dict[str, str]]] = {}
+        snapshot_ids_without_header = []
+        for where in self._snapshot_filters(snapshots):
+            for name, identifier, header in fetchall(
+                self.engine_adapter,
+                exp.select("name", "identifier", "header")
+                .from_(self.snapshot_state.snapshots_table)
+                .where(where),
+            ):
+                snapshot_id = SnapshotId(name=name, identifier=identifier)
+                if header is None:
+                    snapshot_ids_without_header.append(snapshot_id)
+                else:
+                    parents[snapshot_id] = json.loads(header).get("parents", [])
+
+        for where in self._snapshot_filters(snapshot_ids_without_header):
+            for name, identifier, serialized_snapshot in fetchall(
+                self.engine_adapter,
+                exp.select("name", "identifier", "snapshot")
+                .from_(self.snapshot_state.snapshots_table)
+                .where(where),
+            ):
+                parents[SnapshotId(name=name, identifier=identifier)] = json.loads(
+                    serialized_snapshot
+                ).get("parents", [])
+
+        dag: DAG[SnapshotId] = DAG()
+        for snapshot_id, raw_parent_ids in parents.items():
+            parent_ids = (SnapshotId.parse_obj(p_id) for p_id in raw_parent_ids)
+            dag.add(snapshot_id, [p_id for p_id in parent_ids if p_id in parents])
+        return dag
+
+    def _get_raw_snapshots(
+        self, snapshots: t.Optional[t.Collection[SnapshotId]]
+    ) -> t.Dict[SnapshotId, RawSnapshotRow]:
+        """Fetches and locks snapshot rows without parsing them."""
+        rows = [
+            row
+            for where in self._snapshot_filters(snapshots)
+            for row in fetchall(
+                self.engine_adapter,
+                exp.select(
+                    "name",
+                    "identifier",
+                    "snapshot",
+                    "updated_ts",
+                    "unpaused_ts",
+                    "unrestorable",
+                )
+                .from_(self.snapshot_state.snapshots_table)
+                .where(where)
+                .lock(),
+            )
+        ]
+        serialized_snapshots = self.snapshot_state.resolve_blobs([row[2] for row in rows])
+        return {
+            SnapshotId(name=name, identifier=identifier): (
+                serialized_snapshot,
+                {
+                    "updated_ts": updated_ts,
+                    "unpaused_ts": unpaused_ts,
+                    "unrestorable": unrestorable,
+                },
+            )
+            for serialized_snapshot, (
+                name,
+                identifier,
+                _,
+                updated_ts,
+                unpaused_ts,
+                unrestorable,
+            ) in zip(serialized_snapshots, rows)
+        }
+
+    def _get_migration_checkpoints(
+        self, snapshot_ids: t.Collection[SnapshotId]
+    ) -> t.Iterator[t.Tuple[SnapshotId, t.Optional[str], t.Optional[str]]]:
+        for where in self._snapshot_filters(snapshot_ids):
+            for name, identifier, fingerprint, table_info in fetchall(
+                self.engine_adapter,
+                exp.select("name", "identifier", "fingerprint", "table_info")
+                .from_(self.migration_checkpoints_table)
+                .where(where),
+            ):
+                yield (
+                    SnapshotId(name=name, identifier=identifier),
+                    fingerprint,
+                    table_info,
+                )
+
+    def _snapshot_filters(
+        self, snapshots: t.Optional[t.Collection[SnapshotId]]
+    ) -> t.Iterable[t.Optional[exp.Condition]]:
+        if snapshots is None:
+            return [None]
+        return snapshot_id_filter(
+            self.engine_adapter, snapshots, batch_size=self.SNAPSHOT_BATCH_SIZE
+        )
+
     def _migrate_environment_rows(
         self,
         environments: t.List[Environment],
@@ -396,7 +794,9 @@ class StateMigrator:
         if updated_prod_environment:
             try:
                 self.snapshot_state.unpause_snapshots(
-                    updated_prod_environment.snapshots, now_timestamp(), self.interval_state
+                    updated_prod_environment.snapshots,
+                    now_timestamp(),
+                    self.interval_state,
                 )
             except Exception:
                 logger.warning("Failed to unpause migrated snapshots", exc_info=True)
@@ -439,6 +839,80 @@ def _backup_table_name(table_name: TableName) -> exp.Table:
     return table
 
 
+def _topological_levels(dag: DAG[SnapshotId]) -> t.List[t.List[SnapshotId]]:
+    """Groups snapshots by the length of the longest path from a root snapshot."""
+    depths: t.Dict[SnapshotId, int] = {}
+    levels: t.List[t.List[SnapshotId]] = []
+    for snapshot_id in dag.sorted:
+        depth = max((depths[p_id] + 1 for p_id in dag.graph[snapshot_id]), default=0)
+        depths[snapshot_id] = depth
+        if depth == len(levels):
+            levels.append([])
+        levels[depth].append(snapshot_id)
+    return levels
+
+
+def _raw_snapshot(raw_snapshot_row: RawSnapshotRow) -> t.Dict[str, t.Any]:
+    serialized_snapshot, fields = raw_snapshot_row
+    if isinstance(serialized_snapshot, dict):
+        return {**serialized_snapshot, **fields}
+    return {**json.loads(serialized_snapshot), **fields}
+
+
+def _migrate_snapshot(
+    raw_snapshot_and_parent_fingerprints: t.Tuple[
+        RawSnapshotRow, t.Dict[str, t.Optional[SnapshotFingerprint]]
+    ],
+) -> t.Tuple[t.Optional[SnapshotFingerprint], t.Optional[Snapshot]]:
+    """Recomputes the fingerprint of a snapshot given the new fingerprints of its parents.
+
+    Returns:
+        The new fingerprint, or None if it couldn't be computed, and the migrated snapshot if the
+        fingerprint has changed.
+    """
+    raw_snapshot_row, parent_fingerprints = raw_snapshot_and_parent_fingerprints
+    snapshot = Snapshot.parse_obj(_raw_snapshot(raw_snapshot_row))
+
+    missing_parents = [name for name, fp in parent_fingerprints.items() if fp is None]
+    if missing_parents:
+        # Missing fingerprints are computed from the parents' nodes before a chunk is migrated.
+        raise SQLMeshError(
+            f"Could not migrate {snapshot.snapshot_id}: missing fingerprints of parents {', '.join(missing_parents)}"
+        )
+
+    try:
+        # Parents of embedded parents are only part of the snapshot's parents, not of its fingerprint
+        fingerprint = fingerprint_from_parents(
+            snapshot.node,
+            [
+                t.cast(SnapshotFingerprint, fp)
+                for name, fp in parent_fingerprints.items()
+                if name in snapshot.node.depends_on
+            ],
+        )
+    except Exception:
+        logger.exception("Could not compute fingerprint for %s", snapshot.snapshot_id)
+        return None, None
+
+    if fingerprint == snapshot.fingerprint:
+        logger.debug(f"{snapshot.snapshot_id} is unchanged.")
+        return fingerprint, None
+
+    new_snapshot = deepcopy(snapshot)
+    new_snapshot.fingerprint = fingerprint
+    new_snapshot.parents = tuple(
+        SnapshotId(name=name, identifier=t.cast(SnapshotFingerprint, fp).to_identifier())
+        for name, fp in parent_fingerprints.items()
+    )
+    # Reset the effective_from date for the new snapshot to avoid unexpected backfills.
+    new_snapshot.effective_from = None
+    new_snapshot.previous_versions = snapshot.all_versions
+    new_snapshot.migrated = True
+    if not new_snapshot.dev_version_:
+        new_snapshot.dev_version_ = snapshot.dev_version
+    return fingerprint, new_snapshot
+
+
 class LazilyParsedSnapshots:
     def __init__(self, raw_snapshots: t.Dict[SnapshotId, t.Dict[str, t.Any]]):
         self._raw_snapshots = raw_snapshots
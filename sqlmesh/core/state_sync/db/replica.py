@@ -0,0 +1,553 @@
+from __future__ import annotations
+
+import threading
+import typing as t
+
+from sqlglot import exp
+
+from sqlmesh.core.snapshot import SnapshotId, SnapshotNameVersion
+from sqlmesh.core.state_sync.base import SCHEMA_VERSION, DelegatingStateSync, StateReader
+from sqlmesh.core.state_sync.db.facade import EngineAdapterStateSync
+from sqlmesh.core.state_sync.db.utils import (
+    create_batches,
+    fetchall,
+    fetchone,
+    snapshot_id_filter,
+    snapshot_name_version_filter,
+)
+from sqlmesh.utils.date import now_timestamp
+
+
+class ReadReplicaStateSync(DelegatingStateSync):
+    """Serves reads from a local replica of the state and writes through to the primary state sync.
+
+    The replica is a full copy of the state tables which is synced incrementally. Each sync starts by
+    comparing aggregate stats of the state tables between the primary and the replica in a single query, and
+    only the tables whose stats differ are synced: snapshots, environments and auto restatements by their
+    `updated_ts` and intervals by their `created_ts`. Row counts are compared after each incremental sync to
+    pick up deleted records, while intervals which have been compacted or updated in place are picked up by
+    comparing their stats per snapshot version. Reads are served from the replica as long as it has been
+    synced within the last `max_staleness` seconds. Writes made through this state sync are sent to the
+    primary and force a sync before the next read.
+
+    Args:
+        state_sync: The primary state sync.
+        replica: The state sync of the local replica. It must use the same schema as the primary.
+        max_staleness: The maximum number of seconds by which reads may lag behind the primary.
+    """
+
+    CURSOR_OVERLAP_MS = 10 * 60 * 1000
+    """Records updated this long before a cursor are fetched again to tolerate clock skew between writers."""
+
+    def __init__(
+        self,
+        state_sync: EngineAdapterStateSync,
+        replica: EngineAdapterStateSync,
+        max_staleness: int = 60,
+    ):
+        super().__init__(state_sync)
+        self.primary = state_sync
+        self.replica = replica
+        self.max_staleness = max_staleness
+
+        self._last_sync_ts: t.Optional[int] = None
+        self._is_replica_usable = False
+        self._is_replica_open = False
+        self._is_replica_broken = False
+        self._sync_lock = threading.RLock()
+
+    def sync(self) -> bool:
+        """Brings the replica up to date with the primary state.
+
+        Returns:
+            Whether the replica can serve reads. It can't if the primary state hasn't been migrated to the
+            schema version of this SQLMesh version.
+        """
+        with self._sync_lock:
+            sync_start_ts = now_timestamp()
+            self._open_replica()
+
+            primary_versions = self.primary.version_state.get_versions()
+            self._last_sync_ts = sync_start_ts
+            if primary_versions.schema_version != SCHEMA_VERSION:
+                self._is_replica_usable = False
+                return False
+
+            primary_stats = self._fetch_stats(self.primary)
+            with self.replica.engine_adapter.transaction():
+                if primary_versions != self.replica.version_state.get_versions():
+                    # Migrations rewrite records in place, so nothing that has been replicated can be trusted
+                    self._clear_replica()
+                    self.replica.version_state.update_versions(
+                        schema_version=primary_versions.schema_version,
+                        sqlglot_version=primary_versions.sqlglot_version,
+                        sqlmesh_version=primary_versions.sqlmesh_version,
+                    )
+                replica_stats = self._fetch_stats(self.replica)
+                if primary_stats.snapshots != replica_stats.snapshots:
+                    self._sync_snapshots(primary_stats.snapshots[0])
+                if primary_stats.auto_restatements != replica_stats.auto_restatements:
+                    self._sync_auto_restatements(primary_stats.auto_restatements[0])
+                if primary_stats.environments != replica_stats.environments:
+                    self._sync_environments(primary_stats.environments[0])
+                if primary_stats.intervals != replica_stats.intervals:
+                    self._sync_intervals(primary_stats.intervals)
+
+            self._is_replica_usable = True
+            return True
+
+    def recycle(self) -> None:
+        self.primary.recycle()
+        self.replica.recycle()
+
+    def close(self) -> None:
+        self.primary.close()
+        self.replica.close()
+
+    def _reader(self) -> StateReader:
+        with self._sync_lock:
+            if self._is_replica_broken:
+                return self.primary
+            if (
+                self._last_sync_ts is None
+                or now_timestamp() - self._last_sync_ts > self.max_staleness * 1000
+            ):
+                try:
+                    self.sync()
+                except Exception as ex:
+                    if self._is_replica_open:
+                        raise
+                    # The replica may be locked by another process, in which case reads fall back to the primary
+                    self.primary.console.log_warning(
+                        f"Failed to open the local state replica, reading state from the primary state connection instead: {ex}"
+                    )
+                    self._is_replica_broken = True
+                    return self.primary
+            return self.replica if self._is_replica_usable else self.primary
+
+    def _invalidate(self) -> None:
+        self._last_sync_ts = None
+
+    def _open_replica(self) -> None:
+        if self._is_replica_open:
+            return
+        if self.replica.version_state.get_versions().schema_version != SCHEMA_VERSION:
+            self.replica.remove_state()
+            self.replica.migrate(default_catalog=None, skip_backup=True)
+        self._is_replica_open = True
+
+    def _clear_replica(self) -> None:
+        for table in (
+            self.replica.snapshot_state.snapshots_table,
+            self.replica.snapshot_state.blobs_table,
+            self.replica.snapshot_state.blob_refs_table,
+            self.replica.snapshot_state.auto_restatements_table,
+            self.replica.environment_state.environments_table,
+            self.replica.environment_state.environment_statements_table,
+            self.replica.environment_state.environment_snapshots_table,
+            self.replica.interval_state.intervals_table,
+        ):
+            self.replica.engine_adapter.delete_from(table, "TRUE")
+
+    def _sync_snapshots(self, primary_count: int) -> None:
+        primary_state = self.primary.snapshot_state
+        replica_state = self.replica.snapshot_state
+
+        cursor = self._max_value(replica_state.snapshots_table, "updated_ts")
+        updated_ids = self._copy_snapshots(where=self._cursor_filter(cursor))
+
+        if self._count(replica_state.snapshots_table) == primary_count:
+            return
+
+        # Some snapshots have been deleted or were written with an earlier timestamp
+        primary_ids = self._snapshot_ids(self.primary)
+        replica_ids = self._snapshot_ids(self.replica)
+        replica_state.delete_snapshots(replica_ids - primary_ids)
+        missing_ids = primary_ids - replica_ids - updated_ids
+        if not missing_ids:
+            return
+        for id_filter in snapshot_id_filter(
+            self.primary.engine_adapter, missing_ids, batch_size=replica_state.SNAPSHOT_BATCH_SIZE
+        ):
+            self._copy_snapshots(where=id_filter)
+
+    def _copy_snapshots(self, where: t.Optional[exp.Expression]) -> t.Set[SnapshotId]:
+        primary_state = self.primary.snapshot_state
+        replica_state = self.replica.snapshot_state
+
+        rows = self._fetch_rows(
+            primary_state.snapshots_table, replica_state._snapshot_columns_to_types, where=where
+        )
+        snapshot_ids = {SnapshotId(name=row[0], identifier=row[1]) for row in rows}
+        if not snapshot_ids:
+            return snapshot_ids
+
+        for id_filter in snapshot_id_filter(
+            self.replica.engine_adapter, snapshot_ids, batch_size=replica_state.SNAPSHOT_BATCH_SIZE
+        ):
+            self.replica.engine_adapter.delete_from(replica_state.snapshots_table, where=id_filter)
+            self.replica.engine_adapter.delete_from(replica_state.blob_refs_table, where=id_filter)
+        self._insert_rows(
+            replica_state.snapshots_table, replica_state._snapshot_columns_to_types, rows
+        )
+
+        blob_refs = []
+        for id_filter in snapshot_id_filter(
+            self.primary.engine_adapter, snapshot_ids, batch_size=primary_state.SNAPSHOT_BATCH_SIZE
+        ):
+            blob_refs.extend(
+                self._fetch_rows(
+                    primary_state.blob_refs_table,
+                    replica_state._blob_ref_columns_to_types,
+                    where=id_filter,
+                )
+            )
+        self._insert_rows(
+            replica_state.blob_refs_table, replica_state._blob_ref_columns_to_types, blob_refs
+        )
+
+        # Blobs are immutable, so only the ones which haven't been replicated yet are fetched
+        missing_hashes = {blob_hash for _, _, blob_hash in blob_refs}
+        for batch in create_batches(
+            sorted(missing_hashes), batch_size=replica_state.SNAPSHOT_BATCH_SIZE
+        ):
+            for (blob_hash,) in fetchall(
+                self.replica.engine_adapter,
+                exp.select("hash")
+                .from_(replica_state.blobs_table)
+                .where(exp.column("hash").isin(*batch)),
+            ):
+                missing_hashes.discard(blob_hash)
+        for batch in create_batches(
+            sorted(missing_hashes), batch_size=replica_state.SNAPSHOT_BATCH_SIZE
+        ):
+            self._copy_rows(
+                primary_state.blobs_table,
+                replica_state.blobs_table,
+                replica_state._blob_columns_to_types,
+                where=exp.column("hash").isin(*batch),
+            )
+
+        return snapshot_ids
+
+    def _sync_auto_restatements(self, primary_count: int) -> None:
+        primary_table = self.primary.snapshot_state.auto_restatements_table
+        replica_state = self.replica.snapshot_state
+        replica_table = replica_state.auto_restatements_table
+        columns_to_types = replica_state._auto_restatement_columns_to_types
+
+        cursor = self._max_value(replica_table, "updated_ts")
+        rows = self._fetch_rows(primary_table, columns_to_types, where=self._cursor_filter(cursor))
+        for where in snapshot_name_version_filter(
+            self.replica.engine_adapter,
+            [SnapshotNameVersion(name=row[0], version=row[1]) for row in rows],
+            column_prefix="snapshot",
+            alias=None,
+            batch_size=replica_state.SNAPSHOT_BATCH_SIZE,
+        ):
+            self.replica.engine_adapter.delete_from(replica_table, where=where)
+        self._insert_rows(replica_table, columns_to_types, rows)
+
+        if self._count(replica_table) != primary_count:
+            # Records have been removed, there is at most one per snapshot version so they're cheap to copy in full
+            self.replica.engine_adapter.delete_from(replica_table, "TRUE")
+            self._copy_rows(primary_table, replica_table, columns_to_types)
+
+    def _sync_environments(self, primary_count: int) -> None:
+        primary_state = self.primary.environment_state
+        replica_state = self.replica.environment_state
+
+        # Environments are stamped whenever they are promoted, finalized or invalidated
+        cursor = self._max_value(replica_state.environments_table, "updated_ts")
+        changed_names = self._environment_names(self.primary, where=self._cursor_filter(cursor))
+        self._copy_environments(changed_names)
+
+        if self._count(replica_state.environments_table) == primary_count:
+            return
+
+        # Some environments have been deleted or were written with an earlier timestamp
+        primary_names = self._environment_names(self.primary)
+        replica_names = self._environment_names(self.replica)
+        self._copy_environments(
+            (primary_names - replica_names - changed_names) | (replica_names - primary_names)
+        )
+
+    def _copy_environments(self, names: t.Collection[str]) -> None:
+        primary_state = self.primary.environment_state
+        replica_state = self.replica.environment_state
+
+        tables = (
+            (
+                primary_state.environments_table,
+                replica_state.environments_table,
+                replica_state._environment_columns_to_types,
+                "name",
+            ),
+            (
+                primary_state.environment_statements_table,
+                replica_state.environment_statements_table,
+                replica_state._environment_statements_columns_to_types,
+                "environment_name",
+            ),
+            (
+                primary_state.environment_snapshots_table,
+                replica_state.environment_snapshots_table,
+                replica_state._environment_snapshots_columns_to_types,
+                "environment_name",
+            ),
+        )
+        for batch in create_batches(sorted(names), batch_size=100):
+            for primary_table, replica_table, columns_to_types, name_column in tables:
+                name_filter = exp.column(name_column).isin(*batch)
+                self.replica.engine_adapter.delete_from(replica_table, where=name_filter)
+                self._copy_rows(primary_table, replica_table, columns_to_types, where=name_filter)
+
+    def _sync_intervals(self, primary_stats: t.Tuple[t.Any, ...]) -> None:
+        primary_table = self.primary.interval_state.intervals_table
+        replica_table = self.replica.interval_state.intervals_table
+        columns_to_types = self.replica.interval_state._interval_columns_to_types
+
+        cursor = self._max_value(replica_table, "created_ts")
+        if cursor is not None:
+            since = cursor - self.CURSOR_OVERLAP_MS
+            rows = self._fetch_rows(
+                primary_table, columns_to_types, where=exp.column("created_ts") > since
+            )
+            replicated_ids = {
+                row[0]
+                for row in fetchall(
+                    self.replica.engine_adapter,
+                    exp.select("id").from_(replica_table).where(exp.column("created_ts") > since),
+                )
+            }
+            self._insert_rows(
+                replica_table,
+                columns_to_types,
+                [row for row in rows if row[0] not in replicated_ids],
+            )
+            if self._fetch_stats(self.replica).intervals == primary_stats:
+                return
+
+        # Intervals have been compacted, removed or updated in place, which rewrites records of arbitrary age.
+        # Only the snapshot versions whose records differ are copied again.
+        primary_version_stats = self._interval_stats_per_version(self.primary)
+        replica_version_stats = self._interval_stats_per_version(self.replica)
+        changed_versions = [
+            SnapshotNameVersion(name=name, version=version)
+            for name, version in primary_version_stats.keys() | replica_version_stats.keys()
+            if primary_version_stats.get((name, version))
+            != replica_version_stats.get((name, version))
+        ]
+        for where in snapshot_name_version_filter(
+            self.replica.engine_adapter,
+            changed_versions,
+            alias=None,
+            batch_size=self.replica.interval_state.SNAPSHOT_BATCH_SIZE,
+        ):
+            self.replica.engine_adapter.delete_from(replica_table, where=where)
+            self._copy_rows(primary_table, replica_table, columns_to_types, where=where)
+
+    def _fetch_stats(self, state_sync: EngineAdapterStateSync) -> _StateStats:
+        """Fetches the stats of all state tables in a single query."""
+        aggregates = {
+            "snapshots": (
+                state_sync.snapshot_state.snapshots_table,
+                _updated_ts_stats_aggregates(),
+            ),
+            "auto_restatements": (
+                state_sync.snapshot_state.auto_restatements_table,
+                _updated_ts_stats_aggregates(),
+            ),
+            "environments": (
+                state_sync.environment_state.environments_table,
+                _updated_ts_stats_aggregates(),
+            ),
+            "intervals": (
+                state_sync.interval_state.intervals_table,
+                _interval_stats_aggregates(),
+            ),
+        }
+        row = fetchone(
+            state_sync.engine_adapter,
+            exp.select(
+                *(
+                    exp.select(aggregate).from_(table).subquery()
+                    for table, table_aggregates in aggregates.values()
+                    for aggregate in table_aggregates
+                )
+            ),
+        )
+        values = iter(row or ())
+        return _StateStats(
+            **{
+                field: tuple(next(values, None) for _ in table_aggregates)
+                for field, (_, table_aggregates) in aggregates.items()
+            }
+        )
+
+    def _interval_stats_per_version(
+        self, state_sync: EngineAdapterStateSync
+    ) -> t.Dict[t.Tuple[str, str], t.Tuple[t.Any, ...]]:
+        name = exp.column("name")
+        version = exp.column("version")
+        return {
+            (row[0], row[1]): tuple(row[2:])
+            for row in fetchall(
+                state_sync.engine_adapter,
+                exp.select(name, version, *_interval_stats_aggregates())
+                .from_(state_sync.interval_state.intervals_table)
+                .group_by(name, version),
+            )
+        }
+
+    def _environment_names(
+        self, state_sync: EngineAdapterStateSync, where: t.Optional[exp.Expression] = None
+    ) -> t.Set[str]:
+        query = exp.select("name").from_(state_sync.environment_state.environments_table)
+        if where is not None:
+            query = query.where(where)
+        return {name for (name,) in fetchall(state_sync.engine_adapter, query)}
+
+    def _snapshot_ids(self, state_sync: EngineAdapterStateSync) -> t.Set[SnapshotId]:
+        return {
+            SnapshotId(name=name, identifier=identifier)
+            for name, identifier in fetchall(
+                state_sync.engine_adapter,
+                exp.select("name", "identifier").from_(state_sync.snapshot_state.snapshots_table),
+            )
+        }
+
+    def _max_value(self, table: exp.Table, column: str) -> t.Optional[int]:
+        row = fetchone(
+            self.replica.engine_adapter, exp.select(exp.func("MAX", column)).from_(table)
+        )
+        return row[0] if row else None
+
+    def _cursor_filter(self, cursor: t.Optional[int]) -> t.Optional[exp.Expression]:
+        if cursor is None:
+            return None
+        return exp.column("updated_ts") > cursor - self.CURSOR_OVERLAP_MS
+
+    def _count(self, table: exp.Table) -> int:
+        row = fetchone(
+            self.replica.engine_adapter, exp.select(exp.func("COUNT", exp.Star())).from_(table)
+        )
+        return row[0] if row else 0
+
+    def _copy_rows(
+        self,
+        source_table: exp.Table,
+        target_table: exp.Table,
+        columns_to_types: t.Dict[str, exp.DataType],
+        where: t.Optional[exp.Expression] = None,
+    ) -> None:
+        self._insert_rows(
+            target_table,
+            columns_to_types,
+            self._fetch_rows(source_table, columns_to_types, where=where),
+        )
+
+    def _fetch_rows(
+        self,
+        table: exp.Table,
+        columns_to_types: t.Dict[str, exp.DataType],
+        where: t.Optional[exp.Expression] = None,
+    ) -> t.List[t.Tuple]:
+        query = exp.select(*columns_to_types).from_(table)
+        if where is not None:
+            query = query.where(where)
+        return fetchall(self.primary.engine_adapter, query)
+
+    def _insert_rows(
+        self,
+        table: exp.Table,
+        columns_to_types: t.Dict[str, exp.DataType],
+        rows: t.List[t.Tuple],
+    ) -> None:
+        if not rows:
+            return
+
+        import pandas as pd
+
+        self.replica.engine_adapter.insert_append(
+            table,
+            pd.DataFrame(rows, columns=list(columns_to_types)),
+            columns_to_types=columns_to_types,
+        )
+
+
+class _StateStats(t.NamedTuple):
+    """The number of records and the latest update timestamp of each table, and the stats of interval records."""
+
+    snapshots: t.Tuple[t.Any, ...]
+    auto_restatements: t.Tuple[t.Any, ...]
+    environments: t.Tuple[t.Any, ...]
+    intervals: t.Tuple[t.Any, ...]
+
+
+def _updated_ts_stats_aggregates() -> t.List[exp.Expression]:
+    return [exp.func("COUNT", exp.Star()), exp.func("MAX", exp.column("updated_ts"))]
+
+
+def _interval_stats_aggregates() -> t.List[exp.Expression]:
+    # Records are only ever updated in place to clear their identifier and dev version
+    return [
+        exp.func("COUNT", exp.Star()),
+        exp.func("COUNT", exp.column("identifier")),
+        exp.func("COUNT", exp.column("dev_version")),
+        exp.func("MAX", exp.column("created_ts")),
+    ]
+
+
+def _create_read_method(name: str) -> t.Callable:
+    def read(self: ReadReplicaStateSync, *args: t.Any, **kwargs: t.Any) -> t.Any:
+        return getattr(self._reader(), name)(*args, **kwargs)
+
+    return read
+
+
+def _create_write_method(name: str) -> t.Callable:
+    def write(self: ReadReplicaStateSync, *args: t.Any, **kwargs: t.Any) -> t.Any:
+        try:
+            return getattr(self.primary, name)(*args, **kwargs)
+        finally:
+            self._invalidate()
+
+    return write
+
+
+for name in (
+    "get_snapshots",
+    "get_snapshot_headers",
+    "snapshots_exist",
+    "nodes_exist",
+    "get_environment",
+    "get_environment_summary",
+    "get_environments",
+    "get_environments_summary",
+    "max_interval_end_per_model",
+    "get_environment_statements",
+    "_get_versions",
+):
+    setattr(ReadReplicaStateSync, name, _create_read_method(name))
+
+# Expiration checks and exports always read from the primary since they act on the latest state
+for name in (
+    "push_snapshots",
+    "delete_snapshots",
+    "delete_expired_snapshots",
+    "invalidate_environment",
+    "remove_state",
+    "remove_intervals",
+    "promote",
+    "finalize",
+    "delete_expired_environments",
+    "unpause_snapshots",
+    "compact_intervals",
+    "migrate",
+    "rollback",
+    "add_snapshots_intervals",
+    "update_auto_restatements",
+    "import_",
+):
+    setattr(ReadReplicaStateSync, name, _create_write_method(name))
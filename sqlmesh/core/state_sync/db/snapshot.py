@@ -1,12 +1,13 @@
 from __future__ import annotations
 
 import typing as t
+import base64
+import hashlib
 import json
 import logging
 from pathlib import Path
 from collections import defaultdict
 from sqlglot import exp
-from pydantic import Field
 
 from sqlmesh.core import constants as c
 from sqlmesh.core.engine_adapter import EngineAdapter
@@ -17,8 +18,7 @@ from sqlmesh.core.state_sync.db.utils import (
     fetchall,
     create_batches,
 )
-from sqlmesh.core.node import IntervalUnit
-from sqlmesh.core.environment import Environment
+from sqlmesh.core.state_sync.base import SCHEMA_VERSION
 from sqlmesh.core.model import SeedModel, ModelKindName
 from sqlmesh.core.snapshot.cache import SnapshotCache
 from sqlmesh.core.snapshot import (
@@ -29,22 +29,40 @@ from sqlmesh.core.snapshot import (
     SnapshotInfoLike,
     Snapshot,
     SnapshotId,
-    SnapshotFingerprint,
-    SnapshotChangeCategory,
+    SnapshotHeader,
 )
-from sqlmesh.utils.migration import index_text_type, blob_text_type
-from sqlmesh.utils.date import now_timestamp, TimeLike, now, to_timestamp
-from sqlmesh.utils.pydantic import PydanticModel
-from sqlmesh.utils import unique
+from sqlmesh.core.snapshot.definition import Interval
+from sqlmesh.utils.migration import (
+    index_text_type,
+    blob_text_type,
+    fetch_rows_in_batches,
+    update_column_by_key,
+)
+from sqlmesh.utils.date import now_timestamp, TimeLike, now
+from sqlmesh.utils import optional_import, unique
+from sqlmesh.utils.errors import SQLMeshError
+from sqlmesh.utils.pydantic import TRUSTED_CONTEXT_KEY
 
 if t.TYPE_CHECKING:
     import pandas as pd
 
     from sqlmesh.core.state_sync.db.interval import IntervalState
+    from sqlmesh.core.state_sync.db.version import VersionState
 
 
 logger = logging.getLogger(__name__)
 
+BLOB_REFERENCE_KEY = "__sqlmesh_blob__"
+"""The key of the JSON object that replaces a serialized value which was moved to the blobs table."""
+BLOB_MIN_SIZE = 256
+"""The minimum size of a serialized value for it to be moved to the blobs table."""
+BLOB_GC_GRACE_PERIOD_MS = 60 * 60 * 1000
+"""Unreferenced blobs are only deleted once they haven't been referenced by a push for this long."""
+
+# A snapshot as stored in the state, or its deserialized form if blob references had to be resolved
+SerializedSnapshot = t.Union[str, bytes, t.Dict[str, t.Any]]
+_ZSTD_BLOB_PREFIX = "zstd:"
+
 
 class SnapshotState:
     SNAPSHOT_BATCH_SIZE = 1000
@@ -54,10 +72,17 @@ class SnapshotState:
         engine_adapter: EngineAdapter,
         schema: t.Optional[str] = None,
         context_path: Path = Path(),
+        version_state: t.Optional[VersionState] = None,
+        compress_blobs: bool = False,
     ):
         self.engine_adapter = engine_adapter
+        self._version_state = version_state
+        self._schema_version_current = False
         self.snapshots_table = exp.table_("_snapshots", db=schema)
         self.auto_restatements_table = exp.table_("_auto_restatements", db=schema)
+        self.blobs_table = exp.table_("_snapshot_blobs", db=schema)
+        self.blob_refs_table = exp.table_("_snapshot_blob_refs", db=schema)
+        self._compress_blobs = compress_blobs
 
         index_type = index_text_type(engine_adapter.dialect)
         blob_type = blob_text_type(engine_adapter.dialect)
@@ -71,12 +96,27 @@ class SnapshotState:
             "unpaused_ts": exp.DataType.build("bigint"),
             "ttl_ms": exp.DataType.build("bigint"),
             "unrestorable": exp.DataType.build("boolean"),
+            "header": exp.DataType.build(blob_type),
+            "dev_version": exp.DataType.build(index_type),
+        }
+
+        self._blob_columns_to_types = {
+            "hash": exp.DataType.build(index_type),
+            "content": exp.DataType.build(blob_type),
+            "updated_ts": exp.DataType.build("bigint"),
+        }
+
+        self._blob_ref_columns_to_types = {
+            "name": exp.DataType.build(index_type),
+            "identifier": exp.DataType.build(index_type),
+            "hash": exp.DataType.build(index_type),
         }
 
         self._auto_restatement_columns_to_types = {
             "snapshot_name": exp.DataType.build(index_type),
             "snapshot_version": exp.DataType.build(index_type),
             "next_auto_restatement_ts": exp.DataType.build("bigint"),
+            "updated_ts": exp.DataType.build("bigint"),
         }
 
         self._snapshot_cache = SnapshotCache(context_path / c.CACHE)
@@ -97,14 +137,10 @@ class SnapshotState:
         for snapshot in snapshots:
             if isinstance(snapshot.node, SeedModel):
                 seed_model = t.cast(SeedModel, snapshot.node)
-                snapshot = snapshot.copy(update={"node": seed_model.to_dehydrated()})
+                snapshot = snapshot.copy(update={"node_": seed_model.to_dehydrated()})
             snapshots_to_store.append(snapshot)
 
-        self.engine_adapter.insert_append(
-            self.snapshots_table,
-            _snapshots_to_df(snapshots_to_store),
-            columns_to_types=self._snapshot_columns_to_types,
-        )
+        self._insert_snapshots(snapshots_to_store)
 
         for snapshot in snapshots:
             self._snapshot_cache.put(snapshot)
@@ -134,9 +170,26 @@ class SnapshotState:
             if s.snapshot_id in target_snapshot_ids
         }
 
+        # The full snapshots are only needed to compute the removal intervals of superseded snapshots,
+        # so they're fetched at once instead of one by one.
+        superseded_snapshot_ids: t.List[SnapshotId] = []
+        for snapshot in same_version_snapshots:
+            if snapshot.snapshot_id in target_snapshot_ids:
+                continue
+            target_snapshot = target_snapshots_by_version[(snapshot.name, snapshot.version)]
+            if (
+                target_snapshot.normalized_effective_from_ts
+                and not target_snapshot.disable_restatement
+            ):
+                superseded_snapshot_ids.append(snapshot.snapshot_id)
+        full_snapshots = (
+            self._get_snapshots(superseded_snapshot_ids) if superseded_snapshot_ids else {}
+        )
+
         unpaused_snapshots: t.Dict[int, t.List[SnapshotId]] = defaultdict(list)
         paused_snapshots: t.List[SnapshotId] = []
         unrestorable_snapshots: t.List[SnapshotId] = []
+        intervals_to_remove: t.List[t.Tuple[SnapshotInfoLike, Interval]] = []
 
         for snapshot in same_version_snapshots:
             is_target_snapshot = snapshot.snapshot_id in target_snapshot_ids
@@ -159,14 +212,12 @@ class SnapshotState:
                         snapshot.snapshot_id,
                         target_snapshot.snapshot_id,
                     )
-                    full_snapshot = snapshot.full_snapshot
-                    interval_state.remove_intervals(
-                        [
-                            (
-                                full_snapshot,
-                                full_snapshot.get_removal_interval(effective_from_ts, current_ts),
-                            )
-                        ]
+                    full_snapshot = full_snapshots[snapshot.snapshot_id]
+                    intervals_to_remove.append(
+                        (
+                            full_snapshot,
+                            full_snapshot.get_removal_interval(effective_from_ts, current_ts),
+                        )
                     )
 
                 if snapshot.unpaused_ts:
@@ -183,6 +234,9 @@ class SnapshotState:
                     snapshot.unrestorable = True
                     unrestorable_snapshots.append(snapshot.snapshot_id)
 
+        if intervals_to_remove:
+            interval_state.remove_intervals(intervals_to_remove)
+
         if unpaused_snapshots:
             for unpaused_ts, snapshot_ids in unpaused_snapshots.items():
                 self._update_snapshots(snapshot_ids, unpaused_ts=unpaused_ts)
@@ -195,21 +249,25 @@ class SnapshotState:
 
     def get_expired_snapshots(
         self,
-        environments: t.Iterable[Environment],
+        environment_snapshots_table: exp.Table,
         current_ts: int,
         ignore_ttl: bool = False,
-    ) -> t.List[SnapshotTableCleanupTask]:
-        """Aggregates the id's of the expired snapshots and creates a list of table cleanup tasks.
+    ) -> t.Iterator[SnapshotTableCleanupTask]:
+        """Aggregates the id's of the expired snapshots and creates table cleanup tasks.
 
         Expired snapshots are snapshots that have exceeded their time-to-live
         and are no longer in use within an environment.
 
+        Args:
+            environment_snapshots_table: The table which maps environments to their snapshots.
+            current_ts: The current timestamp.
+            ignore_ttl: Whether to ignore the time-to-live of snapshots.
+
         Returns:
-            The set of expired snapshot ids.
-            The list of table cleanup tasks.
+            An iterator over table cleanup tasks.
         """
         _, cleanup_targets = self._get_expired_snapshots(
-            environments=environments,
+            environment_snapshots_table=environment_snapshots_table,
             current_ts=current_ts,
             ignore_ttl=ignore_ttl,
         )
@@ -217,7 +275,143 @@ class SnapshotState:
 
     def _get_expired_snapshots(
         self,
-        environments: t.Iterable[Environment],
+        environment_snapshots_table: exp.Table,
+        current_ts: int,
+        ignore_ttl: bool = False,
+    ) -> t.Tuple[t.Set[SnapshotId], t.Iterator[SnapshotTableCleanupTask]]:
+        if not self.engine_adapter.SUPPORTS_CORRELATED_SUBQUERIES:
+            expired_snapshot_ids, cleanup_targets = self._get_expired_snapshots_in_batches(
+                environment_snapshots_table, current_ts, ignore_ttl
+            )
+            return expired_snapshot_ids, iter(cleanup_targets)
+
+        live_query = (
+            exp.select(
+                exp.column("name", table="live"),
+                exp.column("version", table="live"),
+                exp.column("dev_version", table="live"),
+            )
+            .from_(self.snapshots_table.as_("live"))
+            .where(
+                self._is_in_environment_expr("live", environment_snapshots_table)
+                if ignore_ttl
+                else exp.or_(
+                    self._is_live_by_ttl_expr("live", current_ts),
+                    self._is_in_environment_expr("live", environment_snapshots_table),
+                )
+            )
+        )
+        live_versions = (
+            exp.select("name", "version").distinct().from_(live_query.subquery("live_snapshots"))
+        )
+        live_dev_versions = (
+            exp.select("name", "dev_version")
+            .distinct()
+            .from_(live_query.subquery("live_snapshots"))
+        )
+
+        expired_filter: exp.Expression = exp.not_(
+            self._is_in_environment_expr("s", environment_snapshots_table)
+        )
+        if not ignore_ttl:
+            expired_filter = exp.and_(
+                exp.not_(self._is_live_by_ttl_expr("s", current_ts)), expired_filter
+            )
+
+        # A single statement returns every expired snapshot along with whether its physical table
+        # and its dev table are still shared with a snapshot that is not expired
+        expired_query = (
+            exp.select(
+                exp.column("name", table="s"),
+                exp.column("identifier", table="s"),
+                exp.column("version", table="s"),
+                exp.column("dev_version", table="s"),
+                exp.column("version", table="lv"),
+                exp.column("dev_version", table="ldv"),
+            )
+            .from_(self.snapshots_table.as_("s"))
+            .join(
+                live_versions.subquery("lv"),
+                on=exp.and_(
+                    exp.column("name", table="lv").eq(exp.column("name", table="s")),
+                    exp.column("version", table="lv").eq(exp.column("version", table="s")),
+                ),
+                join_type="left",
+            )
+            .join(
+                live_dev_versions.subquery("ldv"),
+                on=exp.and_(
+                    exp.column("name", table="ldv").eq(exp.column("name", table="s")),
+                    exp.column("dev_version", table="ldv").eq(exp.column("dev_version", table="s")),
+                ),
+                join_type="left",
+            )
+            .where(expired_filter)
+            .order_by(
+                exp.column("updated_ts", table="s"),
+                exp.column("name", table="s"),
+                exp.column("identifier", table="s"),
+            )
+        )
+
+        expired_snapshot_ids = set()
+        # Only one cleanup task is created per dev table that is no longer shared
+        last_by_dev_version: t.Dict[t.Tuple[str, str], t.Tuple[SnapshotId, str, bool]] = {}
+        for (
+            name,
+            identifier,
+            version,
+            dev_version,
+            live_version,
+            live_dev_version,
+        ) in fetchall(self.engine_adapter, expired_query):
+            snapshot_id = SnapshotId(name=name, identifier=identifier)
+            expired_snapshot_ids.add(snapshot_id)
+            if live_dev_version is None:
+                last_by_dev_version[(name, dev_version)] = (
+                    snapshot_id,
+                    version,
+                    live_version is not None,
+                )
+
+        # ...and the last of these tasks drops the physical table if no live snapshot shares it
+        dev_table_only_by_id: t.Dict[SnapshotId, bool] = {}
+        dropped_versions: t.Set[t.Tuple[str, str]] = set()
+        for snapshot_id, version, is_version_live in reversed(last_by_dev_version.values()):
+            name_version = (snapshot_id.name, version)
+            dev_table_only = is_version_live or name_version in dropped_versions
+            if not dev_table_only:
+                dropped_versions.add(name_version)
+            dev_table_only_by_id[snapshot_id] = dev_table_only
+        dev_table_only_by_id = dict(reversed(dev_table_only_by_id.items()))
+
+        return expired_snapshot_ids, self._iter_cleanup_tasks(dev_table_only_by_id)
+
+    def _iter_cleanup_tasks(
+        self, dev_table_only_by_id: t.Dict[SnapshotId, bool]
+    ) -> t.Iterator[SnapshotTableCleanupTask]:
+        for snapshot_ids_batch in create_batches(
+            list(dev_table_only_by_id), batch_size=self.SNAPSHOT_BATCH_SIZE
+        ):
+            headers = {
+                header.snapshot_id: header
+                for header in self._get_snapshot_headers(
+                    snapshot_id_filter(
+                        self.engine_adapter,
+                        snapshot_ids_batch,
+                        batch_size=self.SNAPSHOT_BATCH_SIZE,
+                    )
+                )
+            }
+            for snapshot_id in snapshot_ids_batch:
+                if snapshot_id in headers:
+                    yield self._create_cleanup_task(
+                        headers[snapshot_id], dev_table_only_by_id[snapshot_id]
+                    )
+
+    def _get_expired_snapshots_in_batches(
+        self,
+        environment_snapshots_table: exp.Table,
         current_ts: int,
         ignore_ttl: bool = False,
     ) -> t.Tuple[t.Set[SnapshotId], t.List[SnapshotTableCleanupTask]]:
@@ -228,26 +422,25 @@ class SnapshotState:
                 (exp.column("updated_ts") + exp.column("ttl_ms")) <= current_ts
             )
 
+        promoted_snapshot_ids = {
+            SnapshotId(name=name, identifier=identifier)
+            for name, identifier in fetchall(
+                self.engine_adapter,
+                exp.select("name", "identifier").distinct().from_(environment_snapshots_table),
+            )
+        }
         expired_candidates = {
             SnapshotId(name=name, identifier=identifier): SnapshotNameVersion(
                 name=name, version=version
             )
             for name, identifier, version in fetchall(self.engine_adapter, expired_query)
+            if SnapshotId(name=name, identifier=identifier) not in promoted_snapshot_ids
         }
         if not expired_candidates:
             return set(), []
 
-        promoted_snapshot_ids = {
-            snapshot.snapshot_id
-            for environment in environments
-            for snapshot in environment.snapshots
-        }
-
-        def _is_snapshot_used(snapshot: SharedVersionSnapshot) -> bool:
-            return (
-                snapshot.snapshot_id in promoted_snapshot_ids
-                or snapshot.snapshot_id not in expired_candidates
-            )
+        def _is_snapshot_used(snapshot: SnapshotHeader) -> bool:
+            return snapshot.snapshot_id not in expired_candidates
 
         unique_expired_versions = unique(expired_candidates.values())
         version_batches = create_batches(
@@ -256,7 +449,10 @@ class SnapshotState:
         cleanup_targets = []
         expired_snapshot_ids = set()
         for versions_batch in version_batches:
-            snapshots = self._get_snapshots_with_same_version(versions_batch)
+            snapshots = sorted(
+                self._get_snapshots_with_same_version(versions_batch),
+                key=lambda s: (s.updated_ts, s.name, s.identifier),
+            )
 
             snapshots_by_version = defaultdict(set)
             snapshots_by_dev_version = defaultdict(set)
@@ -278,14 +474,40 @@ class SnapshotState:
 
                 if not shared_dev_version_snapshots:
                     cleanup_targets.append(
-                        SnapshotTableCleanupTask(
-                            snapshot=snapshot.full_snapshot.table_info,
-                            dev_table_only=bool(shared_version_snapshots),
-                        )
+                        self._create_cleanup_task(snapshot, bool(shared_version_snapshots))
                     )
 
         return expired_snapshot_ids, cleanup_targets
 
+    def _create_cleanup_task(
+        self, snapshot: SnapshotHeader, dev_table_only: bool
+    ) -> SnapshotTableCleanupTask:
+        if snapshot.table_info is None:
+            raise SQLMeshError(f"Snapshot {snapshot.snapshot_id} has not been categorized yet.")
+        return SnapshotTableCleanupTask(snapshot=snapshot.table_info, dev_table_only=dev_table_only)
+
+    def _is_live_by_ttl_expr(self, alias: str, current_ts: int) -> exp.Expression:
+        return (
+            exp.column("updated_ts", table=alias) + exp.column("ttl_ms", table=alias)
+        ) > current_ts
+
+    def _is_in_environment_expr(
+        self, alias: str, environment_snapshots_table: exp.Table
+    ) -> exp.Expression:
+        es_alias = f"{alias}_es"
+        return exp.Exists(
+            this=exp.select("1")
+            .from_(environment_snapshots_table.as_(es_alias))
+            .where(
+                exp.and_(
+                    exp.column("name", table=es_alias).eq(exp.column("name", table=alias)),
+                    exp.column("identifier", table=es_alias).eq(
+                        exp.column("identifier", table=alias)
+                    ),
+                )
+            )
+        )
+
     def delete_snapshots(self, snapshot_ids: t.Iterable[SnapshotIdLike]) -> None:
         """Deletes snapshots.
 
@@ -298,6 +520,21 @@ class SnapshotState:
             self.engine_adapter, snapshot_ids, batch_size=self.SNAPSHOT_BATCH_SIZE
         ):
             self.engine_adapter.delete_from(self.snapshots_table, where=where)
+            self.engine_adapter.delete_from(self.blob_refs_table, where=where)
+
+        # Blobs are shared between snapshots, so only the ones which are no longer referenced are deleted.
+        # A concurrent push may be about to reference an existing blob, which is why it stamps the blob
+        # first and recently stamped blobs are kept.
+        self.engine_adapter.delete_from(
+            self.blobs_table,
+            where=exp.and_(
+                exp.func("COALESCE", exp.column("updated_ts"), exp.Literal.number(0))
+                < now_timestamp() - BLOB_GC_GRACE_PERIOD_MS,
+                exp.column("hash")
+                .isin(query=exp.select("hash").from_(self.blob_refs_table))
+                .not_(),
+            ),
+        )
 
     def touch_snapshots(self, snapshot_ids: t.Iterable[SnapshotIdLike]) -> None:
         """Touch snapshots to set their updated_ts to the current timestamp.
@@ -321,6 +558,29 @@ class SnapshotState:
         """
         return self._get_snapshots(snapshot_ids)
 
+    def get_snapshot_headers(
+        self,
+        snapshot_ids: t.Iterable[SnapshotIdLike],
+    ) -> t.Dict[SnapshotId, SnapshotHeader]:
+        """Fetches snapshot headers without fetching and parsing the snapshots' nodes.
+
+        Args:
+            snapshot_ids: The snapshot IDs to fetch.
+
+        Returns:
+            A dictionary of snapshot IDs to snapshot headers.
+        """
+        headers: t.Dict[SnapshotId, SnapshotHeader] = {}
+        for header in self._get_snapshot_headers(
+            snapshot_id_filter(
+                self.engine_adapter, snapshot_ids, batch_size=self.SNAPSHOT_BATCH_SIZE
+            )
+        ):
+            other = headers.get(header.snapshot_id)
+            if other is None or header.updated_ts > other.updated_ts:
+                headers[header.snapshot_id] = header
+        return headers
+
     def snapshots_exist(self, snapshot_ids: t.Iterable[SnapshotIdLike]) -> t.Set[SnapshotId]:
         """Checks if snapshots exist.
 
@@ -395,6 +655,48 @@ class SnapshotState:
             columns_to_types=self._auto_restatement_columns_to_types,
         )
 
+    def backfill_headers(self) -> None:
+        """Populates the headers of snapshot records that were written before headers were introduced.
+
+        Records are processed in batches and updated in place. Records that can't be parsed are left
+        without a header, in which case it's derived from the full snapshot when read.
+        """
+        for rows in fetch_rows_in_batches(
+            self.engine_adapter,
+            self.snapshots_table,
+            ["name", "identifier", "snapshot", "updated_ts", "unpaused_ts", "unrestorable"],
+            batch_size=self.SNAPSHOT_BATCH_SIZE,
+            where=exp.column("header").is_(exp.null()),
+        ):
+            serialized_snapshots = self.resolve_blobs([row[2] for row in rows])
+            headers = {}
+            for (
+                name,
+                identifier,
+                _,
+                updated_ts,
+                unpaused_ts,
+                unrestorable,
+            ), serialized_snapshot in zip(rows, serialized_snapshots):
+                try:
+                    snapshot = parse_snapshot(
+                        serialized_snapshot=serialized_snapshot,
+                        updated_ts=updated_ts,
+                        unpaused_ts=unpaused_ts,
+                        unrestorable=unrestorable,
+                        next_auto_restatement_ts=None,
+                    )
+                except Exception:
+                    logger.warning(
+                        "Failed to parse snapshot %s with identifier %s to populate its header",
+                        name,
+                        identifier,
+                        exc_info=True,
+                    )
+                    continue
+                headers[(name, identifier)] = _snapshot_header_to_json(snapshot)
+            update_column_by_key(self.engine_adapter, self.snapshots_table, "header", headers)
+
     def count(self) -> int:
         """Counts the number of snapshots in the state."""
         result = fetchone(self.engine_adapter, exp.select("COUNT(*)").from_(self.snapshots_table))
@@ -426,15 +728,138 @@ class SnapshotState:
         for snapshot in snapshots:
             if isinstance(snapshot.node, SeedModel):
                 seed_model = t.cast(SeedModel, snapshot.node)
-                snapshot = snapshot.copy(update={"node": seed_model.to_dehydrated()})
+                snapshot = snapshot.copy(update={"node_": seed_model.to_dehydrated()})
             snapshots_to_store.append(snapshot)
 
-        self.engine_adapter.insert_append(
+        self._insert_snapshots(snapshots_to_store)
+
+    def resolve_blobs(self, serialized_snapshots: t.List[str]) -> t.List[SerializedSnapshot]:
+        """Replaces references to values that were moved to the blobs table with the values themselves.
+
+        Args:
+            serialized_snapshots: The serialized snapshots as they are stored in the snapshots table.
+
+        Returns:
+            The snapshots in the same order. Snapshots without blob references are returned as they are,
+            while snapshots with references are returned as deserialized objects with the references resolved.
+        """
+        raw_snapshots: t.Dict[int, t.Dict[str, t.Any]] = {}
+        references: t.Dict[int, t.List[t.Tuple[t.Dict[str, t.Any], str, str]]] = {}
+        for i, serialized_snapshot in enumerate(serialized_snapshots):
+            if BLOB_REFERENCE_KEY not in serialized_snapshot:
+                continue
+            raw_snapshot = json.loads(serialized_snapshot)
+            snapshot_references = _blob_references(raw_snapshot)
+            if snapshot_references:
+                raw_snapshots[i] = raw_snapshot
+                references[i] = snapshot_references
+        if not references:
+            return list(serialized_snapshots)
+
+        hashes = {
+            blob_hash
+            for snapshot_references in references.values()
+            for _, _, blob_hash in snapshot_references
+        }
+        blobs = self._get_blobs(hashes)
+        missing_hashes = hashes - blobs.keys()
+        if missing_hashes:
+            raise SQLMeshError(
+                f"Snapshot blobs {', '.join(sorted(missing_hashes))} are missing from the state."
+            )
+
+        values = {blob_hash: json.loads(content) for blob_hash, content in blobs.items()}
+        for snapshot_references in references.values():
+            for container, key, blob_hash in snapshot_references:
+                container[key] = values[blob_hash]
+
+        return [raw_snapshots.get(i, s) for i, s in enumerate(serialized_snapshots)]
+
+    def _insert_snapshots(self, snapshots: t.Collection[Snapshot]) -> None:
+        blobs_by_snapshot: t.Dict[SnapshotId, t.Dict[str, str]] = {}
+
+        self.engine_adapter.insert_append_rows(
             self.snapshots_table,
-            _snapshots_to_df(snapshots_to_store),
+            _snapshots_to_rows(snapshots, blobs_by_snapshot),
             columns_to_types=self._snapshot_columns_to_types,
         )
 
+        blob_refs = [
+            (snapshot_id.name, snapshot_id.identifier, blob_hash)
+            for snapshot_id, blobs in blobs_by_snapshot.items()
+            for blob_hash in blobs
+        ]
+        if not blob_refs:
+            return
+
+        # References are inserted first so that the blobs are never considered orphaned
+        self.engine_adapter.insert_append_rows(
+            self.blob_refs_table,
+            blob_refs,
+            columns_to_types=self._blob_ref_columns_to_types,
+        )
+
+        new_blobs = {
+            blob_hash: content
+            for blobs in blobs_by_snapshot.values()
+            for blob_hash, content in blobs.items()
+        }
+        updated_ts = now_timestamp()
+        for batch in create_batches(sorted(new_blobs), batch_size=self.SNAPSHOT_BATCH_SIZE):
+            # Existing blobs are stamped so that they aren't garbage collected while this push is in progress
+            self.engine_adapter.update_table(
+                self.blobs_table,
+                {"updated_ts": updated_ts},
+                where=exp.column("hash").isin(*batch),
+            )
+            for (blob_hash,) in fetchall(
+                self.engine_adapter,
+                exp.select("hash").from_(self.blobs_table).where(exp.column("hash").isin(*batch)),
+            ):
+                new_blobs.pop(blob_hash, None)
+
+        if new_blobs:
+            self.engine_adapter.insert_append_rows(
+                self.blobs_table,
+                [
+                    (blob_hash, self._encode_blob(content), updated_ts)
+                    for blob_hash, content in new_blobs.items()
+                ],
+                columns_to_types=self._blob_columns_to_types,
+            )
+
+    def _get_blobs(self, hashes: t.Collection[str]) -> t.Dict[str, str]:
+        blobs = {}
+        for batch in create_batches(sorted(hashes), batch_size=self.SNAPSHOT_BATCH_SIZE):
+            for blob_hash, content in fetchall(
+                self.engine_adapter,
+                exp.select("hash", "content")
+                .from_(self.blobs_table)
+                .where(exp.column("hash").isin(*batch)),
+            ):
+                blobs[blob_hash] = _decode_blob(content)
+        return blobs
+
+    def _encode_blob(self, content: str) -> str:
+        if not self._compress_blobs:
+            return content
+        zstd = _import_zstandard()
+        compressed = zstd.ZstdCompressor().compress(content.encode("utf-8"))
+        return _ZSTD_BLOB_PREFIX + base64.b64encode(compressed).decode("ascii")
+
+    def _is_schema_version_current(self) -> bool:
+        """Returns whether the state has been migrated to the current schema version.
+
+        In that case all stored snapshots were either serialized by the current schema version or
+        migrated to it, and the checks that were performed before serialization can be skipped
+        when parsing them.
+        """
+        if not self._schema_version_current and self._version_state is not None:
+            self._schema_version_current = (
+                self._version_state.get_versions().schema_version == SCHEMA_VERSION
+            )
+        return self._schema_version_current
+
     def _get_snapshots(
         self,
         snapshot_ids: t.Iterable[SnapshotIdLike],
@@ -453,9 +878,12 @@ class SnapshotState:
 
         def _loader(snapshot_ids_to_load: t.Set[SnapshotId]) -> t.Collection[Snapshot]:
             fetched_snapshots: t.Dict[SnapshotId, Snapshot] = {}
+            trusted = self._is_schema_version_current()
             for query in self._get_snapshots_expressions(snapshot_ids_to_load, lock_for_update):
-                for (
-                    serialized_snapshot,
+                rows = fetchall(self.engine_adapter, query)
+                serialized_snapshots = self.resolve_blobs([row[0] for row in rows])
+                for serialized_snapshot, (
+                    _,
                     _,
                     _,
                     _,
@@ -463,13 +891,14 @@ class SnapshotState:
                     unpaused_ts,
                     unrestorable,
                     next_auto_restatement_ts,
-                ) in fetchall(self.engine_adapter, query):
+                ) in zip(serialized_snapshots, rows):
                     snapshot = parse_snapshot(
                         serialized_snapshot=serialized_snapshot,
                         updated_ts=updated_ts,
                         unpaused_ts=unpaused_ts,
                         unrestorable=unrestorable,
                         next_auto_restatement_ts=next_auto_restatement_ts,
+                        trusted=trusted,
                     )
                     snapshot_id = snapshot.snapshot_id
                     if snapshot_id in fetched_snapshots:
@@ -493,12 +922,12 @@ class SnapshotState:
             ):
                 query = (
                     exp.select(
-                        "name",
-                        "identifier",
-                        "updated_ts",
-                        "unpaused_ts",
-                        "unrestorable",
-                        "next_auto_restatement_ts",
+                        "snapshots.name",
+                        "snapshots.identifier",
+                        "snapshots.updated_ts",
+                        "snapshots.unpaused_ts",
+                        "snapshots.unrestorable",
+                        "auto_restatements.next_auto_restatement_ts",
                     )
                     .from_(exp.to_table(self.snapshots_table).as_("snapshots"))
                     .join(
@@ -590,8 +1019,8 @@ class SnapshotState:
         self,
         snapshots: t.Collection[SnapshotNameVersionLike],
         lock_for_update: bool = False,
-    ) -> t.List[SharedVersionSnapshot]:
-        """Fetches all snapshots that share the same version as the snapshots.
+    ) -> t.List[SnapshotHeader]:
+        """Fetches headers of all snapshots that share the same version as the snapshots.
 
         The output includes the snapshots with the specified identifiers.
 
@@ -600,22 +1029,33 @@ class SnapshotState:
             lock_for_update: Lock the snapshot rows for future update
 
         Returns:
-            The list of Snapshot objects.
+            The list of snapshot headers.
         """
         if not snapshots:
             return []
 
-        snapshot_rows = []
+        return self._get_snapshot_headers(
+            snapshot_name_version_filter(
+                self.engine_adapter, snapshots, batch_size=self.SNAPSHOT_BATCH_SIZE
+            ),
+            lock_for_update=lock_for_update,
+        )
 
-        for where in snapshot_name_version_filter(
-            self.engine_adapter, snapshots, batch_size=self.SNAPSHOT_BATCH_SIZE
-        ):
+    def _get_snapshot_headers(
+        self,
+        filters: t.Iterable[exp.Condition],
+        lock_for_update: bool = False,
+    ) -> t.List[SnapshotHeader]:
+        headers = []
+        snapshot_ids_without_header: t.Set[SnapshotId] = set()
+
+        for where in filters:
             query = (
                 exp.select(
-                    "snapshot",
                     "name",
                     "identifier",
-                    "version",
+                    "header",
+                    "ttl_ms",
                     "updated_ts",
                     "unpaused_ts",
                     "unrestorable",
@@ -626,176 +1066,222 @@ class SnapshotState:
             if lock_for_update:
                 query = query.lock(copy=False)
 
-            snapshot_rows.extend(fetchall(self.engine_adapter, query))
-
-        return [
-            SharedVersionSnapshot.from_snapshot_record(
-                name=name,
-                identifier=identifier,
-                version=version,
-                updated_ts=updated_ts,
-                unpaused_ts=unpaused_ts,
-                unrestorable=unrestorable,
-                snapshot=snapshot,
+            for (
+                name,
+                identifier,
+                header,
+                ttl_ms,
+                updated_ts,
+                unpaused_ts,
+                unrestorable,
+            ) in fetchall(self.engine_adapter, query):
+                if header is None:
+                    # Records written before headers were introduced
+                    snapshot_ids_without_header.add(SnapshotId(name=name, identifier=identifier))
+                    continue
+                headers.append(
+                    parse_snapshot_header(
+                        serialized_header=header,
+                        ttl_ms=ttl_ms,
+                        updated_ts=updated_ts,
+                        unpaused_ts=unpaused_ts,
+                        unrestorable=unrestorable,
+                    )
+                )
+
+        if snapshot_ids_without_header:
+            headers.extend(
+                SnapshotHeader.from_snapshot(snapshot)
+                for snapshot in self._get_snapshots(snapshot_ids_without_header).values()
             )
-            for snapshot, name, identifier, version, updated_ts, unpaused_ts, unrestorable in snapshot_rows
-        ]
+
+        return headers
 
 
 def parse_snapshot(
-    serialized_snapshot: str,
+    serialized_snapshot: SerializedSnapshot,
     updated_ts: int,
     unpaused_ts: t.Optional[int],
     unrestorable: bool,
     next_auto_restatement_ts: t.Optional[int],
+    trusted: bool = False,
 ) -> Snapshot:
-    return Snapshot(
-        **{
-            **json.loads(serialized_snapshot),
-            "updated_ts": updated_ts,
-            "unpaused_ts": unpaused_ts,
-            "unrestorable": unrestorable,
-            "next_auto_restatement_ts": next_auto_restatement_ts,
-        }
+    """Parses a serialized snapshot together with the attributes that are stored in separate columns.
+
+    Args:
+        serialized_snapshot: The serialized snapshot or its deserialized form.
+        updated_ts: The value of the updated_ts column.
+        unpaused_ts: The value of the unpaused_ts column.
+        unrestorable: The value of the unrestorable column.
+        next_auto_restatement_ts: The value of the next_auto_restatement_ts column.
+        trusted: Whether the snapshot was serialized by the current schema version, in which case the
+            checks which have already been performed before serialization are skipped.
+
+    Returns:
+        The parsed snapshot.
+    """
+    context = {TRUSTED_CONTEXT_KEY: True} if trusted else None
+    if isinstance(serialized_snapshot, dict):
+        snapshot = Snapshot.model_validate(serialized_snapshot, context=context)
+    else:
+        snapshot = Snapshot.model_validate_json(serialized_snapshot, context=context)
+    snapshot.updated_ts = updated_ts
+    snapshot.unpaused_ts = unpaused_ts
+    snapshot.unrestorable = unrestorable
+    snapshot.next_auto_restatement_ts = next_auto_restatement_ts
+    return snapshot
+
+
+def parse_snapshot_header(
+    serialized_header: str | bytes,
+    ttl_ms: int,
+    updated_ts: int,
+    unpaused_ts: t.Optional[int],
+    unrestorable: bool,
+) -> SnapshotHeader:
+    header = SnapshotHeader.model_validate_json(serialized_header)
+    header.ttl_ms = ttl_ms
+    header.updated_ts = updated_ts
+    header.unpaused_ts = unpaused_ts
+    header.unrestorable = unrestorable
+    return header
+
+
+def _snapshot_header_to_json(snapshot: Snapshot) -> str:
+    return SnapshotHeader.from_snapshot(snapshot).json(
+        exclude={"ttl_ms", "updated_ts", "unpaused_ts", "unrestorable"}
     )
 
 
-def _snapshot_to_json(snapshot: Snapshot) -> str:
-    return snapshot.json(
-        exclude={
-            "intervals",
-            "dev_intervals",
-            "pending_restatement_intervals",
-            "updated_ts",
-            "unpaused_ts",
-            "unrestorable",
-            "next_auto_restatement_ts",
+_SNAPSHOT_JSON_EXCLUDE = {
+    "intervals",
+    "dev_intervals",
+    "pending_restatement_intervals",
+    "updated_ts",
+    "unpaused_ts",
+    "unrestorable",
+    "next_auto_restatement_ts",
+}
+
+
+def _snapshot_to_json(snapshot: Snapshot, blobs: t.Optional[t.Dict[str, str]] = None) -> str:
+    """Serializes a snapshot for storage.
+
+    Args:
+        snapshot: The snapshot to serialize.
+        blobs: If provided, large python environment entries, Jinja macros and seed content are replaced with
+            references and added to this dictionary of blob hashes to serialized values.
+
+    Returns:
+        The serialized snapshot.
+    """
+    if blobs is None:
+        return snapshot.json(exclude=_SNAPSHOT_JSON_EXCLUDE)
+
+    raw_snapshot = snapshot.dict(mode="json", exclude=_SNAPSHOT_JSON_EXCLUDE)
+    raw_node = raw_snapshot["node"]
+    if python_env := raw_node.get("python_env"):
+        raw_node["python_env"] = {
+            name: _to_blob_reference(value, blobs) for name, value in python_env.items()
         }
-    )
+    for key in ("jinja_macros", "seed"):
+        if key in raw_node:
+            raw_node[key] = _to_blob_reference(raw_node[key], blobs)
+    return json.dumps(raw_snapshot)
 
 
-def _snapshots_to_df(snapshots: t.Iterable[Snapshot]) -> pd.DataFrame:
-    import pandas as pd
+def _to_blob_reference(value: t.Any, blobs: t.Dict[str, str]) -> t.Any:
+    content = json.dumps(value, sort_keys=True)
+    if len(content) < BLOB_MIN_SIZE:
+        return value
+    blob_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()
+    blobs[blob_hash] = content
+    return {BLOB_REFERENCE_KEY: blob_hash}
 
-    return pd.DataFrame(
-        [
-            {
-                "name": snapshot.name,
-                "identifier": snapshot.identifier,
-                "version": snapshot.version,
-                "snapshot": _snapshot_to_json(snapshot),
-                "kind_name": snapshot.model_kind_name.value if snapshot.model_kind_name else None,
-                "updated_ts": snapshot.updated_ts,
-                "unpaused_ts": snapshot.unpaused_ts,
-                "ttl_ms": snapshot.ttl_ms,
-                "unrestorable": snapshot.unrestorable,
-            }
-            for snapshot in snapshots
-        ]
-    )
+
+def _blob_references(
+    raw_snapshot: t.Dict[str, t.Any],
+) -> t.List[t.Tuple[t.Dict[str, t.Any], str, str]]:
+    """Returns the containers, keys and hashes of values of a snapshot that were moved to the blobs table.
+
+    Only the values which are moved by `_snapshot_to_json` are considered.
+    """
+
+    def _reference_hash(value: t.Any) -> t.Optional[str]:
+        if isinstance(value, dict) and len(value) == 1 and BLOB_REFERENCE_KEY in value:
+            return value[BLOB_REFERENCE_KEY]
+        return None
+
+    references = []
+    node = raw_snapshot.get("node") or {}
+    for container in (node.get("python_env") or {}, node):
+        keys = container if container is not node else ["jinja_macros", "seed"]
+        for key in keys:
+            blob_hash = _reference_hash(container.get(key))
+            if blob_hash is not None:
+                references.append((container, key, blob_hash))
+    return references
+
+
+def _decode_blob(content: str) -> str:
+    if content.startswith(_ZSTD_BLOB_PREFIX):
+        zstd = _import_zstandard()
+        compressed = base64.b64decode(content[len(_ZSTD_BLOB_PREFIX) :])
+        return zstd.ZstdDecompressor().decompress(compressed).decode("utf-8")
+    return content
+
+
+def _import_zstandard() -> t.Any:
+    zstd = optional_import("zstandard")
+    if zstd is None:
+        raise SQLMeshError(
+            "Compressed snapshot blobs require the zstandard package. Please install it with 'pip install zstandard'."
+        )
+    return zstd
+
+
+def _snapshots_to_rows(
+    snapshots: t.Iterable[Snapshot],
+    blobs_by_snapshot: t.Optional[t.Dict[SnapshotId, t.Dict[str, str]]] = None,
+) -> t.List[t.Tuple[t.Any, ...]]:
+    """Returns the rows of the snapshots table in the order of `SnapshotState._snapshot_columns_to_types`."""
+
+    def _serialize(snapshot: Snapshot) -> str:
+        if blobs_by_snapshot is None:
+            return _snapshot_to_json(snapshot)
+        blobs = blobs_by_snapshot.setdefault(snapshot.snapshot_id, {})
+        return _snapshot_to_json(snapshot, blobs)
+
+    return [
+        (
+            snapshot.name,
+            snapshot.identifier,
+            snapshot.version,
+            _serialize(snapshot),
+            snapshot.model_kind_name.value if snapshot.model_kind_name else None,
+            snapshot.updated_ts,
+            snapshot.unpaused_ts,
+            snapshot.ttl_ms,
+            snapshot.unrestorable,
+            _snapshot_header_to_json(snapshot),
+            snapshot.dev_version,
+        )
+        for snapshot in snapshots
+    ]
 
 
 def _auto_restatements_to_df(auto_restatements: t.Dict[SnapshotNameVersion, int]) -> pd.DataFrame:
     import pandas as pd
 
+    updated_ts = now_timestamp()
     return pd.DataFrame(
         [
             {
                 "snapshot_name": name_version.name,
                 "snapshot_version": name_version.version,
                 "next_auto_restatement_ts": ts,
+                "updated_ts": updated_ts,
             }
             for name_version, ts in auto_restatements.items()
         ]
     )
-
-
-class SharedVersionSnapshot(PydanticModel):
-    """A stripped down version of a snapshot that is used for fetching snapshots that share the same version
-    with a significantly reduced parsing overhead.
-    """
-
-    name: str
-    version: str
-    dev_version_: t.Optional[str] = Field(alias="dev_version")
-    identifier: str
-    fingerprint: SnapshotFingerprint
-    interval_unit: IntervalUnit
-    change_category: SnapshotChangeCategory
-    updated_ts: int
-    unpaused_ts: t.Optional[int]
-    unrestorable: bool
-    disable_restatement: bool
-    effective_from: t.Optional[TimeLike]
-    raw_snapshot: t.Dict[str, t.Any]
-
-    @property
-    def snapshot_id(self) -> SnapshotId:
-        return SnapshotId(name=self.name, identifier=self.identifier)
-
-    @property
-    def is_forward_only(self) -> bool:
-        return self.change_category == SnapshotChangeCategory.FORWARD_ONLY
-
-    @property
-    def normalized_effective_from_ts(self) -> t.Optional[int]:
-        return (
-            to_timestamp(self.interval_unit.cron_floor(self.effective_from))
-            if self.effective_from
-            else None
-        )
-
-    @property
-    def dev_version(self) -> str:
-        return self.dev_version_ or self.fingerprint.to_version()
-
-    @property
-    def full_snapshot(self) -> Snapshot:
-        return Snapshot(
-            **{
-                **self.raw_snapshot,
-                "updated_ts": self.updated_ts,
-                "unpaused_ts": self.unpaused_ts,
-                "unrestorable": self.unrestorable,
-            }
-        )
-
-    def set_unpaused_ts(self, unpaused_dt: t.Optional[TimeLike]) -> None:
-        """Sets the timestamp for when this snapshot was unpaused.
-
-        Args:
-            unpaused_dt: The datetime object of when this snapshot was unpaused.
-        """
-        self.unpaused_ts = (
-            to_timestamp(self.interval_unit.cron_floor(unpaused_dt)) if unpaused_dt else None
-        )
-
-    @classmethod
-    def from_snapshot_record(
-        cls,
-        *,
-        name: str,
-        identifier: str,
-        version: str,
-        updated_ts: int,
-        unpaused_ts: t.Optional[int],
-        unrestorable: bool,
-        snapshot: str,
-    ) -> SharedVersionSnapshot:
-        raw_snapshot = json.loads(snapshot)
-        raw_node = raw_snapshot["node"]
-        return SharedVersionSnapshot(
-            name=name,
-            version=version,
-            dev_version=raw_snapshot.get("dev_version"),
-            identifier=identifier,
-            fingerprint=raw_snapshot["fingerprint"],
-            interval_unit=raw_node.get("interval_unit", IntervalUnit.from_cron(raw_node["cron"])),
-            change_category=raw_snapshot["change_category"],
-            updated_ts=updated_ts,
-            unpaused_ts=unpaused_ts,
-            unrestorable=unrestorable,
-            disable_restatement=raw_node.get("kind", {}).get("disable_restatement", False),
-            effective_from=raw_snapshot.get("effective_from"),
-            raw_snapshot=raw_snapshot,
-        )
@@ -1,12 +1,17 @@
+import gzip
 import json
+import struct
 import typing as t
+from concurrent.futures import Future
 
+from sqlmesh.core import constants as c
 from sqlmesh.core.state_sync import StateSync
-from sqlmesh.core.snapshot import Snapshot
+from sqlmesh.core.snapshot import Snapshot, SnapshotFingerprint
 from sqlmesh.utils.date import now, to_tstz
 from sqlmesh.utils.pydantic import _expression_encoder
 from sqlmesh.core.state_sync import Versions
 from sqlmesh.core.state_sync.common import (
+    chunk_iterable,
     EnvironmentsChunk,
     SnapshotsChunk,
     VersionsChunk,
@@ -23,9 +28,18 @@ from json_stream.writer import StreamableDict
 from json_stream.base import StreamingJSONObject
 from json_stream.dump import JSONStreamEncoder
 from sqlmesh.utils.errors import SQLMeshError
+from sqlmesh.utils.process import PoolExecutor, create_process_pool_executor
 from sqlglot import exp
 from sqlmesh.utils.pydantic import DEFAULT_ARGS as PYDANTIC_DEFAULT_ARGS, PydanticModel
 
+# Chunked state files start and end with this marker. The index offset precedes the trailing marker.
+CHUNKED_STATE_FILE_MARKER = b"SQLMESH\x02"
+CHUNKED_STATE_FILE_VERSION = 2
+# The number of records in each compressed chunk of a chunked state file
+CHUNK_SIZE = 1000
+
+_FOOTER = struct.Struct(">Q")
+
 
 class SQLMeshJSONStreamEncoder(JSONStreamEncoder):
     def default(self, obj: t.Any) -> t.Any:
@@ -155,6 +169,7 @@ def export_state(
     local_snapshots: t.Optional[t.Dict[str, Snapshot]] = None,
     environment_names: t.Optional[t.List[str]] = None,
     console: t.Optional[Console] = None,
+    chunked: bool = False,
 ) -> None:
     console = console or NoopConsole()
 
@@ -170,6 +185,15 @@ def export_state(
 
     importable = False if local_snapshots else True
 
+    if chunked:
+        _export_chunked(
+            state_stream=state_stream,
+            importable=importable,
+            output_file=output_file,
+            console=console,
+        )
+        return
+
     json_stream = _export(state_stream=state_stream, importable=importable, console=console)
     with output_file.open(mode="w", encoding="utf8") as fh:
         json.dump(json_stream, fh, indent=2, cls=SQLMeshJSONStreamEncoder)
@@ -180,9 +204,25 @@ def import_state(
     input_file: Path,
     clear: bool = False,
     console: t.Optional[Console] = None,
+    environment_names: t.Optional[t.List[str]] = None,
 ) -> None:
     console = console or NoopConsole()
 
+    if is_chunked_state_file(input_file):
+        _import_chunked(
+            state_sync=state_sync,
+            input_file=input_file,
+            clear=clear,
+            console=console,
+            environment_names=environment_names,
+        )
+        return
+
+    if environment_names:
+        raise SQLMeshError(
+            "Importing specific environments is only supported for chunked state files"
+        )
+
     # we need to peek into the file to figure out what state version we are dealing with
     with input_file.open("r", encoding="utf8") as fh:
         stream = json_stream.load(fh)
@@ -224,3 +264,267 @@ def import_state(
     finally:
         for handle in handles:
             handle.close()
+
+
+def is_chunked_state_file(path: Path) -> bool:
+    with path.open("rb") as fh:
+        return fh.read(len(CHUNKED_STATE_FILE_MARKER)) == CHUNKED_STATE_FILE_MARKER
+
+
+def _export_chunked(
+    state_stream: StateStream, importable: bool, output_file: Path, console: Console
+) -> None:
+    """
+    Write the state to a chunked state file.
+
+    The file consists of gzip-compressed chunks of newline-delimited JSON records followed by a JSON index.
+    The index contains the metadata, the versions and the location of every chunk. It also maps each
+    environment to the chunk with its record and the chunks with its snapshots, so that a single
+    environment can be imported without reading the whole file.
+
+    Args:
+        state_stream: A stream of state to export
+        importable: Whether or not the file can be imported
+        output_file: The path to write the file to
+        console: A Console instance to print progress to
+    """
+    chunks: t.List[t.Dict[str, t.Any]] = []
+    snapshot_chunks: t.Dict[t.Tuple[str, str], int] = {}
+    environments: t.Dict[str, t.Dict[str, t.Any]] = {}
+    versions: t.Dict[str, t.Any] = {}
+
+    with output_file.open(mode="wb") as fh:
+        fh.write(CHUNKED_STATE_FILE_MARKER)
+
+        def _write_chunk(chunk_type: str, records: t.List[t.Dict[str, t.Any]]) -> int:
+            content = gzip.compress(
+                "".join(
+                    json.dumps(record, cls=SQLMeshJSONStreamEncoder) + "\n" for record in records
+                ).encode("utf-8"),
+                compresslevel=1,
+            )
+            chunks.append(
+                {
+                    "type": chunk_type,
+                    "offset": fh.tell(),
+                    "length": len(content),
+                    "count": len(records),
+                }
+            )
+            fh.write(content)
+            return len(chunks) - 1
+
+        for state_chunk in state_stream:
+            if isinstance(state_chunk, VersionsChunk):
+                versions = _dump_pydantic_model(state_chunk.versions)
+                console.update_state_export_progress(
+                    version_count=len(versions), versions_complete=True
+                )
+
+            if isinstance(state_chunk, SnapshotsChunk):
+                console.update_state_export_progress(snapshot_count=0)
+                snapshot_count = 0
+                for snapshot_batch in chunk_iterable(state_chunk, CHUNK_SIZE):
+                    snapshot_batch = list(snapshot_batch)
+                    chunk_idx = _write_chunk(
+                        "snapshots", [_dump_pydantic_model(s) for s in snapshot_batch]
+                    )
+                    for snapshot in snapshot_batch:
+                        snapshot_chunks[(snapshot.name, snapshot.identifier)] = chunk_idx
+                    snapshot_count += len(snapshot_batch)
+                    console.update_state_export_progress(snapshot_count=snapshot_count)
+                console.update_state_export_progress(snapshots_complete=True)
+
+            if isinstance(state_chunk, EnvironmentsChunk):
+                console.update_state_export_progress(environment_count=0)
+                for environment_batch in chunk_iterable(state_chunk, CHUNK_SIZE):
+                    environment_batch = list(environment_batch)
+                    chunk_idx = _write_chunk(
+                        "environments", [_dump_pydantic_model(env) for env in environment_batch]
+                    )
+                    for env in environment_batch:
+                        environments[env.environment.name] = {
+                            "chunk": chunk_idx,
+                            "snapshot_chunks": sorted(
+                                {
+                                    snapshot_chunks[(s.name, s.identifier)]
+                                    for s in env.environment.snapshots
+                                    if (s.name, s.identifier) in snapshot_chunks
+                                }
+                            ),
+                        }
+                    console.update_state_export_progress(environment_count=len(environments))
+                console.update_state_export_progress(environments_complete=True)
+
+        index_offset = fh.tell()
+        index = {
+            "metadata": {
+                "timestamp": to_tstz(now()),
+                "file_version": CHUNKED_STATE_FILE_VERSION,
+                "importable": importable,
+            },
+            "versions": versions,
+            "chunks": chunks,
+            "environments": environments,
+        }
+        fh.write(json.dumps(index, cls=SQLMeshJSONStreamEncoder).encode("utf-8"))
+        fh.write(_FOOTER.pack(index_offset))
+        fh.write(CHUNKED_STATE_FILE_MARKER)
+
+
+def _read_chunked_index(input_file: Path) -> t.Dict[str, t.Any]:
+    footer_size = _FOOTER.size + len(CHUNKED_STATE_FILE_MARKER)
+    with input_file.open("rb") as fh:
+        fh.seek(0, 2)
+        file_size = fh.tell()
+        if file_size < len(CHUNKED_STATE_FILE_MARKER) + footer_size:
+            raise SQLMeshError("The chunked state file is truncated")
+
+        fh.seek(file_size - footer_size)
+        footer = fh.read(footer_size)
+        if footer[_FOOTER.size :] != CHUNKED_STATE_FILE_MARKER:
+            raise SQLMeshError("The chunked state file is truncated")
+
+        (index_offset,) = _FOOTER.unpack(footer[: _FOOTER.size])
+        fh.seek(index_offset)
+        return json.loads(fh.read(file_size - footer_size - index_offset))
+
+
+def _import_chunked(
+    state_sync: StateSync,
+    input_file: Path,
+    clear: bool,
+    console: Console,
+    environment_names: t.Optional[t.List[str]],
+) -> None:
+    """
+    Load the state from a chunked state file into the supplied :state_sync.
+
+    Snapshot chunks are decompressed and parsed in a process pool. If :environment_names are provided,
+    only the chunks that contain these environments and their snapshots are read.
+    """
+    index = _read_chunked_index(input_file)
+
+    metadata = index["metadata"]
+    if not metadata.get("importable", False):
+        raise SQLMeshError("State file is marked as not importable. Aborting")
+
+    chunks = index["chunks"]
+    environment_index = index["environments"]
+
+    if environment_names:
+        missing_environments = [name for name in environment_names if name not in environment_index]
+        if missing_environments:
+            raise SQLMeshError(f"No such environment: {', '.join(missing_environments)}")
+        environment_chunk_ids = sorted(
+            {environment_index[name]["chunk"] for name in environment_names}
+        )
+        snapshot_chunk_ids = sorted(
+            {
+                chunk_idx
+                for name in environment_names
+                for chunk_idx in environment_index[name]["snapshot_chunks"]
+            }
+        )
+    else:
+        environment_chunk_ids = [
+            idx for idx, chunk in enumerate(chunks) if chunk["type"] == "environments"
+        ]
+        snapshot_chunk_ids = [
+            idx for idx, chunk in enumerate(chunks) if chunk["type"] == "snapshots"
+        ]
+
+    environments = [
+        EnvironmentWithStatements.model_validate(raw_environment)
+        for chunk_idx in environment_chunk_ids
+        for raw_environment in _read_chunk(input_file, chunks[chunk_idx])
+        if not environment_names or raw_environment["environment"]["name"] in environment_names
+    ]
+    snapshot_ids = (
+        {(s.name, s.identifier) for env in environments for s in env.environment.snapshots}
+        if environment_names
+        else None
+    )
+
+    console.update_state_import_progress(
+        timestamp=metadata["timestamp"], state_file_version=metadata["file_version"]
+    )
+    versions = Versions.model_validate(index["versions"])
+    console.update_state_import_progress(versions=versions)
+
+    def _load_snapshots(pool: PoolExecutor) -> t.Iterator[Snapshot]:
+        console.update_state_import_progress(snapshot_count=0)
+        snapshot_count = 0
+        for snapshots in _map_chunks(
+            pool,
+            [(chunks[chunk_idx], snapshot_ids) for chunk_idx in snapshot_chunk_ids],
+        ):
+            yield from snapshots
+            snapshot_count += len(snapshots)
+            console.update_state_import_progress(snapshot_count=snapshot_count)
+        console.update_state_import_progress(snapshots_complete=True)
+
+    def _load_environments() -> t.Iterator[EnvironmentWithStatements]:
+        console.update_state_import_progress(environment_count=0)
+        for idx, environment in enumerate(environments):
+            yield environment
+            console.update_state_import_progress(environment_count=idx + 1)
+        console.update_state_import_progress(environments_complete=True)
+
+    with create_process_pool_executor(
+        initializer=_init_chunk_reader,
+        initargs=(input_file,),
+        max_workers=c.MAX_FORK_WORKERS,
+    ) as pool:
+        stream = StateStream.from_iterators(
+            versions=versions, snapshots=_load_snapshots(pool), environments=_load_environments()
+        )
+        state_sync.import_(stream, clear=clear)
+
+
+def _map_chunks(
+    pool: PoolExecutor,
+    args: t.List[t.Tuple[t.Dict[str, t.Any], t.Optional[t.Set[t.Tuple[str, str]]]]],
+) -> t.Iterator[t.List[Snapshot]]:
+    """Loads snapshot chunks in order, parsing a bounded number of chunks ahead of the consumer."""
+    max_pending = 2 * (c.MAX_FORK_WORKERS or 4)
+    pending: t.List[Future] = []
+    for chunk_args in args:
+        pending.append(pool.submit(_load_snapshot_chunk, chunk_args))
+        if len(pending) >= max_pending:
+            yield pending.pop(0).result()
+    for future in pending:
+        yield future.result()
+
+
+_input_file: t.Optional[Path] = None
+
+
+def _init_chunk_reader(input_file: Path) -> None:
+    global _input_file
+    _input_file = input_file
+
+
+def _load_snapshot_chunk(
+    chunk_and_snapshot_ids: t.Tuple[t.Dict[str, t.Any], t.Optional[t.Set[t.Tuple[str, str]]]],
+) -> t.List[Snapshot]:
+    assert _input_file
+    chunk, snapshot_ids = chunk_and_snapshot_ids
+    return [
+        Snapshot.model_validate(raw_snapshot)
+        for raw_snapshot in _read_chunk(_input_file, chunk)
+        if snapshot_ids is None
+        or (
+            raw_snapshot["name"],
+            SnapshotFingerprint.model_validate(raw_snapshot["fingerprint"]).to_identifier(),
+        )
+        in snapshot_ids
+    ]
+
+
+def _read_chunk(input_file: Path, chunk: t.Dict[str, t.Any]) -> t.Iterator[t.Dict[str, t.Any]]:
+    with input_file.open("rb") as fh:
+        fh.seek(chunk["offset"])
+        content = gzip.decompress(fh.read(chunk["length"]))
+    for line in content.splitlines():
+        yield json.loads(line)
@@ -0,0 +1,25 @@
+"""Add a header column to the snapshots table with attributes that can be read without parsing the node."""
+
+from sqlglot import exp
+
+from sqlmesh.utils.migration import blob_text_type
+
+
+def migrate(state_sync, **kwargs):  # type: ignore
+    engine_adapter = state_sync.engine_adapter
+    snapshots_table = "_snapshots"
+    if state_sync.schema:
+        snapshots_table = f"{state_sync.schema}.{snapshots_table}"
+
+    # Headers of existing records are populated by the migrator once all migration scripts have been applied.
+    alter_table_exp = exp.Alter(
+        this=exp.to_table(snapshots_table),
+        kind="TABLE",
+        actions=[
+            exp.ColumnDef(
+                this=exp.to_column("header"),
+                kind=exp.DataType.build(blob_text_type(engine_adapter.dialect)),
+            )
+        ],
+    )
+    engine_adapter.execute(alter_table_exp)
@@ -0,0 +1,121 @@
+"""Move large python environment entries, Jinja macros and seed content of snapshots into content-addressed blobs."""
+
+import hashlib
+import json
+import time
+import typing as t
+
+from sqlglot import exp
+
+from sqlmesh.utils.migration import (
+    blob_text_type,
+    fetch_rows_in_batches,
+    index_text_type,
+    update_column_by_key,
+)
+
+BLOB_REFERENCE_KEY = "__sqlmesh_blob__"
+BLOB_MIN_SIZE = 256
+
+
+def migrate(state_sync, **kwargs):  # type: ignore
+    import pandas as pd
+
+    engine_adapter = state_sync.engine_adapter
+    schema = state_sync.schema
+    snapshots_table = "_snapshots"
+    blobs_table = "_snapshot_blobs"
+    blob_refs_table = "_snapshot_blob_refs"
+    if schema:
+        snapshots_table = f"{schema}.{snapshots_table}"
+        blobs_table = f"{schema}.{blobs_table}"
+        blob_refs_table = f"{schema}.{blob_refs_table}"
+
+    index_type = index_text_type(engine_adapter.dialect)
+    blob_type = blob_text_type(engine_adapter.dialect)
+
+    blobs_columns_to_types = {
+        "hash": exp.DataType.build(index_type),
+        "content": exp.DataType.build(blob_type),
+        "updated_ts": exp.DataType.build("bigint"),
+    }
+    blob_refs_columns_to_types = {
+        "name": exp.DataType.build(index_type),
+        "identifier": exp.DataType.build(index_type),
+        "hash": exp.DataType.build(index_type),
+    }
+
+    engine_adapter.create_state_table(blobs_table, blobs_columns_to_types)
+    engine_adapter.create_index(blobs_table, "hash_idx", ("hash",))
+    engine_adapter.create_state_table(blob_refs_table, blob_refs_columns_to_types)
+    engine_adapter.create_index(blob_refs_table, "name_identifier_idx", ("name", "identifier"))
+    engine_adapter.create_index(blob_refs_table, "hash_idx", ("hash",))
+
+    updated_ts = int(time.time() * 1000)
+
+    # Only the hashes of inserted blobs are tracked, rows are streamed and updated in place
+    inserted_hashes: t.Set[str] = set()
+    for rows in fetch_rows_in_batches(
+        engine_adapter, snapshots_table, ["name", "identifier", "snapshot"], batch_size=1000
+    ):
+        new_blobs: t.Dict[str, str] = {}
+        blob_refs = []
+        new_snapshots = {}
+
+        for name, identifier, snapshot in rows:
+            parsed_snapshot = json.loads(snapshot)
+            snapshot_blobs: t.Dict[str, str] = {}
+
+            node = parsed_snapshot["node"]
+            if python_env := node.get("python_env"):
+                node["python_env"] = {
+                    key: _to_blob_reference(value, snapshot_blobs)
+                    for key, value in python_env.items()
+                }
+            for key in ("jinja_macros", "seed"):
+                if key in node:
+                    node[key] = _to_blob_reference(node[key], snapshot_blobs)
+
+            if not snapshot_blobs:
+                continue
+
+            new_blobs.update(
+                (blob_hash, content)
+                for blob_hash, content in snapshot_blobs.items()
+                if blob_hash not in inserted_hashes
+            )
+            blob_refs.extend(
+                {"name": name, "identifier": identifier, "hash": blob_hash}
+                for blob_hash in snapshot_blobs
+            )
+            new_snapshots[(name, identifier)] = json.dumps(parsed_snapshot)
+
+        if new_blobs:
+            engine_adapter.insert_append(
+                blobs_table,
+                pd.DataFrame(
+                    [
+                        {"hash": blob_hash, "content": content, "updated_ts": updated_ts}
+                        for blob_hash, content in new_blobs.items()
+                    ]
+                ),
+                columns_to_types=blobs_columns_to_types,
+            )
+            inserted_hashes.update(new_blobs)
+        if blob_refs:
+            engine_adapter.insert_append(
+                blob_refs_table,
+                pd.DataFrame(blob_refs),
+                columns_to_types=blob_refs_columns_to_types,
+            )
+        if new_snapshots:
+            update_column_by_key(engine_adapter, snapshots_table, "snapshot", new_snapshots)
+
+
+def _to_blob_reference(value: t.Any, blobs: t.Dict[str, str]) -> t.Any:
+    content = json.dumps(value, sort_keys=True)
+    if len(content) < BLOB_MIN_SIZE:
+        return value
+    blob_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()
+    blobs[blob_hash] = content
+    return {BLOB_REFERENCE_KEY: blob_hash}
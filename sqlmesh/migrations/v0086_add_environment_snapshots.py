@@ -0,0 +1,84 @@
+"""Store the membership of snapshots in environments in a normalized table."""
+
+import json
+import zlib
+
+from sqlglot import exp
+
+from sqlmesh.utils.migration import index_text_type
+
+ENVIRONMENT_BATCH_SIZE = 100
+
+
+def _hash(data):  # type: ignore
+    return str(zlib.crc32(";".join("" if d is None else d for d in data).encode("utf-8")))
+
+
+def migrate(state_sync, **kwargs):  # type: ignore
+    engine_adapter = state_sync.engine_adapter
+    schema = state_sync.schema
+    environments_table = "_environments"
+    environment_snapshots_table = "_environment_snapshots"
+    if schema:
+        environments_table = f"{schema}.{environments_table}"
+        environment_snapshots_table = f"{schema}.{environment_snapshots_table}"
+
+    index_type = index_text_type(engine_adapter.dialect)
+    environment_snapshots_columns_to_types = {
+        "environment_name": exp.DataType.build(index_type),
+        "name": exp.DataType.build(index_type),
+        "identifier": exp.DataType.build(index_type),
+        "version": exp.DataType.build(index_type),
+    }
+
+    engine_adapter.create_state_table(
+        environment_snapshots_table, environment_snapshots_columns_to_types
+    )
+    engine_adapter.create_index(
+        environment_snapshots_table, "environment_name_idx", ("environment_name",)
+    )
+    engine_adapter.create_index(
+        environment_snapshots_table, "name_identifier_idx", ("name", "identifier")
+    )
+    engine_adapter.delete_from(environment_snapshots_table, "TRUE")
+
+    # Only the names of all environments are fetched up front, their snapshots are fetched in batches
+    environment_names = [
+        name
+        for (name,) in engine_adapter.fetchall(
+            exp.select("name").from_(environments_table), quote_identifiers=True
+        )
+    ]
+    for i in range(0, len(environment_names), ENVIRONMENT_BATCH_SIZE):
+        batch = environment_names[i : i + ENVIRONMENT_BATCH_SIZE]
+        environment_snapshots = []
+        for name, snapshots in engine_adapter.fetchall(
+            exp.select("name", "snapshots")
+            .from_(environments_table)
+            .where(exp.column("name").isin(*batch)),
+            quote_identifiers=True,
+        ):
+            for snapshot in json.loads(snapshots):
+                fingerprint = snapshot["fingerprint"]
+                environment_snapshots.append(
+                    (
+                        name,
+                        snapshot["name"],
+                        _hash(
+                            [
+                                fingerprint["data_hash"],
+                                fingerprint["metadata_hash"],
+                                fingerprint["parent_data_hash"],
+                                fingerprint["parent_metadata_hash"],
+                            ]
+                        ),
+                        snapshot["version"],
+                    )
+                )
+
+        if environment_snapshots:
+            engine_adapter.insert_append_rows(
+                environment_snapshots_table,
+                environment_snapshots,
+                columns_to_types=environment_snapshots_columns_to_types,
+            )
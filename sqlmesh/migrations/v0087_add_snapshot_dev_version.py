@@ -0,0 +1,50 @@
+"""Add a dev_version column to the snapshots table so that expired dev tables can be found with SQL."""
+
+import json
+import zlib
+
+from sqlglot import exp
+
+from sqlmesh.utils.migration import (
+    fetch_rows_in_batches,
+    index_text_type,
+    update_column_by_key,
+)
+
+
+def _hash(data):  # type: ignore
+    return str(zlib.crc32(";".join("" if d is None else d for d in data).encode("utf-8")))
+
+
+def migrate(state_sync, **kwargs):  # type: ignore
+    engine_adapter = state_sync.engine_adapter
+    snapshots_table = "_snapshots"
+    if state_sync.schema:
+        snapshots_table = f"{state_sync.schema}.{snapshots_table}"
+
+    index_type = index_text_type(engine_adapter.dialect)
+
+    alter_table_exp = exp.Alter(
+        this=exp.to_table(snapshots_table),
+        kind="TABLE",
+        actions=[
+            exp.ColumnDef(
+                this=exp.to_column("dev_version"),
+                kind=exp.DataType.build(index_type),
+            )
+        ],
+    )
+    engine_adapter.execute(alter_table_exp)
+
+    # Existing records are streamed in batches and their dev versions are set in place
+    for rows in fetch_rows_in_batches(
+        engine_adapter, snapshots_table, ["name", "identifier", "snapshot"], batch_size=1000
+    ):
+        dev_versions = {}
+        for name, identifier, snapshot in rows:
+            parsed_snapshot = json.loads(snapshot)
+            fingerprint = parsed_snapshot["fingerprint"]
+            dev_versions[(name, identifier)] = parsed_snapshot.get("dev_version") or _hash(
+                [fingerprint["data_hash"], fingerprint["parent_data_hash"]]
+            )
+        update_column_by_key(engine_adapter, snapshots_table, "dev_version", dev_versions)
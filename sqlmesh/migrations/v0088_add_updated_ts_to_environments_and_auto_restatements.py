@@ -0,0 +1,29 @@
+"""Add an updated_ts column to the environments and auto restatements tables so that changes can be synced incrementally."""
+
+from sqlglot import exp
+
+
+def migrate(state_sync, **kwargs):  # type: ignore
+    engine_adapter = state_sync.engine_adapter
+    schema = state_sync.schema
+    environments_table = "_environments"
+    auto_restatements_table = "_auto_restatements"
+    if schema:
+        environments_table = f"{schema}.{environments_table}"
+        auto_restatements_table = f"{schema}.{auto_restatements_table}"
+
+    # Existing records are left without a timestamp, they are stamped the next time they're written.
+    for table in (environments_table, auto_restatements_table):
+        if "updated_ts" in engine_adapter.columns(table):
+            continue
+        alter_table_exp = exp.Alter(
+            this=exp.to_table(table),
+            kind="TABLE",
+            actions=[
+                exp.ColumnDef(
+                    this=exp.to_column("updated_ts"),
+                    kind=exp.DataType.build("bigint"),
+                )
+            ],
+        )
+        engine_adapter.execute(alter_table_exp)
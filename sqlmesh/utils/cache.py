@@ -1,19 +1,24 @@
 from __future__ import annotations
 
-import gzip
+import abc
 import logging
-import pickle
+import os
 import shutil
+import threading
+import time
 import typing as t
 from pathlib import Path
 
 from sqlglot import __version__ as SQLGLOT_VERSION
 
-from sqlmesh.utils import sanitize_name
+from sqlmesh.utils import sanitize_name, serialization
 from sqlmesh.utils.date import to_datetime
 from sqlmesh.utils.errors import SQLMeshError
 from sqlmesh.utils.windows import IS_WINDOWS, fix_windows_path
 
+if t.TYPE_CHECKING:
+    import sqlite3
+
 logger = logging.getLogger(__name__)
 
 T = t.TypeVar("T")
@@ -23,6 +28,297 @@ SQLGLOT_VERSION_TUPLE = tuple(SQLGLOT_VERSION.split("."))
 SQLGLOT_MAJOR_VERSION = SQLGLOT_VERSION_TUPLE[0]
 SQLGLOT_MINOR_VERSION = SQLGLOT_VERSION_TUPLE[1]
 
+CACHE_BACKEND_ENV_VAR = "SQLMESH_CACHE_BACKEND"
+"""The environment variable used to select the cache backend: 'sqlite' (default) or 'directory'."""
+
+# Entries that haven't been accessed for this many seconds are evicted
+_ENTRY_TTL_SECONDS = 7 * 24 * 60 * 60
+
+
+class CacheStore(abc.ABC):
+    """Storage for serialized cache entries that share the same namespace.
+
+    Args:
+        path: The path to the cache folder.
+        namespace: The namespace of entries in this store.
+        version: The version of the cache format. Entries of other versions are never returned.
+    """
+
+    def __init__(self, path: Path, namespace: str, version: str):
+        self._path = path
+        self._namespace = namespace
+        self._version = version
+
+    @abc.abstractmethod
+    def get_many(self, keys: t.Collection[str]) -> t.Dict[str, bytes]:
+        """Returns the content of the entries with the given keys that exist in the store."""
+
+    @abc.abstractmethod
+    def put_many(self, entries: t.Dict[str, bytes]) -> None:
+        """Stores the given entries, replacing existing entries with the same keys."""
+
+    @abc.abstractmethod
+    def exists_many(self, keys: t.Collection[str]) -> t.Set[str]:
+        """Returns the subset of the given keys for which entries exist in the store."""
+
+    @abc.abstractmethod
+    def clear(self) -> None:
+        """Removes all entries of this store."""
+
+
+class DirectoryCacheStore(CacheStore):
+    """Stores each entry in a separate file in a folder named after the namespace."""
+
+    def __init__(self, path: Path, namespace: str, version: str):
+        super().__init__(path, namespace, version)
+        self._dir = path / namespace if namespace else path
+
+        threshold = to_datetime("1 week ago").timestamp()
+        # delete all old cache files
+        for file in self._dir.glob("*"):
+            if not file.stem.startswith(self._version) or file.stat().st_atime < threshold:
+                file.unlink(missing_ok=True)
+
+    def get_many(self, keys: t.Collection[str]) -> t.Dict[str, bytes]:
+        entries = {}
+        for key in keys:
+            entry_path = self._entry_path(key)
+            if entry_path.exists():
+                entries[key] = entry_path.read_bytes()
+        return entries
+
+    def put_many(self, entries: t.Dict[str, bytes]) -> None:
+        self._dir.mkdir(parents=True, exist_ok=True)
+        if not self._dir.is_dir():
+            raise SQLMeshError(f"Cache path '{self._dir}' is not a directory.")
+
+        for key, content in entries.items():
+            self._entry_path(key).write_bytes(content)
+
+    def exists_many(self, keys: t.Collection[str]) -> t.Set[str]:
+        return {key for key in keys if self._entry_path(key).exists()}
+
+    def clear(self) -> None:
+        try:
+            shutil.rmtree(str(self._dir.absolute()))
+        except Exception:
+            pass
+
+    def _entry_path(self, key: str) -> Path:
+        full_path = self._dir / sanitize_name("__".join(p for p in (self._version, key) if p))
+        if IS_WINDOWS:
+            # handle paths longer than 260 chars
+            full_path = fix_windows_path(full_path)
+        return full_path
+
+
+class SQLiteCacheStore(CacheStore):
+    """Stores entries of all namespaces in a single SQLite database in WAL mode.
+
+    Each process uses its own connection, so the store can be used safely by forked workers.
+    Entries are evicted when they haven't been accessed for a week, and least recently accessed
+    entries are evicted when the database exceeds MAX_SIZE_BYTES.
+    """
+
+    FILE_NAME = "cache.db"
+    MAX_SIZE_BYTES = 1024 * 1024 * 1024
+    # How often the access time of an entry is updated when it's read
+    TOUCH_INTERVAL_SECONDS = 60 * 60
+    # SQLite limits the number of parameters in a statement
+    BATCH_SIZE = 500
+
+    _connections: t.Dict[Path, t.Tuple[int, sqlite3.Connection]] = {}
+    # Connections that were opened by a parent process. They must never be closed by a forked child.
+    _inherited_connections: t.List[sqlite3.Connection] = []
+    _evicted: t.Set[t.Tuple[Path, str]] = set()
+    # Locks by process ID. A lock inherited from the parent process may have been held by another thread at the
+    # time of the fork, in which case it would never be released in the child.
+    _locks: t.Dict[int, threading.RLock] = {}
+
+    def __init__(self, path: Path, namespace: str, version: str):
+        super().__init__(path, namespace, version)
+        self._db_path = path / self.FILE_NAME
+
+        with self._lock:
+            if (self._db_path, namespace) not in self._evicted:
+                self._evict()
+                self._evicted.add((self._db_path, namespace))
+
+    def get_many(self, keys: t.Collection[str]) -> t.Dict[str, bytes]:
+        entries: t.Dict[str, bytes] = {}
+        stale_keys = []
+        now = time.time()
+        with self._lock:
+            connection = self._connection()
+            for batch in _batches(keys, self.BATCH_SIZE):
+                rows = connection.execute(
+                    f"SELECT key, value, accessed_ts FROM entries WHERE namespace = ? AND version = ? AND key IN ({_placeholders(batch)})",
+                    (self._namespace, self._version, *batch),
+                )
+                for key, value, accessed_ts in rows:
+                    entries[key] = value
+                    if accessed_ts < now - self.TOUCH_INTERVAL_SECONDS:
+                        stale_keys.append(key)
+
+            if stale_keys:
+                with connection:
+                    connection.executemany(
+                        "UPDATE entries SET accessed_ts = ? WHERE namespace = ? AND key = ?",
+                        [(now, self._namespace, key) for key in stale_keys],
+                    )
+        return entries
+
+    def put_many(self, entries: t.Dict[str, bytes]) -> None:
+        now = time.time()
+        with self._lock:
+            connection = self._connection()
+            with connection:
+                connection.executemany(
+                    "INSERT OR REPLACE INTO entries (namespace, key, version, value, size, accessed_ts) VALUES (?, ?, ?, ?, ?, ?)",
+                    [
+                        (self._namespace, key, self._version, content, len(content), now)
+                        for key, content in entries.items()
+                    ],
+                )
+
+    def exists_many(self, keys: t.Collection[str]) -> t.Set[str]:
+        existing: t.Set[str] = set()
+        with self._lock:
+            connection = self._connection()
+            for batch in _batches(keys, self.BATCH_SIZE):
+                existing.update(
+                    key
+                    for (key,) in connection.execute(
+                        f"SELECT key FROM entries WHERE namespace = ? AND version = ? AND key IN ({_placeholders(batch)})",
+                        (self._namespace, self._version, *batch),
+                    )
+                )
+        return existing
+
+    def clear(self) -> None:
+        if not self._db_path.exists():
+            return
+
+        with self._lock:
+            connection = self._connection()
+            with connection:
+                connection.execute("DELETE FROM entries WHERE namespace = ?", (self._namespace,))
+
+    def _evict(self) -> None:
+        if not self._db_path.exists():
+            return
+
+        connection = self._connection()
+        with connection:
+            connection.execute(
+                "DELETE FROM entries WHERE namespace = ? AND (version != ? OR accessed_ts < ?)",
+                (self._namespace, self._version, time.time() - _ENTRY_TTL_SECONDS),
+            )
+
+            (total_size,) = connection.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()
+            if total_size <= self.MAX_SIZE_BYTES:
+                return
+
+            to_delete = []
+            for namespace, key, size in connection.execute(
+                "SELECT namespace, key, size FROM entries ORDER BY accessed_ts"
+            ):
+                to_delete.append((namespace, key))
+                total_size -= size
+                if total_size <= self.MAX_SIZE_BYTES:
+                    break
+            connection.executemany("DELETE FROM entries WHERE namespace = ? AND key = ?", to_delete)
+
+    @property
+    def _lock(self) -> threading.RLock:
+        pid = os.getpid()
+        lock = self._locks.get(pid)
+        if lock is None:
+            # setdefault is atomic, so threads racing to create the lock of a process end up with the same one
+            lock = self._locks.setdefault(pid, threading.RLock())
+        return lock
+
+    def _connection(self) -> sqlite3.Connection:
+        import sqlite3
+
+        pid = os.getpid()
+        owner_pid, connection = self._connections.get(self._db_path, (None, None))
+        if connection is not None and owner_pid == pid and self._db_path.exists():
+            return connection
+
+        if connection is not None:
+            if owner_pid == pid:
+                # The database file was removed
+                connection.close()
+            else:
+                # Closing a connection that was inherited from the parent process can corrupt the database
+                self._inherited_connections.append(connection)
+
+        self._db_path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(
+            str(self._db_path), timeout=60, isolation_level=None, check_same_thread=False
+        )
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                namespace TEXT NOT NULL,
+                key TEXT NOT NULL,
+                version TEXT NOT NULL,
+                value BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                accessed_ts REAL NOT NULL,
+                PRIMARY KEY (namespace, key)
+            )
+            """
+        )
+        connection.execute(
+            "CREATE INDEX IF NOT EXISTS entries_accessed_ts_idx ON entries (accessed_ts)"
+        )
+        self._connections[self._db_path] = (pid, connection)
+        return connection
+
+
+CACHE_STORES: t.Dict[str, t.Type[CacheStore]] = {
+    "sqlite": SQLiteCacheStore,
+    "directory": DirectoryCacheStore,
+}
+
+
+def create_cache_store(
+    path: Path, namespace: str, version: str, backend: t.Optional[str] = None
+) -> CacheStore:
+    """Creates a cache store using the given backend, falling back to the directory layout if it fails.
+
+    Args:
+        path: The path to the cache folder.
+        namespace: The namespace of entries in the store.
+        version: The version of the cache format.
+        backend: The name of the backend. Defaults to the value of the SQLMESH_CACHE_BACKEND
+            environment variable or 'sqlite'.
+    """
+    backend = (backend or os.environ.get(CACHE_BACKEND_ENV_VAR) or "sqlite").lower()
+    store_class = CACHE_STORES.get(backend)
+    if store_class is None:
+        raise SQLMeshError(
+            f"Unsupported cache backend '{backend}'. Supported backends: {', '.join(CACHE_STORES)}."
+        )
+
+    if store_class is not DirectoryCacheStore:
+        try:
+            return store_class(path, namespace, version)
+        except Exception as ex:
+            logger.warning(
+                "Failed to open the '%s' cache in '%s', falling back to the directory cache: %s",
+                backend,
+                path,
+                ex,
+            )
+    return DirectoryCacheStore(path, namespace, version)
+
 
 class FileCache(t.Generic[T]):
     """Generic file-based cache implementation.
@@ -32,11 +328,10 @@ class FileCache(t.Generic[T]):
         entry_class: The type of cached entries.
         prefix: The prefix shared between all entries to distinguish them from other entries
             stored in the same cache folder.
+        backend: The name of the cache store backend. See `create_cache_store`.
     """
 
-    def __init__(self, path: Path, prefix: t.Optional[str] = None):
-        self._path = path / prefix if prefix else path
-
+    def __init__(self, path: Path, prefix: t.Optional[str] = None, backend: t.Optional[str] = None):
         from sqlmesh.core.state_sync.base import SCHEMA_VERSION
 
         try:
@@ -56,11 +351,7 @@ class FileCache(t.Generic[T]):
             ]
         )
 
-        threshold = to_datetime("1 week ago").timestamp()
-        # delete all old cache files
-        for file in self._path.glob("*"):
-            if not file.stem.startswith(self._cache_version) or file.stat().st_atime < threshold:
-                file.unlink(missing_ok=True)
+        self._store = create_cache_store(path, prefix or "", self._cache_version, backend=backend)
 
     def get_or_load(self, name: str, entry_id: str = "", *, loader: t.Callable[[], T]) -> T:
         """Returns an existing cached entry or loads and caches a new one.
@@ -91,15 +382,29 @@ class FileCache(t.Generic[T]):
         Returns:
             The entry or None if no entry was found in the cache.
         """
-        cache_entry_path = self._cache_entry_path(name, entry_id)
-        if cache_entry_path.exists():
-            with gzip.open(cache_entry_path, "rb") as fd:
-                try:
-                    return pickle.load(fd)
-                except Exception as ex:
-                    logger.warning("Failed to load a cache entry '%s': %s", name, ex)
+        return self.get_many([(name, entry_id)]).get((name, entry_id))
+
+    def get_many(
+        self, names_and_ids: t.Iterable[t.Tuple[str, str]]
+    ) -> t.Dict[t.Tuple[str, str], T]:
+        """Returns all cached entries that exist for the given names and entry identifiers.
+
+        Args:
+            names_and_ids: Pairs of entry names and entry identifiers.
 
-        return None
+        Returns:
+            A mapping from the name and entry identifier to the entry for entries that were found.
+        """
+        keys = {
+            self._entry_key(name, entry_id): (name, entry_id) for name, entry_id in names_and_ids
+        }
+        entries = {}
+        for key, content in self._store.get_many(keys).items():
+            try:
+                entries[keys[key]] = serialization.loads(content)
+            except Exception as ex:
+                logger.warning("Failed to load a cache entry '%s': %s", keys[key][0], ex)
+        return entries
 
     def put(self, name: str, entry_id: str = "", *, value: T) -> None:
         """Stores the given value in the cache.
@@ -109,12 +414,20 @@ class FileCache(t.Generic[T]):
             entry_id: The unique entry identifier. Used for cache invalidation.
             value: The value to store in the cache.
         """
-        self._path.mkdir(parents=True, exist_ok=True)
-        if not self._path.is_dir():
-            raise SQLMeshError(f"Cache path '{self._path}' is not a directory.")
+        self.put_many({(name, entry_id): value})
+
+    def put_many(self, entries: t.Dict[t.Tuple[str, str], T]) -> None:
+        """Stores the given values in the cache.
 
-        with gzip.open(self._cache_entry_path(name, entry_id), "wb", compresslevel=1) as fd:
-            pickle.dump(value, fd)
+        Args:
+            entries: A mapping from the name and entry identifier to the value to store.
+        """
+        self._store.put_many(
+            {
+                self._entry_key(name, entry_id): serialization.dumps(value)
+                for (name, entry_id), value in entries.items()
+            }
+        )
 
     def exists(self, name: str, entry_id: str = "") -> bool:
         """Returns true if the cache entry with the given name and ID exists, false otherwise.
@@ -123,18 +436,32 @@ class FileCache(t.Generic[T]):
             name: The name of the entry.
             entry_id: The unique entry identifier. Used for cache invalidation.
         """
-        return self._cache_entry_path(name, entry_id).exists()
+        return bool(self.exists_many([(name, entry_id)]))
+
+    def exists_many(self, names_and_ids: t.Iterable[t.Tuple[str, str]]) -> t.Set[t.Tuple[str, str]]:
+        """Returns the subset of the given names and entry identifiers for which entries exist."""
+        keys = {
+            self._entry_key(name, entry_id): (name, entry_id) for name, entry_id in names_and_ids
+        }
+        return {keys[key] for key in self._store.exists_many(keys)}
 
     def clear(self) -> None:
-        try:
-            shutil.rmtree(str(self._path.absolute()))
-        except Exception:
-            pass
+        self._store.clear()
 
-    def _cache_entry_path(self, name: str, entry_id: str = "") -> Path:
-        entry_file_name = "__".join(p for p in (self._cache_version, name, entry_id) if p)
-        full_path = self._path / sanitize_name(entry_file_name)
-        if IS_WINDOWS:
-            # handle paths longer than 260 chars
-            full_path = fix_windows_path(full_path)
-        return full_path
+    def _entry_key(self, name: str, entry_id: str = "") -> str:
+        return "__".join(p for p in (name, entry_id) if p)
+
+
+def _placeholders(values: t.Collection[t.Any]) -> str:
+    return ", ".join("?" * len(values))
+
+
+def _batches(values: t.Iterable[str], batch_size: int) -> t.Iterator[t.List[str]]:
+    batch: t.List[str] = []
+    for value in values:
+        batch.append(value)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
@@ -1,3 +1,5 @@
+import heapq
+import itertools
 import typing as t
 from concurrent.futures import Executor, Future, ThreadPoolExecutor
 from threading import Lock
@@ -30,6 +32,12 @@ class ConcurrentDAGExecutor(t.Generic[H]):
         raise_on_error: If set to True raises an exception on a first encountered error,
             otherwises returns a tuple which contains a list of failed nodes and a list of
             skipped nodes.
+        node_priorities: Optional priorities of nodes. When multiple nodes are ready to be processed,
+            the ones with higher priority are submitted first. Nodes without a priority default to 0.
+        node_resources: Optional resource classes (eg. gateways) used by each node.
+        resource_limits: The maximum number of nodes that can use the given resource class concurrently.
+            A ready node whose resource class is saturated waits without occupying a worker, which lets
+            nodes that use other resource classes run in the meantime.
     """
 
     def __init__(
@@ -38,11 +46,17 @@ class ConcurrentDAGExecutor(t.Generic[H]):
         fn: t.Callable[[H], None],
         tasks_num: int,
         raise_on_error: bool,
+        node_priorities: t.Optional[t.Dict[H, float]] = None,
+        node_resources: t.Optional[t.Dict[H, t.Collection[t.Hashable]]] = None,
+        resource_limits: t.Optional[t.Dict[t.Hashable, int]] = None,
     ):
         self.dag = dag
         self.fn = fn
         self.tasks_num = tasks_num
         self.raise_on_error = raise_on_error
+        self.node_priorities = node_priorities or {}
+        self.node_resources = node_resources or {}
+        self.resource_limits = resource_limits or {}
 
         self._init_state()
 
@@ -67,45 +81,102 @@ class ConcurrentDAGExecutor(t.Generic[H]):
     def _process_node(self, node: H, executor: Executor) -> None:
         try:
             self.fn(node)
-
-            with self._unprocessed_nodes_lock:
-                self._unprocessed_nodes_num -= 1
-                self._submit_next_nodes(executor, node)
         except Exception as ex:
-            error = NodeExecutionFailedError(node)
-            error.__cause__ = ex
-
-            if self.raise_on_error:
-                self._finished_future.set_exception(error)
-                return
+            self._on_node_failed(node, ex, executor)
+        else:
+            self._on_node_succeeded(node, executor)
+
+    def _on_node_succeeded(self, node: H, executor: Executor) -> None:
+        with self._unprocessed_nodes_lock:
+            self._unprocessed_nodes_num -= 1
+            self._release_node(node)
+            self._submit_next_nodes(executor, node)
+
+    def _on_node_failed(self, node: H, ex: Exception, executor: Executor) -> None:
+        error = NodeExecutionFailedError(node)
+        error.__cause__ = ex
+
+        if self.raise_on_error:
+            self._finished_future.set_exception(error)
+            return
 
-            with self._unprocessed_nodes_lock:
-                self._unprocessed_nodes_num -= 1
-                self._node_errors.append(error)
-                self._skip_next_nodes(node)
+        with self._unprocessed_nodes_lock:
+            self._unprocessed_nodes_num -= 1
+            self._release_node(node)
+            self._node_errors.append(error)
+            self._skip_next_nodes(node)
+            self._submit_ready_nodes(executor)
 
     def _submit_next_nodes(self, executor: Executor, processed_node: t.Optional[H] = None) -> None:
         if not self._unprocessed_nodes_num:
             self._finished_future.set_result(None)
             return
 
-        submitted_nodes = []
-        for next_node, deps in self._unprocessed_nodes.items():
-            if processed_node:
-                deps.discard(processed_node)
-            if not deps:
-                submitted_nodes.append(next_node)
-
-        for submitted_node in submitted_nodes:
-            self._unprocessed_nodes.pop(submitted_node)
-            executor.submit(self._process_node, submitted_node, executor)
+        if processed_node is None:
+            next_nodes = [
+                node for node, deps_num in self._unprocessed_nodes.items() if not deps_num
+            ]
+        else:
+            next_nodes = []
+            for child in self._children[processed_node]:
+                if child not in self._unprocessed_nodes:
+                    # The child has already been skipped due to a failure of another parent.
+                    continue
+                self._unprocessed_nodes[child] -= 1
+                if not self._unprocessed_nodes[child]:
+                    next_nodes.append(child)
+
+        for next_node in next_nodes:
+            self._unprocessed_nodes.pop(next_node)
+            heapq.heappush(
+                self._ready_nodes,
+                (-self.node_priorities.get(next_node, 0), next(self._ready_nodes_seq), next_node),
+            )
+
+        self._submit_ready_nodes(executor)
+
+    def _submit_ready_nodes(self, executor: Executor) -> None:
+        # Only as many nodes as there are workers are handed to the pool, so that the ones with
+        # the highest priority are picked up first whenever a worker frees up.
+        while self._ready_nodes and self._running_nodes_num < self.tasks_num:
+            entry = heapq.heappop(self._ready_nodes)
+            node = entry[2]
+
+            resources = self.node_resources.get(node, ())
+            saturated_resource = next(
+                (
+                    r
+                    for r in resources
+                    if r in self.resource_limits
+                    and self._used_resources.get(r, 0) >= self.resource_limits[r]
+                ),
+                None,
+            )
+            if saturated_resource is not None:
+                # Park the node until the saturated resource is released.
+                self._blocked_nodes.setdefault(saturated_resource, []).append(entry)
+                continue
+
+            for resource in resources:
+                self._used_resources[resource] = self._used_resources.get(resource, 0) + 1
+            self._running_nodes_num += 1
+            executor.submit(self._process_node, node, executor)
+
+    def _release_node(self, node: H) -> None:
+        self._running_nodes_num -= 1
+        for resource in self.node_resources.get(node, ()):
+            self._used_resources[resource] -= 1
+            for entry in self._blocked_nodes.pop(resource, []):
+                heapq.heappush(self._ready_nodes, entry)
 
     def _skip_next_nodes(self, parent: H) -> None:
         if not self._unprocessed_nodes_num:
             self._finished_future.set_result(None)
             return
 
-        skipped_nodes = {node for node, deps in self._unprocessed_nodes.items() if parent in deps}
+        skipped_nodes = {
+            child for child in self._children[parent] if child in self._unprocessed_nodes
+        }
 
         while skipped_nodes:
             self._skipped_nodes.extend(skipped_nodes)
@@ -115,18 +186,38 @@ class ConcurrentDAGExecutor(t.Generic[H]):
                 self._unprocessed_nodes.pop(skipped_node)
 
             skipped_nodes = {
-                node
-                for node, deps in self._unprocessed_nodes.items()
-                if skipped_nodes.intersection(deps)
+                child
+                for skipped_node in skipped_nodes
+                for child in self._children[skipped_node]
+                if child in self._unprocessed_nodes
             }
 
         if not self._unprocessed_nodes_num:
             self._finished_future.set_result(None)
 
     def _init_state(self) -> None:
-        self._unprocessed_nodes = self.dag.graph
+        graph = self.dag.graph
+
+        # Maps each node to the number of its dependencies that haven't been processed yet.
+        self._unprocessed_nodes: t.Dict[H, int] = {node: len(deps) for node, deps in graph.items()}
+        # Reverse adjacency so that completing a node only touches its direct children.
+        self._children: t.Dict[H, t.List[H]] = {node: [] for node in graph}
+        for node, deps in graph.items():
+            for dep in deps:
+                self._children[dep].append(node)
+
         self._unprocessed_nodes_num = len(self._unprocessed_nodes)
         self._unprocessed_nodes_lock = Lock()
+
+        # Nodes whose dependencies have all been processed, ordered by priority and then by the
+        # order in which they became ready.
+        self._ready_nodes: t.List[t.Tuple[float, int, H]] = []
+        self._ready_nodes_seq = itertools.count()
+        self._running_nodes_num = 0
+
+        self._used_resources: t.Dict[t.Hashable, int] = {}
+        # Ready nodes that wait for the given resource to be released.
+        self._blocked_nodes: t.Dict[t.Hashable, t.List[t.Tuple[float, int, H]]] = {}
         self._finished_future = Future()  # type: ignore
 
         self._node_errors: t.List[NodeExecutionFailedError[H]] = []
@@ -180,6 +271,9 @@ def concurrent_apply_to_dag(
     fn: t.Callable[[H], None],
     tasks_num: int,
     raise_on_error: bool = True,
+    node_priorities: t.Optional[t.Dict[H, float]] = None,
+    node_resources: t.Optional[t.Dict[H, t.Collection[t.Hashable]]] = None,
+    resource_limits: t.Optional[t.Dict[t.Hashable, int]] = None,
 ) -> t.Tuple[t.List[NodeExecutionFailedError[H]], t.List[H]]:
     """Applies a function to the given DAG concurrently while preserving the topological
     order between snapshots.
@@ -191,6 +285,9 @@ def concurrent_apply_to_dag(
         raise_on_error: If set to True raises an exception on a first encountered error,
             otherwises returns a tuple which contains a list of failed nodes and a list of
             skipped nodes.
+        node_priorities: Optional priorities of nodes. Ready nodes with higher priority are processed first.
+        node_resources: Optional resource classes (eg. gateways) used by each node.
+        resource_limits: The maximum number of nodes that can use the given resource class concurrently.
 
     Raises:
         NodeExecutionFailedError if `raise_on_error` is set to True and execution fails for any snapshot.
@@ -209,9 +306,34 @@ def concurrent_apply_to_dag(
         fn,
         tasks_num,
         raise_on_error,
+        node_priorities=node_priorities,
+        node_resources=node_resources,
+        resource_limits=resource_limits,
     ).run()
 
 
+def critical_path_priorities(dag: DAG[H], node_weight: t.Callable[[H], float]) -> t.Dict[H, float]:
+    """Computes the priority of each node as the heaviest path from the node to any of its descendants.
+
+    Prioritizing nodes this way makes sure that long chains of expensive nodes are started as early as
+    possible, which minimizes the overall wall-clock time of the DAG traversal.
+
+    Args:
+        dag: The target DAG.
+        node_weight: Returns the expected cost of processing the given node.
+
+    Returns:
+        A mapping from node to the total weight of the heaviest path starting at that node.
+    """
+    children = dag.reversed.graph
+    priorities: t.Dict[H, float] = {}
+    for node in reversed(dag.sorted):
+        priorities[node] = node_weight(node) + max(
+            (priorities[child] for child in children[node]), default=0.0
+        )
+    return priorities
+
+
 def sequential_apply_to_dag(
     dag: DAG[H],
     fn: t.Callable[[H], None],
@@ -7,7 +7,16 @@ from functools import lru_cache
 from croniter import croniter
 from sqlglot.helper import first
 
-from sqlmesh.utils.date import TimeLike, now, to_datetime
+from sqlmesh.utils.date import TimeLike, now, to_datetime, to_timestamp
+from sqlmesh.utils.intervals import fixed_width_ticks
+
+if t.TYPE_CHECKING:
+    import numpy as np
+
+# Bounds of the process-wide cron calendar. Tick arrays are bounded separately since each of them
+# can hold years worth of ticks.
+CRON_TICKS_CACHE_SIZE = 256
+CRON_TIMESTAMP_CACHE_SIZE = 4096
 
 
 @lru_cache(maxsize=None)
@@ -53,3 +62,72 @@ class CroniterCache:
         else:
             self.curr = to_datetime(croniter(self.cron, self.curr).get_prev() * 1000, tz=self.tz)
         return self.curr
+
+
+@lru_cache(maxsize=CRON_TICKS_CACHE_SIZE)
+def cron_ticks(cron: str, start_ts: int, end_ts: int) -> np.ndarray:
+    """Returns the ticks of a cron between the start and the end.
+
+    The result is cached and shared by all callers, so nodes with the same cron reuse the same array.
+    The array is read-only. Hits and misses are available through `cron_ticks.cache_info()`.
+
+    Args:
+        cron: The cron string.
+        start_ts: The first tick.
+        end_ts: The last tick, which is included even if it doesn't fall on the cron schedule.
+
+    Returns:
+        A read-only int64 array of ticks.
+    """
+    import numpy as np
+
+    width_seconds = interval_seconds(cron)
+    if width_seconds:
+        # Fixed width crons don't need to go through croniter to compute each tick.
+        timestamps = fixed_width_ticks(start_ts, end_ts, width_seconds * 1000)
+    else:
+        croniter = CroniterCache(cron, start_ts)
+        timestamps = [start_ts]
+
+        while True:
+            ts = to_timestamp(croniter.get_next(estimate=True))
+
+            if ts > end_ts:
+                if timestamps and timestamps[-1] != end_ts:
+                    timestamps.append(end_ts)
+                break
+
+            timestamps.append(ts)
+
+    ticks = np.array(timestamps, dtype=np.int64)
+    ticks.flags.writeable = False
+    return ticks
+
+
+@lru_cache(maxsize=CRON_TIMESTAMP_CACHE_SIZE)
+def cron_next(
+    cron: str, time: datetime, tz: t.Optional[tzinfo] = None, estimate: bool = False
+) -> datetime:
+    """Returns the next cron tick after the given time. Hits and misses are available through
+    `cron_next.cache_info()`."""
+    return CroniterCache(cron, time, tz=tz).get_next(estimate=estimate)
+
+
+@lru_cache(maxsize=CRON_TIMESTAMP_CACHE_SIZE)
+def cron_prev(
+    cron: str, time: datetime, tz: t.Optional[tzinfo] = None, estimate: bool = False
+) -> datetime:
+    """Returns the previous cron tick before the given time. Hits and misses are available through
+    `cron_prev.cache_info()`."""
+    return CroniterCache(cron, time, tz=tz).get_prev(estimate=estimate)
+
+
+@lru_cache(maxsize=CRON_TIMESTAMP_CACHE_SIZE)
+def cron_floor(
+    cron: str, time: datetime, tz: t.Optional[tzinfo] = None, estimate: bool = False
+) -> datetime:
+    """Returns the latest cron tick at or before the given time. Hits and misses are available through
+    `cron_floor.cache_info()`."""
+    croniter = CroniterCache(cron, time, tz=tz)
+    croniter.get_next(estimate=estimate)
+    return croniter.get_prev(estimate=True)
@@ -19,7 +19,10 @@ class DAG(t.Generic[T]):
     def __init__(self, graph: t.Optional[t.Dict[T, t.Set[T]]] = None):
         self._dag: t.Dict[T, t.Set[T]] = {}
         self._sorted: t.Optional[t.List[T]] = None
+        self._sorted_index: t.Optional[t.Dict[T, int]] = None
         self._upstream: t.Dict[T, t.Set[T]] = {}
+        # Reverse adjacency, built lazily on first use and maintained incrementally afterwards.
+        self._downstream_index: t.Optional[t.Dict[T, t.Set[T]]] = None
 
         for node, dependencies in (graph or {}).items():
             self.add(node, dependencies)
@@ -31,25 +34,44 @@ class DAG(t.Generic[T]):
             node: The node to add.
             dependencies: Optional dependencies to add to the node.
         """
-        self._sorted = None
-        self._upstream.clear()
-        if node not in self._dag:
+        is_new_node = node not in self._dag
+        if is_new_node:
             self._dag[node] = set()
-        if dependencies:
-            self._dag[node].update(dependencies)
-            for d in dependencies:
-                self.add(d)
+            self._reset_sorted()
+            if self._downstream_index is not None:
+                self._downstream_index[node] = set()
+
+        if not dependencies:
+            return
+
+        node_deps = self._dag[node]
+        new_deps = [d for d in dependencies if d not in node_deps]
+        if not new_deps:
+            return
+
+        for d in new_deps:
+            self.add(d)
+
+        node_deps.update(new_deps)
+        self._reset_sorted()
+        if self._downstream_index is not None:
+            for d in new_deps:
+                self._downstream_index[d].add(node)
+
+        if not is_new_node and self._upstream:
+            # Only the node itself and its descendants see a different upstream. A new node can't
+            # have any descendants yet, so the cache is left intact in that case.
+            self._upstream = {
+                cached_node: upstream
+                for cached_node, upstream in self._upstream.items()
+                if cached_node != node and node not in upstream
+            }
 
     @property
     def reversed(self) -> DAG[T]:
         """Returns a copy of this DAG with all its edges reversed."""
         result = DAG[T]()
-
-        for node, deps in self._dag.items():
-            result.add(node)
-            for dep in deps:
-                result.add(dep, [node])
-
+        result._dag = {node: children.copy() for node, children in self._children.items()}
         return result
 
     def subdag(self, *nodes: T) -> DAG[T]:
@@ -81,18 +103,23 @@ class DAG(t.Generic[T]):
         Returns:
             A new dag consisting of the specified nodes.
         """
+        included = set(nodes)
         dag: DAG[T] = DAG()
 
         for node, deps in self._dag.items():
-            if node in nodes:
-                dag.add(node, (dep for dep in deps if dep in nodes))
+            if node in included:
+                dag.add(node, (dep for dep in deps if dep in included))
 
         return dag
 
     def upstream(self, node: T) -> t.Set[T]:
         """Returns all upstream dependencies."""
+        if node not in self._dag:
+            # Nodes outside of the graph aren't memoized, so adding them later doesn't leave a stale entry.
+            return set()
+
         if node not in self._upstream:
-            deps = self._dag.get(node, set())
+            deps = self._dag[node]
             self._upstream[node] = {
                 upstream for dep in deps for upstream in self.upstream(dep)
             } | deps
@@ -115,52 +142,60 @@ class DAG(t.Generic[T]):
     def sorted(self) -> t.List[T]:
         """Returns a list of nodes sorted in topological order."""
         if self._sorted is None:
-            self._sorted = []
-            unprocessed_nodes = self.graph
-
-            last_processed_nodes: t.Set[T] = set()
-            cycle_candidates: t.Collection = unprocessed_nodes
-
-            while unprocessed_nodes:
-                next_nodes = {node for node, deps in unprocessed_nodes.items() if not deps}
-
-                if not next_nodes:
-                    # Sort cycle candidates to make the order deterministic
-                    cycle_candidates_msg = (
-                        "\nPossible candidates to check for circular references: "
-                        + ", ".join(str(node) for node in sorted(cycle_candidates))
-                    )
-
-                    if last_processed_nodes:
-                        last_processed_msg = "\nLast nodes added to the DAG: " + ", ".join(
-                            str(node) for node in last_processed_nodes
-                        )
-                    else:
-                        last_processed_msg = ""
-
-                    raise SQLMeshError(
-                        "Detected a cycle in the DAG. "
-                        "Please make sure there are no circular references between nodes."
-                        f"{last_processed_msg}{cycle_candidates_msg}"
-                    )
-
+            children = self._children
+            remaining_deps = {node: len(deps) for node, deps in self._dag.items()}
+
+            sorted_nodes: t.List[T] = []
+            # Sort to make the order deterministic
+            next_nodes: t.List[T] = sorted(  # type: ignore
+                node for node, num in remaining_deps.items() if not num
+            )
+            last_processed_nodes: t.List[T] = []
+            affected_nodes: t.Optional[t.Set[T]] = None
+
+            while next_nodes:
+                sorted_nodes.extend(next_nodes)
+
+                ready_nodes = []
+                affected_nodes = set()
                 for node in next_nodes:
-                    unprocessed_nodes.pop(node)
-
-                nodes_with_unaffected_deps: t.Set[T] = set()
-                for node, deps in unprocessed_nodes.items():
-                    deps_before_subtraction = deps
-
-                    deps -= next_nodes
-                    if deps_before_subtraction == deps:
-                        nodes_with_unaffected_deps.add(node)
+                    for child in children[node]:
+                        affected_nodes.add(child)
+                        remaining_deps[child] -= 1
+                        if not remaining_deps[child]:
+                            ready_nodes.append(child)
+
+                last_processed_nodes = next_nodes
+                next_nodes = sorted(ready_nodes)  # type: ignore
+
+            if len(sorted_nodes) < len(self._dag):
+                unprocessed_nodes = [node for node, num in remaining_deps.items() if num]
+                cycle_candidates: t.Collection[T] = unprocessed_nodes
+                if affected_nodes is not None:
+                    cycle_candidates = [
+                        node for node in unprocessed_nodes if node not in affected_nodes
+                    ] or unprocessed_nodes
+
+                # Sort cycle candidates to make the order deterministic
+                cycle_candidates_msg = (
+                    "\nPossible candidates to check for circular references: "
+                    + ", ".join(str(node) for node in sorted(cycle_candidates))  # type: ignore
+                )
+
+                if last_processed_nodes:
+                    last_processed_msg = "\nLast nodes added to the DAG: " + ", ".join(
+                        str(node) for node in last_processed_nodes
+                    )
+                else:
+                    last_processed_msg = ""
 
-                cycle_candidates = nodes_with_unaffected_deps or unprocessed_nodes
+                raise SQLMeshError(
+                    "Detected a cycle in the DAG. "
+                    "Please make sure there are no circular references between nodes."
+                    f"{last_processed_msg}{cycle_candidates_msg}"
+                )
 
-                # Sort to make the order deterministic
-                # TODO: Make protocol that makes the type var both hashable and sortable once we are on Python 3.8+
-                last_processed_nodes = sorted(next_nodes)  # type: ignore
-                self._sorted.extend(last_processed_nodes)
+            self._sorted = sorted_nodes
 
         return self._sorted
 
@@ -173,22 +208,20 @@ class DAG(t.Generic[T]):
         Returns:
             A list of descendant nodes sorted in topological order.
         """
-        sorted_nodes = self.sorted
-        try:
-            node_index = sorted_nodes.index(node)
-        except ValueError:
+        sorted_index = self._get_sorted_index()
+        if node not in sorted_index:
             return []
 
-        def visit() -> t.Iterator[T]:
-            """Visit topologically sorted nodes after input node and yield downstream dependants."""
-            downstream = {node}
-            for current_node in sorted_nodes[node_index + 1 :]:
-                upstream = self._dag.get(current_node, set())
-                if not upstream.isdisjoint(downstream):
-                    downstream.add(current_node)
-                    yield current_node
+        children = self._children
+        downstream: t.Set[T] = set()
+        queue = [node]
+        while queue:
+            for child in children[queue.pop()]:
+                if child not in downstream:
+                    downstream.add(child)
+                    queue.append(child)
 
-        return list(visit())
+        return sorted(downstream, key=sorted_index.__getitem__)
 
     def lineage(self, node: T) -> DAG[T]:
         """Get a dag of the node and its upstream dependencies and downstream dependents.
@@ -201,8 +234,27 @@ class DAG(t.Generic[T]):
         """
         return self.subdag(node, *self.downstream(node))
 
+    @property
+    def _children(self) -> t.Dict[T, t.Set[T]]:
+        if self._downstream_index is None:
+            downstream_index: t.Dict[T, t.Set[T]] = {node: set() for node in self._dag}
+            for node, deps in self._dag.items():
+                for dep in deps:
+                    downstream_index[dep].add(node)
+            self._downstream_index = downstream_index
+        return self._downstream_index
+
+    def _get_sorted_index(self) -> t.Dict[T, int]:
+        if self._sorted_index is None:
+            self._sorted_index = {node: i for i, node in enumerate(self.sorted)}
+        return self._sorted_index
+
+    def _reset_sorted(self) -> None:
+        self._sorted = None
+        self._sorted_index = None
+
     def __contains__(self, item: T) -> bool:
-        return item in self.graph
+        return item in self._dag
 
     def __iter__(self) -> t.Iterator[T]:
         for node in self.sorted:
@@ -0,0 +1,185 @@
+"""
+# Intervals
+
+Vectorized operations on collections of [start, end) intervals of epoch millisecond timestamps.
+
+Intervals are represented as int64 arrays of starts and ends, which lets gap detection, merging and
+removal scale with NumPy instead of nested Python loops over every cron tick.
+"""
+
+from __future__ import annotations
+
+import itertools
+import typing as t
+
+if t.TYPE_CHECKING:
+    import numpy as np
+
+    IntervalArrays = t.Tuple[np.ndarray, np.ndarray]
+
+IntervalTuple = t.Tuple[int, int]
+
+
+def to_arrays(intervals: t.Collection[IntervalTuple], sort: bool = True) -> IntervalArrays:
+    """Converts intervals into a pair of start and end arrays.
+
+    Args:
+        intervals: The intervals to convert.
+        sort: Whether to sort the intervals by start and then by end.
+
+    Returns:
+        A pair of int64 arrays with starts and ends.
+    """
+    import numpy as np
+
+    if not intervals:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+    pairs = np.fromiter(
+        itertools.chain.from_iterable(intervals), dtype=np.int64, count=2 * len(intervals)
+    ).reshape(-1, 2)
+    starts, ends = pairs[:, 0], pairs[:, 1]
+    if sort:
+        order = np.lexsort((ends, starts))
+        starts, ends = starts[order], ends[order]
+    return starts, ends
+
+
+def from_arrays(starts: np.ndarray, ends: np.ndarray) -> t.List[IntervalTuple]:
+    """Converts a pair of start and end arrays back into a list of interval tuples."""
+    return list(zip(starts.tolist(), ends.tolist()))
+
+
+def merge_intervals(intervals: t.Collection[IntervalTuple]) -> t.List[IntervalTuple]:
+    """Merges overlapping and adjacent intervals.
+
+    Args:
+        intervals: The intervals to merge.
+
+    Returns:
+        A new list of sorted and merged intervals.
+    """
+    if len(intervals) < 2:
+        return list(intervals)
+
+    import numpy as np
+
+    starts, ends = to_arrays(intervals)
+    # The end of the merged interval that each interval would extend.
+    running_ends = np.maximum.accumulate(ends)
+    # An interval starts a new group if it begins after all the preceding ones have ended.
+    is_group_start = np.empty(len(starts), dtype=bool)
+    is_group_start[0] = True
+    np.greater(starts[1:], running_ends[:-1], out=is_group_start[1:])
+
+    is_group_end = np.empty(len(starts), dtype=bool)
+    is_group_end[:-1] = is_group_start[1:]
+    is_group_end[-1] = True
+
+    return from_arrays(starts[is_group_start], running_ends[is_group_end])
+
+
+def remove_interval(
+    intervals: t.Collection[IntervalTuple], remove_start: int, remove_end: int
+) -> t.List[IntervalTuple]:
+    """Removes the [remove_start, remove_end) range from each of the given intervals.
+
+    The relative order of the intervals is preserved.
+
+    Args:
+        intervals: A list of exclusive intervals.
+        remove_start: The inclusive start to remove.
+        remove_end: The exclusive end to remove.
+
+    Returns:
+        A new list of intervals.
+    """
+    if not intervals:
+        return []
+
+    import numpy as np
+
+    starts, ends = to_arrays(intervals, sort=False)
+
+    # Each interval leaves at most a head before the removed range and a tail after it.
+    head_ends = np.minimum(remove_start, ends)
+    tail_starts = np.maximum(remove_end, starts)
+    keep = np.stack((starts < remove_start, ends > remove_end), axis=1).ravel()
+    pieces_starts = np.stack((starts, tail_starts), axis=1).ravel()
+    pieces_ends = np.stack((head_ends, ends), axis=1).ravel()
+
+    return from_arrays(pieces_starts[keep], pieces_ends[keep])
+
+
+def fixed_width_ticks(start_ts: int, end_ts: int, width_ms: int) -> t.List[int]:
+    """Generates the boundaries of fixed width intervals between the start and the end.
+
+    The last boundary is always `end_ts`, even if the last interval is shorter than `width_ms`.
+
+    Args:
+        start_ts: The first boundary.
+        end_ts: The last boundary.
+        width_ms: The width of each interval in milliseconds.
+
+    Returns:
+        A list of interval boundaries.
+    """
+    import numpy as np
+
+    if start_ts > end_ts:
+        return [start_ts, end_ts]
+
+    ticks = np.arange(start_ts, end_ts + 1, width_ms, dtype=np.int64).tolist()
+    if ticks[-1] != end_ts:
+        ticks.append(end_ts)
+    return ticks
+
+
+def uncovered_mask(ticks: np.ndarray, intervals: t.Collection[IntervalTuple]) -> np.ndarray:
+    """Finds which of the intervals between consecutive ticks aren't covered by the given intervals.
+
+    An interval between two ticks is covered if it's fully contained in one of the given intervals.
+
+    Args:
+        ticks: A sorted array of interval boundaries.
+        intervals: The intervals which have already been processed.
+
+    Returns:
+        A boolean array with one element per interval between consecutive ticks.
+    """
+    import numpy as np
+
+    tick_starts, tick_ends = ticks[:-1], ticks[1:]
+    if not intervals:
+        return np.ones(len(tick_starts), dtype=bool)
+
+    starts, ends = to_arrays(intervals)
+    # The index of the last interval that starts at or before each tick.
+    idx = np.searchsorted(starts, tick_starts, side="right") - 1
+    running_ends = np.maximum.accumulate(ends)
+    covered = (idx >= 0) & (tick_ends <= running_ends[np.maximum(idx, 0)])
+    return ~covered
+
+
+def apply_lookback(missing: np.ndarray, lookback: int) -> np.ndarray:
+    """Marks each interval as missing if the interval `lookback` positions after it is missing.
+
+    The trailing `lookback` intervals are always considered missing, since the intervals they
+    look back from don't exist yet.
+
+    Args:
+        missing: A boolean array which indicates which intervals are missing.
+        lookback: The lookback window.
+
+    Returns:
+        A new boolean array of missing intervals.
+    """
+    import numpy as np
+
+    if lookback <= 0:
+        return missing.copy()
+
+    shifted = np.ones(len(missing), dtype=bool)
+    if lookback < len(missing):
+        shifted[: len(missing) - lookback] = missing[lookback:]
+    return missing | shifted
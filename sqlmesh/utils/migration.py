@@ -1,5 +1,15 @@
+from __future__ import annotations
+
+import typing as t
+
+from sqlglot import exp
 from sqlglot.dialects.dialect import DialectType
 
+if t.TYPE_CHECKING:
+    from sqlmesh.core._typing import TableName
+    from sqlmesh.core.engine_adapter import EngineAdapter
+
+
 # Sizes based on a composite key/index of two text fields with 4 bytes per characters.
 MAX_TEXT_INDEX_LENGTH = {
     "mysql": "250",  # 250 characters per column, <= 767 byte index size limit
@@ -24,3 +34,87 @@ def index_text_type(dialect: DialectType) -> str:
 
 def blob_text_type(dialect: DialectType) -> str:
     return "LONGTEXT" if dialect == "mysql" else "TEXT"
+
+
+def fetch_rows_in_batches(
+    engine_adapter: EngineAdapter,
+    table: TableName,
+    columns: t.Sequence[str],
+    batch_size: int = 1000,
+    where: t.Optional[exp.Condition] = None,
+) -> t.Iterator[t.List[t.Tuple[t.Any, ...]]]:
+    """Fetches the rows of a state table that is keyed on (name, identifier) in batches.
+
+    Each batch is fetched with a separate query which starts after the last key of the previous batch,
+    so only a single batch of rows is held in memory at a time. Rows of the current batch can safely be
+    updated in place before the next batch is fetched.
+
+    Args:
+        engine_adapter: The engine adapter of the state.
+        table: The table to fetch rows from.
+        columns: The columns to fetch. The first two columns must be `name` and `identifier`.
+        batch_size: The maximum number of rows in each batch.
+        where: An optional filter of the rows to fetch.
+
+    Returns:
+        An iterator of batches of rows ordered by their key.
+    """
+    name = exp.column("name")
+    identifier = exp.column("identifier")
+    last_key: t.Optional[t.Tuple[str, str]] = None
+    while True:
+        query = (
+            exp.select(*columns)
+            .from_(table)
+            .order_by(name, identifier, copy=False)
+            .limit(batch_size, copy=False)
+        )
+        if where is not None:
+            query = query.where(where, copy=False)
+        if last_key is not None:
+            last_name, last_identifier = last_key
+            query = query.where(
+                exp.or_(
+                    name.copy() > last_name,
+                    exp.and_(name.copy().eq(last_name), identifier.copy() > last_identifier),
+                ),
+                copy=False,
+            )
+
+        rows = engine_adapter.fetchall(query, quote_identifiers=True)
+        if rows:
+            yield rows
+        if len(rows) < batch_size:
+            return
+        last_key = (rows[-1][0], rows[-1][1])
+
+
+def update_column_by_key(
+    engine_adapter: EngineAdapter,
+    table: TableName,
+    column: str,
+    values: t.Dict[t.Tuple[str, str], t.Any],
+    batch_size: int = 100,
+) -> None:
+    """Updates a column of rows of a state table that is keyed on (name, identifier) in place.
+
+    Each batch of rows is updated with a single statement.
+
+    Args:
+        engine_adapter: The engine adapter of the state.
+        table: The table to update.
+        column: The column to update.
+        values: The new values of the column by the (name, identifier) key of each row.
+        batch_size: The maximum number of rows updated by a single statement.
+    """
+    items = sorted(values.items())
+    for i in range(0, len(items), batch_size):
+        conditions = []
+        ifs = []
+        for (name, identifier), value in items[i : i + batch_size]:
+            condition = exp.and_(
+                exp.column("name").eq(name), exp.column("identifier").eq(identifier)
+            )
+            conditions.append(condition)
+            ifs.append(exp.If(this=condition.copy(), true=exp.convert(value)))
+        engine_adapter.update_table(table, {column: exp.Case(ifs=ifs)}, where=exp.or_(*conditions))
@@ -3,6 +3,7 @@ from __future__ import annotations
 import json
 import typing as t
 from datetime import tzinfo
+from functools import lru_cache
 
 import pydantic
 from pydantic import ValidationInfo as ValidationInfo
@@ -21,6 +22,8 @@ if t.TYPE_CHECKING:
 
 T = t.TypeVar("T")
 DEFAULT_ARGS = {"exclude_none": True, "by_alias": True}
+# The validation context key which marks values that were serialized by this version of SQLMesh.
+TRUSTED_CONTEXT_KEY = "trusted"
 PRIVATE_FIELDS = "__pydantic_private__"
 PYDANTIC_MAJOR_VERSION, PYDANTIC_MINOR_VERSION = [int(p) for p in pydantic.__version__.split(".")][
     :2
@@ -39,6 +42,10 @@ def field_serializer(*args: t.Any, **kwargs: t.Any) -> t.Callable[[t.Any], t.Any
     return pydantic.field_serializer(*args, **kwargs)
 
 
+def model_serializer(*args: t.Any, **kwargs: t.Any) -> t.Callable[[t.Any], t.Any]:
+    return pydantic.model_serializer(*args, **kwargs)
+
+
 def get_dialect(values: t.Any) -> str:
     """Extracts dialect from a dict or pydantic obj, defaulting to the globally set dialect.
 
@@ -211,6 +218,15 @@ def positive_int_validator(v: t.Any) -> int:
     return v
 
 
+def is_trusted(info: t.Optional[ValidationInfo]) -> bool:
+    """Returns whether the values being validated have already been validated before serialization.
+
+    Validators that only check their values, as opposed to transforming them, can skip the checks
+    for trusted values.
+    """
+    return bool(info and info.context and info.context.get(TRUSTED_CONTEXT_KEY))
+
+
 def validation_error_message(error: pydantic.ValidationError, base: str) -> str:
     errors = "\n  ".join(_formatted_validation_errors(error))
     return f"{base}\n  {errors}"
@@ -294,16 +310,22 @@ def cron_validator(v: t.Any) -> str:
     if isinstance(v, exp.Expression):
         v = v.name
 
-    from croniter import CroniterBadCronError, croniter
-
     if not isinstance(v, str):
         raise ValueError(f"Invalid cron expression '{v}'. Value must be a string.")
 
+    _validate_cron(v)
+    return v
+
+
+@lru_cache(maxsize=1024)
+def _validate_cron(v: str) -> None:
+    # Only valid expressions are cached, since the cache isn't populated when an error is raised.
+    from croniter import CroniterBadCronError, croniter
+
     try:
         croniter(v)
     except CroniterBadCronError:
         raise ValueError(f"Invalid cron expression '{v}'")
-    return v
 
 
 def get_concrete_types_from_typehint(typehint: type[t.Any]) -> set[type[t.Any]]:
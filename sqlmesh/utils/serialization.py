@@ -0,0 +1,220 @@
+"""Compact binary serialization of objects that contain SQLGlot expressions.
+
+The default pickle representation of an expression stores every node as a separate object with all of
+its slots, including the back-reference to its parent. Instead, every expression tree is stored as a
+compact nested tuple of class indices, argument names and values, which is much cheaper to both pickle
+and unpickle. Everything else is pickled as usual.
+
+The resulting payload is compressed with zstd if the zstandard package is installed and gzip otherwise.
+"""
+
+from __future__ import annotations
+
+import gzip
+import io
+import pickle
+import typing as t
+from functools import lru_cache
+
+from sqlglot import exp
+
+from sqlmesh.utils import optional_import
+
+zstandard = optional_import("zstandard")
+
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+_GZIP_MAGIC = b"\x1f\x8b"
+
+# Marks a tuple that was found in the arguments of an expression, since tuples encode expressions
+_RAW_TUPLE = -1
+
+
+def dumps(obj: t.Any) -> bytes:
+    """Serializes and compresses the given object.
+
+    Args:
+        obj: The object to serialize.
+
+    Returns:
+        The compressed payload.
+    """
+    buffer = io.BytesIO()
+    _Pickler(buffer, protocol=pickle.HIGHEST_PROTOCOL).dump(obj)
+    return _compress(buffer.getvalue())
+
+
+def loads(payload: bytes) -> t.Any:
+    """Decompresses and deserializes an object produced by `dumps`.
+
+    Payloads produced by pickling and gzipping an object directly are supported as well.
+
+    Args:
+        payload: The compressed payload.
+
+    Returns:
+        The deserialized object.
+    """
+    return pickle.loads(_decompress(payload))
+
+
+def dump_expression(expression: exp.Expression) -> t.Tuple[t.Tuple[str, ...], t.Tuple]:
+    """Encodes an expression tree as nested tuples.
+
+    Args:
+        expression: The root of the expression tree.
+
+    Returns:
+        A tuple of class names referenced by the tree and the encoded tree.
+    """
+    classes: t.Dict[t.Type[exp.Expression], int] = {}
+    node = _dump_node(expression, classes)
+    return tuple(_class_name(c) for c in classes), node
+
+
+def load_expression(classes: t.Tuple[str, ...], node: t.Tuple) -> exp.Expression:
+    """Decodes an expression tree produced by `dump_expression`.
+
+    Args:
+        classes: The class names referenced by the tree.
+        node: The encoded tree.
+
+    Returns:
+        The root of the expression tree.
+    """
+    return _load_node(node, [_resolve_class(c) for c in classes])
+
+
+class _Pickler(pickle.Pickler):
+    def reducer_override(self, obj: t.Any) -> t.Any:
+        if isinstance(obj, exp.Expression):
+            try:
+                return load_expression, dump_expression(obj)
+            except RecursionError:
+                pass
+        return NotImplemented
+
+
+def _dump_node(node: exp.Expression, classes: t.Dict[t.Type[exp.Expression], int]) -> t.Tuple:
+    # Every argument is stored, including empty ones, so that the decoded expression has exactly the same
+    # arguments as the original, which is what expression diffing relies on
+    args: t.List[t.Any] = []
+    for key, value in node.args.items():
+        args.append(key)
+        args.append(_dump_value(value, classes))
+
+    class_index = classes.get(node.__class__)
+    if class_index is None:
+        class_index = classes[node.__class__] = len(classes)
+
+    encoded: t.Tuple = (class_index, tuple(args))
+    if node.comments or node._type is not None or node._meta is not None:
+        encoded += (
+            node.comments,
+            _dump_node(node._type, classes) if node._type is not None else None,
+            node._meta,
+        )
+    return encoded
+
+
+def _dump_value(value: t.Any, classes: t.Dict[t.Type[exp.Expression], int]) -> t.Any:
+    if isinstance(value, exp.Expression):
+        return _dump_node(value, classes)
+    if type(value) is list:
+        return [
+            _dump_node(v, classes) if isinstance(v, exp.Expression) else _dump_scalar(v)
+            for v in value
+        ]
+    return _dump_scalar(value)
+
+
+def _dump_scalar(value: t.Any) -> t.Any:
+    if type(value) is tuple:
+        return (_RAW_TUPLE, value)
+    return value
+
+
+def _load_node(
+    node: t.Tuple,
+    classes: t.List[t.Type[exp.Expression]],
+    parent: t.Optional[exp.Expression] = None,
+    arg_key: t.Optional[str] = None,
+    index: t.Optional[int] = None,
+) -> exp.Expression:
+    # The constructor is bypassed, since some expressions normalize their arguments in it
+    expression = object.__new__(classes[node[0]])
+    expression.parent = parent
+    expression.arg_key = arg_key
+    expression.index = index
+    expression._hash = None
+
+    args = {}
+    encoded_args = node[1]
+    for i in range(0, len(encoded_args), 2):
+        key = encoded_args[i]
+        value = encoded_args[i + 1]
+        if type(value) is tuple:
+            if value[0] == _RAW_TUPLE:
+                value = value[1]
+            else:
+                value = _load_node(value, classes, expression, key)
+        elif type(value) is list:
+            value = [
+                _load_node(v, classes, expression, key, i)
+                if type(v) is tuple and v[0] != _RAW_TUPLE
+                else _load_scalar(v)
+                for i, v in enumerate(value)
+            ]
+        args[key] = value
+    expression.args = args
+
+    if len(node) > 2:
+        comments, type_, meta = node[2:]
+        expression.comments = comments
+        expression._type = (
+            t.cast(exp.DataType, _load_node(type_, classes)) if type_ is not None else None
+        )
+        expression._meta = meta
+    else:
+        expression.comments = None
+        expression._type = None
+        expression._meta = None
+    return expression
+
+
+def _load_scalar(value: t.Any) -> t.Any:
+    if type(value) is tuple:
+        return value[1]
+    return value
+
+
+def _class_name(klass: t.Type[exp.Expression]) -> str:
+    if klass.__module__ == exp.__name__:
+        return klass.__qualname__
+    return f"{klass.__module__}:{klass.__qualname__}"
+
+
+@lru_cache(maxsize=None)
+def _resolve_class(name: str) -> t.Type[exp.Expression]:
+    module_name, _, qualname = name.rpartition(":")
+    obj: t.Any = __import__(module_name, fromlist=["_"]) if module_name else exp
+    for part in qualname.split("."):
+        obj = getattr(obj, part)
+    return obj
+
+
+def _compress(data: bytes) -> bytes:
+    if zstandard is not None:
+        return zstandard.ZstdCompressor(level=1).compress(data)
+    return gzip.compress(data, compresslevel=1)
+
+
+def _decompress(payload: bytes) -> bytes:
+    if payload.startswith(_ZSTD_MAGIC):
+        if zstandard is None:
+            raise ValueError(
+                "The payload is compressed with zstd, but the zstandard package is not installed."
+            )
+        return zstandard.ZstdDecompressor().decompress(payload)
+    if payload.startswith(_GZIP_MAGIC):
+        return gzip.decompress(payload)
+    raise ValueError("Unsupported compression format.")
@@ -89,3 +89,24 @@ def test_temporary_table(make_mocked_engine_adapter: t.Callable, duck_conn):
     assert to_sql_calls(adapter) == [
         'CREATE TEMPORARY TABLE IF NOT EXISTS "test_table" ("a" INT, "b" INT)',
     ]
+
+
+def test_insert_append_rows(adapter: EngineAdapter, duck_conn):
+    duck_conn.execute("CREATE TABLE test_table (id BIGINT, name TEXT, flag BOOLEAN)")
+
+    adapter.insert_append_rows(
+        "test_table",
+        [(1, "a", True), (None, "b", False)],
+        columns_to_types={
+            "id": exp.DataType.build("BIGINT"),
+            "name": exp.DataType.build("TEXT"),
+            "flag": exp.DataType.build("BOOLEAN"),
+        },
+    )
+
+    assert duck_conn.execute("SELECT * FROM test_table ORDER BY name").fetchall() == [
+        (1, "a", True),
+        (None, "b", False),
+    ]
+    # No temporary tables are created
+    assert [row[0] for row in duck_conn.execute("SHOW TABLES").fetchall()] == ["tbl", "test_table"]
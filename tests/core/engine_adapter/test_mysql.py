@@ -84,3 +84,21 @@ def test_create_table_like(make_mocked_engine_adapter: t.Callable):
     adapter.cursor.execute.assert_called_once_with(
         "CREATE TABLE IF NOT EXISTS `target_table` LIKE `source_table`"
     )
+
+
+def test_insert_append_rows(make_mocked_engine_adapter: t.Callable):
+    adapter = make_mocked_engine_adapter(MySQLEngineAdapter)
+
+    rows = [(1, "a"), (2, None)]
+    adapter.insert_append_rows(
+        "test_schema.test_table",
+        rows,
+        columns_to_types={
+            "id": exp.DataType.build("BIGINT"),
+            "name": exp.DataType.build("TEXT"),
+        },
+    )
+
+    adapter.cursor.executemany.assert_called_once_with(
+        "INSERT INTO `test_schema`.`test_table` (`id`, `name`) VALUES (%s, %s)", rows
+    )
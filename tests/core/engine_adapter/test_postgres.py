@@ -161,3 +161,75 @@ def test_alter_table_drop_column_cascade(make_mocked_engine_adapter: t.Callable)
     assert to_sql_calls(adapter) == [
         'ALTER TABLE "test_table" DROP COLUMN "test_column" CASCADE',
     ]
+
+
+def test_insert_append_rows(make_mocked_engine_adapter: t.Callable):
+    adapter = make_mocked_engine_adapter(PostgresEngineAdapter)
+
+    adapter.insert_append_rows(
+        "test_schema.test_table",
+        [(1, "a\tb\\c", True), (None, "line\nbreak", False)],
+        columns_to_types={
+            "id": exp.DataType.build("BIGINT"),
+            "name": exp.DataType.build("TEXT"),
+            "flag": exp.DataType.build("BOOLEAN"),
+        },
+    )
+
+    sql, buffer = adapter.cursor.copy_expert.call_args[0]
+    assert sql == 'COPY "test_schema"."test_table" ("id", "name", "flag") FROM STDIN'
+    assert buffer.read() == "1\ta\\tb\\\\c\tt\n\\N\tline\\nbreak\tf\n"
+    adapter.cursor.execute.assert_not_called()
+
+
+def test_insert_append_rows_empty(make_mocked_engine_adapter: t.Callable):
+    adapter = make_mocked_engine_adapter(PostgresEngineAdapter)
+
+    adapter.insert_append_rows(
+        "test_table", [], columns_to_types={"id": exp.DataType.build("BIGINT")}
+    )
+
+    adapter.cursor.copy_expert.assert_not_called()
+
+
+def test_insert_append_rows_pg8000(make_mocked_engine_adapter: t.Callable, mocker: MockerFixture):
+    class Cursor:
+        __module__ = "pg8000.dbapi"
+
+        def execute(self, operation, args=(), stream=None): ...
+
+    adapter = make_mocked_engine_adapter(PostgresEngineAdapter)
+    cursor = mocker.Mock(spec=Cursor)
+    mocker.patch.object(
+        PostgresEngineAdapter, "cursor", new_callable=mocker.PropertyMock, return_value=cursor
+    )
+
+    adapter.insert_append_rows(
+        "test_table",
+        [(1, "a"), (2, None)],
+        columns_to_types={"id": exp.DataType.build("BIGINT"), "name": exp.DataType.build("TEXT")},
+    )
+
+    sql = cursor.execute.call_args[0][0]
+    assert sql == 'COPY "test_table" ("id", "name") FROM STDIN'
+    assert cursor.execute.call_args[1]["stream"].read() == "1\ta\n2\t\\N\n"
+
+
+def test_insert_append_rows_without_copy(
+    make_mocked_engine_adapter: t.Callable, mocker: MockerFixture
+):
+    adapter = make_mocked_engine_adapter(PostgresEngineAdapter)
+    cursor = mocker.Mock(spec=["execute", "fetchall"])
+    mocker.patch.object(
+        PostgresEngineAdapter, "cursor", new_callable=mocker.PropertyMock, return_value=cursor
+    )
+
+    adapter.insert_append_rows(
+        "test_table",
+        [(1, "a")],
+        columns_to_types={"id": exp.DataType.build("BIGINT"), "name": exp.DataType.build("TEXT")},
+    )
+
+    assert [call[0][0] for call in cursor.execute.call_args_list] == [
+        'INSERT INTO "test_table" ("id", "name") SELECT CAST("id" AS BIGINT) AS "id", CAST("name" AS TEXT) AS "name" FROM (VALUES (1, \'a\')) AS "t"("id", "name")'
+    ]
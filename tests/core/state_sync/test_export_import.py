@@ -1,7 +1,13 @@
 import pytest
+from pytest_mock import MockerFixture
 from pathlib import Path
 from sqlmesh.core.state_sync import StateSync, EngineAdapterStateSync, CachingStateSync
-from sqlmesh.core.state_sync.export_import import export_state, import_state
+from sqlmesh.core.state_sync.export_import import (
+    _read_chunked_index,
+    export_state,
+    import_state,
+    is_chunked_state_file,
+)
 from sqlmesh.utils.errors import SQLMeshError
 from sqlmesh.core import constants as c
 from sqlmesh.cli.example_project import init_example_project
@@ -522,6 +528,87 @@ def test_roundtrip(tmp_path: Path, example_project_config: Config, state_sync: S
     assert "new_model" in list(prod_plan.modified_snapshots.values())[0].name
 
 
+def test_roundtrip_chunked(
+    tmp_path: Path, example_project_config: Config, state_sync: StateSync, mocker: MockerFixture
+) -> None:
+    state_file = tmp_path / "state_dump.bin"
+
+    init_example_project(path=tmp_path, dialect="duckdb")
+    context = Context(paths=tmp_path, config=example_project_config, state_sync=state_sync)
+    context.plan(auto_apply=True)
+
+    # force multiple chunks
+    mocker.patch("sqlmesh.core.state_sync.export_import.CHUNK_SIZE", 1)
+    export_state(state_sync, state_file, chunked=True)
+    assert is_chunked_state_file(state_file)
+
+    index = _read_chunked_index(state_file)
+    assert index["metadata"]["file_version"] == 2
+    assert index["metadata"]["importable"]
+    assert len([c for c in index["chunks"] if c["type"] == "snapshots"]) == 3
+    assert list(index["environments"]) == ["prod"]
+
+    assert isinstance(state_sync, EngineAdapterStateSync)
+    state_sync.engine_adapter.drop_schema("sqlmesh", cascade=True)
+    state_sync.migrate(default_catalog=None)
+    assert context.plan().has_changes
+
+    import_state(state_sync, state_file)
+
+    assert not context.plan().has_changes
+
+
+def test_import_chunked_specific_environment(
+    tmp_path: Path, example_project_config: Config, state_sync: StateSync, mocker: MockerFixture
+) -> None:
+    state_file = tmp_path / "state_dump.bin"
+
+    init_example_project(path=tmp_path, dialect="duckdb")
+    context = Context(paths=tmp_path, config=example_project_config, state_sync=state_sync)
+    context.plan(auto_apply=True)
+
+    (tmp_path / c.MODELS / "new_model.sql").write_text("""
+    MODEL (
+        name sqlmesh_example.new_model,
+        kind FULL,
+        cron '@daily'
+    );
+
+    SELECT 1 as id;
+    """)
+    context.load()
+    context.plan(environment="dev", auto_apply=True, skip_tests=True)
+
+    mocker.patch("sqlmesh.core.state_sync.export_import.CHUNK_SIZE", 1)
+    export_state(state_sync, state_file, chunked=True)
+
+    assert isinstance(state_sync, EngineAdapterStateSync)
+    state_sync.engine_adapter.drop_schema("sqlmesh", cascade=True)
+    state_sync.migrate(default_catalog=None)
+
+    with pytest.raises(SQLMeshError, match=r"No such environment: missing"):
+        import_state(state_sync, state_file, environment_names=["missing"])
+
+    import_state(state_sync, state_file, environment_names=["prod"])
+
+    assert [env.name for env in state_sync.get_environments_summary()] == ["prod"]
+    assert {
+        s.name for s in state_sync.get_snapshots(list(context.snapshots.values())).values()
+    } == {s.name for s in context.snapshots.values() if "new_model" not in s.name}
+    # only the dev-only model needs to be backfilled again
+    new_snapshots = context.plan(environment="prod", skip_tests=True).new_snapshots
+    assert [s.name for s in new_snapshots] == ['"warehouse"."sqlmesh_example"."new_model"']
+
+
+def test_import_specific_environment_from_json_fails(tmp_path: Path, state_sync: StateSync) -> None:
+    state_file = tmp_path / "state_dump.json"
+    state_sync.migrate(default_catalog=None)
+    export_state(state_sync, state_file)
+
+    with pytest.raises(SQLMeshError, match=r"only supported for chunked state files"):
+        import_state(state_sync, state_file, environment_names=["prod"])
+
+
 def test_roundtrip_includes_auto_restatements(
     tmp_path: Path, example_project_config: Config, state_sync: StateSync
 ) -> None:
@@ -2,6 +2,7 @@ import json
 import logging
 import re
 import typing as t
+from pathlib import Path
 from unittest.mock import call, patch
 
 import duckdb  # noqa: TID253
@@ -26,9 +27,11 @@ from sqlmesh.core.model import (
     SqlModel,
 )
 from sqlmesh.core.model.definition import ExternalModel
+from sqlmesh.core.node import IntervalUnit
 from sqlmesh.core.snapshot import (
     Snapshot,
     SnapshotChangeCategory,
+    SnapshotHeader,
     SnapshotId,
     SnapshotIntervals,
     SnapshotNameVersion,
@@ -37,6 +40,7 @@ from sqlmesh.core.snapshot import (
 )
 from sqlmesh.core.state_sync import (
     CachingStateSync,
+    ReadReplicaStateSync,
     EngineAdapterStateSync,
     cleanup_expired_views,
 )
@@ -46,8 +50,13 @@ from sqlmesh.core.state_sync.base import (
     PromotionResult,
     Versions,
 )
+from sqlmesh.core.state_sync.db import interval as interval_module
+from sqlmesh.core.state_sync.db.interval import IntervalState
+from sqlmesh.core.state_sync.db import snapshot as snapshot_module
+from sqlmesh.core.state_sync.db.snapshot import _snapshot_to_json, parse_snapshot
 from sqlmesh.utils.date import now_timestamp, to_datetime, to_timestamp
 from sqlmesh.utils.errors import SQLMeshError
+from sqlmesh.utils.metaprogramming import Executable
 
 pytestmark = pytest.mark.slow
 
@@ -174,6 +183,219 @@ def test_push_snapshots(
     )
 
 
+def test_parse_snapshot_trusted(
+    state_sync: EngineAdapterStateSync, make_snapshot: t.Callable, mocker: MockerFixture
+) -> None:
+    snapshot = make_snapshot(SqlModel(name="a", cron="@daily", query=parse_one("select 1, ds")))
+    snapshot.categorize_as(SnapshotChangeCategory.BREAKING)
+
+    serialized_snapshot = json.loads(_snapshot_to_json(snapshot))
+    serialized_snapshot["ttl"] = "1 week ago"
+
+    with pytest.raises(ValueError):
+        parse_snapshot(json.dumps(serialized_snapshot), 1, None, False, None)
+
+    parsed_snapshot = parse_snapshot(
+        json.dumps(serialized_snapshot).encode("utf-8"), 1, 2, True, 3, trusted=True
+    )
+    assert parsed_snapshot.ttl == "1 week ago"
+    assert parsed_snapshot.updated_ts == 1
+    assert parsed_snapshot.unpaused_ts == 2
+    assert parsed_snapshot.unrestorable
+    assert parsed_snapshot.next_auto_restatement_ts == 3
+
+    # Cron expressions are validated even for trusted snapshots, once their nodes are parsed
+    serialized_snapshot["node"]["cron"] = "invalid"
+    parsed_snapshot = parse_snapshot(
+        json.dumps(serialized_snapshot), 1, None, False, None, trusted=True
+    )
+    with pytest.raises(ValueError, match="Invalid cron expression 'invalid'"):
+        parsed_snapshot.node
+
+    # Snapshots are trusted once the state has been migrated to the current schema version
+    parse_snapshot_spy = mocker.spy(snapshot_module, "parse_snapshot")
+    state_sync.push_snapshots([snapshot])
+    state_sync.snapshot_state._snapshot_cache.clear()
+    assert state_sync.get_snapshots([snapshot]) == {snapshot.snapshot_id: snapshot}
+    assert parse_snapshot_spy.call_args.kwargs["trusted"]
+
+
+def test_get_snapshot_headers(
+    state_sync: EngineAdapterStateSync, make_snapshot: t.Callable
+) -> None:
+    snapshot_a = make_snapshot(
+        SqlModel(name="a", cron="@hourly", query=parse_one("select 1, ds")),
+    )
+    snapshot_a.categorize_as(SnapshotChangeCategory.BREAKING)
+    snapshot_b = make_snapshot(
+        SqlModel(name="b", query=parse_one("select * from a")),
+        nodes={'"a"': snapshot_a.model},
+    )
+    snapshot_b.categorize_as(SnapshotChangeCategory.FORWARD_ONLY)
+
+    state_sync.push_snapshots([snapshot_a, snapshot_b])
+
+    expected = {
+        snapshot_a.snapshot_id: SnapshotHeader.from_snapshot(snapshot_a),
+        snapshot_b.snapshot_id: SnapshotHeader.from_snapshot(snapshot_b),
+    }
+    headers = state_sync.get_snapshot_headers([snapshot_a, snapshot_b])
+    assert headers == expected
+    assert headers[snapshot_a.snapshot_id].interval_unit == IntervalUnit.HOUR
+    assert headers[snapshot_b.snapshot_id].parents == (snapshot_a.snapshot_id,)
+    assert headers[snapshot_b.snapshot_id].table_info == snapshot_b.table_info
+
+    # Records written before the header column was introduced fall back to the full snapshot
+    state_sync.engine_adapter.update_table(
+        state_sync.snapshot_state.snapshots_table, {"header": None}, where=exp.true()
+    )
+    assert state_sync.get_snapshot_headers([snapshot_a, snapshot_b]) == expected
+
+    # Missing headers are backfilled in batches.
+    state_sync.snapshot_state.SNAPSHOT_BATCH_SIZE = 1
+    state_sync.snapshot_state.backfill_headers()
+    assert state_sync.engine_adapter.fetchone(
+        exp.select("COUNT(*)")
+        .from_(state_sync.snapshot_state.snapshots_table)
+        .where(exp.column("header").is_(exp.null()))
+    ) == (0,)
+    assert state_sync.get_snapshot_headers([snapshot_a, snapshot_b]) == expected
+
+
+def test_get_snapshots_parses_node_lazily(
+    state_sync: EngineAdapterStateSync, make_snapshot: t.Callable
+) -> None:
+    snapshot = make_snapshot(SqlModel(name="a", query=parse_one("select 1, ds")))
+    snapshot.categorize_as(SnapshotChangeCategory.BREAKING)
+    state_sync.push_snapshots([snapshot])
+    state_sync.snapshot_state.clear_cache()
+
+    stored_snapshot = state_sync.get_snapshots([snapshot])[snapshot.snapshot_id]
+    assert not stored_snapshot.is_node_parsed
+    assert stored_snapshot.is_model
+    # Serializing a snapshot doesn't require parsing its node.
+    assert stored_snapshot.json(exclude={"updated_ts"}) == snapshot.json(exclude={"updated_ts"})
+    assert not stored_snapshot.is_node_parsed
+
+    assert stored_snapshot.model.query == snapshot.model.query
+    assert stored_snapshot.is_node_parsed
+    assert stored_snapshot.node.data_hash == snapshot.fingerprint.data_hash
+    assert stored_snapshot.table_info == snapshot.table_info
+
+    # The snapshot is cached once its node has been parsed.
+    cached_snapshot = state_sync.get_snapshots([snapshot])[snapshot.snapshot_id]
+    assert cached_snapshot.is_node_parsed
+    assert cached_snapshot.model.query == snapshot.model.query
+
+
+def test_snapshot_blobs(state_sync: EngineAdapterStateSync, make_snapshot: t.Callable) -> None:
+    macro_payload = "def shared_macro(evaluator):\n" + "    x = 1\n" * 50 + "    return x"
+    python_env = {"shared_macro": Executable(name="shared_macro", payload=macro_payload)}
+
+    snapshot_a = make_snapshot(
+        SqlModel(name="a", query=parse_one("select 1, ds"), python_env=python_env)
+    )
+    snapshot_a.categorize_as(SnapshotChangeCategory.BREAKING)
+    snapshot_b = make_snapshot(
+        SqlModel(name="b", query=parse_one("select 2, ds"), python_env=python_env)
+    )
+    snapshot_b.categorize_as(SnapshotChangeCategory.BREAKING)
+
+    state_sync.push_snapshots([snapshot_a, snapshot_b])
+
+    def get_blob_hashes(table: exp.Table) -> t.List[str]:
+        return [
+            row[0] for row in state_sync.engine_adapter.fetchall(exp.select("hash").from_(table))
+        ]
+
+    # The macro is stored once and referenced from both snapshots
+    assert len(get_blob_hashes(state_sync.snapshot_state.blobs_table)) == 1
+    assert len(get_blob_hashes(state_sync.snapshot_state.blob_refs_table)) == 2
+    serialized_snapshot = state_sync.engine_adapter.fetchone(
+        exp.select("snapshot").from_(state_sync.snapshot_state.snapshots_table)
+    )[0]
+    assert macro_payload not in json.loads(serialized_snapshot)["node"]["python_env"]
+
+    state_sync.snapshot_state.clear_cache()
+    assert state_sync.get_snapshots([snapshot_a, snapshot_b]) == {
+        snapshot_a.snapshot_id: snapshot_a,
+        snapshot_b.snapshot_id: snapshot_b,
+    }
+
+    # Blobs that were stored or stamped recently are never deleted
+    state_sync.engine_adapter.insert_append(
+        state_sync.snapshot_state.blobs_table,
+        pd.DataFrame([{"hash": "unrelated", "content": "{}", "updated_ts": now_timestamp()}]),
+        columns_to_types=state_sync.snapshot_state._blob_columns_to_types,
+    )
+    state_sync.delete_snapshots([snapshot_a])
+    assert len(get_blob_hashes(state_sync.snapshot_state.blobs_table)) == 2
+    state_sync.delete_snapshots([snapshot_b])
+    assert len(get_blob_hashes(state_sync.snapshot_state.blobs_table)) == 2
+    assert not get_blob_hashes(state_sync.snapshot_state.blob_refs_table)
+
+    grace_period_ms = snapshot_module.BLOB_GC_GRACE_PERIOD_MS
+    with time_machine.travel(to_datetime(now_timestamp() + grace_period_ms + 1000)):
+        # Pushing a snapshot that reuses an existing blob stamps it, so that it survives the sweep
+        state_sync.push_snapshots([snapshot_a])
+        state_sync.delete_snapshots([snapshot_b])
+        assert len(get_blob_hashes(state_sync.snapshot_state.blobs_table)) == 1
+
+        state_sync.snapshot_state.clear_cache()
+        assert state_sync.get_snapshots([snapshot_a]) == {snapshot_a.snapshot_id: snapshot_a}
+
+    # The blob is only deleted once it's no longer referenced and the grace period has passed
+    state_sync.delete_snapshots([snapshot_a])
+    with time_machine.travel(to_datetime(now_timestamp() + 3 * grace_period_ms)):
+        state_sync.delete_snapshots([snapshot_a])
+    assert not get_blob_hashes(state_sync.snapshot_state.blobs_table)
+
+
+def test_snapshot_blobs_seed_content(make_snapshot: t.Callable) -> None:
+    seed_content = "id,name\n" + "".join(f"{i},name_{i}\n" for i in range(100))
+    snapshot = make_snapshot(
+        SeedModel(
+            name="seed",
+            kind=SeedKind(path="./path/to/seed"),
+            seed=Seed(content=seed_content),
+            column_hashes={"id": "hash1", "name": "hash2"},
+            depends_on=set(),
+        )
+    )
+
+    blobs: t.Dict[str, str] = {}
+    serialized_snapshot = _snapshot_to_json(snapshot, blobs)
+    assert seed_content not in serialized_snapshot
+    assert [json.loads(content) for content in blobs.values()] == [{"content": seed_content}]
+
+
+def test_snapshot_blobs_compression(
+    state_sync: EngineAdapterStateSync, make_snapshot: t.Callable
+) -> None:
+    macro_payload = "def compressed_macro(evaluator):\n" + "    x = 1\n" * 50 + "    return x"
+    snapshot = make_snapshot(
+        SqlModel(
+            name="a",
+            query=parse_one("select 1, ds"),
+            python_env={
+                "compressed_macro": Executable(name="compressed_macro", payload=macro_payload)
+            },
+        )
+    )
+    snapshot.categorize_as(SnapshotChangeCategory.BREAKING)
+
+    state_sync.snapshot_state._compress_blobs = True
+    state_sync.push_snapshots([snapshot])
+
+    (content,) = state_sync.engine_adapter.fetchone(
+        exp.select("content").from_(state_sync.snapshot_state.blobs_table)
+    )
+    assert content.startswith("zstd:")
+
+    state_sync.snapshot_state.clear_cache()
+    assert state_sync.get_snapshots([snapshot]) == {snapshot.snapshot_id: snapshot}
+
+
 def test_duplicates(state_sync: EngineAdapterStateSync, make_snapshot: t.Callable) -> None:
     snapshot_a = make_snapshot(
         SqlModel(
@@ -521,6 +743,242 @@ def test_compact_intervals_delete_batches(
     )
 
 
+@pytest.mark.parametrize("server_side", [True, False])
+def test_compact_intervals_server_side(
+    state_sync: EngineAdapterStateSync,
+    make_snapshot: t.Callable,
+    get_snapshot_intervals: t.Callable,
+    server_side: bool,
+) -> None:
+    if not server_side:
+        state_sync.interval_state.SERVER_SIDE_COMPACTION_DIALECTS = set()
+
+    snapshot_a = make_snapshot(
+        SqlModel(name="a", cron="@daily", query=parse_one("select 1, ds")),
+        version="a",
+    )
+    snapshot_b = make_snapshot(
+        SqlModel(name="b", cron="@daily", query=parse_one("select 2, ds")),
+        version="b",
+    )
+    state_sync.push_snapshots([snapshot_a, snapshot_b])
+
+    state_sync.add_interval(snapshot_a, "2020-01-05", "2020-01-06")
+    state_sync.add_interval(snapshot_a, "2020-01-01", "2020-01-02")
+    state_sync.add_interval(snapshot_a, "2020-01-03", "2020-01-03")
+    state_sync.add_interval(snapshot_a, "2020-01-02", "2020-01-03")
+    state_sync.add_interval(snapshot_a, "2020-01-10", "2020-01-10")
+    state_sync.add_interval(snapshot_a, "2020-01-01", "2020-01-01", is_dev=True)
+    # Removals have to be applied in order, so these intervals are compacted in Python.
+    state_sync.add_interval(snapshot_b, "2020-01-01", "2020-01-05")
+    state_sync.remove_intervals(
+        [(snapshot_b, snapshot_b.inclusive_exclusive("2020-01-02", "2020-01-02"))]
+    )
+
+    expected_a = [
+        (to_timestamp("2020-01-01"), to_timestamp("2020-01-04")),
+        (to_timestamp("2020-01-05"), to_timestamp("2020-01-07")),
+        (to_timestamp("2020-01-10"), to_timestamp("2020-01-11")),
+    ]
+    expected_a_dev = [(to_timestamp("2020-01-01"), to_timestamp("2020-01-02"))]
+    expected_b = [
+        (to_timestamp("2020-01-01"), to_timestamp("2020-01-02")),
+        (to_timestamp("2020-01-03"), to_timestamp("2020-01-06")),
+    ]
+
+    state_sync.compact_intervals()
+
+    assert get_snapshot_intervals(snapshot_a).intervals == expected_a
+    assert get_snapshot_intervals(snapshot_a).dev_intervals == expected_a_dev
+    assert get_snapshot_intervals(snapshot_b).intervals == expected_b
+    assert state_sync.engine_adapter.fetchall(
+        f"SELECT name, COUNT(*) FROM {state_sync.interval_state.intervals_table.sql()} "
+        "WHERE is_compacted GROUP BY name ORDER BY name"
+    ) == [('"a"', 4), ('"b"', 2)]
+    assert state_sync.engine_adapter.fetchone(
+        f"SELECT COUNT(*) FROM {state_sync.interval_state.intervals_table.sql()} "
+        "WHERE NOT is_compacted"
+    ) == (0,)
+
+    # Make sure compaction is idempotent.
+    state_sync.compact_intervals()
+    assert get_snapshot_intervals(snapshot_a).intervals == expected_a
+    assert get_snapshot_intervals(snapshot_b).intervals == expected_b
+
+
+def test_compact_intervals_server_side_concurrent_insert(
+    state_sync: EngineAdapterStateSync,
+    make_snapshot: t.Callable,
+    get_snapshot_intervals: t.Callable,
+) -> None:
+    snapshot = make_snapshot(
+        SqlModel(name="a", cron="@daily", query=parse_one("select 1, ds")),
+        version="a",
+    )
+    state_sync.push_snapshots([snapshot])
+
+    with time_machine.travel("2023-01-08 00:00:00 UTC", tick=False):
+        state_sync.add_interval(snapshot, "2020-01-01", "2020-01-02")
+        state_sync.add_interval(snapshot, "2020-01-02", "2020-01-03")
+
+    engine_adapter = state_sync.engine_adapter
+    insert_append = engine_adapter.insert_append
+
+    def insert_append_and_add_interval(*args: t.Any, **kwargs: t.Any) -> None:
+        insert_append(*args, **kwargs)
+        # Another process commits a record between the INSERT and the DELETE of the compaction, which
+        # isn't newer than the compaction's cutoff.
+        with time_machine.travel("2023-01-08 00:00:00 UTC", tick=False):
+            state_sync.add_interval(snapshot, "2020-01-10", "2020-01-10")
+
+    with patch.object(engine_adapter, "insert_append", side_effect=insert_append_and_add_interval):
+        state_sync.interval_state._compact_intervals_server_side()
+
+    expected = [
+        (to_timestamp("2020-01-01"), to_timestamp("2020-01-04")),
+        (to_timestamp("2020-01-10"), to_timestamp("2020-01-11")),
+    ]
+    assert get_snapshot_intervals(snapshot).intervals == expected
+
+    state_sync.compact_intervals()
+    assert get_snapshot_intervals(snapshot).intervals == expected
+
+
+def test_get_snapshot_intervals_cached(
+    state_sync: EngineAdapterStateSync, make_snapshot: t.Callable, mocker: MockerFixture
+) -> None:
+    interval_state = IntervalState(
+        state_sync.engine_adapter, schema=state_sync.schema, cache_intervals=True
+    )
+    uncached_interval_state = state_sync.interval_state
+
+    snapshot_a = make_snapshot(
+        SqlModel(name="a", cron="@daily", query=parse_one("select 1, ds")),
+        version="a",
+    )
+    snapshot_b = make_snapshot(
+        SqlModel(name="b", cron="@daily", query=parse_one("select 2, ds")),
+        version="b",
+    )
+    snapshot_a.categorize_as(SnapshotChangeCategory.BREAKING)
+    snapshot_b.categorize_as(SnapshotChangeCategory.BREAKING)
+    state_sync.push_snapshots([snapshot_a, snapshot_b])
+
+    def assert_intervals_match() -> None:
+        def _sort_key(i: SnapshotIntervals) -> t.Tuple[str, str, str, str]:
+            return (i.name, i.version, i.identifier or "", i.dev_version or "")
+
+        actual = interval_state.get_snapshot_intervals([snapshot_a, snapshot_b])
+        expected = uncached_interval_state.get_snapshot_intervals([snapshot_a, snapshot_b])
+        assert sorted(actual, key=_sort_key) == sorted(expected, key=_sort_key)
+
+    with time_machine.travel("2023-01-08 00:00:00 UTC", tick=False):
+        state_sync.add_interval(snapshot_a, "2020-01-01", "2020-01-05")
+        state_sync.add_interval(snapshot_a, "2020-01-01", "2020-01-01", is_dev=True)
+        state_sync.add_interval(snapshot_b, "2020-01-01", "2020-01-05")
+    assert_intervals_match()
+
+    # Returned intervals don't share state with the cached ones.
+    interval_state.get_snapshot_intervals([snapshot_a])[0].intervals.append((0, 1))
+    assert_intervals_match()
+
+    # No records are fetched if nothing has changed.
+    fetchall_spy = mocker.spy(state_sync.engine_adapter, "fetchall")
+    interval_state.get_snapshot_intervals([snapshot_a, snapshot_b])
+    assert fetchall_spy.call_count == 1
+
+    # Only new records are fetched.
+    with time_machine.travel("2023-01-09 00:00:00 UTC", tick=False):
+        state_sync.add_interval(snapshot_a, "2020-01-06", "2020-01-06")
+        state_sync.remove_intervals(
+            [(snapshot_b, snapshot_b.inclusive_exclusive("2020-01-02", "2020-01-02"))]
+        )
+    apply_rows_spy = mocker.spy(interval_module, "_apply_interval_rows")
+    interval_state.get_snapshot_intervals([snapshot_a, snapshot_b])
+    # One added interval for "a" and removed intervals for "b"
+    assert sum(len(c.args[1]) for c in apply_rows_spy.call_args_list) == 3
+    assert_intervals_match()
+
+    # Records created with an earlier timestamp.
+    with time_machine.travel("2023-01-01 00:00:00 UTC", tick=False):
+        state_sync.add_interval(snapshot_b, "2020-01-02", "2020-01-02")
+    assert_intervals_match()
+
+    state_sync.compact_intervals()
+    assert_intervals_match()
+
+    state_sync.interval_state.SERVER_SIDE_COMPACTION_DIALECTS = set()
+    state_sync.add_interval(snapshot_b, "2020-01-10", "2020-01-10")
+    state_sync.compact_intervals()
+    assert_intervals_match()
+
+    interval_state._update_intervals_for_deleted_snapshots([snapshot_a.snapshot_id])
+    assert_intervals_match()
+
+    interval_state._delete_intervals_by_version(
+        [SnapshotTableCleanupTask(snapshot=snapshot_b.table_info, dev_table_only=False)]
+    )
+    assert_intervals_match()
+    assert {i.name for i in interval_state.get_snapshot_intervals([snapshot_a, snapshot_b])} == {
+        '"a"'
+    }
+
+
+def test_get_snapshot_intervals_persisted_cache(
+    state_sync: EngineAdapterStateSync,
+    make_snapshot: t.Callable,
+    mocker: MockerFixture,
+    tmp_path: Path,
+) -> None:
+    def create_interval_state() -> IntervalState:
+        return IntervalState(
+            state_sync.engine_adapter,
+            schema=state_sync.schema,
+            cache_intervals=True,
+            cache_path=tmp_path,
+        )
+
+    snapshot = make_snapshot(
+        SqlModel(name="a", cron="@daily", query=parse_one("select 1, ds")),
+        version="a",
+    )
+    snapshot.categorize_as(SnapshotChangeCategory.BREAKING)
+    state_sync.push_snapshots([snapshot])
+
+    def assert_intervals_match(interval_state: IntervalState) -> None:
+        assert interval_state.get_snapshot_intervals(
+            [snapshot]
+        ) == state_sync.interval_state.get_snapshot_intervals([snapshot])
+
+    with time_machine.travel("2023-01-08 00:00:00 UTC", tick=False):
+        state_sync.add_interval(snapshot, "2020-01-01", "2020-01-05")
+    assert_intervals_match(create_interval_state())
+
+    # A new instance, eg. in a subsequent process, doesn't fetch any records if nothing has changed.
+    interval_state = create_interval_state()
+    fetchall_spy = mocker.spy(state_sync.engine_adapter, "fetchall")
+    interval_state.get_snapshot_intervals([snapshot])
+    assert fetchall_spy.call_count == 1
+
+    # Only new records are fetched.
+    with time_machine.travel("2023-01-09 00:00:00 UTC", tick=False):
+        state_sync.add_interval(snapshot, "2020-01-06", "2020-01-06")
+    interval_state = create_interval_state()
+    apply_rows_spy = mocker.spy(interval_module, "_apply_interval_rows")
+    assert_intervals_match(interval_state)
+    assert len(apply_rows_spy.call_args_list[0].args[1]) == 1
+
+    # Persisted entries are rebuilt once they no longer match the state.
+    with time_machine.travel("2023-01-01 00:00:00 UTC", tick=False):
+        state_sync.remove_intervals(
+            [(snapshot, snapshot.inclusive_exclusive("2020-01-02", "2020-01-02"))]
+        )
+    assert_intervals_match(create_interval_state())
+
+    state_sync.compact_intervals()
+    assert_intervals_match(create_interval_state())
+
+
 def test_promote_snapshots(state_sync: EngineAdapterStateSync, make_snapshot: t.Callable):
     snapshot_a = make_snapshot(
         SqlModel(
@@ -1123,6 +1581,13 @@ def test_delete_expired_environments(state_sync: EngineAdapterStateSync, make_sn
     # Deleting the environments should remove the corresponding environment's statements
     assert state_sync.get_environment_statements(env_a.name) == []
 
+    # ...and their snapshot membership
+    assert state_sync.engine_adapter.fetchall(
+        exp.select("environment_name", "name", "identifier", "version").from_(
+            state_sync.environment_state.environment_snapshots_table
+        )
+    ) == [(env_b.name, snapshot.name, snapshot.identifier, snapshot.version)]
+
 
 def test_delete_expired_snapshots(state_sync: EngineAdapterStateSync, make_snapshot: t.Callable):
     now_ts = now_timestamp()
@@ -1264,8 +1729,11 @@ def test_delete_expired_snapshots_promoted(
     assert not state_sync.delete_expired_snapshots()
     assert set(state_sync.get_snapshots(all_snapshots)) == {snapshot.snapshot_id}
 
+    assert state_sync.environment_state.get_environment_snapshot_ids() == {snapshot.snapshot_id}
+
     env.snapshots_ = []
     state_sync.promote(env)
+    assert not state_sync.environment_state.get_environment_snapshot_ids()
 
     now_timestamp_mock = mocker.patch("sqlmesh.core.state_sync.db.facade.now_timestamp")
     now_timestamp_mock.return_value = now_timestamp() + 11000
@@ -1354,6 +1822,49 @@ def test_delete_expired_snapshots_shared_dev_table(
     assert set(state_sync.get_snapshots(all_snapshots)) == {new_snapshot.snapshot_id}
 
 
+def test_get_expired_snapshots_without_correlated_subqueries(
+    state_sync: EngineAdapterStateSync, make_snapshot: t.Callable, mocker: MockerFixture
+):
+    now_ts = now_timestamp()
+
+    snapshots = []
+    for i, query in enumerate(["select a, ds", "select a, b, ds", "select a, b, c, ds"]):
+        snapshot = make_snapshot(SqlModel(name="a", query=parse_one(query)))
+        snapshot.ttl = "in 10 seconds"
+        snapshot.categorize_as(
+            SnapshotChangeCategory.BREAKING if i == 0 else SnapshotChangeCategory.FORWARD_ONLY
+        )
+        snapshot.version = snapshots[0].version if snapshots else snapshot.version
+        snapshot.updated_ts = now_ts - 15000
+        snapshots.append(snapshot)
+
+    other_snapshot = make_snapshot(SqlModel(name="b", query=parse_one("select 1 as b")))
+    other_snapshot.ttl = "in 10 seconds"
+    other_snapshot.categorize_as(SnapshotChangeCategory.BREAKING)
+    other_snapshot.updated_ts = now_ts - 15000
+
+    state_sync.push_snapshots([*snapshots, other_snapshot])
+    state_sync.promote(
+        Environment(
+            name="test_environment",
+            snapshots=[other_snapshot.table_info],
+            start_at="2022-01-01",
+            end_at="2022-01-01",
+            plan_id="test_plan_id",
+            previous_plan_id="test_plan_id",
+        )
+    )
+
+    cleanup_targets_iter = state_sync.get_expired_snapshots(current_ts=now_timestamp())
+    assert not isinstance(cleanup_targets_iter, list)
+    cleanup_targets = list(cleanup_targets_iter)
+    assert {t.snapshot.snapshot_id for t in cleanup_targets} == {s.snapshot_id for s in snapshots}
+    assert [t.dev_table_only for t in cleanup_targets].count(False) == 1
+
+    mocker.patch.object(state_sync.engine_adapter, "SUPPORTS_CORRELATED_SUBQUERIES", False)
+    assert list(state_sync.get_expired_snapshots(current_ts=now_timestamp())) == cleanup_targets
+
+
 def test_delete_expired_snapshots_ignore_ttl(
     state_sync: EngineAdapterStateSync, make_snapshot: t.Callable
 ):
@@ -2031,6 +2542,48 @@ def test_unpause_snapshots_remove_intervals(
     ]
 
 
+def test_unpause_snapshots_remove_intervals_batched(
+    state_sync: EngineAdapterStateSync, make_snapshot: t.Callable, mocker: MockerFixture
+):
+    superseded_snapshots = []
+    for i in range(3):
+        snapshot = make_snapshot(
+            SqlModel(name="test_snapshot", query=parse_one(f"select {i}, ds"), cron="@daily"),
+            version="a",
+        )
+        snapshot.categorize_as(SnapshotChangeCategory.BREAKING)
+        snapshot.version = "a"
+        superseded_snapshots.append(snapshot)
+    state_sync.push_snapshots(superseded_snapshots)
+    for snapshot in superseded_snapshots:
+        state_sync.add_interval(snapshot, "2023-01-01", "2023-01-05")
+
+    new_snapshot = make_snapshot(
+        SqlModel(name="test_snapshot", query=parse_one("select 3, ds"), cron="@daily"),
+        version="a",
+    )
+    new_snapshot.categorize_as(SnapshotChangeCategory.FORWARD_ONLY)
+    new_snapshot.version = "a"
+    new_snapshot.effective_from = "2023-01-03"
+    state_sync.push_snapshots([new_snapshot])
+    state_sync.snapshot_state.clear_cache()
+
+    get_snapshots_spy = mocker.spy(state_sync.snapshot_state, "_get_snapshots")
+    remove_intervals_spy = mocker.spy(state_sync.interval_state, "remove_intervals")
+    state_sync.unpause_snapshots([new_snapshot], "2023-01-06")
+
+    # The superseded snapshots are fetched and their intervals are removed at once
+    get_snapshots_spy.assert_called_once()
+    assert set(get_snapshots_spy.call_args.args[0]) == {s.snapshot_id for s in superseded_snapshots}
+    remove_intervals_spy.assert_called_once()
+
+    actual_snapshots = state_sync.get_snapshots(superseded_snapshots)
+    for snapshot in superseded_snapshots:
+        assert actual_snapshots[snapshot.snapshot_id].intervals == [
+            (to_timestamp("2023-01-01"), to_timestamp("2023-01-03")),
+        ]
+
+
 def test_unpause_snapshots_remove_intervals_disabled_restatement(
     state_sync: EngineAdapterStateSync, make_snapshot: t.Callable
 ):
@@ -2270,7 +2823,10 @@ def test_first_migration_failure(duck_conn, mocker: MockerFixture, tmp_path) ->
     assert not state_sync.engine_adapter.table_exists(state_sync.interval_state.intervals_table)
 
 
-def test_migrate_rows(state_sync: EngineAdapterStateSync, mocker: MockerFixture) -> None:
+@pytest.mark.parametrize("streaming", [False, True])
+def test_migrate_rows(
+    state_sync: EngineAdapterStateSync, mocker: MockerFixture, streaming: bool
+) -> None:
     delete_versions(state_sync)
 
     state_sync.engine_adapter.replace_query(
@@ -2304,13 +2860,15 @@ def test_migrate_rows(state_sync: EngineAdapterStateSync, mocker: MockerFixture)
     old_snapshots = state_sync.engine_adapter.fetchdf("select * from sqlmesh._snapshots")
     old_environments = state_sync.engine_adapter.fetchdf("select * from sqlmesh._environments")
 
-    state_sync.migrate(default_catalog=None, skip_backup=True)
+    state_sync.migrate(default_catalog=None, skip_backup=True, streaming=streaming)
 
     new_snapshots = state_sync.engine_adapter.fetchdf("select * from sqlmesh._snapshots")
     new_environments = state_sync.engine_adapter.fetchdf("select * from sqlmesh._environments")
 
     assert len(old_snapshots) * 2 == len(new_snapshots)
     assert len(old_environments) == len(new_environments)
+    # Headers of records written before headers were introduced are backfilled.
+    assert not new_snapshots["header"].isna().any()
 
     start = "2023-01-01"
     end = "2023-01-07"
@@ -2352,6 +2910,153 @@ def test_migrate_rows(state_sync: EngineAdapterStateSync, mocker: MockerFixture)
     )
 
 
+@pytest.mark.parametrize("skip_backup", [False, True])
+def test_migrate_rows_streaming_resume(
+    state_sync: EngineAdapterStateSync, mocker: MockerFixture, skip_backup: bool
+) -> None:
+    delete_versions(state_sync)
+
+    state_sync.engine_adapter.replace_query(
+        "sqlmesh._snapshots",
+        pd.read_json("tests/fixtures/migrations/snapshots.json"),
+        columns_to_types={
+            "name": exp.DataType.build("text"),
+            "identifier": exp.DataType.build("text"),
+            "version": exp.DataType.build("text"),
+            "snapshot": exp.DataType.build("text"),
+        },
+    )
+
+    state_sync.engine_adapter.replace_query(
+        "sqlmesh._environments",
+        pd.read_json("tests/fixtures/migrations/environments.json"),
+        columns_to_types={
+            "name": exp.DataType.build("text"),
+            "snapshots": exp.DataType.build("text"),
+            "start_at": exp.DataType.build("text"),
+            "end_at": exp.DataType.build("text"),
+            "plan_id": exp.DataType.build("text"),
+            "previous_plan_id": exp.DataType.build("text"),
+            "expiration_ts": exp.DataType.build("bigint"),
+        },
+    )
+
+    state_sync.engine_adapter.drop_table("sqlmesh._seeds")
+    state_sync.engine_adapter.drop_table("sqlmesh._intervals")
+
+    old_snapshots = state_sync.engine_adapter.fetchdf("select * from sqlmesh._snapshots")
+
+    migrator = state_sync.migrator
+    mocker.patch.object(migrator, "SNAPSHOT_MIGRATION_BATCH_SIZE", 1)
+
+    push_migrated_snapshots = migrator._push_migrated_snapshots
+    pushed_chunks = 0
+
+    def _interrupted_push(*args: t.Any, **kwargs: t.Any) -> None:
+        nonlocal pushed_chunks
+        if pushed_chunks == 3:
+            raise Exception("mocked error")
+        pushed_chunks += 1
+        push_migrated_snapshots(*args, **kwargs)
+
+    push_mock = mocker.patch.object(
+        migrator, "_push_migrated_snapshots", side_effect=_interrupted_push
+    )
+    rollback_spy = mocker.spy(migrator, "rollback")
+    with pytest.raises(SQLMeshError, match="SQLMesh migration failed."):
+        state_sync.migrate(default_catalog=None, skip_backup=skip_backup, streaming=True)
+    mocker.stop(push_mock)
+
+    # The scripts have been committed together with the checkpoints, so the migration isn't rolled back
+    rollback_spy.assert_not_called()
+    assert state_sync.engine_adapter.fetchone(
+        exp.select("COUNT(*)").from_(migrator.migration_checkpoints_table)
+    ) == (3,)
+    versions = state_sync.get_versions(validate=False)
+    assert versions.schema_version == SCHEMA_VERSION
+    assert versions.sqlmesh_version == Versions().sqlmesh_version
+
+    apply_migrations_spy = mocker.spy(migrator, "_apply_migrations")
+    state_sync.migrate(default_catalog=None, skip_backup=skip_backup, streaming=True)
+    apply_migrations_spy.assert_not_called()
+    assert state_sync.get_versions(validate=False).sqlglot_version == SQLGLOT_VERSION
+
+    assert not state_sync.engine_adapter.table_exists(migrator.migration_checkpoints_table)
+
+    new_snapshots = state_sync.engine_adapter.fetchdf("select * from sqlmesh._snapshots")
+    assert len(old_snapshots) * 2 == len(new_snapshots)
+
+    dev_snapshots = state_sync.get_snapshots(
+        t.cast(Environment, state_sync.get_environment("dev")).snapshots
+    ).values()
+    assert all(s.migrated for s in dev_snapshots)
+
+
+def test_migrate_rows_streaming_failed_parent(
+    state_sync: EngineAdapterStateSync, mocker: MockerFixture
+) -> None:
+    from sqlmesh.core.state_sync.db import migrator as migrator_module
+
+    delete_versions(state_sync)
+
+    state_sync.engine_adapter.replace_query(
+        "sqlmesh._snapshots",
+        pd.read_json("tests/fixtures/migrations/snapshots.json"),
+        columns_to_types={
+            "name": exp.DataType.build("text"),
+            "identifier": exp.DataType.build("text"),
+            "version": exp.DataType.build("text"),
+            "snapshot": exp.DataType.build("text"),
+        },
+    )
+    state_sync.engine_adapter.replace_query(
+        "sqlmesh._environments",
+        pd.read_json("tests/fixtures/migrations/environments.json"),
+        columns_to_types={
+            "name": exp.DataType.build("text"),
+            "snapshots": exp.DataType.build("text"),
+            "start_at": exp.DataType.build("text"),
+            "end_at": exp.DataType.build("text"),
+            "plan_id": exp.DataType.build("text"),
+            "previous_plan_id": exp.DataType.build("text"),
+            "expiration_ts": exp.DataType.build("bigint"),
+        },
+    )
+
+    state_sync.engine_adapter.drop_table("sqlmesh._seeds")
+    state_sync.engine_adapter.drop_table("sqlmesh._intervals")
+
+    old_snapshots = state_sync.engine_adapter.fetchdf("select * from sqlmesh._snapshots")
+
+    migrate_snapshot = migrator_module._migrate_snapshot
+
+    def _failing_migrate_snapshot(args: t.Any) -> t.Any:
+        if migrator_module._raw_snapshot(args[0])["name"] == '"sushi"."waiter_revenue_by_day"':
+            return None, None
+        return migrate_snapshot(args)
+
+    mocker.patch("sqlmesh.core.constants.MAX_FORK_WORKERS", 1)
+    mocker.patch.object(migrator_module, "_migrate_snapshot", side_effect=_failing_migrate_snapshot)
+    fingerprints_from_nodes_spy = mocker.spy(state_sync.migrator, "_fingerprints_from_nodes")
+
+    state_sync.migrate(default_catalog=None, skip_backup=True, streaming=True)
+
+    # The parent's fingerprint is computed from its node, so that its child is still migrated
+    fingerprints_from_nodes_spy.assert_called_once()
+    new_snapshots = state_sync.engine_adapter.fetchdf("select * from sqlmesh._snapshots")
+    assert len(new_snapshots) == len(old_snapshots) * 2 - 1
+
+    top_waiters = [
+        json.loads(snapshot)
+        for name, snapshot in new_snapshots[["name", "snapshot"]].itertuples(index=False)
+        if name == '"sushi"."top_waiters"'
+    ]
+    migrated_top_waiters = [s for s in top_waiters if s.get("migrated")]
+    original_top_waiters = [s for s in top_waiters if not s.get("migrated")]
+    assert len(migrated_top_waiters) == 1
+    assert migrated_top_waiters[0]["parents"] != original_top_waiters[0]["parents"]
+
+
 def test_backup_state(state_sync: EngineAdapterStateSync, mocker: MockerFixture) -> None:
     state_sync.engine_adapter.replace_query(
         "sqlmesh._snapshots",
@@ -2601,6 +3306,148 @@ def test_cache(state_sync, make_snapshot, mocker):
         mock.assert_called()
 
 
+def test_cache_lru(state_sync, make_snapshot, mocker):
+    snapshots = []
+    for name in ("a", "b", "c"):
+        snapshot = make_snapshot(SqlModel(name=name, query=parse_one("select 1, ds")))
+        snapshot.categorize_as(SnapshotChangeCategory.BREAKING)
+        snapshots.append(snapshot)
+    snapshot_a, snapshot_b, snapshot_c = snapshots
+    state_sync.push_snapshots(snapshots)
+
+    cache = CachingStateSync(state_sync, max_entries=2)
+    get_snapshots = mocker.spy(state_sync, "get_snapshots")
+
+    cache.get_snapshots([snapshot_a, snapshot_b])
+    # Reading a makes b the least recently used entry, which is then evicted in favor of c
+    cache.get_snapshots([snapshot_a])
+    cache.get_snapshots([snapshot_c])
+    assert get_snapshots.call_count == 2
+    assert snapshot_b.snapshot_id not in cache.snapshot_cache
+    assert cache.cache_stats == (1, 3, 1, 2, 0)
+
+    cache.get_snapshots([snapshot_a, snapshot_c])
+    assert get_snapshots.call_count == 2
+
+    # Intervals added by name evict all snapshots with that name
+    cache.add_snapshots_intervals(
+        [SnapshotIntervals(name=snapshot_a.name, identifier=None, version="a", dev_version=None)]
+    )
+    assert list(cache.snapshot_cache._entries) == [snapshot_c.snapshot_id]
+    assert dict(cache.snapshot_cache._ids_by_name) == {snapshot_c.name: {snapshot_c.snapshot_id}}
+
+    # The size budget only fits a single snapshot
+    cache = CachingStateSync(state_sync, max_entries=None, max_size_bytes=1)
+    cache.get_snapshots([snapshot_a])
+    assert cache.cache_stats.evictions == 1
+    assert cache.cache_stats.size_bytes == 0
+    cache = CachingStateSync(state_sync, max_entries=None, max_size_bytes=10**9)
+    cache.get_snapshots([snapshot_a, snapshot_b])
+    assert cache.cache_stats.entries == 2
+    assert cache.cache_stats.size_bytes == sum(
+        len(snapshot.json())
+        for snapshot in state_sync.get_snapshots([snapshot_a, snapshot_b]).values()
+    )
+
+
+def test_read_replica(state_sync, make_snapshot, mocker, tmp_path):
+    replica = ReadReplicaStateSync(
+        state_sync,
+        EngineAdapterStateSync(
+            create_engine_adapter(duckdb.connect, "duckdb"),
+            schema=c.SQLMESH,
+            context_path=tmp_path,
+        ),
+        max_staleness=10,
+    )
+    now_timestamp = mocker.patch("sqlmesh.core.state_sync.db.replica.now_timestamp")
+    now_timestamp.return_value = to_timestamp("2023-01-01 00:00:00")
+
+    snapshot_a = make_snapshot(SqlModel(name="a", query=parse_one("select 1, ds")))
+    snapshot_a.categorize_as(SnapshotChangeCategory.BREAKING)
+    snapshot_b = make_snapshot(SqlModel(name="b", query=parse_one("select 2, ds")))
+    snapshot_b.categorize_as(SnapshotChangeCategory.BREAKING)
+
+    # Writes go through to the primary and are visible to the next read
+    replica.push_snapshots([snapshot_a])
+    replica.add_interval(snapshot_a, "2023-01-01", "2023-01-01")
+    with patch.object(state_sync, "get_snapshots") as mock:
+        assert replica.get_snapshots([snapshot_a]).keys() == {snapshot_a.snapshot_id}
+        mock.assert_not_called()
+    assert replica.get_snapshots([snapshot_a])[snapshot_a.snapshot_id].intervals == [
+        (to_timestamp("2023-01-01"), to_timestamp("2023-01-02"))
+    ]
+    assert replica.get_versions() == state_sync.get_versions()
+
+    # Writes made elsewhere are only visible once the replica becomes stale
+    state_sync.push_snapshots([snapshot_b])
+    promote_snapshots(state_sync, [snapshot_a, snapshot_b], "prod")
+    state_sync.add_interval(snapshot_a, "2023-01-02", "2023-01-02")
+    assert not replica.snapshots_exist([snapshot_b])
+    assert not replica.get_environments()
+
+    now_timestamp.return_value = to_timestamp("2023-01-01 00:00:11")
+    assert replica.snapshots_exist([snapshot_a, snapshot_b]) == {
+        snapshot_a.snapshot_id,
+        snapshot_b.snapshot_id,
+    }
+    assert replica.get_environment("prod") == state_sync.get_environment("prod")
+    assert replica.get_snapshots([snapshot_a])[snapshot_a.snapshot_id].intervals == [
+        (to_timestamp("2023-01-01"), to_timestamp("2023-01-03"))
+    ]
+
+    # Deleted snapshots and compacted intervals are picked up as well
+    state_sync.delete_snapshots([snapshot_b])
+    state_sync.compact_intervals()
+    state_sync.invalidate_environment("prod", protect_prod=False)
+    assert replica.sync()
+    assert replica.snapshots_exist([snapshot_a, snapshot_b]) == {snapshot_a.snapshot_id}
+    assert replica.get_environment("prod") == state_sync.get_environment("prod")
+    assert replica.get_snapshots([snapshot_a])[snapshot_a.snapshot_id].intervals == [
+        (to_timestamp("2023-01-01"), to_timestamp("2023-01-03"))
+    ]
+    assert replica.replica.interval_state.get_snapshot_intervals(
+        [snapshot_a]
+    ) == state_sync.interval_state.get_snapshot_intervals([snapshot_a])
+
+    # Intervals updated in place and auto restatements are picked up as well
+    state_sync.interval_state._update_intervals_for_deleted_snapshots([snapshot_a])
+    state_sync.update_auto_restatements({snapshot_a.name_version: 1})
+    assert replica.sync()
+    state_sync.update_auto_restatements({snapshot_a.name_version: 2})
+    assert replica.sync()
+
+    def fetch_rows(
+        state: EngineAdapterStateSync, table: exp.Table, *columns: str
+    ) -> t.List[t.Tuple]:
+        return sorted(state.engine_adapter.fetchall(exp.select(*columns).from_(table)))
+
+    interval_columns = ("id", "identifier", "dev_version", "is_compacted")
+    assert fetch_rows(
+        replica.replica, replica.replica.interval_state.intervals_table, *interval_columns
+    ) == fetch_rows(state_sync, state_sync.interval_state.intervals_table, *interval_columns)
+    assert fetch_rows(
+        replica.replica,
+        replica.replica.snapshot_state.auto_restatements_table,
+        "snapshot_name",
+        "next_auto_restatement_ts",
+    ) == [(snapshot_a.name, 2)]
+
+    # Tables are only synced if their stats have changed
+    sync_methods = [
+        mocker.spy(replica, name)
+        for name in (
+            "_sync_snapshots",
+            "_sync_auto_restatements",
+            "_sync_environments",
+            "_sync_intervals",
+        )
+    ]
+    assert replica.sync()
+    for sync_method in sync_methods:
+        sync_method.assert_not_called()
+
+
 def test_cleanup_expired_views(
     mocker: MockerFixture, state_sync: EngineAdapterStateSync, make_snapshot: t.Callable
 ):
@@ -2926,19 +3773,25 @@ def test_snapshot_batching(state_sync, mocker, make_snapshot):
     )
     calls = mock.delete_from.call_args_list
     identifiers = sorted([snapshot_a.identifier, snapshot_b.identifier, snapshot_c.identifier])
-    assert mock.delete_from.call_args_list == [
-        call(
-            exp.to_table("sqlmesh._snapshots"),
-            where=parse_one(
-                f"(name, identifier) in (('\"a\"', '{identifiers[0]}'), ('\"a\"', '{identifiers[1]}'))"
-            ),
-        ),
-        call(
-            exp.to_table("sqlmesh._snapshots"),
-            where=parse_one(f"(name, identifier) in (('\"a\"', '{identifiers[2]}'))"),
-        ),
+    first_batch = parse_one(
+        f"(name, identifier) in (('\"a\"', '{identifiers[0]}'), ('\"a\"', '{identifiers[1]}'))"
+    )
+    second_batch = parse_one(f"(name, identifier) in (('\"a\"', '{identifiers[2]}'))")
+    assert mock.delete_from.call_args_list[:-1] == [
+        call(exp.to_table("sqlmesh._snapshots"), where=first_batch),
+        call(exp.to_table("sqlmesh._snapshot_blob_refs"), where=first_batch),
+        call(exp.to_table("sqlmesh._snapshots"), where=second_batch),
+        call(exp.to_table("sqlmesh._snapshot_blob_refs"), where=second_batch),
     ]
+    # Unreferenced blobs are swept once after all batches were deleted
+    blobs_call = mock.delete_from.call_args_list[-1]
+    assert blobs_call.args == (exp.to_table("sqlmesh._snapshot_blobs"),)
+    assert (
+        "NOT hash IN (SELECT hash FROM sqlmesh._snapshot_blob_refs)"
+        in blobs_call.kwargs["where"].sql()
+    )
 
+    mock.fetchall.reset_mock()
     mock.fetchall.side_effect = [
         [
             [
@@ -3513,6 +4366,68 @@ def test_get_environments_summary_no_env(state_sync: EngineAdapterStateSync) ->
     assert state_sync.get_environments_summary() == []
 
 
+def test_get_environment_summary(state_sync: EngineAdapterStateSync, make_snapshot: t.Callable):
+    snapshot = make_snapshot(SqlModel(name="a", query=parse_one("select a, ds")))
+    snapshot.categorize_as(SnapshotChangeCategory.BREAKING)
+    state_sync.push_snapshots([snapshot])
+
+    env = Environment(
+        name="test_environment",
+        snapshots=[snapshot.table_info],
+        start_at="2022-01-01",
+        end_at="2022-01-01",
+        plan_id="test_plan_id",
+        previous_plan_id="test_plan_id",
+    )
+    state_sync.promote(env)
+
+    assert state_sync.get_environment_summary(env.name) == env.summary
+    assert state_sync.get_environment_summary("missing") is None
+
+
+def test_get_environments_by_snapshot_names(
+    state_sync: EngineAdapterStateSync, make_snapshot: t.Callable
+):
+    snapshot_a = make_snapshot(SqlModel(name="a", query=parse_one("select 1 as a, ds")))
+    snapshot_a.categorize_as(SnapshotChangeCategory.BREAKING)
+    snapshot_b = make_snapshot(SqlModel(name="b", query=parse_one("select 2 as b, ds")))
+    snapshot_b.categorize_as(SnapshotChangeCategory.BREAKING)
+    state_sync.push_snapshots([snapshot_a, snapshot_b])
+
+    env_a = Environment(
+        name="env_a",
+        snapshots=[snapshot_a.table_info],
+        start_at="2022-01-01",
+        end_at="2022-01-01",
+        plan_id="test_plan_id",
+    )
+    env_ab = Environment(
+        name="env_ab",
+        snapshots=[snapshot_a.table_info, snapshot_b.table_info],
+        start_at="2022-01-01",
+        end_at="2022-01-01",
+        plan_id="test_plan_id",
+    )
+    state_sync.promote(env_a)
+    state_sync.promote(env_ab)
+
+    def _names(environments: t.List[Environment]) -> t.Set[str]:
+        return {environment.name for environment in environments}
+
+    assert _names(state_sync.get_environments()) == {"env_a", "env_ab"}
+    assert _names(state_sync.get_environments(snapshot_names=[snapshot_a.name])) == {
+        "env_a",
+        "env_ab",
+    }
+    assert _names(state_sync.get_environments(snapshot_names=[snapshot_b.name])) == {"env_ab"}
+    assert not state_sync.get_environments(snapshot_names=['"missing"'])
+
+    assert state_sync.environment_state.get_environment_snapshot_name_versions(
+        "env_ab", names={snapshot_b.name}
+    ) == [snapshot_b.name_version]
+    assert state_sync.max_interval_end_per_model("missing") == {}
+
+
 @time_machine.travel("2020-01-05 00:00:00 UTC")
 def test_compact_intervals_pending_restatement_many_snapshots_same_version(
     state_sync: EngineAdapterStateSync,
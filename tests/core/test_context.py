@@ -20,6 +20,7 @@ from sqlmesh.core import dialect as d, constants as c
 from sqlmesh.core.config import (
     load_configs,
     AutoCategorizationMode,
+    BuiltInSchedulerConfig,
     CategorizerConfig,
     Config,
     DuckDBConnectionConfig,
@@ -547,6 +548,35 @@ def test_env_and_default_schema_normalization(mocker: MockerFixture):
     assert list(context.fetchdf('select c from "DEFAULT__DEV"."X"')["c"])[0] == 1
 
 
+def test_load_skips_cached_optimized_queries(tmp_path: pathlib.Path, mocker: MockerFixture):
+    from sqlmesh.core.model import schema
+
+    # The models don't reference any Python macros, so that their optimized query cache keys don't depend on
+    # which modules have already been imported by other tests
+    create_temp_file(
+        tmp_path,
+        pathlib.Path("models", "parent.sql"),
+        "MODEL (name db.parent, kind FULL); SELECT 1 AS id, 'a' AS name",
+    )
+    create_temp_file(
+        tmp_path,
+        pathlib.Path("models", "child.sql"),
+        "MODEL (name db.child, kind FULL); SELECT * FROM db.parent WHERE name <> 'b'",
+    )
+    config = Config(model_defaults=ModelDefaultsConfig(dialect="duckdb"))
+
+    load_spy = mocker.spy(schema, "load_optimized_query_and_mapping")
+    expected = Context(paths=tmp_path, config=config).render("db.child").sql()
+    assert {call.args[0].name for call in load_spy.call_args_list} == {"db.parent", "db.child"}
+
+    load_spy.reset_mock()
+    context = Context(paths=tmp_path, config=config)
+
+    # SQL models whose optimized queries are cached are not sent to workers
+    assert not load_spy.called
+    assert context.render("db.child").sql() == expected
+
+
 def test_clear_caches(tmp_path: pathlib.Path):
     models_dir = tmp_path / "models"
 
@@ -1209,6 +1239,33 @@ def test_duckdb_state_connection_automatic_multithreaded_mode(tmp_path):
     assert isinstance(state_sync.engine_adapter._connection_pool, ThreadLocalSharedConnectionPool)
 
 
+def test_state_cache_config(tmp_path):
+    config = Config(
+        model_defaults=ModelDefaultsConfig(dialect="duckdb"),
+        default_scheduler=BuiltInSchedulerConfig(
+            state_cache_max_entries=10,
+            state_cache_max_size_bytes=1000,
+            state_cache_intervals=True,
+            state_compress_blobs=True,
+        ),
+    )
+
+    context = Context(paths=[tmp_path], config=config)
+    assert isinstance(context.state_sync, CachingStateSync)
+    assert context.state_sync.snapshot_cache.max_entries == 10
+    assert context.state_sync.snapshot_cache.max_size_bytes == 1000
+    interval_state = t.cast(EngineAdapterStateSync, context.state_sync.state_sync).interval_state
+    assert interval_state._interval_cache is not None
+    assert interval_state._persisted_interval_cache is not None
+    snapshot_state = t.cast(EngineAdapterStateSync, context.state_sync.state_sync).snapshot_state
+    assert snapshot_state._compress_blobs
+
+    context = Context(paths=[tmp_path], config=Config())
+    state_sync = t.cast(EngineAdapterStateSync, context.state_sync.state_sync)
+    assert state_sync.interval_state._interval_cache is None
+    assert not state_sync.snapshot_state._compress_blobs
+
+
 def test_requirements(copy_to_temp_path: t.Callable):
     from sqlmesh.utils.metaprogramming import Executable
 
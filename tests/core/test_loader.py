@@ -1,8 +1,14 @@
+import os
+import time
+import typing as t
+
 import pytest
 from pathlib import Path
+from pytest_mock.plugin import MockerFixture
 from sqlmesh.cli.example_project import init_example_project
 from sqlmesh.core.config import Config, ModelDefaultsConfig
 from sqlmesh.core.context import Context
+from sqlmesh.core.model import ModelCache
 from sqlmesh.utils.errors import ConfigError
 
 
@@ -201,3 +207,57 @@ def my_model(context, **kwargs):
     assert model.description == "model_payload_a"
     path_b.write_text(model_payload_b)
     context.load()  # raise no error to duplicate key if the functions are identical (by registry class_method)
+
+
+def test_model_cache_invalidation(tmp_path: Path, mocker: MockerFixture) -> None:
+    """Cached models are only reloaded when the definitions they reference change."""
+    macro_a = tmp_path / "macros" / "macro_a.py"
+    macro_b = tmp_path / "macros" / "macro_b.py"
+    macro_a.parent.mkdir()
+    macro_a.write_text("""from sqlmesh import macro
+
+@macro()
+def macro_a(evaluator):
+    return 1
+""")
+    macro_b.write_text("""from sqlmesh import macro
+
+@macro()
+def macro_b(evaluator):
+    return 1
+""")
+
+    models_path = tmp_path / "models"
+    models_path.mkdir()
+    (models_path / "model_a.sql").write_text("MODEL (name db.model_a); SELECT @macro_a() AS a")
+    (models_path / "model_b.sql").write_text("MODEL (name db.model_b); SELECT @VAR('x') AS b")
+    (models_path / "model_c.sql").write_text("MODEL (name db.model_c); SELECT 1 AS c")
+
+    def _config(x: int) -> Config:
+        return Config(model_defaults=ModelDefaultsConfig(dialect="duckdb"), variables={"x": x})
+
+    Context(paths=tmp_path, config=_config(1))
+
+    put = mocker.patch.object(ModelCache, "put", autospec=True, side_effect=ModelCache.put)
+
+    def _reloaded(config: Config) -> t.Set[str]:
+        put.reset_mock()
+        context = Context(paths=tmp_path, config=config)
+        assert len(context.models) == 3
+        return {call.args[2] for call in put.call_args_list}
+
+    # Nothing has changed
+    assert _reloaded(_config(1)) == set()
+
+    # Only the modification time has changed
+    os.utime(macro_a, (time.time() + 10, time.time() + 10))
+    assert _reloaded(_config(1)) == set()
+
+    # No model references this macro
+    macro_b.write_text(macro_b.read_text().replace("return 1", "return 2"))
+    assert _reloaded(_config(1)) == set()
+
+    macro_a.write_text(macro_a.read_text().replace("return 1", "return 2"))
+    assert _reloaded(_config(1)) == {"models__model_a"}
+
+    assert _reloaded(_config(2)) == {"models__model_b"}
@@ -1,5 +1,6 @@
 # ruff: noqa: F811
 import json
+import pickle
 import typing as t
 from datetime import date, datetime
 from pathlib import Path
@@ -55,6 +56,7 @@ from sqlmesh.core.model import (
     load_sql_based_model,
     model,
 )
+from sqlmesh.core.model.cache import OptimizedQueryCache
 from sqlmesh.core.model.common import parse_expression
 from sqlmesh.core.model.kind import ModelKindName, _model_kind_validator
 from sqlmesh.core.model.seed import CsvSettings
@@ -2970,6 +2972,54 @@ def test_model_cache(tmp_path: Path, mocker: MockerFixture):
     assert not cache.put([seed_model], "test_model", "test_entry_b")
 
 
+def test_model_cache_lazy_query(tmp_path: Path):
+    cache = ModelCache(tmp_path)
+    optimized_query_cache = OptimizedQueryCache(tmp_path)
+
+    model = load_sql_based_model(
+        d.parse(
+            """
+            MODEL (name db.model_sql, kind FULL);
+            SELECT 1 AS a, ds FROM db.parent -- comment
+            """
+        )
+    )
+    optimized_query_cache.with_optimized_query(model)
+    cache.put([model], "test_model")
+
+    cached_model = t.cast(SqlModel, cache.get("test_model")[0])
+    assert "query" not in cached_model.__dict__
+
+    # Cheap fields, hashes and cache keys don't require the query to be decoded
+    assert optimized_query_cache.with_optimized_query(cached_model)
+    assert cached_model.fqn == model.fqn
+    assert cached_model.depends_on == {'"db"."parent"'}
+    assert cached_model.columns_to_types == model.columns_to_types
+    assert cached_model.data_hash == model.data_hash
+    assert cached_model.metadata_hash == model.metadata_hash
+    assert "query" not in cached_model.__dict__
+
+    assert cached_model.query == model.query
+    assert cached_model.query.parent is None
+    assert "query" in cached_model.__dict__
+
+    # Serialization decodes the query
+    assert t.cast(SqlModel, cache.get("test_model")[0]).dict() == model.dict()
+
+    updated_model = t.cast(SqlModel, cache.get("test_model")[0]).copy(
+        update={"query": parse_one("SELECT 2 AS a, ds FROM db.parent")}
+    )
+    assert updated_model.query.sql() == "SELECT 2 AS a, ds FROM db.parent"
+    assert updated_model.metadata_hash != model.metadata_hash
+
+    # Pickling doesn't generate the canonical query strings if they haven't been computed yet
+    uncached_model = load_sql_based_model(d.parse("MODEL (name db.model_sql); SELECT 1 AS a"))
+    restored_model = pickle.loads(pickle.dumps(uncached_model))
+    assert "_query_gen" not in uncached_model.__dict__
+    assert "_query_gen" not in restored_model.__dict__
+    assert restored_model.metadata_hash == uncached_model.metadata_hash
+
+
 @pytest.mark.slow
 def test_model_cache_gateway(tmp_path: Path, mocker: MockerFixture):
     init_example_project(tmp_path, dialect="duckdb")
@@ -2990,7 +3040,8 @@ def test_model_cache_gateway(tmp_path: Path, mocker: MockerFixture):
     assert patched_cache_put.call_count == 0
 
     Context(paths=tmp_path, config=config, gateway="secondary")
-    assert patched_cache_put.call_count == 2
+    # Each entry stores the models and their dependencies
+    assert patched_cache_put.call_count == 4
 
 
 @pytest.mark.slow
@@ -3008,7 +3059,8 @@ def test_model_cache_default_catalog(tmp_path: Path, mocker: MockerFixture):
         PropertyMock(return_value=None),
     ):
         Context(paths=tmp_path)
-        assert patched_cache_put.call_count == 2
+        # Each entry stores the models and their dependencies
+        assert patched_cache_put.call_count == 4
 
 
 def test_model_ctas_query():
@@ -10279,3 +10331,28 @@ def test_query_label_and_authorization_macro():
         "query_label": d.parse_one("[('key', 'value')]"),
         "authorization": d.parse_one("'test_authorization'"),
     }
+
+
+def test_concurrency_group() -> None:
+    expressions = parse(
+        """
+        MODEL(name sushi.test_concurrency_group);
+        SELECT 1 AS a
+        """
+    )
+    model = load_sql_based_model(expressions)
+    assert model.concurrency_group is None
+
+    expressions = parse(
+        """
+        MODEL(name sushi.test_concurrency_group, concurrency_group heavy_models);
+        SELECT 1 AS a
+        """
+    )
+    grouped_model = load_sql_based_model(expressions)
+    assert grouped_model.concurrency_group == "heavy_models"
+    assert "concurrency_group heavy_models" in grouped_model.render_definition()[0].sql()
+
+    # Assigning a concurrency group is a metadata-only change.
+    assert grouped_model.data_hash == model.data_hash
+    assert grouped_model.metadata_hash != model.metadata_hash
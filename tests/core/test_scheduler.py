@@ -29,6 +29,7 @@ from sqlmesh.core.snapshot import (
     SnapshotChangeCategory,
     DeployabilityIndex,
 )
+from sqlmesh.core.snapshot.cache import EvaluationDurationCache
 from sqlmesh.utils.date import to_datetime, to_timestamp, DatetimeRanges, TimeLike
 from sqlmesh.utils.errors import CircuitBreakerError, NodeAuditsErrors
 
@@ -877,3 +878,119 @@ def test_scd_type_2_batch_size(
 
     # Verify batches match expectations
     assert batches == expected_batches
+
+
+def test_node_priorities_from_evaluation_durations(
+    mocker: MockerFixture, make_snapshot, get_batched_missing_intervals, tmp_path
+):
+    start = to_datetime("2023-01-01")
+    end = to_datetime("2023-01-04")
+
+    def _make_snapshot(name: str, query: str) -> Snapshot:
+        return make_snapshot(
+            SqlModel(
+                name=name,
+                kind=IncrementalByTimeRangeKind(time_column=TimeColumn(column="ds")),
+                cron="@daily",
+                start=start,
+                query=parse_one(query),
+            ),
+        )
+
+    slow = _make_snapshot("slow", "SELECT @end_ds AS ds")
+    slow_child = _make_snapshot("slow_child", "SELECT ds FROM slow")
+    fast = _make_snapshot("fast", "SELECT @end_ds AS ds")
+    slow_child.parents = (slow.snapshot_id,)
+
+    duration_cache = EvaluationDurationCache(tmp_path)
+    # 100ms per daily interval for the slow chain and 10ms for the fast model.
+    one_day = to_timestamp("2023-01-02") - to_timestamp("2023-01-01")
+    duration_cache.record(slow, 0, one_day, 100)
+    duration_cache.record(slow_child, 0, one_day, 100)
+    duration_cache.record(fast, 0, one_day, 10)
+    duration_cache.save()
+
+    scheduler = Scheduler(
+        snapshots=[slow, slow_child, fast],
+        snapshot_evaluator=SnapshotEvaluator(adapters=mocker.MagicMock(), ddl_concurrent_tasks=1),
+        state_sync=mocker.MagicMock(),
+        max_workers=2,
+        default_catalog=None,
+        evaluation_duration_cache=EvaluationDurationCache(tmp_path),
+    )
+    batches = get_batched_missing_intervals(scheduler, start, end, end)
+    dag = scheduler._dag(batches)
+    priorities = scheduler._node_priorities(dag, 2)
+    assert priorities
+
+    interval = (to_timestamp("2023-01-01"), to_timestamp("2023-01-04"))
+    assert priorities[(slow.name, (interval, 0))] == 600
+    assert priorities[(slow_child.name, (interval, 0))] == 300
+    assert priorities[(fast.name, (interval, 0))] == 30
+
+    # No priorities are computed when the DAG is evaluated serially.
+    assert scheduler._node_priorities(dag, 1) is None
+
+    # No priorities are computed without a duration history.
+    scheduler.evaluation_duration_cache = EvaluationDurationCache(tmp_path / "empty")
+    assert scheduler._node_priorities(dag, 2) is None
+
+
+def test_node_resources_per_gateway_and_concurrency_group(
+    mocker: MockerFixture, make_snapshot, get_batched_missing_intervals
+):
+    start = to_datetime("2023-01-01")
+    end = to_datetime("2023-01-02")
+
+    def _make_snapshot(name: str, **kwargs: t.Any) -> Snapshot:
+        return make_snapshot(
+            SqlModel(
+                name=name,
+                kind=IncrementalByTimeRangeKind(time_column=TimeColumn(column="ds")),
+                cron="@daily",
+                start=start,
+                query=parse_one("SELECT @end_ds AS ds"),
+                **kwargs,
+            ),
+        )
+
+    default_model = _make_snapshot("default_model")
+    pg_model = _make_snapshot("pg_model", gateway="postgres", concurrency_group="heavy")
+    sf_model = _make_snapshot("sf_model", gateway="snowflake")
+
+    scheduler = Scheduler(
+        snapshots=[default_model, pg_model, sf_model],
+        snapshot_evaluator=SnapshotEvaluator(
+            adapters={
+                "default": mocker.MagicMock(),
+                "postgres": mocker.MagicMock(),
+                "snowflake": mocker.MagicMock(),
+            },
+            ddl_concurrent_tasks=1,
+        ),
+        state_sync=mocker.MagicMock(),
+        max_workers=4,
+        default_catalog=None,
+        max_workers_per_gateway={"postgres": 2, "snowflake": 8},
+        concurrency_group_limits={"heavy": 1},
+    )
+    batches = get_batched_missing_intervals(scheduler, start, end, end)
+    node_resources, resource_limits, tasks_num = scheduler._node_resources(scheduler._dag(batches))
+
+    interval = (to_timestamp("2023-01-01"), to_timestamp("2023-01-02"))
+    assert node_resources == {
+        (default_model.name, (interval, 0)): [("gateway", None)],
+        (pg_model.name, (interval, 0)): [("gateway", "postgres"), ("concurrency_group", "heavy")],
+        (sf_model.name, (interval, 0)): [("gateway", "snowflake")],
+    }
+    assert resource_limits == {
+        ("gateway", None): 4,
+        ("gateway", "postgres"): 2,
+        ("gateway", "snowflake"): 8,
+        ("concurrency_group", "heavy"): 1,
+    }
+    assert tasks_num == 14
+
+    scheduler.max_workers_per_gateway = {}
+    scheduler.concurrency_group_limits = {}
+    assert scheduler._node_resources(scheduler._dag(batches)) == (None, None, 4)
@@ -47,6 +47,7 @@ from sqlmesh.core.snapshot import (
     SnapshotChangeCategory,
     SnapshotFingerprint,
     SnapshotIntervals,
+    SnapshotIntervalsBuilder,
     SnapshotTableInfo,
     earliest_start_date,
     fingerprint_from_node,
@@ -2972,3 +2973,34 @@ def test_partitioned_by_roundtrip(make_snapshot: t.Callable):
 
     assert isinstance(deserialized.node, SqlModel)
     assert deserialized.node.partitioned_by == snapshot.node.partitioned_by
+
+
+def test_snapshot_intervals_builder():
+    operations = [
+        ("add_interval", 0, 5),
+        ("add_interval", 10, 15),
+        ("add_interval", 5, 10),
+        ("remove_interval", 3, 4),
+        ("remove_interval", 20, 30),
+        ("add_interval", 20, 25),
+        ("remove_interval", 12, 12),
+        ("add_dev_interval", 0, 5),
+        ("remove_dev_interval", 0, 5),
+        ("add_pending_restatement_interval", 0, 10),
+        ("remove_pending_restatement_interval", 2, 4),
+        ("remove_pending_restatement_interval", 40, 50),
+    ]
+
+    expected = SnapshotIntervals(name="a", identifier="i", version="v", dev_version="d")
+    builder = SnapshotIntervalsBuilder(
+        SnapshotIntervals(name="a", identifier="i", version="v", dev_version="d")
+    )
+    for operation, start, end in operations:
+        getattr(expected, operation)(start, end)
+        getattr(builder, operation)(start, end)
+
+    actual = builder.build()
+    assert actual.intervals == expected.intervals == [(0, 3), (4, 12), (12, 15), (20, 25)]
+    assert actual.dev_intervals == expected.dev_intervals == []
+    assert actual.pending_restatement_intervals == expected.pending_restatement_intervals
+    assert actual.pending_restatement_intervals == [(0, 2), (4, 10)]
@@ -1,13 +1,17 @@
+import shutil
+import threading
 import typing as t
 from pathlib import Path
 
+import pytest
 from pytest_mock.plugin import MockerFixture
 from sqlglot import parse_one
 
 from sqlmesh.core import dialect as d
 from sqlmesh.core.model import SqlModel, load_sql_based_model
 from sqlmesh.core.model.cache import OptimizedQueryCache
-from sqlmesh.utils.cache import FileCache
+from sqlmesh.utils.cache import DirectoryCacheStore, FileCache, SQLiteCacheStore
+from sqlmesh.utils.errors import SQLMeshError
 from sqlmesh.utils.pydantic import PydanticModel
 
 
@@ -15,8 +19,9 @@ class _TestEntry(PydanticModel):
     value: str
 
 
-def test_file_cache(tmp_path: Path, mocker: MockerFixture):
-    cache: FileCache[_TestEntry] = FileCache(tmp_path)
+@pytest.mark.parametrize("backend", ["sqlite", "directory"])
+def test_file_cache(tmp_path: Path, mocker: MockerFixture, backend: str):
+    cache: FileCache[_TestEntry] = FileCache(tmp_path, backend=backend)
 
     test_entry_a = _TestEntry(value="value_a")
     test_entry_b = _TestEntry(value="value_b")
@@ -38,7 +43,108 @@ def test_file_cache(tmp_path: Path, mocker: MockerFixture):
 
     loader.assert_called_once()
 
-    assert "___test_model_" in cache._cache_entry_path('"test_model"').name
+    assert cache.exists("test_name", "test_entry_a")
+    assert not cache.exists("test_name", "test_entry_c")
+
+    cache.clear()
+    assert cache.get("test_name", "test_entry_a") is None
+
+
+def test_file_cache_directory_entry_path(tmp_path: Path):
+    store = DirectoryCacheStore(tmp_path, "", "1_0")
+    assert "___test_model_" in store._entry_path('"test_model"').name
+
+
+@pytest.mark.parametrize("backend", ["sqlite", "directory"])
+def test_file_cache_get_put_many(tmp_path: Path, backend: str):
+    cache: FileCache[_TestEntry] = FileCache(tmp_path, prefix="test", backend=backend)
+    other_cache: FileCache[_TestEntry] = FileCache(tmp_path, prefix="other", backend=backend)
+
+    entries = {(f"name_{i}", f"id_{i}"): _TestEntry(value=f"value_{i}") for i in range(1200)}
+    cache.put_many(entries)
+
+    assert cache.get_many(entries) == entries
+    assert cache.get_many([("name_1", "id_1"), ("name_1", "id_2"), ("missing", "")]) == {
+        ("name_1", "id_1"): _TestEntry(value="value_1")
+    }
+    assert cache.exists_many([("name_1", "id_1"), ("name_1", "id_2")]) == {("name_1", "id_1")}
+    assert not other_cache.get_many(entries)
+
+    other_cache.put("name_1", "id_1", value=_TestEntry(value="other"))
+    cache.clear()
+    assert not cache.get_many(entries)
+    assert other_cache.get("name_1", "id_1") == _TestEntry(value="other")
+
+
+def test_sqlite_cache_store_eviction(tmp_path: Path, mocker: MockerFixture):
+    old_store = SQLiteCacheStore(tmp_path, "test", "old_version")
+    old_store.put_many({"a": b"a"})
+
+    store = SQLiteCacheStore(tmp_path, "new", "new_version")
+    store.put_many({"b": b"b" * 10, "c": b"c" * 10})
+
+    # Eviction only happens once per process and namespace
+    SQLiteCacheStore._evicted.clear()
+    SQLiteCacheStore(tmp_path, "test", "new_version")
+    assert not old_store.get_many(["a"])
+
+    mocker.patch("time.time", return_value=1e12)
+    store.get_many(["c"])
+    mocker.stopall()
+
+    mocker.patch.object(SQLiteCacheStore, "MAX_SIZE_BYTES", 15)
+    SQLiteCacheStore._evicted.clear()
+    SQLiteCacheStore(tmp_path, "new", "new_version")
+
+    # The least recently accessed entry is evicted first
+    assert store.get_many(["b", "c"]) == {"c": b"c" * 10}
+
+
+def test_sqlite_cache_store_reconnects(tmp_path: Path, mocker: MockerFixture):
+    cache_path = tmp_path / ".cache"
+    cache: FileCache[_TestEntry] = FileCache(cache_path, prefix="test", backend="sqlite")
+    cache.put("name", value=_TestEntry(value="value"))
+
+    shutil.rmtree(cache_path)
+    assert cache.get("name") is None
+    cache.put("name", value=_TestEntry(value="value"))
+    assert cache.get("name") == _TestEntry(value="value")
+
+    # Simulate a forked worker which must not reuse or close the parent's connection, nor wait for a lock
+    # which was held by another thread of the parent at the time of the fork
+    _, parent_connection = SQLiteCacheStore._connections[cache_path / SQLiteCacheStore.FILE_NAME]
+    parent_lock = cache._store._lock  # type: ignore
+    lock_acquired = threading.Event()
+    release_lock = threading.Event()
+
+    def _hold_lock() -> None:
+        with parent_lock:
+            lock_acquired.set()
+            release_lock.wait(timeout=10)
+
+    thread = threading.Thread(target=_hold_lock)
+    thread.start()
+    try:
+        assert lock_acquired.wait(timeout=10)
+        mocker.patch("os.getpid", return_value=-1)
+        assert cache.get("name") == _TestEntry(value="value")
+        assert parent_connection in SQLiteCacheStore._inherited_connections
+    finally:
+        release_lock.set()
+        thread.join()
+
+
+def test_file_cache_backend(tmp_path: Path, mocker: MockerFixture):
+    assert isinstance(FileCache(tmp_path)._store, SQLiteCacheStore)
+
+    mocker.patch.dict("os.environ", {"SQLMESH_CACHE_BACKEND": "directory"})
+    assert isinstance(FileCache(tmp_path)._store, DirectoryCacheStore)
+
+    with pytest.raises(SQLMeshError, match="Unsupported cache backend 'unknown'"):
+        FileCache(tmp_path, backend="unknown")
+
+    mocker.patch.object(SQLiteCacheStore, "__init__", side_effect=Exception("failed"))
+    assert isinstance(FileCache(tmp_path, backend="sqlite")._store, DirectoryCacheStore)
 
 
 def test_optimized_query_cache(tmp_path: Path, mocker: MockerFixture):
@@ -1,12 +1,21 @@
+import threading
+import time
+import typing as t
+from concurrent.futures import Executor
+
 import pytest
 from pytest_mock.plugin import MockerFixture
 
 from sqlmesh.core.snapshot import SnapshotId
 from sqlmesh.utils.concurrency import (
+    ConcurrentDAGExecutor,
     NodeExecutionFailedError,
+    concurrent_apply_to_dag,
     concurrent_apply_to_snapshots,
     concurrent_apply_to_values,
+    critical_path_priorities,
 )
+from sqlmesh.utils.dag import DAG
 
 
 @pytest.mark.parametrize("tasks_num", [1, 2])
@@ -147,3 +156,85 @@ def test_concurrent_apply(tasks_num: int):
     values = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10]
     results = concurrent_apply_to_values(values, lambda x: x * 2, tasks_num)
     assert results == [x * 2 for x in values]
+
+
+def test_concurrent_apply_to_dag_skipped_child_of_completed_parent():
+    # Node "c" depends on a failing node and on a slow node that completes after the failure.
+    dag = DAG[str]({"failed": set(), "slow": set(), "c": {"failed", "slow"}, "d": {"c"}})
+    failure_recorded = threading.Event()
+
+    class _Executor(ConcurrentDAGExecutor[str]):
+        def _on_node_failed(self, node: str, ex: Exception, executor: Executor) -> None:
+            super()._on_node_failed(node, ex, executor)
+            failure_recorded.set()
+
+    def fn(node: str) -> None:
+        if node == "failed":
+            raise RuntimeError("fail")
+        if node == "slow":
+            assert failure_recorded.wait(timeout=10)
+
+    errors, skipped = _Executor(dag, fn, 2, raise_on_error=False).run()
+
+    assert [e.node for e in errors] == ["failed"]
+    assert skipped == ["c", "d"]
+
+
+def test_concurrent_apply_to_dag_large():
+    nodes_num = 10_000
+    dag = DAG[int]({i: {i - 1, i // 2} if i else set() for i in range(nodes_num)})
+
+    processed: t.List[int] = []
+    errors, skipped = concurrent_apply_to_dag(dag, processed.append, 4)
+
+    assert not errors
+    assert not skipped
+    # Each node depends on its predecessor, so the processing order is fully determined.
+    assert processed == list(range(nodes_num))
+
+
+def test_concurrent_apply_to_dag_priorities():
+    dag = DAG[str]({"a": set(), "b": set(), "c": set(), "d": set(), "e": {"d"}})
+    priorities = critical_path_priorities(dag, lambda node: 10.0 if node in ("d", "e") else 1.0)
+    assert priorities == {"a": 1.0, "b": 1.0, "c": 1.0, "d": 20.0, "e": 10.0}
+
+    started: t.List[str] = []
+    errors, skipped = concurrent_apply_to_dag(dag, started.append, 2, node_priorities=priorities)
+
+    assert not errors
+    assert not skipped
+    assert "d" in started[:2]
+    assert len(started) == 5
+
+
+def test_concurrent_apply_to_dag_resource_limits():
+    dag = DAG[str]({f"pg_{i}": set() for i in range(4)})
+    for i in range(4):
+        dag.add(f"sf_{i}")
+
+    lock = threading.Lock()
+    running: t.Dict[str, int] = {"pg": 0, "sf": 0}
+    max_running: t.Dict[str, int] = {"pg": 0, "sf": 0}
+
+    def fn(node: str) -> None:
+        resource = node.split("_")[0]
+        with lock:
+            running[resource] += 1
+            max_running[resource] = max(max_running[resource], running[resource])
+        time.sleep(0.05)
+        with lock:
+            running[resource] -= 1
+
+    errors, skipped = concurrent_apply_to_dag(
+        dag,
+        fn,
+        4,
+        node_resources={node: [node.split("_")[0]] for node in dag},
+        resource_limits={"pg": 1},
+    )
+
+    assert not errors
+    assert not skipped
+    assert max_running["pg"] == 1
+    # Snowflake nodes fill the slots that are left idle by the saturated Postgres resource.
+    assert max_running["sf"] == 3
@@ -0,0 +1,48 @@
+import pytest
+
+from sqlmesh.utils.cron import cron_floor, cron_ticks
+from sqlmesh.utils.date import to_datetime, to_timestamp
+
+
+@pytest.fixture(autouse=True)
+def clear_cron_calendar():
+    cron_ticks.cache_clear()
+    cron_floor.cache_clear()
+
+
+def test_cron_ticks():
+    start, end = to_timestamp("2020-01-01"), to_timestamp("2020-01-03")
+    assert cron_ticks("@daily", start, end).tolist() == [
+        to_timestamp("2020-01-01"),
+        to_timestamp("2020-01-02"),
+        to_timestamp("2020-01-03"),
+    ]
+    assert cron_ticks(
+        "0 0 1 * *", to_timestamp("2020-01-01"), to_timestamp("2020-03-15")
+    ).tolist() == [
+        to_timestamp("2020-01-01"),
+        to_timestamp("2020-02-01"),
+        to_timestamp("2020-03-01"),
+        to_timestamp("2020-03-15"),
+    ]
+
+
+def test_cron_ticks_shared():
+    start, end = to_timestamp("2020-01-01"), to_timestamp("2020-02-01")
+
+    ticks = cron_ticks("@hourly", start, end)
+    assert cron_ticks("@hourly", start, end) is ticks
+    assert cron_ticks.cache_info().hits == 1
+    assert cron_ticks.cache_info().misses == 1
+
+    with pytest.raises(ValueError):
+        ticks[0] = 0
+
+
+def test_cron_floor_cached():
+    time = to_datetime("2020-01-01 10:00:00")
+
+    assert cron_floor("@daily", time) == to_datetime("2020-01-01")
+    assert cron_floor("@daily", time) == to_datetime("2020-01-01")
+    assert cron_floor.cache_info().hits == 1
+    assert cron_floor.cache_info().misses == 1
@@ -104,3 +104,42 @@ def test_prune():
         "a": {"d"},
         "d": set(),
     }
+
+
+def test_upstream_cache_after_add():
+    dag = DAG({"a": {"b"}, "c": {"a"}})
+    assert dag.upstream("c") == {"a", "b"}
+    assert dag.upstream("a") == {"b"}
+
+    # Adding a new node doesn't affect existing entries.
+    dag.add("d", ["c"])
+    assert dag.upstream("d") == {"a", "b", "c"}
+    assert dag.upstream("c") == {"a", "b"}
+
+    # Extending dependencies of an existing node invalidates the node and its descendants.
+    dag.add("b", ["e"])
+    assert dag.upstream("b") == {"e"}
+    assert dag.upstream("a") == {"b", "e"}
+    assert dag.upstream("d") == {"a", "b", "c", "e"}
+    assert dag.upstream("e") == set()
+
+
+def test_upstream_of_missing_node_then_add():
+    dag = DAG({"a": set()})
+    assert dag.upstream("b") == set()
+
+    dag.add("b", {"a"})
+    assert dag.upstream("b") == {"a"}
+
+
+def test_downstream_sorted():
+    dag = DAG({"a": set(), "b": {"a"}, "c": {"b"}, "d": {"a", "c"}, "e": set()})
+    assert dag.downstream("a") == ["b", "c", "d"]
+    assert dag.downstream("c") == ["d"]
+    assert dag.downstream("e") == []
+    assert dag.downstream("missing") == []
+
+    dag.add("f", ["b"])
+    assert dag.downstream("a") == ["b", "c", "f", "d"]
+    assert dag.reversed.graph["b"] == {"c", "f"}
+    assert "f" in dag
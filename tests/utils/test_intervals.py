@@ -0,0 +1,65 @@
+import numpy as np  # noqa: TID253
+import pytest
+
+from sqlmesh.utils.intervals import (
+    apply_lookback,
+    fixed_width_ticks,
+    merge_intervals,
+    remove_interval,
+    uncovered_mask,
+)
+
+
+@pytest.mark.parametrize(
+    "intervals, expected",
+    [
+        ([], []),
+        ([(1, 2)], [(1, 2)]),
+        ([(3, 4), (1, 2)], [(1, 2), (3, 4)]),
+        ({(1, 2), (2, 3)}, [(1, 3)]),
+        ([(1, 5), (2, 3), (4, 7), (8, 9)], [(1, 7), (8, 9)]),
+        ([(5, 6), (1, 10), (2, 3)], [(1, 10)]),
+    ],
+)
+def test_merge_intervals(intervals, expected):
+    assert merge_intervals(intervals) == expected
+
+
+@pytest.mark.parametrize(
+    "intervals, remove_start, remove_end, expected",
+    [
+        ([], 1, 2, []),
+        ([(0, 10)], 3, 5, [(0, 3), (5, 10)]),
+        ([(0, 10)], 0, 5, [(5, 10)]),
+        ([(0, 10)], 5, 10, [(0, 5)]),
+        ([(0, 10)], 0, 10, []),
+        ([(0, 5), (8, 12), (20, 30)], 3, 10, [(0, 3), (10, 12), (20, 30)]),
+        ([(20, 30), (0, 5)], 25, 40, [(20, 25), (0, 5)]),
+    ],
+)
+def test_remove_interval(intervals, remove_start, remove_end, expected):
+    assert remove_interval(intervals, remove_start, remove_end) == expected
+
+
+def test_fixed_width_ticks():
+    assert fixed_width_ticks(0, 10, 5) == [0, 5, 10]
+    assert fixed_width_ticks(0, 12, 5) == [0, 5, 10, 12]
+    assert fixed_width_ticks(3, 3, 5) == [3]
+    assert fixed_width_ticks(5, 3, 5) == [5, 3]
+
+
+def test_uncovered_mask():
+    ticks = np.array([0, 5, 10, 15, 20, 25])
+
+    assert uncovered_mask(ticks, []).tolist() == [True] * 5
+    assert uncovered_mask(ticks, [(5, 15), (20, 23)]).tolist() == [True, False, False, True, True]
+    assert uncovered_mask(ticks, [(0, 12), (12, 25)]).tolist() == [False, False, True, False, False]
+
+
+def test_apply_lookback():
+    missing = np.array([False, False, True, False, False])
+
+    assert apply_lookback(missing, 0).tolist() == missing.tolist()
+    assert apply_lookback(missing, 1).tolist() == [False, True, True, False, True]
+    assert apply_lookback(missing, 2).tolist() == [True, False, True, True, True]
+    assert apply_lookback(missing, 10).tolist() == [True] * 5
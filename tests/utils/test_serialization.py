@@ -0,0 +1,102 @@
+import gzip
+import pickle
+import typing as t
+
+import pytest
+from pytest_mock.plugin import MockerFixture
+from sqlglot import diff, exp, parse_one
+from sqlglot.diff import Keep
+from sqlglot.optimizer import optimize
+
+from sqlmesh.core import dialect as d
+from sqlmesh.core.model import SqlModel, load_sql_based_model
+from sqlmesh.utils import serialization
+
+
+def test_expression_roundtrip():
+    expression = optimize(
+        parse_one("SELECT a, b::INT AS c /* comment */ FROM x WHERE a IN (1, 2) AND b LIKE 'x'"),
+        schema={"x": {"a": "int", "b": "text"}},
+    )
+    expression.meta["key"] = "value"
+
+    loaded = serialization.loads(serialization.dumps(expression))
+
+    assert loaded == expression
+    assert loaded.sql(comments=True) == expression.sql(comments=True)
+    assert loaded.meta == {"key": "value"}
+    for original, node in zip(expression.walk(), loaded.walk()):
+        assert type(node) is type(original)
+        assert node.arg_key == original.arg_key
+        assert node.index == original.index
+        assert type(node.parent) is type(original.parent)
+        assert node.comments == original.comments
+        assert node.type == original.type
+
+
+def test_expression_arguments_are_not_normalized():
+    expression = parse_one("DATE_TRUNC('q', x)", read="oracle")
+    assert serialization.loads(serialization.dumps(expression)).sql("oracle") == expression.sql(
+        "oracle"
+    )
+
+
+def test_expression_roundtrip_has_no_diff():
+    expression = optimize(
+        parse_one(
+            "SELECT x.a, SUM(b) AS c FROM x JOIN y ON x.a = y.a WHERE x.a > 1 GROUP BY x.a ORDER BY c LIMIT 5"
+        ),
+        schema={"x": {"a": "int", "b": "int"}, "y": {"a": "int"}},
+    )
+
+    loaded = serialization.loads(serialization.dumps(expression))
+
+    assert loaded.args.keys() == expression.args.keys()
+    assert all(isinstance(edit, Keep) for edit in diff(expression, loaded))
+
+
+def test_model_roundtrip():
+    model = t.cast(
+        SqlModel,
+        load_sql_based_model(
+            d.parse(
+                """
+                MODEL (name db.table, kind FULL);
+
+                @DEF(filter_, a = 1);
+
+                SELECT a FROM (SELECT 1 AS a) WHERE @filter_ AND @macro_var
+                """
+            ),
+            variables={"macro_var": True},
+        ),
+    )
+
+    loaded = serialization.loads(serialization.dumps([model]))[0]
+
+    assert loaded.query == model.query
+    assert loaded.data_hash == model.data_hash
+    assert loaded.metadata_hash == model.metadata_hash
+    assert loaded.render_query_or_raise().sql() == model.render_query_or_raise().sql()
+
+
+def test_shared_expressions_keep_identity():
+    expression = parse_one("SELECT 1")
+    loaded = serialization.loads(serialization.dumps([expression, expression]))
+    assert loaded[0] is loaded[1]
+
+
+def test_loads_legacy_payload():
+    expression = parse_one("SELECT 1")
+    assert serialization.loads(gzip.compress(pickle.dumps(expression))) == expression
+
+
+def test_compression_fallback(mocker: MockerFixture):
+    mocker.patch.object(serialization, "zstandard", None)
+
+    payload = serialization.dumps(exp.column("a"))
+    assert payload.startswith(serialization._GZIP_MAGIC)
+    assert serialization.loads(payload) == exp.column("a")
+
+    with pytest.raises(ValueError, match="Unsupported compression format"):
+        serialization.loads(b"invalid")